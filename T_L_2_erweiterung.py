@@ -15,6 +15,7 @@ import os
 import json
 import subprocess
 import importlib.util
+import sqlite3
 import traceback
 
 from PyQt5 import QtCore, QtWidgets
@@ -31,9 +32,32 @@ from PyQt5.QtCore import (
     QPropertyAnimation, QEasingCurve, QEvent, QTimer, pyqtSignal
 )
 
+# --- Eigene URL-Schemata der Plugins ---
+# QWebEngineUrlScheme muss vor dem Erzeugen der QApplication registriert sein; die
+# Plugins werden erst später geladen und installieren dann nur noch ihren Handler.
+PLUGIN_URL_SCHEMES = (b"canvas-store",)  # Zeichenheft: Bilddaten als Bytes statt Base64
+
+
+def register_plugin_url_schemes():
+    try:
+        from PyQt5.QtWebEngineCore import QWebEngineUrlScheme
+    except Exception:
+        return  # Qt < 5.12: Plugins fallen auf den WebChannel zurück
+    for name in PLUGIN_URL_SCHEMES:
+        if QWebEngineUrlScheme.schemeByName(name).name():
+            continue
+        scheme = QWebEngineUrlScheme(name)
+        scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+        scheme.setFlags(QWebEngineUrlScheme.SecureScheme |
+                        QWebEngineUrlScheme.LocalAccessAllowed |
+                        QWebEngineUrlScheme.CorsEnabled)
+        QWebEngineUrlScheme.registerScheme(scheme)
+
+
 # --- WebEngine optional laden ---
 WEBENGINE_AVAILABLE = False
 try:
+    register_plugin_url_schemes()
     try:
         from PyQt5.QtWebEngine import QtWebEngine
 
@@ -47,6 +71,9 @@ try:
 except Exception:
     WEBENGINE_AVAILABLE = False
 
+# Gemeinsame Ablage für Plugin-Daten (SQLite + window.launcherStorage), s. _plugin_storage.py
+from _plugin_storage import PluginStorageService  # noqa: E402
+
 
 # --- CONFIG MANAGER (NEU) ---
 class ConfigManager:
@@ -1193,6 +1220,22 @@ class SettingsWidget(QWidget):
 
         self.layout.addWidget(gb_plugins)
 
+        # --- Plugin-Daten Section ---
+        gb_data = QGroupBox("Plugin-Daten")
+        v_data = QVBoxLayout(gb_data)
+        self.list_storage = QListWidget()
+        self.list_storage.setMaximumHeight(120)
+        v_data.addWidget(self.list_storage)
+        h_data = QHBoxLayout()
+        btn_refresh = QPushButton("Aktualisieren")
+        btn_refresh.clicked.connect(self.load_storage_overview)
+        btn_backup = QPushButton("Sichern…")
+        btn_backup.clicked.connect(self.backup_storage)
+        h_data.addWidget(btn_refresh)
+        h_data.addWidget(btn_backup)
+        v_data.addLayout(h_data)
+        self.layout.addWidget(gb_data)
+
         self.load_values()
 
     def load_values(self):
@@ -1215,6 +1258,43 @@ class SettingsWidget(QWidget):
                     item.setCheckState(Qt.Checked)
                 self.list_plugins.addItem(item)
 
+        self.load_storage_overview()
+
+    def _plugin_storage(self):
+        service = getattr(self.main_window.app, "plugin_storage", None)
+        return service.storage if service is not None else None
+
+    def load_storage_overview(self):
+        self.list_storage.clear()
+        storage = self._plugin_storage()
+        if storage is None:
+            self.list_storage.addItem("Ablage nicht verfügbar")
+            return
+        try:
+            rows = storage.namespaces()
+        except sqlite3.Error as e:
+            self.list_storage.addItem(f"Fehler: {e}")
+            return
+        for ns, keys, size in rows:
+            self.list_storage.addItem(f"{ns} – {keys} Schlüssel, {(size or 0) / 1024:.1f} KB")
+        if not rows:
+            self.list_storage.addItem("Noch keine Daten")
+
+    def backup_storage(self):
+        storage = self._plugin_storage()
+        if storage is None:
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Plugin-Daten sichern", "plugin_storage_backup.sqlite3", "SQLite (*.sqlite3 *.db)")
+        if not path:
+            return
+        try:
+            storage.backup(path)
+        except (OSError, sqlite3.Error) as e:
+            QMessageBox.critical(self, "Sichern fehlgeschlagen", str(e))
+            return
+        QMessageBox.information(self, "Plugin-Daten", f"Gesichert nach:\n{path}")
+
     def save_settings(self):
         config = ConfigManager.load_config()
         config["pomodoro_visible"] = self.cb_pomo_visible.isChecked()
@@ -1826,9 +1906,13 @@ class MainAppWindow(QMainWindow, ButtonContentMixin):
             cls = getattr(mod, "PluginWidget", None)
             if cls is not None and isinstance(cls, type):
                 try:
-                    return cls(mode=mode)
+                    widget = cls(mode=mode)
                 except TypeError:
-                    return cls()
+                    widget = cls()
+                storage = getattr(self.app, "plugin_storage", None)
+                if storage is not None:
+                    storage.attach(widget, os.path.splitext(os.path.basename(path))[0])
+                return widget
             return None
         except Exception:
             return None
@@ -1840,6 +1924,8 @@ class TrayApp(QApplication):
         self.setQuitOnLastWindowClosed(False)
         self.setStyleSheet(current_stylesheet())
         self.setProperty("toolbar_theme", theme)
+        self.plugin_storage = PluginStorageService(self)
+        self.plugin_storage.install_page_script()
         self.popup = PopupWindow(app=self)
         self.main_window = MainAppWindow(self, popup=self.popup)
         self.popup.set_plugin_loader(self.main_window.load_plugin_from_path)
@@ -1870,6 +1956,7 @@ class TrayApp(QApplication):
                 self.tray.activated.disconnect(self.on_tray_activated)
             except Exception:
                 pass
+            self.plugin_storage.close()
             if WEBENGINE_AVAILABLE:
                 try:
                     if hasattr(self.popup, "html_toolbar"):
@@ -1888,6 +1975,10 @@ class TrayApp(QApplication):
 
 
 if __name__ == "__main__":
+    # Plugins (z.B. Kalender) nutzen Worker-Prozesse; in der PyInstaller-EXE
+    # darf ein Worker nicht erneut den Launcher starten.
+    import multiprocessing
+    multiprocessing.freeze_support()
     try:
         import ctypes, platform
 
@@ -0,0 +1,335 @@
+# _plugin_storage.py
+"""
+Gemeinsame Ablage für Plugin-Daten, von tray_launcher.py und T_L_2_erweiterung.py
+gleichermaßen genutzt.
+"""
+import os
+import sqlite3
+import time
+import traceback
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSlot, QFile, QIODevice
+
+WEBENGINE_AVAILABLE = False
+try:
+    from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEngineProfile, QWebEngineScript
+    from PyQt5.QtWebChannel import QWebChannel
+
+    WEBENGINE_AVAILABLE = True
+except Exception:
+    WEBENGINE_AVAILABLE = False
+
+
+# --- Gemeinsame Ablage für Plugin-Daten ---
+# Plugins legen ihren Zustand statt in localStorage (an den Origin der Seite gebunden,
+# bei jeder Änderung komplett und synchron geschrieben, für den Launcher unsichtbar) über
+# den WebChannel in einer SQLite-Datei des Launchers ab. Jedes Plugin bekommt einen
+# eigenen Namensraum; Schreibzugriffe werden gesammelt und gebündelt geschrieben.
+PLUGIN_STORAGE_DIR = os.path.expanduser("~/.tray_launcher")
+PLUGIN_STORAGE_DB = os.path.join(PLUGIN_STORAGE_DIR, "plugin_storage.sqlite3")
+PLUGIN_STORAGE_FLUSH_MS = 250  # Sammelzeit bis zum Schreiben
+
+PLUGIN_STORAGE_SCRIPT = """
+// window.launcherStorage: Schlüssel-Wert-Ablage des Launchers für Plugin-Seiten.
+// open() verbindet sich einmal mit dem Namensraum des Plugins und lädt ihn komplett;
+// danach liest get() aus dem Speicher, set()/remove() sammeln Änderungen und schicken
+// sie gebündelt an den Launcher. Läuft die Seite nicht im Launcher, liefert open() null.
+(function () {
+  if (window.launcherStorage) return;
+
+  // Pro Transport darf es nur einen QWebChannel-Client geben: ein zweiter ersetzt den
+  // Nachrichten-Handler des Transports, der erste bekommt dann keine Antworten mehr.
+  // Daher liefert new QWebChannel() für denselben Transport immer denselben Client,
+  // egal ob die Seite oder open() ihn zuerst anlegt.
+  if (typeof QWebChannel === 'function' && !QWebChannel.shared) {
+    const Base = QWebChannel;
+    let client = null, ready = false;
+    const waiting = [];
+    const Shared = function (transport, initCallback) {
+      if (!client || client.transport !== transport) {
+        ready = false;
+        client = new Base(transport, channel => {
+          ready = true;
+          waiting.splice(0).forEach(cb => cb(channel));
+        });
+      }
+      if (initCallback) {
+        if (ready) setTimeout(() => initCallback(client), 0);
+        else waiting.push(initCallback);
+      }
+      return client;
+    };
+    Shared.shared = true;
+    window.QWebChannel = Shared;
+  }
+
+  class StorageNamespace {
+    constructor(api, items) {
+      this.api = api;
+      this.cache = new Map(Object.entries(items || {}));
+      this.pending = null;   // Schlüssel -> Wert bzw. null (löschen) bis zum nächsten Senden
+    }
+    get(key) { return this.cache.has(key) ? this.cache.get(key) : null; }
+    set(key, value) {
+      value = String(value);
+      this.cache.set(key, value);
+      this.queue(key, value);
+    }
+    remove(key) {
+      this.cache.delete(key);
+      this.queue(key, null);
+    }
+    keys() { return Array.from(this.cache.keys()); }
+    queue(key, value) {
+      if (!this.pending) {
+        this.pending = {};
+        setTimeout(() => this.flush(), 0);
+      }
+      this.pending[key] = value;
+    }
+    flush() {
+      const changes = this.pending;
+      this.pending = null;
+      if (changes) this.api.write(changes);
+    }
+  }
+
+  let opening = null, opened = null;
+  window.launcherStorage = {
+    // options.legacyKeys: localStorage-Schlüssel des Plugins für den einmaligen Import,
+    // options.channel: schon vorhandener QWebChannel-Client der Seite
+    open(options) {
+      options = options || {};
+      if (opening) return opening;
+      opening = new Promise(resolve => {
+        const connect = channel => {
+          const api = channel.objects.launcherStorage;
+          if (!api) { resolve(null); return; }
+          api.load(state => {
+            opened = new StorageNamespace(api, state.items);
+            if (state.imported) { resolve(opened); return; }
+            const legacy = {};
+            (options.legacyKeys || []).forEach(key => {
+              try {
+                const value = localStorage.getItem(key);
+                if (value !== null) legacy[key] = value;
+              } catch (e) {
+                // Seite ohne localStorage (z. B. setHtml ohne Basis-URL)
+              }
+            });
+            api.import_legacy(legacy, () => {
+              Object.keys(legacy).forEach(key => {
+                if (!opened.cache.has(key)) opened.cache.set(key, legacy[key]);
+              });
+              resolve(opened);
+            });
+          });
+        };
+        if (options.channel) connect(options.channel);
+        else if (typeof qt === 'undefined' || !qt.webChannelTransport || typeof QWebChannel === 'undefined') resolve(null);
+        else new QWebChannel(qt.webChannelTransport, connect);  // liefert den schon vorhandenen Client, s. u.
+      });
+      return opening;
+    }
+  };
+  window.addEventListener('pagehide', () => { if (opened) opened.flush(); });
+})();
+"""
+
+
+class PluginStorage:
+    """Schlüssel-Wert-Ablage der Plugins in SQLite, ein Namensraum je Plugin.
+
+    set()/write() landen zunächst in einem Puffer, den flush() in einer Transaktion
+    schreibt; Lesezugriffe sehen den Puffer bereits.
+    """
+
+    def __init__(self, db_path=PLUGIN_STORAGE_DB):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(db_path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS kv (
+                ns TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                updated REAL NOT NULL,
+                PRIMARY KEY (ns, key)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS imports (ns TEXT PRIMARY KEY, at REAL NOT NULL);
+        """)
+        self._pending = {}  # (ns, key) -> Wert, None = löschen
+
+    def items(self, ns):
+        out = dict(self.db.execute("SELECT key, value FROM kv WHERE ns = ?", (ns,)))
+        for (pns, key), value in self._pending.items():
+            if pns != ns:
+                continue
+            if value is None:
+                out.pop(key, None)
+            else:
+                out[key] = value
+        return out
+
+    def get(self, ns, key, default=None):
+        if (ns, key) in self._pending:
+            value = self._pending[(ns, key)]
+            return default if value is None else value
+        row = self.db.execute("SELECT value FROM kv WHERE ns = ? AND key = ?", (ns, key)).fetchone()
+        return row[0] if row else default
+
+    def set(self, ns, key, value):
+        self._pending[(ns, key)] = None if value is None else str(value)
+
+    def write(self, ns, changes):
+        for key, value in changes.items():
+            self.set(ns, str(key), value)
+        return len(changes)
+
+    def flush(self):
+        if not self._pending:
+            return 0
+        now = time.time()
+        puts = [(ns, key, value, now) for (ns, key), value in self._pending.items() if value is not None]
+        dels = [(ns, key) for (ns, key), value in self._pending.items() if value is None]
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO kv (ns, key, value, updated) VALUES (?, ?, ?, ?)", puts)
+            self.db.executemany("DELETE FROM kv WHERE ns = ? AND key = ?", dels)
+        count = len(self._pending)
+        self._pending.clear()
+        return count
+
+    def is_imported(self, ns):
+        return self.db.execute("SELECT 1 FROM imports WHERE ns = ?", (ns,)).fetchone() is not None
+
+    def import_legacy(self, ns, items):
+        """Übernimmt einmalig Werte aus localStorage; schon vorhandene Schlüssel bleiben."""
+        if self.is_imported(ns):
+            return 0
+        self.flush()
+        now = time.time()
+        with self.db:
+            cur = self.db.executemany(
+                "INSERT OR IGNORE INTO kv (ns, key, value, updated) VALUES (?, ?, ?, ?)",
+                [(ns, str(key), str(value), now) for key, value in items.items() if value is not None])
+            self.db.execute("INSERT OR REPLACE INTO imports (ns, at) VALUES (?, ?)", (ns, now))
+        return max(0, cur.rowcount)
+
+    def namespaces(self):
+        """[(Namensraum, Schlüssel, Bytes)] für die Übersicht im Launcher."""
+        self.flush()
+        return self.db.execute(
+            "SELECT ns, COUNT(*), SUM(LENGTH(value)) FROM kv GROUP BY ns ORDER BY ns").fetchall()
+
+    def backup(self, path):
+        self.flush()
+        dest = sqlite3.connect(path)
+        try:
+            self.db.backup(dest)
+        finally:
+            dest.close()
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+
+class PluginStorageAPI(QObject):
+    """Namensraum eines Plugins, im WebChannel der Seite als 'launcherStorage'."""
+
+    def __init__(self, service, namespace, parent=None):
+        super().__init__(parent)
+        self.service = service
+        self.namespace = namespace
+
+    @pyqtSlot(result='QVariantMap')
+    def load(self):
+        storage = self.service.storage
+        try:
+            return {"items": storage.items(self.namespace), "imported": storage.is_imported(self.namespace)}
+        except sqlite3.Error:
+            print("Plugin-Ablage: Laden fehlgeschlagen:", traceback.format_exc())
+            return {"items": {}, "imported": True}
+
+    @pyqtSlot('QVariantMap', result=int)
+    def write(self, changes):
+        count = self.service.storage.write(self.namespace, changes)
+        self.service.schedule_flush()
+        return count
+
+    @pyqtSlot('QVariantMap', result=int)
+    def import_legacy(self, items):
+        try:
+            return self.service.storage.import_legacy(self.namespace, items)
+        except sqlite3.Error:
+            print("Plugin-Ablage: Import fehlgeschlagen:", traceback.format_exc())
+            return 0
+
+
+class PluginStorageService(QObject):
+    """Hält die Ablage, schreibt gesammelt und hängt sie an die Seiten geladener Plugins."""
+
+    def __init__(self, parent=None, db_path=PLUGIN_STORAGE_DB):
+        super().__init__(parent)
+        self.storage = None
+        try:
+            self.storage = PluginStorage(db_path)
+        except (OSError, sqlite3.Error):
+            print("Plugin-Ablage nicht verfügbar:", traceback.format_exc())
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(PLUGIN_STORAGE_FLUSH_MS)
+        self._flush_timer.timeout.connect(self.flush)
+
+    def install_page_script(self):
+        """qwebchannel.js und window.launcherStorage in jede Seite des Standardprofils."""
+        if not WEBENGINE_AVAILABLE or self.storage is None:
+            return
+        qwc = QFile(":/qtwebchannel/qwebchannel.js")
+        if not qwc.open(QIODevice.ReadOnly):
+            print("qwebchannel.js nicht gefunden, Plugin-Ablage für Seiten deaktiviert.")
+            return
+        source = bytes(qwc.readAll()).decode("utf-8")
+        qwc.close()
+        script = QWebEngineScript()
+        script.setName("launcherStorage")
+        script.setSourceCode(source + "\n" + PLUGIN_STORAGE_SCRIPT)
+        script.setInjectionPoint(QWebEngineScript.DocumentCreation)
+        script.setWorldId(QWebEngineScript.MainWorld)
+        script.setRunsOnSubFrames(False)
+        QWebEngineProfile.defaultProfile().scripts().insert(script)
+
+    def attach(self, widget, namespace):
+        """Meldet den Namensraum im WebChannel jeder Seite des Plugin-Widgets an."""
+        if not WEBENGINE_AVAILABLE or self.storage is None or widget is None:
+            return
+        for view in widget.findChildren(QWebEngineView):
+            page = view.page()
+            channel = page.webChannel()
+            if channel is None:
+                channel = QWebChannel(page)
+                page.setWebChannel(channel)
+            channel.registerObject("launcherStorage", PluginStorageAPI(self, namespace, channel))
+
+    def schedule_flush(self):
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self):
+        if self.storage is None:
+            return
+        try:
+            self.storage.flush()
+        except sqlite3.Error:
+            print("Plugin-Ablage: Schreiben fehlgeschlagen:", traceback.format_exc())
+
+    def close(self):
+        self._flush_timer.stop()
+        if self.storage is None:
+            return
+        try:
+            self.storage.close()
+        except sqlite3.Error:
+            print("Plugin-Ablage: Schließen fehlgeschlagen:", traceback.format_exc())
+        self.storage = None
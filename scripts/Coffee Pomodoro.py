@@ -851,6 +851,15 @@ class="machine-steam-cloud"></div>
   </div>
 
 <script>
+  // Ablage: im Launcher dessen Plugin-Ablage, eigenständig localStorage
+  let store = null;
+  function openStorage() {
+    if (!window.launcherStorage) return Promise.resolve();
+    return launcherStorage.open({ legacyKeys: ['pomodoroTheme'] }).then(s => { store = s; });
+  }
+  function storageGet(key) { return store ? store.get(key) : localStorage.getItem(key); }
+  function storageSet(key, value) { if (store) store.set(key, value); else localStorage.setItem(key, value); }
+
   /**
    * Ultimate Coffee Pomodoro Timer (Level 6.1 - Final Polish)
    * FIX 1: Kaffeestrahl startet 5px höher.
@@ -974,9 +983,11 @@ class="machine-steam-cloud"></div>
      */
     init() {
       // Gespeichertes Theme laden
-      const savedTheme = localStorage.getItem('pomodoroTheme') || 'theme-dark';
-      document.documentElement.className = savedTheme;
-      this.elements.themeSelect.value = savedTheme;
+      openStorage().then(() => {
+        const savedTheme = storageGet('pomodoroTheme') || 'theme-dark';
+        document.documentElement.className = savedTheme;
+        this.elements.themeSelect.value = savedTheme;
+      });
 
       // Zeiten aus Config in UI laden
       this.elements.workInput.value = this.config.work / 60;
@@ -1393,7 +1404,7 @@ class="machine-steam-cloud"></div>
     applyTheme() {
       const selectedTheme = this.elements.themeSelect.value;
       document.documentElement.className = selectedTheme;
-      localStorage.setItem('pomodoroTheme', selectedTheme);
+      storageSet('pomodoroTheme', selectedTheme);
     }
 
     playAudio(soundId) {
@@ -2255,6 +2266,15 @@ class="machine-steam-cloud"></div>
   </div>
 
 <script>
+  // Ablage: im Launcher dessen Plugin-Ablage, eigenständig localStorage
+  let store = null;
+  function openStorage() {
+    if (!window.launcherStorage) return Promise.resolve();
+    return launcherStorage.open({ legacyKeys: ['pomodoroTheme'] }).then(s => { store = s; });
+  }
+  function storageGet(key) { return store ? store.get(key) : localStorage.getItem(key); }
+  function storageSet(key, value) { if (store) store.set(key, value); else localStorage.setItem(key, value); }
+
   /**
    * Ultimate Coffee Pomodoro Timer (Level 6.1 - Final Polish)
    * FIX 1: Kaffeestrahl startet 5px höher.
@@ -2378,9 +2398,11 @@ class="machine-steam-cloud"></div>
      */
     init() {
       // Gespeichertes Theme laden
-      const savedTheme = localStorage.getItem('pomodoroTheme') || 'theme-dark';
-      document.documentElement.className = savedTheme;
-      this.elements.themeSelect.value = savedTheme;
+      openStorage().then(() => {
+        const savedTheme = storageGet('pomodoroTheme') || 'theme-dark';
+        document.documentElement.className = savedTheme;
+        this.elements.themeSelect.value = savedTheme;
+      });
 
       // Zeiten aus Config in UI laden
       this.elements.workInput.value = this.config.work / 60;
@@ -2797,7 +2819,7 @@ class="machine-steam-cloud"></div>
     applyTheme() {
       const selectedTheme = this.elements.themeSelect.value;
       document.documentElement.className = selectedTheme;
-      localStorage.setItem('pomodoroTheme', selectedTheme);
+      storageSet('pomodoroTheme', selectedTheme);
     }
 
     playAudio(soundId) {
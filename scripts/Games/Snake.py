@@ -138,14 +138,21 @@ class PluginWidget(QMainWindow):
   function setStatus(text, ok){
     statusEl.innerHTML = text ? `<span class="${ok?'ok':'fail'}">${text}</span>` : '';
   }
+  // Ablage: im Launcher dessen Plugin-Ablage, eigenständig localStorage
+  let store = null;
+  function openStorage(){
+    if (!window.launcherStorage) return Promise.resolve();
+    return launcherStorage.open({ legacyKeys:[LSKEY] }).then(s => { store = s; });
+  }
   function loadHiscore(){
-    let v = parseInt(localStorage.getItem(LSKEY) || '0', 10);
+    const raw = store ? store.get(LSKEY) : localStorage.getItem(LSKEY);
+    let v = parseInt(raw || '0', 10);
     if (!Number.isFinite(v)) v = 0;
     hiscoreEl.textContent = v;
     return v;
   }
   function saveHiscore(v){
-    localStorage.setItem(LSKEY, String(v));
+    if (store) store.set(LSKEY, String(v)); else localStorage.setItem(LSKEY, String(v));
     hiscoreEl.textContent = v;
   }
 
@@ -366,7 +373,7 @@ class PluginWidget(QMainWindow):
   }
 
   // ==== Boot ====
-  loadHiscore();
+  openStorage().then(loadHiscore);
   newGame();
 })();
 </script>
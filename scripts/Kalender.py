@@ -3,15 +3,17 @@ import os
 import json
 import sys
 import uuid  # Hinzugefügt für eindeutige Event-IDs
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, date, timedelta, time
+from itertools import repeat
 from pathlib import Path
 
-from pytz import timezone
-from dateutil.rrule import rrulestr, rruleset
 from icalendar import Calendar, Event  # Hinzugefügt, um Events zu erstellen
 from icalendar.prop import vDDDTypes
 
-from PyQt5.QtCore import Qt, QUrl, pyqtSignal, QEvent, QDateTime, pyqtSlot, QObject
+from PyQt5.QtCore import (
+    Qt, QUrl, pyqtSignal, QEvent, QDateTime, pyqtSlot, QObject, QFileSystemWatcher, QTimer
+)
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QFileDialog, QListWidget, QListWidgetItem, QLabel, QAbstractItemView,
@@ -23,6 +25,10 @@ from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtWebChannel import QWebChannel
 from PyQt5.QtGui import QPalette
 
+# ICS-Expansion liegt in einem importierbaren Hilfsmodul (nötig für Worker-Prozesse)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _kalender_ics import EventStore, expand_calendar, merge_calendars  # noqa: E402
+
 
 # ===========================
 # (Das BlurOverlay wurde komplett entfernt)
@@ -32,11 +38,27 @@ from PyQt5.QtGui import QPalette
 # Calendar API für JavaScript (Löschen von Terminen)
 # ===========================
 class CalendarAPI(QObject):
-    """API für JavaScript, um Termine zu löschen."""
+    """API für JavaScript: Termine löschen und Termin-Deltas an die Seite liefern.
+
+    Die Seite wird nur einmal geladen; danach kommen Änderungen ausschließlich
+    über die Signale (ein JS-Aufruf pro Batch statt setHtml).
+    """
+
+    # JSON: {"add": [...], "update": [...], "remove": [id, ...]}
+    eventsBatch = pyqtSignal(str)
+    # Ansicht ("week" | "two_weeks" | "month" | "day"), heutiges Datum (ISO)
+    viewChanged = pyqtSignal(str, str)
+    themeChanged = pyqtSignal(str)
+
     def __init__(self, parent_plugin):
         super().__init__(parent_plugin)
         self.plugin = parent_plugin
 
+    @pyqtSlot()
+    def page_ready(self):
+        """Wird vom JavaScript aufgerufen, sobald der WebChannel verbunden ist."""
+        self.plugin._on_page_ready()
+
     @pyqtSlot(str, str, str, result=bool)
     def delete_event(self, event_uid: str, calendar_path: str, event_start: str = "") -> bool:
         """Löscht einen Termin anhand seiner UID aus der angegebenen ICS-Datei.
@@ -111,6 +133,28 @@ class PluginWidget(QMainWindow):
         self.ics_files = load_config()
         self._current_theme = _detect_host_theme(default=theme if theme in ("light", "dark") else "dark")
         self._theme_watcher = None
+        self._expand_pool = None  # ProcessPoolExecutor, erst bei Bedarf gestartet
+        self._expand_cache = {}   # Pfad -> ((Datei-Stempel, Fensterstart), expandierte Zeilen)
+
+        # Änderungen an den ICS-Dateien (z.B. durch Sync-Clients) automatisch übernehmen
+        self._changed_ics_paths = set()
+        self._own_write_stamps = {}  # Pfad -> Datei-Stempel nach eigenem Schreiben (kein zweites Neuladen)
+        self._ics_reload_timer = QTimer(self)
+        self._ics_reload_timer.setSingleShot(True)
+        self._ics_reload_timer.setInterval(ICS_RELOAD_DEBOUNCE_MS)
+        self._ics_reload_timer.timeout.connect(self._reload_changed_calendars)
+        self._ics_watcher = QFileSystemWatcher(self)
+        self._ics_watcher.fileChanged.connect(self._on_ics_file_changed)
+        self._sync_watched_paths()
+
+        # Zustand der geladenen Seite (wird nur bei Wechsel Fenster <-> Tag neu geladen)
+        self._page_kind = None        # "window" | "day"
+        self._page_ready = False
+        self._shown_events = {}       # row_key -> (Draht-ID, Signatur), wie es die Seite kennt
+        self._shown_view = None       # (mode, today_iso)
+        self._pending_events = None   # (EventStore, Zeilenindizes)
+        self._pending_view = None
+        self._next_wire_id = 1
 
         # --- Layout Grundgerüst ---
         central = QWidget()
@@ -210,6 +254,10 @@ class PluginWidget(QMainWindow):
             self._theme_watcher = HostThemeWatcher(app_instance)
             self._theme_watcher.themeChanged.connect(self._on_host_theme_changed)
             self.destroyed.connect(self._cleanup_theme_watcher)
+            app_instance.aboutToQuit.connect(self._shutdown_expand_pool)
+        # Der Launcher schließt Tabs per deleteLater() ohne closeEvent; die
+        # Worker-Prozesse sollen dabei nicht bis zum Programmende weiterlaufen
+        self.destroyed.connect(self._shutdown_expand_pool)
 
         # Initial
         if self.mode == "Window":
@@ -226,7 +274,7 @@ class PluginWidget(QMainWindow):
             self._current_theme = theme
             if self.mode == "Window":
                 self._update_toolbar_style()
-            self.render()  # Neu rendern mit neuem Theme
+            self.calendar_api.themeChanged.emit(theme)
 
     def _update_toolbar_style(self):
         """Aktualisiert die Toolbar-Styles basierend auf dem aktuellen Theme."""
@@ -377,7 +425,7 @@ class PluginWidget(QMainWindow):
                         cal.subcomponents.remove(comp)
 
             # Kalender speichern
-            cal_path.write_bytes(cal.to_ical())
+            self._write_calendar(cal_path, cal.to_ical())
             # UI aktualisieren
             self.render()
             return True
@@ -390,6 +438,7 @@ class PluginWidget(QMainWindow):
 
     def closeEvent(self, event):
         self._cleanup_theme_watcher()
+        self._shutdown_expand_pool()
         super().closeEvent(event)
 
     # ===========================
@@ -567,7 +616,7 @@ class PluginWidget(QMainWindow):
 
             # Event hinzufügen und speichern
             cal.add_component(event)
-            cal_path.write_bytes(cal.to_ical())
+            self._write_calendar(cal_path, cal.to_ical())
 
             # UI aktualisieren
             self.render()  # Neu rendern, um den Termin anzuzeigen
@@ -609,6 +658,7 @@ class PluginWidget(QMainWindow):
                 # Zur Konfiguration hinzufügen und UI aktualisieren
                 self.ics_files.append(new_path_str)
                 save_config(self.ics_files)
+                self._sync_watched_paths()
                 self._refresh_calendar_list()
                 self._refresh_calendar_list_day()
                 self.render()
@@ -693,6 +743,7 @@ class PluginWidget(QMainWindow):
                 changed = True
         if changed:
             save_config(self.ics_files)
+            self._sync_watched_paths()
             if self.mode == "Window":
                 self._refresh_calendar_list()
                 self._refresh_calendar_list_day()
@@ -713,6 +764,7 @@ class PluginWidget(QMainWindow):
         to_remove = {it.data(Qt.UserRole) for it in selected}
         self.ics_files = [p for p in self.ics_files if p not in to_remove]
         save_config(self.ics_files)
+        self._sync_watched_paths()
         self._refresh_calendar_list()
         self._refresh_calendar_list_day()
         self.render()
@@ -738,173 +790,105 @@ class PluginWidget(QMainWindow):
         return act
 
     def load_events(self, active_paths=None):
-        # (Original unveränderte Funktion, wie in der Vorlage)
-        evs = []
-        now = datetime.now()
-        window_start = now - timedelta(days=730)
-        window_end = now + timedelta(days=730)
+        # Fenster tagesgenau, damit der Expansions-Cache über den Tag gültig bleibt
+        today_start = datetime.combine(date.today(), time.min)
+        window_start = today_start - timedelta(days=730)
+        window_end = today_start + timedelta(days=731)
 
         calendars = active_paths if active_paths is not None else self._active_calendars()
 
-        for i, path in enumerate(calendars):
-            color = PALETTE[i % len(PALETTE)]
-            try:
-                with open(path, "rb") as f:
-                    cal = Calendar.from_ical(f.read())
-
-                masters = []
-                overrides = {}
-
-                for comp in cal.walk():
-                    if comp.name != "VEVENT":
-                        continue
-
-                    uid = str(comp.get("UID") or "")
-                    rec_id = comp.get("RECURRENCE-ID")
-
-                    if rec_id:
-                        rid_dt = ensure_datetime(getattr(rec_id, "dt", rec_id))
-                        overrides[(uid, rid_dt)] = comp
-                    else:
-                        masters.append(comp)
-
-                for comp in masters:
-                    uid = str(comp.get("UID") or "")
-                    dtstart_prop = comp.get("DTSTART")
-                    if not dtstart_prop:
-                        continue
-
-                    start_base = ensure_datetime(getattr(dtstart_prop, "dt", dtstart_prop))
-
-                    end_prop = comp.get("DTEND")
-                    if end_prop is not None:
-                        end_base = ensure_datetime(getattr(end_prop, "dt", end_prop))
-                    else:
-                        dur_prop = comp.get("DURATION")
-                        if dur_prop:
-                            try:
-                                delta = getattr(dur_prop, "dt", dur_prop)
-                                end_base = start_base + delta
-                            except Exception:
-                                end_base = start_base + timedelta(hours=1)
-                        else:
-                            end_base = start_base + timedelta(hours=1)
-
-                    duration = max(end_base - start_base, timedelta(minutes=1))
-
-                    summary_base = str(comp.get("SUMMARY") or "Termin")
-                    all_day_base = isinstance(getattr(dtstart_prop, "dt", dtstart_prop), date) and not isinstance(
-                        getattr(dtstart_prop, "dt", dtstart_prop), datetime)
-
-                    rrule_prop = comp.get("RRULE")
-                    rdate_props = comp.get("RDATE")
-                    exdate_props = comp.get("EXDATE")
-
-                    has_recur = bool(rrule_prop or rdate_props or exdate_props)
-
-                    if has_recur:
-                        rset = rruleset()
-
-                        if rrule_prop:
-                            try:
-                                rule_bytes = rrule_prop.to_ical() if hasattr(rrule_prop, "to_ical") else None
-                                rule_str = (rule_bytes.decode()
-                                            if isinstance(rule_bytes, (bytes, bytearray))
-                                            else (str(rule_bytes) if rule_bytes is not None else str(rrule_prop)))
-                                r = rrulestr(rule_str, dtstart=start_base)
-                                rset.rrule(r)
-                            except Exception:
-                                pass
-
-                        if rdate_props:
-                            rdate_list = rdate_props if isinstance(rdate_props, list) else [rdate_props]
-
-                            for rdp in rdate_list:
-                                dts = getattr(rdp, "dts", None)
-                                if dts:
-                                    for d in dts:
-                                        try:
-                                            rset.rdate(ensure_datetime(getattr(d, "dt", d)))
-                                        except Exception:
-                                            pass
-
-                        if exdate_props:
-                            exdate_list = exdate_props if isinstance(exdate_props, list) else [exdate_props]
-
-                            for edp in exdate_list:
-                                dts = getattr(edp, "dts", None)
-                                if dts:
-                                    for d in dts:
-                                        try:
-                                            rset.exdate(ensure_datetime(getattr(d, "dt", d)))
-                                        except Exception:
-                                            pass
-
-                        try:
-                            occurrences = rset.between(window_start, window_end, inc=True)
-                        except Exception:
-                            occurrences = []
-
-                        for occ_start in occurrences:
-                            ov = overrides.get((uid, occ_start))
-                            if ov:
-                                o_dtstart_prop = ov.get("DTSTART")
-                                o_dtend_prop = ov.get("DTEND")
-                                o_start = ensure_datetime(getattr(o_dtstart_prop, "dt", o_dtstart_prop)) if o_dtstart_prop else occ_start
-                                if o_dtend_prop:
-                                    o_end = ensure_datetime(getattr(o_dtend_prop, "dt", o_dtend_prop))
-                                else:
-                                    o_end = o_start + duration
-
-                                o_summary = str(ov.get("SUMMARY") or summary_base)
-                                o_all_day = (isinstance(getattr(o_dtstart_prop, "dt", o_dtstart_prop), date) and
-                                             not isinstance(getattr(o_dtstart_prop, "dt", o_dtstart_prop), datetime)) if o_dtstart_prop else all_day_base
-                                if o_end <= o_start:
-                                    o_end = o_start + timedelta(minutes=60)
-
-                                evs.append({
-                                    "title": o_summary,
-                                    "start": o_start.isoformat(),
-                                    "end": o_end.isoformat(),
-                                    "allDay": bool(o_all_day),
-                                    "calendar": os.path.basename(path),
-                                    "color": color,
-                                    "path": path,
-                                    "uid": uid
-                                })
-                            else:
-                                occ_end = occ_start + duration
-                                if occ_end <= occ_start:
-                                    occ_end = occ_start + timedelta(minutes=60)
-                                evs.append({
-                                    "title": summary_base,
-                                    "start": occ_start.isoformat(),
-                                    "end": occ_end.isoformat(),
-                                    "allDay": bool(all_day_base),
-                                    "calendar": os.path.basename(path),
-                                    "color": color,
-                                    "path": path,
-                                    "uid": uid
-                                })
-                    else:
-                        if end_base <= start_base:
-                            end_base = start_base + timedelta(minutes=60)
-                        evs.append({
-                            "title": summary_base,
-                            "start": start_base.isoformat(),
-                            "end": end_base.isoformat(),
-                            "allDay": bool(all_day_base),
-                            "calendar": os.path.basename(path),
-                            "color": color,
-                            "path": path,
-                            "uid": uid
-                        })
-
-            except Exception:
+        # Nur Kalender neu expandieren, deren Datei sich seit dem letzten Mal geändert hat
+        stamps = {path: _file_stamp(path) for path in calendars}
+        stale = []
+        for path in calendars:
+            cached = self._expand_cache.get(path)
+            if stamps[path] is None or cached is None or cached[0] != (stamps[path], window_start):
+                if path not in stale:
+                    stale.append(path)
+
+        if stale:
+            expanded = None
+            if len(stale) >= PARALLEL_MIN_CALENDARS and (os.cpu_count() or 1) > 1:
+                expanded = self._expand_parallel(stale, window_start, window_end)
+            if expanded is None:
+                expanded = [expand_calendar(path, window_start, window_end) for path in stale]
+            for path, rows in zip(stale, expanded):
+                if stamps[path] is not None:
+                    self._expand_cache[path] = ((stamps[path], window_start), rows)
+                else:
+                    self._expand_cache.pop(path, None)
+            fresh = dict(zip(stale, expanded))
+        else:
+            fresh = {}
+
+        per_calendar = [fresh[path] if path in fresh else self._expand_cache[path][1] for path in calendars]
+
+        # Jede Liste ist bereits nach (start, end) sortiert -> k-Wege-Merge statt globalem sort
+        cal_table = [(os.path.basename(path), PALETTE[i % len(PALETTE)], path) for i, path in enumerate(calendars)]
+        return EventStore.from_merged(cal_table, merge_calendars(per_calendar))
+
+    # ---- Dateiüberwachung der ICS-Dateien ----
+    def _sync_watched_paths(self):
+        """Gleicht den Watcher (und den Expansions-Cache) mit self.ics_files ab."""
+        wanted = {p for p in self.ics_files if os.path.isfile(p)}
+        watched = set(self._ics_watcher.files())
+        if watched - wanted:
+            self._ics_watcher.removePaths(list(watched - wanted))
+        if wanted - watched:
+            self._ics_watcher.addPaths(list(wanted - watched))
+        for path in list(self._expand_cache):
+            if path not in self.ics_files:
+                del self._expand_cache[path]
+
+    def _write_calendar(self, cal_path, data: bytes):
+        """Schreibt eine ICS-Datei und merkt sich ihren Stempel: render() danach liest sie
+        ohnehin neu ein, der Watcher soll dieselbe Änderung nicht ein zweites Mal laden."""
+        cal_path = Path(cal_path)
+        cal_path.write_bytes(data)
+        stamp = _file_stamp(cal_path)
+        if stamp is not None:
+            self._own_write_stamps[os.path.normcase(os.path.abspath(cal_path))] = stamp
+
+    def _on_ics_file_changed(self, path: str):
+        # Sync-Clients schreiben oft mehrfach kurz hintereinander -> entprellen
+        self._changed_ics_paths.add(path)
+        self._ics_reload_timer.start()
+
+    def _reload_changed_calendars(self):
+        changed, self._changed_ics_paths = self._changed_ics_paths, set()
+        reload_needed = False
+        for path in changed:
+            # Atomares Ersetzen (Schreiben + Umbenennen) entfernt die Datei aus dem Watcher
+            if os.path.isfile(path) and path not in self._ics_watcher.files():
+                self._ics_watcher.addPath(path)
+            # Eigene Schreibvorgänge sind schon gerendert
+            own = self._own_write_stamps.pop(os.path.normcase(os.path.abspath(path)), None)
+            if own is not None and own == _file_stamp(path):
                 continue
+            self._expand_cache.pop(path, None)
+            reload_needed = True
+        if reload_needed:
+            self.render()
 
-        evs.sort(key=lambda e: (e["start"], e["end"]))
-        return evs
+    def _expand_parallel(self, calendars, window_start, window_end):
+        """Verteilt die Kalender auf Worker-Prozesse; None -> sequenziell weitermachen."""
+        try:
+            if self._expand_pool is None:
+                # Nach CPU-Zahl, nicht nach der Kalenderzahl des ersten Aufrufs: der Pool wird wiederverwendet
+                self._expand_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+            return list(self._expand_pool.map(
+                expand_calendar, calendars, repeat(window_start), repeat(window_end),
+                chunksize=max(1, len(calendars) // (4 * (os.cpu_count() or 1)))
+            ))
+        except Exception as e:
+            print(f"Parallele Expansion fehlgeschlagen, nutze sequenziell: {e}")
+            self._shutdown_expand_pool()
+            return None
+
+    def _shutdown_expand_pool(self):
+        if self._expand_pool is not None:
+            self._expand_pool.shutdown(wait=False)
+            self._expand_pool = None
 
     def render(self, mode: str = None):
         if mode is None:
@@ -915,30 +899,20 @@ class PluginWidget(QMainWindow):
             if self.mode == "Window":
                 self.list_widget.setVisible(False)
                 self.list_widget_day.setVisible(True)
-            all_events = self.load_events(active_paths=self._active_calendars_day())
+            store = self.load_events(active_paths=self._active_calendars_day())
             today_date = date.today()
-            todays = []
-            for ev in all_events:
-                s = datetime.fromisoformat(ev["start"])
-                e = datetime.fromisoformat(ev["end"])
-                if s.date() <= today_date <= e.date():
-                    todays.append(ev)
-
-            def _key(ev):
-                s = datetime.fromisoformat(ev["start"])
-                return (0 if ev.get("allDay") else 1, s.time())
 
-            todays.sort(key=_key)
-
-            html = self._build_day_compact_html(todays, today_date)
-            self.web.setHtml(html, baseUrl=QUrl.fromLocalFile(str(_script_dir())))
+            self._show_page("day")
+            self._pending_view = (mode, today_date.isoformat())
+            self._pending_events = (store, store.overlapping_day(today_date))
+            self._flush_to_page()
             return
 
         if self.mode == "Window":
             self.list_widget.setVisible(True)
             self.list_widget_day.setVisible(False)
 
-            events = self.load_events()
+            store = self.load_events()
             if mode == "week":
                 mo, su = current_week_range()
                 self.title_label.setText(f"Aktuelle Woche · {mo.strftime('%d.%m.%Y')} – {su.strftime('%d.%m.%Y')}")
@@ -952,50 +926,74 @@ class PluginWidget(QMainWindow):
                 today = date.today()
                 self.title_label.setText(today.strftime("Monat · %B %Y"))
 
-            html = self._build_html(events, mode)
-            self.web.setHtml(html, baseUrl=QUrl.fromLocalFile(str(_script_dir())))
+            self._show_page("window")
+            self._pending_view = (mode, date.today().isoformat())
+            self._pending_events = (store, range(len(store)))
+            self._flush_to_page()
 
-    def _build_html(self, events, mode):
-        events_json = json.dumps(events, ensure_ascii=False)
-        today_iso = date.today().isoformat()
+    # ---- Seite / Delta-Übertragung ----
+    def _show_page(self, kind: str):
+        """Lädt das passende Template – aber nur, wenn sich die Seitenart ändert."""
+        if self._page_kind == kind:
+            return
+        self._page_kind = kind
+        self._page_ready = False
+        self._shown_events = {}
+        self._shown_view = None
 
-        html = WINDOW_HTML_TEMPLATE
-        html = html.replace("__EVENTS__", events_json)
-        html = html.replace("__MODE__", mode)
-        html = html.replace("__TODAY__", today_iso)
+        html = WINDOW_HTML_TEMPLATE if kind == "window" else DAY_HTML_TEMPLATE
         html = html.replace("__THEME__", self._current_theme)
-        return html
-
-    def _build_day_compact_html(self, events, today_date: date):
-        js_events = []
-        for ev in events:
-            start_dt = datetime.fromisoformat(ev["start"])
-            end_dt = datetime.fromisoformat(ev["end"])
-            if end_dt <= start_dt:
-                end_dt = start_dt + timedelta(hours=1)
-
-            js_events.append({
-                "startH": start_dt.hour,
-                "startM": start_dt.minute,
-                "endH": end_dt.hour,
-                "endM": end_dt.minute,
-                "title": ev["title"],
-                "color": ev.get("color", "#3a82f6"),
-                "allDay": ev.get("allDay", False),
-                "uid": ev.get("uid", ""),
-                "path": ev.get("path", ""),
-            })
-
-        events_json = json.dumps(js_events, ensure_ascii=False)
-
-        html = DAY_HTML_TEMPLATE
-        html = html.replace("__EVENTS__", events_json)
-        html = html.replace("__THEME__", self._current_theme)
-        # WebChannel auch für Day-View einrichten
-        if hasattr(self, 'channel'):
-            # Channel ist bereits eingerichtet
-            pass
-        return html
+        self.web.setHtml(html, baseUrl=QUrl.fromLocalFile(str(_script_dir())))
+
+    def _on_page_ready(self):
+        """Die Seite hat ihren WebChannel verbunden -> kompletten Stand einmalig senden."""
+        self._page_ready = True
+        self._shown_events = {}
+        self._shown_view = None
+        self.calendar_api.themeChanged.emit(self._current_theme)
+        self._flush_to_page()
+
+    def _flush_to_page(self):
+        """Schickt nur die Unterschiede zwischen gewünschtem und angezeigtem Stand."""
+        if not self._page_ready or self._pending_events is None:
+            return
+
+        if self._pending_view is not None and self._pending_view != self._shown_view:
+            self._shown_view = self._pending_view
+            self.calendar_api.viewChanged.emit(*self._shown_view)
+
+        store, rows = self._pending_events
+        shown = self._shown_events
+        wanted = {}
+        added, added_ids, updated, updated_ids = [], [], [], []
+        for i in rows:
+            base = store.row_key(i)
+            key, n = base, 1
+            while key in wanted:  # z.B. mehrere Termine ohne UID zur selben Zeit
+                key = base + (n,)
+                n += 1
+            sig = store.row_signature(i)
+            old = shown.get(key)
+            if old is None:
+                wire_id = self._next_wire_id
+                self._next_wire_id += 1
+                added.append(i)
+                added_ids.append(wire_id)
+            else:
+                wire_id = old[0]
+                if old[1] != sig:
+                    updated.append(i)
+                    updated_ids.append(wire_id)
+            wanted[key] = (wire_id, sig)
+        removed = [wire_id for key, (wire_id, _) in shown.items() if key not in wanted]
+
+        if added or updated or removed:
+            self.calendar_api.eventsBatch.emit(json.dumps({
+                "add": store.to_payload(added, added_ids) if added else None,
+                "update": store.to_payload(updated, updated_ids) if updated else None,
+                "remove": removed,
+            }, ensure_ascii=False))
+        self._shown_events = wanted
 
 # ===========================
 # Konfiguration / Farben
@@ -1006,7 +1004,10 @@ PALETTE = [
     "#80cbc4",
     "#ff79c6", "#c792ea", "#ffd54f", "#81c784", "#64b5f6"
 ]
-LOCAL_TZ = timezone("Europe/Berlin")  # Lokale TZ für Normalisierung
+# Ab so vielen aktiven Kalendern wird die RRULE-Expansion auf Prozesse verteilt
+PARALLEL_MIN_CALENDARS = 4
+# Wartezeit nach der letzten Dateiänderung, bevor neu eingelesen wird
+ICS_RELOAD_DEBOUNCE_MS = 500
 
 
 # ===========================
@@ -1050,22 +1051,13 @@ def save_config(paths: list):
 # ===========================
 # Datums-/Zeit-Helfer (Dein Original-Code)
 # ===========================
-def ensure_datetime(x):
-    """
-    Normalize ICS date/datetime values to naive local datetimes (no tzinfo).
-    - date -> combine with 00:00 local
-    - aware datetime -> convert to LOCAL_TZ and drop tzinfo
-    - naive datetime -> keep as is
-    """
-    if isinstance(x, date) and not isinstance(x, datetime):
-        return datetime.combine(x, time.min)
-    if isinstance(x, datetime):
-        if x.tzinfo is None:
-            return x
-        dt_local = x.astimezone(LOCAL_TZ)
-
-        return dt_local.replace(tzinfo=None)
-    return x
+def _file_stamp(path):
+    """(mtime_ns, size) einer Datei oder None, wenn sie nicht lesbar ist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
 
 
 def current_week_range(today: date = None):
@@ -1295,35 +1287,82 @@ WINDOW_HTML_TEMPLATE = r"""<!DOCTYPE html>
 
   <script src="qrc:///qtwebchannel/qwebchannel.js"></script>
   <script>
-  const EVENTS_JSON = __EVENTS__;
-  let currentMode = "__MODE__"; // "week" | "two_weeks" | "month"
-  let currentDate = new Date("__TODAY__");
+  let currentMode = "week"; // "week" | "two_weeks" | "month"
+  let currentDate = new Date();
   // NEU: Referenz für "Heute"
-  const todayDate = new Date("__TODAY__");
+  let todayDate = new Date();
   todayDate.setHours(0,0,0,0);
-  
-  // WebChannel für Löschen von Terminen
+
+  // Termine nach ID; werden per eventsBatch-Delta von Python gepflegt
+  const eventsById = new Map();
+  let events = [];
+
+  // WebChannel: Löschen von Terminen + Delta-Updates
   let calendarAPI = null;
   if (typeof qt !== 'undefined' && typeof qt.webChannelTransport !== 'undefined') {
     new QWebChannel(qt.webChannelTransport, function(channel) {
       calendarAPI = channel.objects.calendarAPI;
+      calendarAPI.eventsBatch.connect(applyEventsBatch);
+      calendarAPI.viewChanged.connect(applyView);
+      calendarAPI.themeChanged.connect(applyTheme);
+      calendarAPI.page_ready();
     });
   }
-  function parseLocalISO(s){
-    const [datePart, timePart] = String(s).split("T");
-    const [y,m,d] = datePart.split("-").map(Number);
-    if(!timePart) return new Date(y, m-1, d);
-    const clean = timePart.replace("Z","");
-    const [hh="0", mm="0", ss="0"] = clean.split(":");
-    return new Date(y, m-1, d, parseInt(hh||"0"), parseInt(mm||"0"), parseInt(ss||"0"));
+  // Zeiten kommen als "naive" Epoch-Sekunden (lokale Wanduhrzeit, ohne TZ)
+  function naiveDate(sec){
+    const u = new Date(sec*1000);
+    return new Date(u.getUTCFullYear(), u.getUTCMonth(), u.getUTCDate(),
+                    u.getUTCHours(), u.getUTCMinutes(), u.getUTCSeconds());
+  }
+  function naiveIso(sec){
+    return new Date(sec*1000).toISOString().slice(0, 19);
+  }
+
+  // Dekodiert einen spaltenorientierten Payload (EventStore.to_payload) einmalig in Objekte
+  function decodeEvents(p){
+    if(!p) return [];
+    const bits = atob(p.allDay || "");
+    const out = new Array(p.id.length);
+    for(let i=0;i<p.id.length;i++){
+      const cal = p.cals[p.cal[i]];
+      out[i] = {
+        id: p.id[i], start: p.start[i], end: p.end[i],
+        allDay: ((bits.charCodeAt(i >> 3) >> (i & 7)) & 1) === 1,
+        title: p.titles[p.title[i]], uid: p.uids[p.uid[i]],
+        calendar: cal[0], color: cal[1], path: cal[2],
+      };
+    }
+    return out;
+  }
+
+  function prepareEvent(ev){
+    let s = naiveDate(ev.start);
+    let e = naiveDate(ev.end);
+    if(e <= s) e = new Date(s.getTime()+60*60*1000);
+    return {...ev, startDate:s, endDate:e};
+  }
+
+  function applyEventsBatch(payload){
+    const batch = JSON.parse(payload);
+    (batch.remove || []).forEach(id => eventsById.delete(id));
+    decodeEvents(batch.add).forEach(ev => eventsById.set(ev.id, prepareEvent(ev)));
+    decodeEvents(batch.update).forEach(ev => eventsById.set(ev.id, prepareEvent(ev)));
+    events = Array.from(eventsById.values());
+    render();
+  }
+
+  function applyView(mode, todayIso){
+    currentMode = mode;
+    currentDate = new Date(todayIso);
+    todayDate = new Date(todayIso);
+    todayDate.setHours(0,0,0,0);
+    render();
+  }
+
+  function applyTheme(theme){
+    document.body.className = "theme-" + theme;
   }
 
-  const events = EVENTS_JSON.map(ev=>{
-    let s = parseLocalISO(ev.start);
-    let e = ev.end ? parseLocalISO(ev.end) : null;
-    if(!e || e <= s) e = new Date(s.getTime()+60*60*1000);
-    return {...ev, startDate:s, endDate:e, allDay:!!ev.allDay};
-  });
   function startOfWeekMonday(d){
     const tmp = new Date(d);
     const dow = (tmp.getDay()+6)%7;
@@ -1466,7 +1505,7 @@ WINDOW_HTML_TEMPLATE = r"""<!DOCTYPE html>
         e.preventDefault();
         if (calendarAPI && ev.uid && ev.path) {
           if (confirm(`Möchten Sie den Termin "${ev.title}" wirklich löschen?`)) {
-            calendarAPI.delete_event(ev.uid, ev.path, ev.start);
+            calendarAPI.delete_event(ev.uid, ev.path, naiveIso(ev.start));
           }
         }
       });
@@ -1635,15 +1674,60 @@ DAY_HTML_TEMPLATE = """<!DOCTYPE html>
 
   <script src="qrc:///qtwebchannel/qwebchannel.js"></script>
   <script>
-    const events = __EVENTS__;
-    
-    // WebChannel für Löschen von Terminen
+    // Termine nach ID; werden per eventsBatch-Delta von Python gepflegt
+    const eventsById = new Map();
+    let events = [];
+
+    // WebChannel: Löschen von Terminen + Delta-Updates
     let calendarAPI = null;
     if (typeof qt !== 'undefined' && typeof qt.webChannelTransport !== 'undefined') {
       new QWebChannel(qt.webChannelTransport, function(channel) {
         calendarAPI = channel.objects.calendarAPI;
+        calendarAPI.eventsBatch.connect(applyEventsBatch);
+        calendarAPI.themeChanged.connect(applyTheme);
+        calendarAPI.page_ready();
       });
     }
+
+    // Dekodiert einen spaltenorientierten Payload (EventStore.to_payload) einmalig in Objekte.
+    // Zeiten sind "naive" Epoch-Sekunden -> Stunden/Minuten über die UTC-Getter.
+    function decodeEvents(p) {
+      if (!p) return [];
+      const bits = atob(p.allDay || "");
+      const out = new Array(p.id.length);
+      for (let i = 0; i < p.id.length; i++) {
+        const s = new Date(p.start[i] * 1000);
+        const e = new Date(p.end[i] * 1000);
+        const cal = p.cals[p.cal[i]];
+        out[i] = {
+          id: p.id[i],
+          startH: s.getUTCHours(), startM: s.getUTCMinutes(),
+          endH: e.getUTCHours(), endM: e.getUTCMinutes(),
+          allDay: ((bits.charCodeAt(i >> 3) >> (i & 7)) & 1) === 1,
+          title: p.titles[p.title[i]], uid: p.uids[p.uid[i]],
+          color: cal[1], path: cal[2],
+        };
+      }
+      return out;
+    }
+
+    function applyEventsBatch(payload) {
+      const batch = JSON.parse(payload);
+      (batch.remove || []).forEach(id => eventsById.delete(id));
+      decodeEvents(batch.add).forEach(ev => eventsById.set(ev.id, ev));
+      decodeEvents(batch.update).forEach(ev => eventsById.set(ev.id, ev));
+      events = Array.from(eventsById.values());
+      events.sort((a, b) => {
+        if (a.allDay !== b.allDay) return a.allDay ? -1 : 1;
+        return (a.startH * 60 + a.startM) - (b.startH * 60 + b.startM);
+      });
+      renderEvents();
+    }
+
+    function applyTheme(theme) {
+      document.body.className = "theme-" + theme;
+    }
+
     
     function renderEvents() {
       const hoursDiv = document.getElementById("hours");
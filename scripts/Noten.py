@@ -1,7 +1,22 @@
 from PyQt5.QtWidgets import QApplication, QVBoxLayout, QWidget, QMainWindow
 from PyQt5.QtWebEngineWidgets import QWebEngineView
-from PyQt5.QtCore import QUrl, QEvent, QObject, pyqtSignal
+from PyQt5.QtWebChannel import QWebChannel
+from PyQt5.QtCore import QUrl, QEvent, QObject, pyqtSignal, pyqtSlot
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+import json
+import math
+import os
 import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # optional: ohne NumPy rechnet die reine Python-Variante
+    np = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _webchannel import install_webchannel_script  # noqa: E402
 
 # --- KONFIGURATION & THEMES ---
 
@@ -101,7 +116,7 @@ body.theme-light {
 /* SIDEBAR */
 .sidebar {
     width: 260px; background: var(--sidebar-bg); border-right: 1px solid var(--border-color);
-    display: flex; flex-direction: column; padding: 20px; flex-shrink: 0;
+    display: flex; flex-direction: column; padding: 20px; flex-shrink: 0; overflow-y: auto;
 }
 .sidebar h1 { margin: 0 0 20px 0; font-size: 20px; font-weight: 700; color: var(--text-main); }
 .stats-container { display: flex; flex-direction: column; gap: 15px; }
@@ -118,20 +133,15 @@ body.theme-light {
     margin-top: 30px; flex: 1; display: flex; flex-direction: column; justify-content: flex-end;
 }
 .chart-title { font-size: 12px; color: var(--text-muted); margin-bottom: 10px; text-align: center; }
-.bars-wrapper {
-    display: flex; align-items: flex-end; justify-content: space-between; 
-    height: 150px; gap: 4px; padding-bottom: 5px; border-bottom: 1px solid var(--border-color);
-}
-.bar-col { 
-    display: flex; flex-direction: column; align-items: center; justify-content: flex-end;
-    flex: 1; height: 100%; 
-}
-.bar {
-    width: 100%; min-width: 8px; border-radius: 4px 4px 0 0; 
-    transition: height 0.5s ease; opacity: 0.8;
-}
-.bar:hover { opacity: 1; }
-.bar-label { font-size: 10px; color: var(--text-muted); margin-top: 4px; }
+.chart-canvas { height: 150px; border-bottom: 1px solid var(--border-color); }
+
+/* ANALYSE */
+.analytics { text-align: left; display: none; }
+.an-row { display: flex; justify-content: space-between; font-size: 13px; margin-top: 6px; color: var(--text-muted); }
+.an-row b { color: var(--text-main); }
+.an-whatif { display: flex; gap: 6px; align-items: center; font-size: 12px; color: var(--text-muted); margin-top: 12px; }
+.an-whatif input { padding: 4px 6px; font-size: 12px; width: 56px; }
+.dist-canvas { height: 60px; margin-top: 10px; }
 
 
 /* MAIN CONTENT */
@@ -216,6 +226,189 @@ THEME_SCRIPT = """
 """
 
 
+# ============================================================
+# ANALYSE: Verteilung, Trend und Prognosen über alle Noten
+# ============================================================
+
+GRADE_BINS = (1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 5.0)  # Klassen der Verteilung, 5.0 gehört zur letzten
+QUANTILES = (0.25, 0.5, 0.75)                           # nach Credits gewichtet
+
+
+def _graded(subjects):
+    """
+    Benotete Fächer mit Credits > 0 als (Noten, Credits, Semester) plus die Credits
+    der nur bestandenen ('b') Fächer, die nicht in den Schnitt eingehen.
+    """
+    grades, cps, sems = [], [], []
+    passed = 0.0
+    for s in subjects:
+        if not isinstance(s, dict):
+            continue
+        try:
+            cp = float(s.get("cp") or 0)
+            sem = int(s.get("sem") or 0)
+        except (TypeError, ValueError):
+            continue
+        grade = s.get("grade")
+        if grade == "b":
+            passed += cp
+            continue
+        try:
+            grade = float(grade)
+        except (TypeError, ValueError):
+            continue
+        if cp <= 0 or math.isnan(grade) or math.isnan(cp):
+            continue
+        grades.append(grade)
+        cps.append(cp)
+        sems.append(sem)
+    return grades, cps, sems, passed
+
+
+def _core_numpy(grades, cps, sems):
+    g = np.asarray(grades, dtype=float)
+    w = np.asarray(cps, dtype=float)
+    s = np.asarray(sems, dtype=np.int64)
+    total = float(w.sum())
+    gp = float(g @ w)
+    avg = gp / total
+    order = np.argsort(g, kind="stable")
+    cum = np.cumsum(w[order])
+    idx = np.minimum(np.searchsorted(cum, np.asarray(QUANTILES) * total, side="left"), len(g) - 1)
+    counts, _ = np.histogram(g, bins=GRADE_BINS)
+    bin_cp, _ = np.histogram(g, bins=GRADE_BINS, weights=w)
+    sem_ids, inv = np.unique(s, return_inverse=True)
+    sem_gp = np.bincount(inv, weights=g * w)
+    sem_cp = np.bincount(inv, weights=w)
+    return {
+        "gp": gp, "cp": total, "avg": avg,
+        "quantiles": [float(x) for x in g[order][idx]],
+        "std": float(np.sqrt(((g - avg) ** 2) @ w / total)),
+        "best": float(g.min()), "worst": float(g.max()),
+        "counts": [int(x) for x in counts], "bin_cp": [float(x) for x in bin_cp],
+        "sems": [int(x) for x in sem_ids],
+        "sem_avg": [float(x) for x in sem_gp / sem_cp],
+        "sem_cp": [float(x) for x in sem_cp],
+        "running": [float(x) for x in np.cumsum(sem_gp) / np.cumsum(sem_cp)],
+    }
+
+
+def _core_python(grades, cps, sems):
+    total = sum(cps)
+    gp = sum(g * w for g, w in zip(grades, cps))
+    avg = gp / total
+    pairs = sorted(zip(grades, cps), key=lambda p: p[0])
+    cum = list(accumulate(w for _, w in pairs))
+    counts = [0] * (len(GRADE_BINS) - 1)
+    bin_cp = [0.0] * (len(GRADE_BINS) - 1)
+    per_sem = {}
+    for g, w, sem in zip(grades, cps, sems):
+        agg = per_sem.setdefault(sem, [0.0, 0.0])
+        agg[0] += g * w
+        agg[1] += w
+        if GRADE_BINS[0] <= g <= GRADE_BINS[-1]:
+            i = min(bisect_right(GRADE_BINS, g) - 1, len(counts) - 1)
+            counts[i] += 1
+            bin_cp[i] += w
+    sem_ids = sorted(per_sem)
+    sem_gp = [per_sem[k][0] for k in sem_ids]
+    sem_cp = [per_sem[k][1] for k in sem_ids]
+    return {
+        "gp": gp, "cp": total, "avg": avg,
+        "quantiles": [pairs[min(bisect_left(cum, q * total), len(pairs) - 1)][0] for q in QUANTILES],
+        "std": math.sqrt(sum(w * (g - avg) ** 2 for g, w in zip(grades, cps)) / total),
+        "best": min(grades), "worst": max(grades),
+        "counts": counts, "bin_cp": bin_cp,
+        "sems": sem_ids,
+        "sem_avg": [a / b for a, b in zip(sem_gp, sem_cp)],
+        "sem_cp": sem_cp,
+        "running": [a / b for a, b in zip(accumulate(sem_gp), accumulate(sem_cp))],
+    }
+
+
+def _trend(xs, ys, ws):
+    """Gewichtete Regressionsgerade der Semesterschnitte; Steigung in Noten pro Semester."""
+    if len(xs) < 2:
+        return None
+    sw = sum(ws)
+    mx = sum(w * x for x, w in zip(xs, ws)) / sw
+    my = sum(w * y for y, w in zip(ys, ws)) / sw
+    sxx = sum(w * (x - mx) ** 2 for x, w in zip(xs, ws))
+    if sxx == 0:
+        return None
+    return sum(w * (x - mx) * (y - my) for x, y, w in zip(xs, ys, ws)) / sxx
+
+
+def _what_if(gp, cp, remaining, grades, targets):
+    """
+    projected[i][j]: Gesamtschnitt nach remaining[i] weiteren Credits mit Note grades[j].
+    needed[k][i]: nötiger Schnitt auf remaining[i] Credits, um targets[k] zu erreichen.
+    """
+    if np is not None and remaining:
+        r = np.asarray(remaining, dtype=float)
+        projected = (gp + np.outer(r, np.asarray(grades, dtype=float))) / (cp + r)[:, None]
+        needed = (np.outer(np.asarray(targets, dtype=float), cp + r) - gp) / r
+        return projected.tolist(), needed.tolist()
+    projected = [[(gp + g * r) / (cp + r) for g in grades] for r in remaining]
+    needed = [[(t * (cp + r) - gp) / r for r in remaining] for t in targets]
+    return projected, needed
+
+
+def grade_analytics(subjects, remaining_cp=(), grades=(), targets=()):
+    """Alle Kennzahlen über die gesamte Notenhistorie in einem Durchlauf."""
+    g, w, s, passed = _graded(subjects)
+    remaining = [float(r) for r in remaining_cp if isinstance(r, (int, float)) and r > 0]
+    grades = [float(x) for x in grades if isinstance(x, (int, float))]
+    targets = [float(x) for x in targets if isinstance(x, (int, float))]
+    result = {
+        "engine": "numpy" if np is not None else "python",
+        "count": len(g), "graded_cp": 0.0, "passed_cp": passed,
+        "avg": None, "median": None, "quartiles": [None, None], "std": None, "best": None, "worst": None,
+        "distribution": [
+            {"lo": lo, "hi": hi, "count": 0, "cp": 0.0} for lo, hi in zip(GRADE_BINS, GRADE_BINS[1:])
+        ],
+        "semesters": [], "trend": None,
+        "what_if": {"remaining_cp": remaining, "grades": grades, "targets": targets,
+                    "projected": [], "needed": []},
+    }
+    if not g:
+        return result
+    core = _core_numpy(g, w, s) if np is not None else _core_python(g, w, s)
+    result.update({
+        "graded_cp": core["cp"], "avg": core["avg"],
+        "median": core["quantiles"][1], "quartiles": [core["quantiles"][0], core["quantiles"][2]],
+        "std": core["std"], "best": core["best"], "worst": core["worst"],
+        "trend": _trend(core["sems"], core["sem_avg"], core["sem_cp"]),
+        "semesters": [
+            {"sem": sem, "avg": a, "cp": c, "running": r}
+            for sem, a, c, r in zip(core["sems"], core["sem_avg"], core["sem_cp"], core["running"])
+        ],
+    })
+    for b, n, c in zip(result["distribution"], core["counts"], core["bin_cp"]):
+        b["count"], b["cp"] = n, c
+    projected, needed = _what_if(core["gp"], core["cp"], remaining, grades, targets)
+    result["what_if"]["projected"] = projected
+    result["what_if"]["needed"] = needed
+    return result
+
+
+class GradeAPI(QObject):
+    """Auswertung für die Weboberfläche (per QWebChannel als 'gradeBackend')."""
+
+    @pyqtSlot(str, result='QVariantMap')
+    def analyze(self, raw):
+        """{subjects, remaining_cp, grades, targets} als JSON -> Kennzahlen."""
+        try:
+            req = json.loads(raw)
+        except (TypeError, ValueError):
+            print("Ungültige Analyseanfrage verworfen.")
+            return {}
+        if not isinstance(req, dict) or not isinstance(req.get("subjects"), list):
+            return {}
+        return grade_analytics(req["subjects"], req.get("remaining_cp") or (),
+                               req.get("grades") or (), req.get("targets") or ())
+
+
 class PluginWidget(QMainWindow):
     def __init__(self, theme="dark", mode="Window"):
         super().__init__()
@@ -230,6 +423,13 @@ class PluginWidget(QMainWindow):
         layout.addWidget(self.browser)
         self.setCentralWidget(central)
 
+        if not install_webchannel_script(self.browser.page()):
+            print("qwebchannel.js nicht gefunden – Analyse nicht verfügbar.")
+        self.backend = GradeAPI()
+        self.channel = QWebChannel(self.browser.page())
+        self.channel.registerObject('gradeBackend', self.backend)
+        self.browser.page().setWebChannel(self.channel)
+
         normalized_theme = theme.lower()
         host_theme = _detect_host_theme(normalized_theme if normalized_theme in SUPPORTED_THEMES else THEME_DARK)
         self._current_theme = host_theme if host_theme in SUPPORTED_THEMES else THEME_DARK
@@ -270,12 +470,24 @@ class PluginWidget(QMainWindow):
                 <div class="stat-value" id="totalCP" style="font-size:24px;">0</div>
                 <div class="stat-label">Total Credits (ECTS)</div>
             </div>
+            <div class="stat-card analytics" id="analyticsCard">
+                <div class="stat-label">Analyse</div>
+                <div class="an-row"><span>Trend</span><b id="anTrend">–</b></div>
+                <div class="an-row"><span>Median (Quartile)</span><b id="anMedian">–</b></div>
+                <div class="an-row"><span>Streuung σ</span><b id="anStd">–</b></div>
+                <div class="dist-canvas" id="distChart" title="Verteilung nach Credits"></div>
+                <div class="an-whatif">
+                    Noch <input id="wiCP" type="number" step="0.5" min="0" value="30" oninput="scheduleAnalytics()" /> CP,
+                    Ziel Ø <input id="wiTarget" type="number" step="0.1" min="1" max="5" value="2.0" oninput="scheduleAnalytics()" />
+                </div>
+                <div class="an-row"><span>Nötiger Schnitt</span><b id="anNeeded">–</b></div>
+                <div class="an-row"><span>Spanne (1,0 – 4,0)</span><b id="anRange">–</b></div>
+            </div>
         </div>
 
         <div class="chart-container">
-            <div class="chart-title">Verlauf (Ø pro Semester)</div>
-            <div class="bars-wrapper" id="chartBars">
-                </div>
+            <div class="chart-title">Verlauf (Ø pro Semester, Linie = Gesamtschnitt)</div>
+            <div class="chart-canvas" id="chartCanvas"></div>
         </div>
     </div>
 
@@ -298,9 +510,177 @@ class PluginWidget(QMainWindow):
 const KEY = 'grade_manager_data_v2';
 let subjects = [];
 
+/* --- ABLAGE: im Launcher dessen Plugin-Ablage, eigenständig localStorage --- */
+let store = null;
+function openStorage(channel) {
+    if (!window.launcherStorage) return Promise.resolve();
+    return launcherStorage.open({ legacyKeys: [KEY], channel: channel || undefined }).then(s => { store = s; });
+}
+function storageGet(key) { return store ? store.get(key) : localStorage.getItem(key); }
+function storageSet(key, value) { if (store) store.set(key, value); else localStorage.setItem(key, value); }
+
+/* --- AUSWERTUNG IM LAUNCHER: Python-Backend über den WebChannel --- */
+let backend = null;
+function connectBackend() {
+    return new Promise(resolve => {
+        if (typeof qt === 'undefined' || !qt.webChannelTransport || typeof QWebChannel === 'undefined') {
+            resolve(null);
+            return;
+        }
+        new QWebChannel(qt.webChannelTransport, channel => resolve(channel));
+    });
+}
+
+/* --- STATISTIK: Summen je Semester und gesamt, bei jeder Änderung nachgeführt --- */
+// gp = Σ Note·CP und gcp = Σ CP der benoteten Fächer, cp = alle Credits inkl. 'b'
+class GradeStats {
+    constructor() {
+        this.sems = new Map();
+        this.total = GradeStats.empty();
+    }
+    static empty() { return { gp: 0, gcp: 0, graded: 0, cp: 0, n: 0 }; }
+    static graded(s) { return s.grade !== 'b' && !isNaN(s.grade) && s.cp > 0; }
+    rebuild(list) {
+        this.sems.clear();
+        this.total = GradeStats.empty();
+        list.forEach(s => this.add(s));
+    }
+    add(s) { this.apply(s, 1); }
+    remove(s) { this.apply(s, -1); }
+    apply(s, sign) {
+        let sem = this.sems.get(s.sem);
+        if (!sem) {
+            if (sign < 0) return;
+            sem = GradeStats.empty();
+            this.sems.set(s.sem, sem);
+        }
+        [sem, this.total].forEach(agg => {
+            agg.n += sign;
+            agg.cp += sign * (s.cp || 0);
+            if (GradeStats.graded(s)) {
+                agg.graded += sign;
+                agg.gp += sign * s.grade * s.cp;
+                agg.gcp += sign * s.cp;
+            }
+            // Rundungsreste nicht stehen lassen, wenn nichts mehr übrig ist
+            if (agg.graded === 0) { agg.gp = 0; agg.gcp = 0; }
+            if (agg.n === 0) agg.cp = 0;
+        });
+        if (sem.n === 0) this.sems.delete(s.sem);
+    }
+    avg(agg) { return agg && agg.graded > 0 ? agg.gp / agg.gcp : null; }
+    semesters() { return Array.from(this.sems.keys()).sort((a, b) => a - b); }
+}
+const stats = new GradeStats();
+
+function formatCP(cp) { return Math.round(cp * 100) / 100; }
+
+/* --- DIAGRAMM: Balken auf einem Canvas, Farben aus den Theme-Variablen --- */
+// data: [{ label, value, color, title }], line: optional Werte je Balken (Verbindungslinie)
+class BarChart {
+    constructor(host, opts) {
+        this.host = host;
+        this.opts = Object.assign({ scale: (v, max) => v / max, labels: true, lineColor: '--text-main' }, opts || {});
+        this.data = [];
+        this.line = null;
+        this.frame = 0;
+        this.canvas = document.createElement('canvas');
+        this.canvas.style.display = 'block';
+        this.canvas.style.width = '100%';
+        this.canvas.style.height = '100%';
+        host.appendChild(this.canvas);
+        this.ctx = this.canvas.getContext('2d');
+        new ResizeObserver(() => this.invalidate()).observe(host);
+        // Theme-Wechsel setzt nur die Klasse am body
+        new MutationObserver(() => this.invalidate()).observe(document.body, { attributes: true, attributeFilter: ['class'] });
+        this.canvas.addEventListener('mousemove', e => {
+            const i = this.indexAt(e.offsetX);
+            this.canvas.title = i >= 0 ? this.data[i].title || '' : '';
+        });
+    }
+    setData(data, line) {
+        this.data = data;
+        this.line = line || null;
+        this.invalidate();
+    }
+    invalidate() {
+        if (this.frame) return;
+        this.frame = requestAnimationFrame(() => { this.frame = 0; this.draw(); });
+    }
+    layout() {
+        const w = this.host.clientWidth, h = this.host.clientHeight;
+        const labelH = this.opts.labels ? 16 : 0;
+        const slot = this.data.length ? w / this.data.length : w;
+        return { w: w, h: h, plotH: h - labelH, slot: slot, barW: Math.min(40, slot * 0.7) };
+    }
+    indexAt(x) {
+        if (!this.data.length) return -1;
+        const i = Math.floor(x / this.layout().slot);
+        return i >= 0 && i < this.data.length ? i : -1;
+    }
+    color(name) { return getComputedStyle(document.body).getPropertyValue(name).trim() || '#888'; }
+    draw() {
+        const L = this.layout();
+        const dpr = window.devicePixelRatio || 1;
+        if (this.canvas.width !== Math.round(L.w * dpr) || this.canvas.height !== Math.round(L.h * dpr)) {
+            this.canvas.width = Math.round(L.w * dpr);
+            this.canvas.height = Math.round(L.h * dpr);
+        }
+        const ctx = this.ctx;
+        ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+        ctx.clearRect(0, 0, L.w, L.h);
+        if (!this.data.length || L.plotH <= 0) return;
+
+        const max = Math.max.apply(null, this.data.map(d => d.value).concat([0])) || 1;
+        const heightOf = v => Math.max(0, Math.min(1, this.opts.scale(v, max))) * L.plotH;
+        const colors = {};
+        const colorOf = name => colors[name] || (colors[name] = this.color(name));
+
+        ctx.font = '10px sans-serif';
+        ctx.textAlign = 'center';
+        ctx.textBaseline = 'top';
+        this.data.forEach((d, i) => {
+            const cx = (i + 0.5) * L.slot;
+            const bh = heightOf(d.value);
+            if (bh > 0) {
+                ctx.fillStyle = colorOf(d.color);
+                roundedTop(ctx, cx - L.barW / 2, L.plotH - bh, L.barW, bh, Math.min(4, L.barW / 2, bh));
+                ctx.fill();
+            }
+            if (this.opts.labels) {
+                ctx.fillStyle = colorOf('--text-muted');
+                ctx.fillText(d.label, cx, L.plotH + 3);
+            }
+        });
+
+        if (this.line && this.line.length > 1) {
+            ctx.strokeStyle = colorOf(this.opts.lineColor);
+            ctx.lineWidth = 1.5;
+            ctx.beginPath();
+            this.line.forEach((v, i) => {
+                const x = (i + 0.5) * L.slot, y = L.plotH - heightOf(v);
+                if (i === 0) ctx.moveTo(x, y); else ctx.lineTo(x, y);
+            });
+            ctx.stroke();
+        }
+    }
+}
+
+// Rechteck mit oben abgerundeten Ecken (ctx.roundRect gibt es in dieser Engine noch nicht)
+function roundedTop(ctx, x, y, w, h, r) {
+    ctx.beginPath();
+    ctx.moveTo(x, y + h);
+    ctx.lineTo(x, y + r);
+    ctx.arcTo(x, y, x + r, y, r);
+    ctx.lineTo(x + w - r, y);
+    ctx.arcTo(x + w, y, x + w, y + r, r);
+    ctx.lineTo(x + w, y + h);
+    ctx.closePath();
+}
+
 /* --- DATA LOGIC --- */
 function load() {
-    const raw = localStorage.getItem(KEY);
+    const raw = storageGet(KEY);
     if (raw) {
         subjects = JSON.parse(raw);
     } else {
@@ -310,13 +690,19 @@ function load() {
             { id: '2', name: 'Praxisprojekt', grade: 'b', cp: 10, sem: 2 }, 
             { id: '3', name: 'Datenbanken', grade: 2.7, cp: 5, sem: 1 }
         ];
-        save();
+        persist();
     }
+    stats.rebuild(subjects);
     render();
 }
 
+function persist() {
+    storageSet(KEY, JSON.stringify(subjects));
+    scheduleAnalytics();
+}
+
 function save() {
-    localStorage.setItem(KEY, JSON.stringify(subjects));
+    persist();
     render();
 }
 
@@ -342,13 +728,15 @@ function addSubject() {
         }
     }
 
-    subjects.push({
+    const s = {
         id: Date.now().toString(),
         name: name,
         grade: gradeToStore,
         cp: parseFloat(cpVal),
         sem: parseInt(semVal)
-    });
+    };
+    subjects.push(s);
+    stats.add(s);
 
     document.getElementById('inSubject').value = '';
     document.getElementById('inGrade').value = '';
@@ -359,7 +747,9 @@ function addSubject() {
 
 function deleteSubject(id) {
     if(confirm("Fach wirklich löschen?")) {
-        subjects = subjects.filter(s => s.id !== id);
+        const s = subjects.find(x => x.id === id);
+        if (s) stats.remove(s);
+        subjects = subjects.filter(x => x.id !== id);
         save();
     }
 }
@@ -369,6 +759,7 @@ function updateSubject(id, field, value) {
     if (!s) return;
 
     value = value.trim();
+    stats.remove(s);
 
     if (field === 'name') {
         s.name = value;
@@ -384,7 +775,12 @@ function updateSubject(id, field, value) {
         if (!isNaN(parsed)) s[field] = parsed;
     }
 
-    save();
+    stats.add(s);
+    persist();
+    // Nur die betroffenen Stellen neu zeichnen, die Liste bleibt stehen
+    refreshRow(s);
+    refreshSemester(s.sem);
+    renderTotals();
 }
 
 /* --- HELPER --- */
@@ -396,20 +792,24 @@ function getColorClass(grade) {
     return 'color-bad';
 }
 
-function calculateAverage(subs) {
-    let totalGradePoints = 0;
-    let countedCP = 0;
-
-    subs.forEach(s => {
-        if (s.grade === 'b') return; 
-        totalGradePoints += (s.grade * s.cp);
-        countedCP += s.cp;
-    });
-
-    return countedCP === 0 ? null : (totalGradePoints / countedCP);
+function gradeVar(avg) {
+    return avg <= 1.5 ? '--grade-excellent' :
+           avg <= 2.5 ? '--grade-good' :
+           avg <= 3.5 ? '--grade-ok' : '--grade-bad';
 }
 
 /* --- RENDER --- */
+function semHeaderHtml(sem) {
+    const agg = stats.sems.get(sem);
+    const semAvg = stats.avg(agg);
+    const badge = semAvg !== null
+        ? `<span class="sem-avg-badge ${getColorClass(semAvg)}">Ø ${semAvg.toFixed(2)}</span>` : '';
+    return `
+        <div class="sem-title">Semester ${sem} ${badge}</div>
+        <div class="sem-stats">${formatCP(agg ? agg.cp : 0)} Credits</div>
+    `;
+}
+
 function render() {
     const container = document.getElementById('semesterLists');
     container.innerHTML = '';
@@ -420,32 +820,12 @@ function render() {
         semMap[s.sem].push(s);
     });
 
-    const semesters = Object.keys(semMap).map(Number).sort((a,b) => a - b);
-    const chartData = [];
-
-    semesters.forEach(sem => {
-        const semSubjects = semMap[sem];
-
-        const semAvg = calculateAverage(semSubjects);
-        const semTotalCP = semSubjects.reduce((acc, cur) => acc + cur.cp, 0);
-
-        if (semAvg !== null) {
-            chartData.push({ sem: sem, avg: semAvg });
-        }
-
+    stats.semesters().forEach(sem => {
         const block = document.createElement('div');
         block.className = 'semester-block';
 
-        const avgDisplay = semAvg !== null ? `Ø ${semAvg.toFixed(2)}` : 'N/A';
-        const avgColor = semAvg !== null ? getColorClass(semAvg) : '';
-
         block.innerHTML = `
-            <div class="sem-header">
-                <div class="sem-title">Semester ${sem} 
-                    ${semAvg !== null ? `<span class="sem-avg-badge ${avgColor}">${avgDisplay}</span>` : ''}
-                </div>
-                <div class="sem-stats">${semTotalCP} Credits</div>
-            </div>
+            <div class="sem-header" id="sem-head-${sem}">${semHeaderHtml(sem)}</div>
             <div class="table-container">
                 <div class="row row-header">
                     <div>Fach</div>
@@ -459,9 +839,10 @@ function render() {
         container.appendChild(block);
 
         const rowsContainer = block.querySelector(`#rows-${sem}`);
-        semSubjects.forEach(s => {
+        (semMap[sem] || []).forEach(s => {
             const r = document.createElement('div');
             r.className = 'row';
+            r.dataset.id = s.id;
 
             let gradeDisplay = s.grade === 'b' ? 'B' : s.grade;
             let gColor = getColorClass(s.grade);
@@ -476,8 +857,25 @@ function render() {
         });
     });
 
-    const totalAvg = calculateAverage(subjects);
-    const totalCredits = subjects.reduce((acc, cur) => acc + cur.cp, 0);
+    renderTotals();
+}
+
+function refreshRow(s) {
+    const row = document.querySelector(`.row[data-id="${s.id}"]`);
+    if (!row) return;
+    const grade = row.querySelector('.cell-grade');
+    grade.className = 'cell-grade ' + getColorClass(s.grade);
+    grade.innerText = s.grade === 'b' ? 'B' : s.grade;
+    row.querySelector('.cell-credits').innerText = s.cp;
+}
+
+function refreshSemester(sem) {
+    const head = document.getElementById(`sem-head-${sem}`);
+    if (head) head.innerHTML = semHeaderHtml(sem);
+}
+
+function renderTotals() {
+    const totalAvg = stats.avg(stats.total);
 
     const totalEl = document.getElementById('totalGPA');
     if (totalAvg !== null) {
@@ -488,42 +886,97 @@ function render() {
         totalEl.className = 'stat-value';
     }
 
-    document.getElementById('totalCP').innerText = totalCredits;
+    document.getElementById('totalCP').innerText = formatCP(stats.total.cp);
 
-    renderChart(chartData);
+    renderChart();
 }
 
-function renderChart(data) {
-    const wrapper = document.getElementById('chartBars');
-    wrapper.innerHTML = '';
-
-    if (data.length === 0) return;
-
-    data.forEach(d => {
-        const col = document.createElement('div');
-        col.className = 'bar-col';
+// Höhe: 1,0 = voll, 5,0 = leer; die Linie zeigt den Gesamtschnitt bis zum jeweiligen Semester
+const gradeScale = v => Math.max(0.05, Math.min(1, (5 - v) / 4));
+let semChart = null;
+function renderChart() {
+    if (!semChart) semChart = new BarChart(document.getElementById('chartCanvas'), { scale: gradeScale });
+    const data = [], line = [];
+    let gp = 0, gcp = 0;
+    stats.semesters().forEach(sem => {
+        const agg = stats.sems.get(sem);
+        const avg = stats.avg(agg);
+        if (avg === null) return;
+        gp += agg.gp;
+        gcp += agg.gcp;
+        data.push({ label: 'S' + sem, value: avg, color: gradeVar(avg), title: `Semester ${sem}: Ø ${avg.toFixed(2)}, gesamt Ø ${(gp / gcp).toFixed(2)}` });
+        line.push(gp / gcp);
+    });
+    semChart.setData(data, line);
+}
 
-        let pct = ((5 - d.avg) / 4) * 100;
-        if (pct < 5) pct = 5; 
-        if (pct > 100) pct = 100;
+/* --- ANALYSE (nur im Launcher) --- */
+let analyticsTimer = 0;
+let distChart = null;
+function scheduleAnalytics() {
+    if (!backend) return;
+    clearTimeout(analyticsTimer);
+    analyticsTimer = setTimeout(requestAnalytics, 150);
+}
 
-        const colorVar = d.avg <= 1.5 ? 'var(--grade-excellent)' :
-                         d.avg <= 2.5 ? 'var(--grade-good)' :
-                         d.avg <= 3.5 ? 'var(--grade-ok)' : 'var(--grade-bad)';
+function requestAnalytics() {
+    const cp = parseFloat(document.getElementById('wiCP').value);
+    const target = parseFloat(document.getElementById('wiTarget').value.replace(',', '.'));
+    const request = {
+        subjects: subjects,
+        remaining_cp: isNaN(cp) ? [] : [cp],
+        grades: [1.0, 4.0],
+        targets: isNaN(target) ? [] : [target]
+    };
+    backend.analyze(JSON.stringify(request), renderAnalytics);
+}
 
-        col.innerHTML = `
-            <div class="bar" style="height:${pct}%; background:${colorVar};" title="Ø ${d.avg.toFixed(2)}"></div>
-            <div class="bar-label">S${d.sem}</div>
-        `;
-        wrapper.appendChild(col);
-    });
+function renderAnalytics(res) {
+    const card = document.getElementById('analyticsCard');
+    if (!res || res.count === undefined) { card.style.display = 'none'; return; }
+    card.style.display = 'block';
+    const fmt = v => v === null || v === undefined ? '–' : v.toFixed(2);
+
+    const trend = document.getElementById('anTrend');
+    if (res.trend === null) trend.innerText = '–';
+    else if (Math.abs(res.trend) < 0.005) trend.innerText = 'stabil';
+    else trend.innerText = `${res.trend < 0 ? 'besser' : 'schlechter'} (${res.trend > 0 ? '+' : ''}${res.trend.toFixed(2)}/Sem.)`;
+
+    document.getElementById('anMedian').innerText = res.median === null
+        ? '–' : `${fmt(res.median)} (${fmt(res.quartiles[0])} – ${fmt(res.quartiles[1])})`;
+    document.getElementById('anStd').innerText = fmt(res.std);
+
+    const wi = res.what_if;
+    const needed = wi.needed.length && wi.needed[0].length ? wi.needed[0][0] : null;
+    const neededEl = document.getElementById('anNeeded');
+    if (needed === null || res.avg === null) neededEl.innerText = '–';
+    else if (needed > 4) neededEl.innerText = 'nicht erreichbar';
+    else if (needed < 1) neededEl.innerText = 'mit jeder Note';
+    else neededEl.innerText = 'Ø ' + needed.toFixed(2);
+    const projected = wi.projected.length ? wi.projected[0] : [];
+    document.getElementById('anRange').innerText = projected.length === 2 && res.avg !== null
+        ? `${fmt(projected[0])} – ${fmt(projected[1])}` : '–';
+
+    if (!distChart) distChart = new BarChart(document.getElementById('distChart'), { labels: false });
+    distChart.setData(res.distribution.map(b => ({
+        label: `${b.lo}`,
+        value: b.cp,
+        color: gradeVar(b.lo),
+        title: `${b.lo.toFixed(1)} – ${b.hi.toFixed(1)}: ${b.count} Fächer, ${formatCP(b.cp)} CP`
+    })));
 }
 
 document.getElementById('inSem').addEventListener('keydown', (e) => {
     if(e.key === 'Enter') addSubject();
 });
 
-load();
+connectBackend().then(channel => {
+    backend = channel && channel.objects.gradeBackend || null;
+    return openStorage(channel);
+}).then(() => {
+    load();
+    scheduleAnalytics();
+});
 </script>
 </body>
 </html>
@@ -545,7 +998,52 @@ load();
         self._apply_theme(normalized)
 
 
+def _benchmark_analytics(sizes=(100, 1000, 10000, 100000), rounds=20):
+    """
+    Zeit pro Analyseaufruf (Verteilung, Quartile, Trend, 3x3 Prognosen) für wachsende
+    Notenhistorien; mit NumPy zusätzlich die reine Python-Variante zum Vergleich und
+    ein Abgleich beider Ergebnisse.
+    """
+    import random
+
+    rnd = random.Random(1)
+    for n in sizes:
+        subjects = [{"grade": "b" if rnd.random() < 0.1 else round(rnd.uniform(1.0, 5.0), 1),
+                     "cp": rnd.choice((2.5, 5, 5, 7.5, 10)), "sem": rnd.randint(1, 12)} for _ in range(n)]
+        payload = json.dumps({"subjects": subjects, "remaining_cp": [30, 60, 90],
+                              "grades": [1.0, 2.5, 4.0], "targets": [1.5, 2.0, 2.5]})
+        api = GradeAPI()
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            result = api.analyze(payload)
+        t_api = (time.perf_counter() - t0) / rounds
+        line = f"{n:6d} Fächer: {result['engine']} {t_api * 1000:8.2f} ms/Aufruf (inkl. JSON)"
+        if np is not None:
+            g, w, sem, _ = _graded(subjects)
+            t0 = time.perf_counter()
+            for _ in range(rounds):
+                fast = _core_numpy(g, w, sem)
+            t_np = (time.perf_counter() - t0) / rounds
+            t0 = time.perf_counter()
+            for _ in range(rounds):
+                ref = _core_python(g, w, sem)
+            t_py = (time.perf_counter() - t0) / rounds
+            same = all(
+                math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+                for key in ("avg", "std", "quantiles", "bin_cp", "sem_avg", "running")
+                for a, b in zip(*(([x[key]] if isinstance(x[key], float) else x[key]) for x in (fast, ref)))
+            ) and fast["counts"] == ref["counts"] and fast["sems"] == ref["sems"]
+            line += (f", Kernrechnung NumPy {t_np * 1000:7.2f} ms / reines Python {t_py * 1000:7.2f} ms"
+                     f", Ergebnisse gleich: {same}")
+        print(line)
+
+
 if __name__ == '__main__':
+    # Analysezeiten messen: python Noten.py --benchmark-analytics
+    if len(sys.argv) == 2 and sys.argv[1] == "--benchmark-analytics":
+        _benchmark_analytics()
+        sys.exit(0)
+
     app = QApplication(sys.argv)
     app.setProperty("toolbar_theme", "dark")
     window = PluginWidget(theme="dark")
@@ -1,8 +1,12 @@
 # scripts/pro_flappy_html_v3_singlefile.py
+import json
 import os
+import re
+import sqlite3
 import sys
+import time
 from PyQt5.QtCore import (
-    QObject, pyqtSlot, pyqtSignal, QUrl, QEvent
+    QObject, pyqtSlot, pyqtSignal, QUrl, QEvent, QTimer
 )
 from PyQt5.QtWebChannel import QWebChannel
 from PyQt5.QtWidgets import (
@@ -11,11 +15,20 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtGui import QPalette
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _text_docs import VIRTUAL_LIST_JS, MetaListing, WriteBehindBuffer  # noqa: E402
+
 # --- 1. Python-Backend-Logik (Unsere API für JS) ---
 
 NOTES_DIR = os.path.expanduser('~/.simple_notes_plugin_v2')
 os.makedirs(NOTES_DIR, exist_ok=True)
 
+# Ablage der Notizen: "directory" (eine .txt pro Notiz, Standard) oder "sqlite"
+NOTES_STORAGE = "directory"
+NOTES_DB = os.path.join(NOTES_DIR, 'notes.sqlite3')
+# Geänderte Notizen werden gesammelt nach dieser Ruhezeit auf die Platte geschrieben
+WRITE_BEHIND_MS = 1500
+
 THEME_LIGHT = "light"
 THEME_DARK = "dark"
 SUPPORTED_THEMES = {THEME_LIGHT, THEME_DARK}
@@ -40,6 +53,297 @@ def _detect_host_theme(default=THEME_LIGHT):
     return default
 
 
+def _preview_line(content, limit=120):
+    """Erste nicht-leere Zeile einer Notiz (gekürzt) für Listenansichten."""
+    for line in content.splitlines():
+        line = line.strip()
+        if line:
+            return line[:limit]
+    return ""
+
+
+class DirectoryNoteStore:
+    """
+    Standard-Ablage: eine .txt-Datei pro Titel im Notizordner.
+    Schreibzugriffe laufen atomar über eine temporäre Datei + os.replace.
+    """
+
+    kind = "directory"
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, title):
+        return os.path.join(self.root, title + '.txt')
+
+    def _entries(self):
+        for entry in os.scandir(self.root):
+            if entry.name.endswith('.txt') and entry.is_file():
+                yield entry
+
+    def list_titles(self):
+        return [entry.name[:-4] for entry in self._entries()]
+
+    def stamps(self):
+        """title -> (mtime_ns, size), ohne Inhalte zu lesen."""
+        result = {}
+        for entry in self._entries():
+            st = entry.stat()
+            result[entry.name[:-4]] = (st.st_mtime_ns, st.st_size)
+        return result
+
+    def list_meta(self):
+        """Alle Notizen mit Größe, mtime und Vorschauzeile in einem Durchgang."""
+        meta = []
+        for entry in self._entries():
+            st = entry.stat()
+            try:
+                with open(entry.path, 'r', encoding='utf-8', errors='replace') as f:
+                    head = f.read(512)
+            except OSError:
+                head = ""
+            meta.append({
+                "title": entry.name[:-4],
+                "size": st.st_size,
+                "mtime": st.st_mtime_ns // 1_000_000,
+                "preview": _preview_line(head),
+            })
+        return meta
+
+    def stamp(self, title):
+        """(mtime_ns, size) einer Notiz oder None."""
+        try:
+            st = os.stat(self._path(title))
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def version(self):
+        """Ändert sich bei jedem Anlegen, Speichern (os.replace) und Löschen im Ordner."""
+        return os.stat(self.root).st_mtime_ns
+
+    def exists(self, title):
+        return os.path.isfile(self._path(title))
+
+    def load(self, title):
+        path = self._path(title)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def save(self, title, content):
+        path = self._path(title)
+        tmp = os.path.join(self.root, '.' + title + '.txt.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+
+    def delete(self, title):
+        path = self._path(title)
+        if not os.path.exists(path):
+            return False
+        os.remove(path)
+        return True
+
+    def close(self):
+        pass
+
+
+class SQLiteNoteStore:
+    """
+    Alternative Ablage: alle Notizen in einer SQLite-Datei (WAL-Modus).
+    Jeder Schreibzugriff ist eine eigene Transaktion und damit atomar.
+    """
+
+    kind = "sqlite"
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.db = sqlite3.connect(db_path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS notes (
+                title TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                preview TEXT NOT NULL
+            )
+        """)
+        self.db.commit()
+
+    def list_titles(self):
+        return [row[0] for row in self.db.execute("SELECT title FROM notes")]
+
+    def stamps(self):
+        return {title: (mtime, size) for title, mtime, size
+                in self.db.execute("SELECT title, mtime_ns, size FROM notes")}
+
+    def list_meta(self):
+        return [{"title": title, "size": size, "mtime": mtime // 1_000_000, "preview": preview}
+                for title, size, mtime, preview
+                in self.db.execute("SELECT title, size, mtime_ns, preview FROM notes")]
+
+    def stamp(self, title):
+        row = self.db.execute("SELECT mtime_ns, size FROM notes WHERE title = ?", (title,)).fetchone()
+        return tuple(row) if row else None
+
+    def version(self):
+        """Ändert sich, sobald eine andere Verbindung (z.B. das Popup) etwas festschreibt."""
+        return self.db.execute("PRAGMA data_version").fetchone()[0]
+
+    def exists(self, title):
+        return self.db.execute("SELECT 1 FROM notes WHERE title = ?", (title,)).fetchone() is not None
+
+    def load(self, title):
+        row = self.db.execute("SELECT content FROM notes WHERE title = ?", (title,)).fetchone()
+        return row[0] if row else None
+
+    def save(self, title, content):
+        stamp = (time.time_ns(), len(content.encode('utf-8')))
+        with self.db:
+            self.db.execute(
+                "INSERT INTO notes (title, content, mtime_ns, size, preview) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(title) DO UPDATE SET content = excluded.content, mtime_ns = excluded.mtime_ns, "
+                "size = excluded.size, preview = excluded.preview",
+                (title, content, stamp[0], stamp[1], _preview_line(content)))
+        return stamp
+
+    def delete(self, title):
+        with self.db:
+            return self.db.execute("DELETE FROM notes WHERE title = ?", (title,)).rowcount > 0
+
+    def close(self):
+        self.db.close()
+
+
+def open_note_store(kind=None):
+    """Erzeugt die konfigurierte Ablage ("directory" oder "sqlite")."""
+    kind = kind or NOTES_STORAGE
+    if kind == "sqlite":
+        return SQLiteNoteStore(NOTES_DB)
+    return DirectoryNoteStore(NOTES_DIR)
+
+
+def migrate_notes(source, target):
+    """Kopiert alle Notizen von einer Ablage in eine andere; liefert die Anzahl."""
+    count = 0
+    for title in source.list_titles():
+        content = source.load(title)
+        if content is None:
+            continue
+        target.save(title, content)
+        count += 1
+    return count
+
+
+class NoteSearchIndex:
+    """
+    Persistenter Volltextindex über alle Notizen (SQLite FTS5).
+
+    Der Index liegt als versteckte Datei im Notizordner und wird beim Start
+    anhand der mtimes der Ablage inkrementell abgeglichen; danach halten
+    save_note/delete_note ihn aktuell.
+    """
+
+    # Markierungen für Treffer im Snippet; das Frontend ersetzt sie durch <mark>
+    HIT_START = "\x02"
+    HIT_END = "\x03"
+
+    def __init__(self, store, index_dir, db_name=".search_index.sqlite"):
+        self.db = sqlite3.connect(os.path.join(index_dir, db_name))
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS note_meta (
+                id INTEGER PRIMARY KEY,
+                title TEXT UNIQUE NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS note_fts USING fts5(
+                title, content, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+            );
+        """)
+        self.sync(store)
+
+    def sync(self, store):
+        """Indiziert nur neue/geänderte Notizen neu und entfernt gelöschte."""
+        known = {title: (mtime, size) for title, mtime, size
+                 in self.db.execute("SELECT title, mtime_ns, size FROM note_meta")}
+        stamps = store.stamps()
+        with self.db:
+            for title, stamp in stamps.items():
+                if known.get(title) == stamp:
+                    continue
+                try:
+                    self._upsert(title, store.load(title) or "", stamp)
+                except Exception as e:
+                    print(f"Fehler beim Indizieren der Notiz {title}: {e}")
+            for title in known.keys() - stamps.keys():
+                self._delete(title)
+
+    def _upsert(self, title, content, stamp):
+        mtime_ns, size = stamp
+        row = self.db.execute("SELECT id FROM note_meta WHERE title = ?", (title,)).fetchone()
+        if row:
+            note_id = row[0]
+            self.db.execute("UPDATE note_meta SET mtime_ns = ?, size = ? WHERE id = ?",
+                            (mtime_ns, size, note_id))
+            self.db.execute("DELETE FROM note_fts WHERE rowid = ?", (note_id,))
+        else:
+            note_id = self.db.execute(
+                "INSERT INTO note_meta (title, mtime_ns, size) VALUES (?, ?, ?)",
+                (title, mtime_ns, size)).lastrowid
+        self.db.execute("INSERT INTO note_fts (rowid, title, content) VALUES (?, ?, ?)",
+                        (note_id, title, content))
+
+    def _delete(self, title):
+        row = self.db.execute("SELECT id FROM note_meta WHERE title = ?", (title,)).fetchone()
+        if row:
+            self.db.execute("DELETE FROM note_fts WHERE rowid = ?", (row[0],))
+            self.db.execute("DELETE FROM note_meta WHERE id = ?", (row[0],))
+
+    def update(self, title, content, stamp):
+        with self.db:
+            self._upsert(title, content, stamp)
+
+    def remove(self, title):
+        with self.db:
+            self._delete(title)
+
+    @staticmethod
+    def _match_query(text):
+        """
+        Freitext -> FTS5-Abfrage: alle Wörter müssen vorkommen, das letzte
+        (gerade getippte) Wort zählt auch als Präfix.
+        """
+        words = re.findall(r"\w+", text, re.UNICODE)
+        if not words:
+            return ""
+        terms = ['"{}"'.format(w) for w in words[:-1]]
+        terms.append('"{}"*'.format(words[-1]))
+        return " ".join(terms)
+
+    def search(self, text, limit=50):
+        query = self._match_query(text)
+        if not query:
+            return []
+        rows = self.db.execute(
+            "SELECT title, snippet(note_fts, 1, ?, ?, '…', 12), bm25(note_fts, 10.0, 1.0) AS rank "
+            "FROM note_fts WHERE note_fts MATCH ? ORDER BY rank LIMIT ?",
+            (self.HIT_START, self.HIT_END, query, limit))
+        return [{"title": title, "snippet": snippet, "score": -rank} for title, snippet, rank in rows]
+
+    def close(self):
+        self.db.close()
+
+
 class NotesAPI(QObject):
     """
     Diese API wird per QWebChannel 1:1 in JavaScript bereitgestellt.
@@ -50,58 +354,212 @@ class NotesAPI(QObject):
     notesChanged = pyqtSignal()
     themeChanged = pyqtSignal(str)
 
-    def __init__(self, initial_theme=THEME_LIGHT):
+    def __init__(self, initial_theme=THEME_LIGHT, store=None):
         super().__init__()
         self._theme = initial_theme if initial_theme in SUPPORTED_THEMES else THEME_LIGHT
+        self._store = store or open_note_store()
+        self._listing = None  # MetaListing, erst beim ersten Seitenabruf aufgebaut
+        self._listing_version = None  # Stand der Ablage, auf dem die Liste beruht
+        # Fenster und Popup haben je eine eigene API; Speichern des anderen über Stempel erkennen
+        self._buffer = WriteBehindBuffer(self._store.load, self._store.stamp, self._on_external_change)
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(WRITE_BEHIND_MS)
+        self._flush_timer.timeout.connect(self.flush_pending)
+        try:
+            self._search_index = NoteSearchIndex(self._store, NOTES_DIR)
+        except Exception as e:
+            print(f"Suchindex nicht verfügbar: {e}")
+            self._search_index = None
 
     @pyqtSlot(result='QVariantList')
     def list_notes(self):
         """Liefert eine Liste aller Notiztitel."""
         try:
-            return sorted(
-                [f[:-4] for f in os.listdir(NOTES_DIR) if f.endswith('.txt')],
-                key=lambda s: s.lower()
-            )
+            return sorted(self._store.list_titles(), key=lambda s: s.lower())
+        except Exception as e:
+            print(f"Fehler beim Auflisten der Notizen: {e}")
+            return []
+
+    @pyqtSlot(result='QVariantList')
+    def list_notes_meta(self):
+        """Liefert alle Notizen mit Metadaten ({title, size, mtime, preview}) in einem Aufruf."""
+        try:
+            return sorted(self._store.list_meta(), key=lambda m: m["title"].lower())
         except Exception as e:
             print(f"Fehler beim Auflisten der Notizen: {e}")
             return []
 
+    def _get_listing(self):
+        if self._listing is None:
+            self._listing = MetaListing(self._store.list_meta(), "title")
+        elif self._store.version() != self._listing_version:
+            # Von außen geändert (anderes Fenster): neu einlesen, Clients bekommen einen Reset
+            self._listing.rebase(self._store.list_meta())
+            if self._search_index:
+                self._search_index.sync(self._store)
+        else:
+            return self._listing
+        self._listing_version = self._store.version()
+        return self._listing
+
+    def _track_own_change(self, version_before):
+        """Eigene Änderung: Liste ist aktuell, sofern vorher nichts von außen kam."""
+        if self._listing is not None and self._listing_version == version_before:
+            self._listing_version = self._store.version()
+
+    def _on_external_change(self, title):
+        self._listing_version = None
+        self.notesChanged.emit()
+
+    def check_external_changes(self):
+        """Beim Aktivieren des Fensters: Hat das andere Fenster die Ablage geändert?"""
+        if self._store and self._listing is not None and self._store.version() != self._listing_version:
+            self.notesChanged.emit()
+
+    @pyqtSlot(int, int, str, bool, result='QVariantMap')
+    def list_notes_page(self, offset, limit, sort, descending):
+        """
+        Eine Seite der Notizliste: {token, total, offset, items: [{title, size, mtime, preview}]}.
+        sort: "title" | "mtime" | "size".
+        """
+        try:
+            return self._get_listing().page(offset, limit, sort, descending)
+        except Exception as e:
+            print(f"Fehler beim Auflisten der Notizen: {e}")
+            return {"token": 0, "total": 0, "offset": 0, "items": []}
+
+    @pyqtSlot(int, result='QVariantMap')
+    def list_notes_changes(self, since_token):
+        """Änderungen seit since_token: {token, reset, upserts, removed}."""
+        return self._get_listing().changes(since_token)
+
     @pyqtSlot(str, result=str)
     def load_note(self, title):
         """Lädt den Inhalt einer Notiz anhand des Titels."""
-        path = os.path.join(NOTES_DIR, title + '.txt')
-        if not title or not os.path.exists(path):
+        if not title:
             return ""
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return f.read()
+            buffered = self._buffer.text(title)
+            if buffered is not None:
+                return buffered
+            return self._store.load(title) or ""
         except Exception as e:
             print(f"Fehler beim Laden der Notiz {title}: {e}")
             return ""
 
+    @pyqtSlot(str, result='QVariantMap')
+    def open_note(self, title):
+        """
+        Lädt eine Notiz in den Puffer: {content, rev}. Mit rev schickt der Editor
+        danach nur noch Patches (patch_note). rev 0 = Notiz existiert nicht.
+        """
+        try:
+            opened = self._buffer.open(title) if title else None
+        except Exception as e:
+            print(f"Fehler beim Laden der Notiz {title}: {e}")
+            opened = None
+        if opened is None:
+            return {"content": "", "rev": 0}
+        return {"content": opened[0], "rev": opened[1]}
+
+    @pyqtSlot(str, int, str, result=int)
+    def patch_note(self, title, base_rev, ops_json):
+        """
+        Wendet einen Patch ([[start, delete_count, insert], ...], UTF-16-Offsets)
+        auf die Revision base_rev an. Liefert die neue Revision oder -1 bei Konflikt;
+        der Editor schickt dann den vollen Text über replace_note.
+        """
+        try:
+            rev = self._buffer.patch(title, base_rev, json.loads(ops_json))
+        except ValueError:
+            rev = None
+        if rev is None:
+            return -1
+        self._flush_timer.start()
+        return rev
+
+    @pyqtSlot(str, str, result=int)
+    def replace_note(self, title, content):
+        """Ersetzt den gepufferten Text vollständig (Fallback für patch_note)."""
+        if not title:
+            return -1
+        rev = self._buffer.replace(title, content)
+        self._flush_timer.start()
+        return rev
+
     @pyqtSlot(str, str)
     def save_note(self, title, content):
-        """Speichert oder erstellt eine Notiz."""
+        """Speichert oder erstellt eine Notiz (sofort, ohne Write-Behind)."""
         if not title: return
-        path = os.path.join(NOTES_DIR, title + '.txt')
-        try:
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            self.notesChanged.emit()  # Signal senden!
-        except Exception as e:
-            print(f"Fehler beim Speichern der Notiz {title}: {e}")
+        self._buffer.replace(title, content)
+        self.flush_pending()
+
+    @pyqtSlot()
+    def flush_pending(self):
+        """Schreibt alle gepufferten Änderungen (atomar über die Ablage)."""
+        self._flush_timer.stop()
+        written = False
+        for title, content in self._buffer.take_dirty():
+            try:
+                self._write_note(title, content)
+                written = True
+            except Exception as e:
+                self._buffer.mark_dirty(title)
+                print(f"Fehler beim Speichern der Notiz {title}: {e}")
+        if written:
+            # Das Frontend holt daraufhin nur die Änderungen seit seinem Token
+            self.notesChanged.emit()
+
+    def _write_note(self, title, content):
+        version_before = self._store.version()
+        stamp = self._store.save(title, content)
+        self._buffer.saved(title, stamp)
+        if self._search_index:
+            self._search_index.update(title, content, stamp)
+        if self._listing is not None:
+            self._listing.upsert({"title": title, "size": stamp[1], "mtime": stamp[0] // 1_000_000,
+                                  "preview": _preview_line(content)})
+        # Erst nach dem Index: dessen Journal liegt ebenfalls im Notizordner
+        self._track_own_change(version_before)
 
     @pyqtSlot(str)
     def delete_note(self, title):
         """Löscht eine Notiz."""
         if not title: return
-        path = os.path.join(NOTES_DIR, title + '.txt')
-        if os.path.exists(path):
-            try:
-                os.remove(path)
+        self._buffer.discard(title)
+        try:
+            version_before = self._store.version()
+            if self._store.delete(title):
+                if self._search_index:
+                    self._search_index.remove(title)
+                if self._listing is not None:
+                    self._listing.remove(title)
+                self._track_own_change(version_before)
                 self.notesChanged.emit()
-            except Exception as e:
-                print(f"Fehler beim Löschen der Notiz {title}: {e}")
+        except Exception as e:
+            print(f"Fehler beim Löschen der Notiz {title}: {e}")
+
+    @pyqtSlot(str, result='QVariantList')
+    def search_notes(self, query):
+        """Volltextsuche über alle Notizen; liefert [{title, snippet, score}] nach Relevanz."""
+        if not self._search_index:
+            return []
+        try:
+            return self._search_index.search(query)
+        except Exception as e:
+            print(f"Fehler bei der Notizsuche: {e}")
+            return []
+
+    def close(self):
+        if self._store:
+            self.flush_pending()
+        if self._search_index:
+            self._search_index.close()
+            self._search_index = None
+        if self._store:
+            self._store.close()
+            self._store = None
 
     def _set_theme_internal(self, theme: str):
         theme_lower = (theme or "").lower()
@@ -225,7 +683,9 @@ button.danger:hover { background: #a71d2a; }
     min-width: 150px;
     padding: 1em;
     box-sizing: border-box;
-    overflow-y: auto;
+    display: flex;
+    flex-direction: column;
+    overflow: hidden;
     height: 100vh;
     border-right: 1px solid #d7d7d7;
 }
@@ -241,22 +701,63 @@ button.danger:hover { background: #a71d2a; }
 #main #content {
     flex: 1; /* Nimmt allen verfügbaren Platz ein */
 }
+/* Virtualisierte Liste: eigener Scrollbereich, Zeilen mit fester Höhe absolut positioniert */
 #notelist {
-    padding: 0; list-style: none; margin-bottom: 2em;
+    padding: 0; list-style: none; margin: 0 0 1em 0;
+    flex: 1;
+    min-height: 0;
+    overflow-y: auto;
+    position: relative;
 }
 #notelist li {
-    padding: .5em .3em;
+    position: absolute;
+    left: 0; right: 0;
+    height: 32px;
+    line-height: 32px;
+    padding: 0 .3em;
+    box-sizing: border-box;
     cursor: pointer;
     border-radius: 3px;
-    word-break: break-all;
+    white-space: nowrap;
+    overflow: hidden;
+    text-overflow: ellipsis;
     transition: background .2s ease;
 }
+#notelist li.vl-spacer {
+    position: static;
+    width: 1px;
+    padding: 0;
+    visibility: hidden;
+    pointer-events: none;
+}
+#notelist li.placeholder { opacity: .4; }
+#list-sort { width: 100%; margin: 0 0 .5em 0; }
 #notelist li:hover { background: #dcdcdc; }
 #notelist li.selected {
     background: #007aff;
     color: white;
     font-weight: bold;
 }
+#search-results {
+    padding: 0; list-style: none; margin: 0 0 1em 0;
+    flex: 1;
+    min-height: 0;
+    overflow-y: auto;
+}
+#search-results:empty { display: none; }
+#search-results li {
+    padding: .5em .3em;
+    cursor: pointer;
+    border-radius: 3px;
+    transition: background .2s ease;
+}
+#search-results li:hover { background: #dcdcdc; }
+#search-results .hit-title { font-weight: bold; word-break: break-all; }
+#search-results .hit-snippet { font-size: .85em; opacity: .8; }
+#search-results mark { background: #ffe58a; color: inherit; border-radius: 2px; }
+body.searching #notelist, body.searching #list-sort { display: none; }
+body.theme-dark #search-results li:hover { background: #333948; }
+body.theme-dark #search-results mark { background: #6b5a1e; }
 #new-title { width: 90%; }
 #add-note-btn { width: 100%; }
 /* --- Popup-Modus --- */
@@ -431,7 +932,7 @@ body.theme-dark #popup-status-bar {
 }
 """
 
-MAIN_JS = r"""
+MAIN_JS = VIRTUAL_LIST_JS + r"""
 let currentTheme = 'light';
 
 // Warten, bis das Fenster geladen ist, um die Bridge einzurichten
@@ -453,8 +954,18 @@ window.addEventListener('load', () => {
         initApp();
         initThemeSync();
     });
+
+    // Der Launcher schließt Tabs ohne closeEvent: gepufferte Änderungen beim Verlassen schreiben
+    window.addEventListener('pagehide', flushBackend);
+    document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'hidden') flushBackend();
+    });
 });
 
+function flushBackend() {
+    if (window.backend) window.backend.flush_pending();
+}
+
 /**
  * Initialisiert die Anwendung basierend auf dem Modus.
  */
@@ -501,6 +1012,9 @@ const el = {
     noteList: document.getElementById('notelist'),
     newTitle: document.getElementById('new-title'),
     addNoteBtn: document.getElementById('add-note-btn'),
+    listSort: document.getElementById('list-sort'),
+    searchInput: document.getElementById('search-input'),
+    searchResults: document.getElementById('search-results'),
     currentTitle: document.getElementById('current-title'),
     content: document.getElementById('content'),
     saveBtn: document.getElementById('save-btn'),
@@ -509,58 +1023,165 @@ const el = {
 };
 
 let currentSelectedTitle = "";
+let noteList = null;
+
+// Zuletzt mit dem Backend abgeglichener Stand der geöffneten Notiz
+let synced = { title: "", text: "", rev: 0 };
+let saveChain = Promise.resolve();
+
+/**
+ * Minimaler Patch zwischen zwei Ständen: gemeinsamer Anfang und gemeinsames Ende
+ * werden übersprungen, der Rest wird als [[start, deleteCount, insert]] übertragen.
+ * Offsets in UTF-16-Einheiten; Surrogatpaare werden nie getrennt.
+ */
+function computePatch(oldText, newText) {
+    if (oldText === newText) return [];
+    const maxPrefix = Math.min(oldText.length, newText.length);
+    let prefix = 0;
+    while (prefix < maxPrefix && oldText.charCodeAt(prefix) === newText.charCodeAt(prefix)) prefix++;
+    if (prefix > 0 && isHighSurrogate(oldText.charCodeAt(prefix - 1))) prefix--;
+
+    const maxSuffix = maxPrefix - prefix;
+    let suffix = 0;
+    while (suffix < maxSuffix &&
+           oldText.charCodeAt(oldText.length - 1 - suffix) === newText.charCodeAt(newText.length - 1 - suffix)) suffix++;
+    if (suffix > 0 && isLowSurrogate(oldText.charCodeAt(oldText.length - suffix))) suffix--;
+
+    return [[prefix, oldText.length - prefix - suffix, newText.slice(prefix, newText.length - suffix)]];
+}
+
+function isHighSurrogate(code) { return code >= 0xD800 && code <= 0xDBFF; }
+function isLowSurrogate(code) { return code >= 0xDC00 && code <= 0xDFFF; }
+
+function renderNoteRow(li, note) {
+    if (!note) {
+        li.innerText = "…";
+        li.className = 'placeholder';
+        delete li.dataset.title;
+        return;
+    }
+    li.className = (note.title === currentSelectedTitle) ? 'selected' : '';
+    li.innerText = note.title;
+    li.dataset.title = note.title;
+    li.title = note.preview || "";
+}
 
 function initWindowView() {
     // Event Listeners
     el.addNoteBtn.addEventListener('click', addNewNote);
     el.saveBtn.addEventListener('click', saveCurrentNote);
     el.deleteBtn.addEventListener('click', deleteCurrentNote);
+    el.noteList.addEventListener('click', (event) => {
+        const li = event.target.closest('li');
+        if (li && li.dataset.title) openNote(li.dataset.title);
+    });
+    el.listSort.addEventListener('change', () => {
+        const [sort, dir] = el.listSort.value.split(':');
+        noteList.setSort(sort, dir === 'desc');
+    });
+    el.searchInput.addEventListener('input', () => {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(runSearch, 120);
+    });
 
     // Beim Start die Liste laden
     refreshNoteList();
 }
 
 /**
- * Holt die Notizliste vom Python-Backend und zeigt sie an.
+ * Gleicht die Notizliste mit dem Python-Backend ab. Beim ersten Aufruf wird die
+ * erste Seite geladen, danach nur noch die Änderungen seit dem letzten Token.
  */
 async function refreshNoteList() {
     if (!window.backend || !el.noteList) return;
 
     try {
-        const notes = await window.backend.list_notes();
-        el.noteList.innerHTML = ""; // Liste leeren
+        if (!noteList) {
+            noteList = new VirtualList(el.noteList, {
+                rowHeight: 32,
+                pageSize: 200,
+                fetchPage: (offset, limit, sort, desc) => window.backend.list_notes_page(offset, limit, sort, desc),
+                fetchChanges: (since) => window.backend.list_notes_changes(since),
+                renderRow: renderNoteRow,
+                keyOf: (note) => note.title,
+            });
+            await noteList.reload();
+        } else {
+            await noteList.sync();
+        }
+        if (el.searchInput && el.searchInput.value.trim()) runSearch();
+    } catch (e) {
+        console.error("Fehler beim Laden der Notizliste:", e);
+    }
+}
+
+/**
+ * Volltextsuche im Backend; Treffer ersetzen die Notizliste, solange gesucht wird.
+ */
+let searchTimer = null;
+let searchSeq = 0;
+
+async function runSearch() {
+    const query = el.searchInput.value.trim();
+    const seq = ++searchSeq;
+    document.body.classList.toggle('searching', query !== "");
+    if (!query) {
+        el.searchResults.innerHTML = "";
+        return;
+    }
+
+    try {
+        const hits = await window.backend.search_notes(query);
+        if (seq !== searchSeq) return; // veraltete Antwort
 
-        notes.forEach(title => {
+        el.searchResults.innerHTML = "";
+        if (!hits.length) {
             const li = document.createElement('li');
-            li.innerText = title;
-            li.dataset.title = title; // Titel im DOM speichern
-            li.addEventListener('click', () => openNote(title));
-
-            if (title === currentSelectedTitle) {
-                li.classList.add('selected');
-            }
-            el.noteList.appendChild(li);
+            li.innerText = "Keine Treffer";
+            el.searchResults.appendChild(li);
+            return;
+        }
+        hits.forEach(hit => {
+            const li = document.createElement('li');
+            const t = document.createElement('div');
+            t.className = 'hit-title';
+            t.innerText = hit.title;
+            const snip = document.createElement('div');
+            snip.className = 'hit-snippet';
+            snip.innerHTML = highlightSnippet(hit.snippet);
+            li.appendChild(t);
+            li.appendChild(snip);
+            li.addEventListener('click', () => openNote(hit.title));
+            el.searchResults.appendChild(li);
         });
     } catch (e) {
-        console.error("Fehler beim Laden der Notizliste:", e);
+        console.error("Fehler bei der Suche:", e);
     }
 }
 
+// Snippet escapen und die Treffermarken (\x02 ... \x03) aus dem Backend in <mark> umsetzen
+function highlightSnippet(text) {
+    const div = document.createElement('div');
+    div.innerText = text || "";
+    return div.innerHTML.replace(/\x02/g, '<mark>').replace(/\x03/g, '</mark>');
+}
+
 /**
  * Öffnet eine Notiz und lädt den Inhalt vom Python-Backend.
  */
 async function openNote(title) {
     try {
-        const content = await window.backend.load_note(title);
+        await saveChain; // laufende Speichervorgänge der vorherigen Notiz abwarten
+        const doc = await window.backend.open_note(title);
+        const content = doc.content;
+        synced = { title: title, text: content, rev: doc.rev };
 
         currentSelectedTitle = title;
         el.currentTitle.value = title;
         el.content.value = content;
 
-        // "selected"-Klasse in der Liste aktualisieren
-        document.querySelectorAll('#notelist li').forEach(li => {
-            li.classList.toggle('selected', li.dataset.title === title);
-        });
+        // "selected"-Klasse in den sichtbaren Zeilen aktualisieren
+        if (noteList) noteList.refreshRows();
     } catch (e) {
         console.error("Fehler beim Öffnen der Notiz:", e);
         showStatus("Fehler beim Laden der Notiz.", "error");
@@ -579,10 +1200,31 @@ async function saveCurrentNote() {
         return;
     }
 
-    await window.backend.save_note(title, content);
+    // Speichervorgänge nacheinander, damit jeder Patch auf der Revision des vorherigen aufsetzt
+    saveChain = saveChain.then(() => pushNote(title, content));
+    await saveChain;
     showStatus(`Notiz '${title}' gespeichert!`, "success");
 }
 
+/**
+ * Schickt nur die Änderung gegenüber dem zuletzt abgeglichenen Stand. Passt die
+ * Revision nicht (oder ist die Notiz noch nicht geöffnet), geht der volle Text raus.
+ */
+async function pushNote(title, content) {
+    try {
+        let rev = -1;
+        if (synced.title === title && synced.rev > 0) {
+            const ops = computePatch(synced.text, content);
+            if (!ops.length) return;
+            rev = await window.backend.patch_note(title, synced.rev, JSON.stringify(ops));
+        }
+        if (rev < 0) rev = await window.backend.replace_note(title, content);
+        synced = { title: title, text: content, rev: rev };
+    } catch (e) {
+        console.error("Fehler beim Speichern:", e);
+    }
+}
+
 /**
  * Erstellt eine neue, leere Notiz.
  */
@@ -615,7 +1257,9 @@ async function deleteCurrentNote() {
 
     // Hier wäre Platz für eine "Sicher?"-Abfrage
 
+    await saveChain;
     await window.backend.delete_note(title);
+    synced = { title: "", text: "", rev: 0 };
 
     // Das 'notesChanged'-Signal vom Backend wird 'refreshNoteList' triggern.
 
@@ -690,6 +1334,13 @@ HTML_TEMPLATE = r"""
     <div id="window-view" class="view-container">
         <div id="sidebar">
             <h3>Notizen</h3>
+            <input id="search-input" type="text" placeholder="Suchen..." />
+            <ul id="search-results"></ul>
+            <select id="list-sort">
+                <option value="title">Titel (A–Z)</option>
+                <option value="mtime:desc">Zuletzt geändert</option>
+                <option value="size:desc">Größe</option>
+            </select>
             <ul id="notelist"></ul>
             <input id="new-title" type="text" placeholder="Neuer Titel..." />
             <button id="add-note-btn">Neue Notiz</button>
@@ -796,6 +1447,10 @@ class PluginWidget(QMainWindow):
             self._theme_watcher = HostThemeWatcher(app_instance)
             self._theme_watcher.themeChanged.connect(self.backend.set_theme)
             self.destroyed.connect(self._cleanup_theme_watcher)
+            app_instance.aboutToQuit.connect(self.backend.close)
+        # Der Launcher schließt Tabs per deleteLater() ohne closeEvent; das
+        # Write-Behind darf dabei nicht verloren gehen
+        self.destroyed.connect(self.backend.close)
 
     def _on_view_ready(self, ok: bool):
         self._view_ready = bool(ok)
@@ -821,13 +1476,81 @@ class PluginWidget(QMainWindow):
             self._theme_watcher.deleteLater()
             self._theme_watcher = None
 
+    def changeEvent(self, event):
+        if event.type() == QEvent.ActivationChange and self.isActiveWindow():
+            self.backend.check_external_changes()
+        super().changeEvent(event)
+
     def closeEvent(self, event):
         self._cleanup_theme_watcher()
+        self.backend.close()
         super().closeEvent(event)
 
 
+def _benchmark_save(size_mb=5, rounds=50):
+    """
+    Speicherlatenz für eine große Markdown-Notiz: voller Text pro Speichern
+    (JSON über den WebChannel + Datei neu schreiben) gegen Patch auf den Puffer
+    mit gesammeltem Write-Behind.
+    """
+    import random
+    import tempfile
+
+    line = "Ein Absatz mit **fett**, `code` und einem [Link](https://example.org) – Umlaute: äöü.\n"
+    blocks = []
+    while sum(map(len, blocks)) < size_mb * 1024 * 1024:
+        blocks.append(f"## Abschnitt {len(blocks)}\n\n" + line * 20 + "\n")
+    content = "".join(blocks)
+    rnd = random.Random(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DirectoryNoteStore(tmp)
+        store.save("gross", content)
+
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            store.save("gross", json.loads(json.dumps(content)))
+        t_full = (time.perf_counter() - t0) / rounds
+
+        buf = WriteBehindBuffer(store.load)
+        text, rev = buf.open("gross")
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            pos = rnd.randrange(len(text))
+            ops = json.loads(json.dumps([[pos, 0, "x"]]))
+            rev = buf.patch("gross", rev, ops)
+        t_patch = (time.perf_counter() - t0) / rounds
+
+        t0 = time.perf_counter()
+        for title, text in buf.take_dirty():
+            store.save(title, text)
+        t_flush = time.perf_counter() - t0
+
+    print(f"Notiz: {len(content) / 1024 / 1024:.1f} MB, {rounds} Speichervorgänge")
+    print(f"  voller Text pro Speichern: {t_full * 1000:8.2f} ms")
+    print(f"  Patch auf Puffer:          {t_patch * 1000:8.2f} ms")
+    print(f"  Write-Behind-Flush (1x):   {t_flush * 1000:8.2f} ms")
+
+
 # --- Zum Testen der Anwendung ---
 if __name__ == "__main__":
+    # Speicherlatenz messen: python Notizen.py --benchmark-save
+    if len(sys.argv) == 2 and sys.argv[1] == "--benchmark-save":
+        _benchmark_save()
+        sys.exit(0)
+
+    # Migration zwischen den Ablagen: python Notizen.py --migrate directory|sqlite
+    if len(sys.argv) == 3 and sys.argv[1] == "--migrate" and sys.argv[2] in ("directory", "sqlite"):
+        target_kind = sys.argv[2]
+        source_kind = "sqlite" if target_kind == "directory" else "directory"
+        source, target = open_note_store(source_kind), open_note_store(target_kind)
+        n = migrate_notes(source, target)
+        source.close()
+        target.close()
+        print(f"{n} Notizen von '{source_kind}' nach '{target_kind}' übertragen.")
+        print(f"Zum Umstellen NOTES_STORAGE = \"{target_kind}\" setzen.")
+        sys.exit(0)
+
     app = QApplication(sys.argv)
 
     # Teste den "Window"-Modus
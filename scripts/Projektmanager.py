@@ -1,8 +1,12 @@
 from PyQt5.QtWidgets import QApplication, QVBoxLayout, QWidget, QMainWindow
 from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtCore import QUrl, QEvent, QObject, pyqtSignal
+import os
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _timeline_canvas import TIMELINE_CANVAS_SCRIPT  # noqa: E402
+
 # --- KONFIGURATION & THEMES ---
 
 THEME_LIGHT = "light"
@@ -393,119 +397,9 @@ class PluginWidget(QMainWindow):
     background: radial-gradient(circle at top, rgba(255,255,255,0.04), transparent 55%);
   }
 
-  .timeline-container {
-    position: relative;
-    display: flex;
-    align-items: center;
-    overflow-x: visible; 
-    overflow-y: visible;
-    min-height: 150px; 
-    padding-inline: 20px;
-    margin-top: 10px;
-    margin-bottom: 10px;
-  }
-
-  .timeline-track {
-    position: relative;
-    width: 100%;
-    height: 6px;
-    background: var(--timeline-line);
-    border-radius: 999px;
-    top: 0; 
-  }
-
-  .timeline-progress {
-    position: absolute; left: 0; top: 0;
-    height: 100%;
-    background: var(--accent-grad);
-    border-radius: 999px; transition: width 0.4s ease;
-    opacity: 0.85;
-  }
-
-  .marker-now {
-    position: absolute; top: -16px; bottom: -16px; width: 2px;
-    background: var(--danger-color);
-    box-shadow: 0 0 10px var(--danger-color);
-    z-index: 5; pointer-events: none;
-    transition: left 0.4s ease;
-  }
-  .marker-now::after {
-    content: 'HEUTE'; position: absolute; top: -20px; left: -22px;
-    background: var(--danger-color); color: white;
-    font-size: 9px;
-    padding: 2px 6px; border-radius: 999px; font-weight: 700;
-    letter-spacing: .06em;
-  }
-
-  .milestone-node {
-    position: absolute;
-    top: 50%; transform: translate(-50%, -50%);
-    width: 16px; height: 16px;
-    background: var(--card-bg); border: 3px solid var(--text-muted);
-    border-radius: 50%;
-    cursor: pointer;
-    z-index: 10;
-    transition: transform 0.18s, box-shadow 0.18s, border-color 0.18s, background 0.18s;
-  }
-  .milestone-node:hover {
-    transform: translate(-50%, -50%) scale(1.2);
-    box-shadow: 0 0 10px rgba(0,0,0,0.45);
-    z-index: 20; 
-  }
-  .milestone-node.completed { border-color: var(--success-color); background: var(--success-color); }
-  .milestone-node.future { border-color: var(--accent-color); background: var(--accent-soft); }
-  .milestone-node.overdue { border-color: var(--danger-color); background: var(--danger-soft); }
-
-  .node-wrapper {
-    position: absolute;
-    left: 50%; 
-    transform: translateX(-50%);
-    width: 100px; 
-    text-align: center;
-    pointer-events: none;
-    display: flex;
-    flex-direction: column;
-    align-items: center;
-  }
-
-  .node-wrapper::before {
-    content: '';
-    display: block;
-    width: 1px;
-    height: 15px; 
-    background-color: var(--border-color);
-    margin: 0 auto;
-  }
-
-  .node-label {
-    white-space: normal; 
-    font-size: 11px; font-weight: 600;
-    color: var(--text-main);
-    line-height: 1.2;
-    background: var(--card-bg); 
-    padding: 2px 4px;
-    border-radius: 4px;
-  }
-
-  .node-date {
-    white-space: nowrap; 
-    font-size: 10px;
-    color: var(--text-muted);
-    margin-top: 2px;
-  }
-
-  .node-wrapper.pos-bottom {
-    top: 20px;
-  }
-
-  .node-wrapper.pos-top {
-    bottom: 20px;
-    flex-direction: column-reverse; 
-  }
-
-  .node-wrapper.pos-top .node-date {
-      margin-bottom: 2px;
-      margin-top: 0;
+  .timeline-canvas {
+    height: 170px;
+    margin: 6px 0;
   }
 
   /* ---------------------- */
@@ -634,7 +528,7 @@ class PluginWidget(QMainWindow):
     }
   }
 </style>
-""" + THEME_OVERRIDE_CSS + THEME_SCRIPT + """
+""" + THEME_OVERRIDE_CSS + THEME_SCRIPT + TIMELINE_CANVAS_SCRIPT + """
 </head>
 <body class="__BODY_CLASS__">
 
@@ -683,15 +577,10 @@ class PluginWidget(QMainWindow):
     <div class="timeline-card">
       <div class="timeline-header">
         <div class="timeline-header-title">Projektzeitachse</div>
-        <div class="chip-small">Rot = Heute · Punkte = Meilensteine</div>
+        <div class="chip-small">Rot = Heute · Punkte = Meilensteine · Mausrad = Zoom · Ziehen = Datum</div>
       </div>
       <div class="timeline-container-inner">
-        <div class="timeline-container" id="timelineContainer">
-          <div class="timeline-track" id="track">
-            <div class="timeline-progress" id="timeProgress"></div>
-            <div class="marker-now" id="markerNow"></div>
-          </div>
-        </div>
+        <div class="timeline-canvas" id="timelineCanvas"></div>
       </div>
     </div>
 
@@ -768,8 +657,17 @@ function applyDateMinMax() {
   endInput.max = "2099-12-31";
 }
 
+// Ablage: im Launcher dessen Plugin-Ablage, eigenständig localStorage
+let store = null;
+function openStorage() {
+  if (!window.launcherStorage) return Promise.resolve();
+  return launcherStorage.open({ legacyKeys: [KEY] }).then(s => { store = s; });
+}
+function storageGet(key) { return store ? store.get(key) : localStorage.getItem(key); }
+function storageSet(key, value) { if (store) store.set(key, value); else localStorage.setItem(key, value); }
+
 function init() {
-  const stored = localStorage.getItem(KEY);
+  const stored = storageGet(KEY);
   if (stored) {
     try {
       appData = JSON.parse(stored);
@@ -805,7 +703,7 @@ function saveData() {
   normalizeDates();
   document.getElementById('startDate').value = appData.start;
   document.getElementById('endDate').value = appData.end;
-  localStorage.setItem(KEY, JSON.stringify(appData));
+  storageSet(KEY, JSON.stringify(appData));
 }
 
 function onDateChange() {
@@ -888,77 +786,53 @@ function updateNextMilestoneBox() {
   }
 }
 
+let timelineView = null;
+
+function timelineItem(ms) {
+  const msDate = safeParseDate(ms.date);
+  const status = getMsStatus(ms);
+  let color = ['--accent-color', '--accent-soft'];
+  if (ms.done) color = ['--success-color', '--success-color'];
+  else if (status.label === "Überfällig") color = ['--danger-color', '--danger-soft'];
+  return {
+    id: ms.id, start: msDate.getTime(), end: msDate.getTime(), label: ms.name,
+    sub: msDate.getUTCDate() + "." + (msDate.getUTCMonth() + 1) + ".",
+    color: color[0], fill: color[1]
+  };
+}
+
 function renderTimeline() {
-  const track = document.getElementById('track');
-  track.innerHTML = `
-      <div class="timeline-progress" id="timeProgress"></div>
-      <div class="marker-now" id="markerNow"></div>
-  `;
+  if (!timelineView) {
+    timelineView = new TimelineCanvas(document.getElementById('timelineCanvas'), {
+      mode: 'track',
+      palette: {
+        text: '--text-main', muted: '--text-muted', line: '--timeline-line',
+        accent: '--accent-color', today: '--danger-color', bg: '--card-bg'
+      },
+      tooltip: item => `${item.label} (${new Date(item.end).toISOString().split('T')[0]})`,
+      onClick: item => {
+        const ms = appData.milestones.find(m => m.id === item.id);
+        if (!ms) return;
+        ms.done = !ms.done;
+        updateAll();
+      },
+      // Ziehen verschiebt den Meilenstein auf den Tag unter dem Zeiger
+      onDrag: (item, ts) => {
+        const ms = appData.milestones.find(m => m.id === item.id);
+        if (!ms) return;
+        ms.date = new Date(ts).toISOString().split('T')[0];
+        updateAll();
+      }
+    });
+  }
   const startDate = safeParseDate(appData.start);
   const endDate = safeParseDate(appData.end);
   if (!startDate || !endDate || endDate <= startDate) {
+    timelineView.setItems([], null);
     return;
   }
-
-  const startTs = startDate.getTime();
-  const endTs = endDate.getTime();
-  const totalDuration = endTs - startTs;
-
-  const nowTs = new Date().getTime();
-  let nowPct = ((nowTs - startTs) / totalDuration) * 100;
-  nowPct = Math.max(0, Math.min(100, nowPct));
-
-  const elMarker = document.getElementById('markerNow');
-  elMarker.style.left = nowPct + "%";
-
-  const elProg = document.getElementById('timeProgress');
-  elProg.style.width = nowPct + "%";
-
-  const sortedMilestones = [...appData.milestones].sort((a,b) => {
-      const da = safeParseDate(a.date) || new Date(0);
-      const db = safeParseDate(b.date) || new Date(0);
-      return da - db;
-  });
-
-  sortedMilestones.forEach((ms, index) => {
-    const msDate = safeParseDate(ms.date);
-    if (!msDate) return;
-    let pct = ((msDate.getTime() - startTs) / totalDuration) * 100;
-    pct = Math.max(0, Math.min(100, pct));
-
-    const node = document.createElement('div');
-    const status = getMsStatus(ms);
-    let extraClass = "";
-    if (status.label === "Überfällig") extraClass = "overdue";
-    node.className = `milestone-node ${ms.done ? 'completed' : 'future'} ${extraClass}`;
-    node.style.left = pct + "%";
-    node.title = `${ms.name} (${ms.date})`;
-
-    const isTop = (index % 2 !== 0); 
-
-    const wrapper = document.createElement('div');
-    wrapper.className = isTop ? 'node-wrapper pos-top' : 'node-wrapper pos-bottom';
-
-    const labelName = document.createElement('div');
-    labelName.className = 'node-label';
-    labelName.innerText = ms.name;
-
-    const labelDate = document.createElement('div');
-    labelDate.className = 'node-date';
-    labelDate.innerText = msDate.getDate() + "." + (msDate.getMonth()+1) + ".";
-
-    wrapper.appendChild(labelName);
-    wrapper.appendChild(labelDate);
-
-    node.appendChild(wrapper);
-
-    node.onclick = () => {
-      ms.done = !ms.done;
-      updateAll();
-    };
-
-    track.appendChild(node);
-  });
+  const items = appData.milestones.filter(ms => safeParseDate(ms.date)).map(timelineItem);
+  timelineView.setItems(items, { start: startDate.getTime(), end: endDate.getTime() });
 }
 
 function renderList() {
@@ -1147,7 +1021,7 @@ function updateAll() {
   renderList();
 }
 
-init();
+openStorage().then(init);
 </script>
 </body>
 </html>"""
@@ -1315,8 +1189,17 @@ function getMsStatus(ms) {
   return { label: "Offen", cls: "inline-badge-warning" };
 }
 
+// Ablage: im Launcher dessen Plugin-Ablage, eigenständig localStorage
+let store = null;
+function openStorage() {
+  if (!window.launcherStorage) return Promise.resolve();
+  return launcherStorage.open({ legacyKeys: [KEY] }).then(s => { store = s; });
+}
+function storageGet(key) { return store ? store.get(key) : localStorage.getItem(key); }
+function storageSet(key, value) { if (store) store.set(key, value); else localStorage.setItem(key, value); }
+
 function loadData() {
-  const stored = localStorage.getItem(KEY);
+  const stored = storageGet(KEY);
   if (stored) {
     try { appData = JSON.parse(stored);
     } catch(e) { appData = null; }
@@ -1418,7 +1301,7 @@ function init() {
   refresh();
 }
 
-init();
+openStorage().then(init);
 </script>
 </body>
 </html>"""
@@ -1,11 +1,22 @@
 from PyQt5.QtWidgets import QApplication, QVBoxLayout, QWidget, QMainWindow
 from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEnginePage
-from PyQt5.QtCore import QUrl, QEvent, QObject, pyqtSignal
+from PyQt5.QtWebChannel import QWebChannel
+from PyQt5.QtCore import QUrl, QEvent, QObject, pyqtSignal, pyqtSlot
+import os
+import sqlite3
 import sys
 import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _task_views import DEADLINE_SCHEDULER_SCRIPT, WINDOWED_LIST_SCRIPT  # noqa: E402
+from _webchannel import install_webchannel_script  # noqa: E402
 
 # --- KONFIGURATION & THEMES ---
 
+TODO_DIR = os.path.expanduser('~/.todo_plugin')
+TODO_DB = os.path.join(TODO_DIR, 'tasks.sqlite3')
+
 THEME_LIGHT = "light"
 THEME_DARK = "dark"
 SUPPORTED_THEMES = {THEME_LIGHT, THEME_DARK}
@@ -119,6 +130,201 @@ THEME_SCRIPT = """
 """
 
 
+# --- PERSISTENZ: Aufgaben-Ablage in SQLite ---
+
+class TaskStore:
+    """
+    Ordner und Aufgaben als je eine Zeile (JSON) in SQLite. Jede Änderung schreibt
+    nur den betroffenen Datensatz, die Speicherzeit hängt also nicht von der Anzahl
+    der Aufgaben ab. Die Reihenfolge entspricht der Einfügereihenfolge (rowid).
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.db = sqlite3.connect(db_path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS folders (
+                id TEXT PRIMARY KEY,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS tasks (
+                id TEXT PRIMARY KEY,
+                folder_id TEXT,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS tasks_folder ON tasks (folder_id);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        """)
+        self.db.commit()
+
+    def snapshot(self):
+        return {
+            "folders": [json.loads(d) for (d,) in self.db.execute("SELECT data FROM folders ORDER BY rowid")],
+            "todos": [json.loads(d) for (d,) in self.db.execute("SELECT data FROM tasks ORDER BY rowid")],
+        }
+
+    def upsert_task(self, task):
+        with self.db:
+            self._upsert_task(task)
+
+    def _upsert_task(self, task):
+        # ON CONFLICT ... DO UPDATE behält die rowid und damit die Position
+        self.db.execute(
+            "INSERT INTO tasks (id, folder_id, data) VALUES (?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET folder_id = excluded.folder_id, data = excluded.data",
+            (task["id"], task.get("folderId"), json.dumps(task, ensure_ascii=False)))
+
+    def delete_tasks(self, ids):
+        with self.db:
+            return self.db.executemany("DELETE FROM tasks WHERE id = ?", [(i,) for i in ids]).rowcount
+
+    def upsert_folder(self, folder):
+        with self.db:
+            self._upsert_folder(folder)
+
+    def _upsert_folder(self, folder):
+        self.db.execute(
+            "INSERT INTO folders (id, data) VALUES (?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET data = excluded.data",
+            (folder["id"], json.dumps(folder, ensure_ascii=False)))
+
+    def delete_folder(self, folder_id):
+        """Löscht den Ordner samt seiner Aufgaben; liefert die Zahl der entfernten Aufgaben."""
+        with self.db:
+            self.db.execute("DELETE FROM folders WHERE id = ?", (folder_id,))
+            return self.db.execute("DELETE FROM tasks WHERE folder_id = ?", (folder_id,)).rowcount
+
+    def legacy_imported(self):
+        return self.db.execute("SELECT 1 FROM meta WHERE key = 'legacy_imported'").fetchone() is not None
+
+    def import_legacy(self, data):
+        """
+        Übernimmt einmalig den alten localStorage-Stand ({folders, todos}) in einer
+        Transaktion. Bereits vorhandene Datensätze haben Vorrang.
+        """
+        with self.db:
+            if self.legacy_imported():
+                return 0
+            count = 0
+            for folder in (data or {}).get("folders") or []:
+                if isinstance(folder, dict) and isinstance(folder.get("id"), str):
+                    self.db.execute("INSERT OR IGNORE INTO folders (id, data) VALUES (?, ?)",
+                                    (folder["id"], json.dumps(folder, ensure_ascii=False)))
+            for task in (data or {}).get("todos") or []:
+                if isinstance(task, dict) and isinstance(task.get("id"), str):
+                    count += self.db.execute(
+                        "INSERT OR IGNORE INTO tasks (id, folder_id, data) VALUES (?, ?, ?)",
+                        (task["id"], task.get("folderId"), json.dumps(task, ensure_ascii=False))).rowcount
+            self.db.execute("INSERT INTO meta (key, value) VALUES ('legacy_imported', ?)",
+                            (str(time.time_ns()),))
+            return count
+
+    def close(self):
+        try:
+            self.db.close()
+        except Exception:
+            pass
+
+
+def _parse_record(raw):
+    """JSON-Datensatz aus JS; None, wenn keine gültige id vorhanden ist."""
+    try:
+        record = json.loads(raw)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(record, dict) or not isinstance(record.get("id"), str) or not record["id"]:
+        return None
+    return record
+
+
+class TodoAPI(QObject):
+    """
+    Aufgaben-Ablage für die Weboberfläche (per QWebChannel als 'todoBackend').
+    JS schickt nur den geänderten Datensatz, nie den ganzen Bestand.
+    """
+
+    def __init__(self, store=None):
+        super().__init__()
+        if store is None:
+            os.makedirs(TODO_DIR, exist_ok=True)
+            store = TaskStore(TODO_DB)
+        self._store = store
+
+    @pyqtSlot(result='QVariantMap')
+    def load_all(self):
+        """Kompletter Bestand beim Start: {folders, todos, imported}."""
+        try:
+            snap = self._store.snapshot()
+            snap["imported"] = self._store.legacy_imported()
+            return snap
+        except Exception as e:
+            print(f"Fehler beim Laden der Aufgaben: {e}")
+            return {"folders": [], "todos": [], "imported": True}
+
+    @pyqtSlot(str, result=bool)
+    def upsert_task(self, raw):
+        task = _parse_record(raw)
+        if task is None:
+            print("Ungültige Aufgabe verworfen.")
+            return False
+        try:
+            self._store.upsert_task(task)
+            return True
+        except Exception as e:
+            print(f"Fehler beim Speichern der Aufgabe {task['id']}: {e}")
+            return False
+
+    @pyqtSlot('QVariantList', result=int)
+    def delete_tasks(self, ids):
+        try:
+            return self._store.delete_tasks([i for i in ids if isinstance(i, str)])
+        except Exception as e:
+            print(f"Fehler beim Löschen von Aufgaben: {e}")
+            return -1
+
+    @pyqtSlot(str, result=bool)
+    def upsert_folder(self, raw):
+        folder = _parse_record(raw)
+        if folder is None:
+            print("Ungültiger Ordner verworfen.")
+            return False
+        try:
+            self._store.upsert_folder(folder)
+            return True
+        except Exception as e:
+            print(f"Fehler beim Speichern des Ordners {folder['id']}: {e}")
+            return False
+
+    @pyqtSlot(str, result=int)
+    def delete_folder(self, folder_id):
+        try:
+            return self._store.delete_folder(folder_id)
+        except Exception as e:
+            print(f"Fehler beim Löschen des Ordners {folder_id}: {e}")
+            return -1
+
+    @pyqtSlot(str, result=int)
+    def import_legacy(self, raw):
+        """Einmaliger Import des alten localStorage-Blobs ("" = nichts zu importieren)."""
+        try:
+            data = json.loads(raw) if raw else {}
+            if isinstance(data, list):  # todo_list_v1: nur eine Aufgabenliste
+                data = {"folders": [{"id": "f_default", "name": "Allgemein"}],
+                        "todos": [dict(t, folderId="f_default") for t in data if isinstance(t, dict)]}
+            return self._store.import_legacy(data if isinstance(data, dict) else {})
+        except Exception as e:
+            print(f"Fehler beim Import der alten Aufgaben: {e}")
+            return -1
+
+    def close(self):
+        self._store.close()
+
+
 class PluginWidget(QMainWindow):
     def __init__(self, theme="light", mode="Window"):
         super().__init__()
@@ -133,6 +339,14 @@ class PluginWidget(QMainWindow):
         layout.addWidget(self.browser)
         self.setCentralWidget(central)
 
+        # Aufgaben-Ablage für JS bereitstellen
+        self.backend = TodoAPI()
+        self.channel = QWebChannel(self.browser.page())
+        self.channel.registerObject('todoBackend', self.backend)
+        self.browser.page().setWebChannel(self.channel)
+        if not install_webchannel_script(self.browser.page()):
+            print("qwebchannel.js nicht gefunden – Aufgaben werden nicht gespeichert.")
+
         normalized_theme = theme.lower() if isinstance(theme, str) else None
         host_theme = _detect_host_theme(normalized_theme if normalized_theme in SUPPORTED_THEMES else THEME_DARK)
         self._current_theme = host_theme if host_theme in SUPPORTED_THEMES else THEME_DARK
@@ -155,6 +369,10 @@ class PluginWidget(QMainWindow):
             self._theme_watcher = HostThemeWatcher(app_instance)
             self._theme_watcher.themeChanged.connect(self._on_host_theme_changed)
             self.destroyed.connect(self._cleanup_theme_watcher)
+            app_instance.aboutToQuit.connect(self.backend.close)
+        # Der Launcher schließt Tabs per deleteLater() ohne closeEvent; die
+        # Datenbank trotzdem sauber schließen
+        self.destroyed.connect(self.backend.close)
 
     # ---------------------------------------------------------
     # 1. WINDOW MODE HTML (Mit Realtime Deadlines)
@@ -334,6 +552,10 @@ class PluginWidget(QMainWindow):
       display: flex; flex-direction: column; gap: 8px;
   }
 
+  /* Gefensterte Listen: nur sichtbare Zeilen im DOM, Rest als Padding */
+  .vlist-window { flex-shrink: 0; }
+  .col-body .vlist-window { display: flex; flex-direction: column; gap: 8px; }
+
   .board-card {
       background: var(--item-bg); border: 1px solid var(--border-color);
       border-radius: 6px; padding: 10px; cursor: grab;
@@ -351,7 +573,7 @@ class PluginWidget(QMainWindow):
   .drag-over { background: var(--hover-bg); border: 2px dashed var(--text-muted); }
 
 </style>
-""" + THEME_OVERRIDE_CSS + THEME_SCRIPT + """
+""" + THEME_OVERRIDE_CSS + THEME_SCRIPT + DEADLINE_SCHEDULER_SCRIPT + WINDOWED_LIST_SCRIPT + """
 </head>
 <body class="__BODY_CLASS__">
 
@@ -419,28 +641,54 @@ class PluginWidget(QMainWindow):
 </div>
 
 <script>
-const KEY = 'todo_list_v2_kanban'; 
+const KEY = 'todo_list_v2_kanban'; // alter localStorage-Stand, wird einmalig nach Python übernommen
 let data = { folders: [], todos: [] };
 let activeFolderId = 'all'; 
 let currentView = 'list'; 
+let backend = null;
+
+// --- PERSISTENZ (Python/SQLite über QWebChannel) ---
+// Jede Änderung schickt nur den betroffenen Datensatz, nicht den ganzen Bestand.
+function connectBackend(onReady) {
+    if (typeof qt === 'undefined' || typeof qt.webChannelTransport === 'undefined' || typeof QWebChannel === 'undefined') {
+        console.error("QWebChannel nicht gefunden! Aufgaben werden nicht gespeichert.");
+        onReady();
+        return;
+    }
+    new QWebChannel(qt.webChannelTransport, (channel) => {
+        backend = channel.objects.todoBackend;
+        onReady();
+    });
+}
 
-function load() {
-    let raw = localStorage.getItem(KEY);
-    if (!raw) {
-        const oldRaw = localStorage.getItem('todo_list_v1');
-        if (oldRaw) {
-            const oldData = JSON.parse(oldRaw);
-            if(Array.isArray(oldData)) {
-                 data = { folders: [{id: 'f_default', name: 'Allgemein'}], todos: oldData.map(t => ({...t, folderId: 'f_default'})) };
-            } else {
-                 data = oldData;
-            }
-        } else {
-            data = { folders: [{id: 'f_default', name: 'Allgemein'}], todos: [] };
-            activeFolderId = 'f_default';
-        }
-    } else {
-        data = JSON.parse(raw);
+function persist(call, what) {
+    if (!backend) return;
+    Promise.resolve(call(backend)).then(ok => {
+        if (ok === false || ok < 0) console.error("Speichern fehlgeschlagen: " + what);
+    }).catch(err => console.error("Speichern fehlgeschlagen: " + what, err));
+}
+
+function saveTask(t) { persist(b => b.upsert_task(JSON.stringify(t)), 'Aufgabe ' + t.id); render(); }
+function saveFolder(f) { persist(b => b.upsert_folder(JSON.stringify(f)), 'Ordner ' + f.id); render(); }
+function removeTasks(ids) {
+    if (ids.length) persist(b => b.delete_tasks(ids), ids.length + ' Aufgaben');
+    render();
+}
+function removeFolder(id) { persist(b => b.delete_folder(id), 'Ordner ' + id); render(); }
+
+async function load() {
+    let snap = backend ? await backend.load_all() : { folders: [], todos: [], imported: true };
+    if (!snap.imported) {
+        const legacy = localStorage.getItem(KEY) || localStorage.getItem('todo_list_v1') || '';
+        await backend.import_legacy(legacy);
+        snap = await backend.load_all();
+    }
+    data = { folders: snap.folders, todos: snap.todos };
+    if (data.folders.length === 0) {
+        const f = {id: 'f_default', name: 'Allgemein'};
+        data.folders.push(f);
+        persist(b => b.upsert_folder(JSON.stringify(f)), 'Ordner ' + f.id);
+        activeFolderId = 'f_default';
     }
     // Migration
     data.todos.forEach(t => {
@@ -450,10 +698,9 @@ function load() {
     if (activeFolderId !== 'all' && !data.folders.find(f => f.id === activeFolderId)) {
         activeFolderId = 'all';
     }
+    rebuildIndexes();
 }
 
-function save() { localStorage.setItem(KEY, JSON.stringify(data)); render(); }
-
 // --- UI HELPER & REALTIME UPDATE ---
 function toggleDateInput() {
     const chk = document.getElementById('hasDeadlineToggle');
@@ -467,10 +714,9 @@ function toggleDateInput() {
     }
 }
 
-function getDeadlineInfo(isoString) {
+function getDeadlineInfo(isoString, now = new Date()) {
     if (!isoString) return null;
     const date = new Date(isoString);
-    const now = new Date();
     const diffMs = date - now;
     const diffHrs = diffMs / (1000 * 60 * 60);
     const diffDays = diffMs / (1000 * 60 * 60 * 24);
@@ -507,27 +753,48 @@ function getDeadlineHtml(isoString) {
     return `<span class="dl-badge dl-${info.status}" data-deadline="${isoString}" title="${info.formatted}">⏰ ${info.relativeText}</span>`;
 }
 
-// Diese Funktion sucht alle Badges im DOM und aktualisiert Text/Farbe
-function updateRealtimeDeadlines() {
-    const badges = document.querySelectorAll('.dl-badge[data-deadline]');
-    badges.forEach(badge => {
-        const iso = badge.getAttribute('data-deadline');
-        if (iso) {
-            const info = getDeadlineInfo(iso);
-            if (info) {
-                // Klasse aktualisieren (Farbe ändert sich sofort)
-                badge.className = `dl-badge dl-${info.status}`;
-                // Text aktualisieren
-                badge.innerHTML = `⏰ ${info.relativeText}`;
-            }
-        }
-    });
+// Aktualisiert eine Badge (vom DeadlineScheduler aufgerufen, nur wenn sie fällig ist)
+function refreshDeadlineBadge(badge, at, now) {
+    const info = getDeadlineInfo(badge.getAttribute('data-deadline'), new Date(now));
+    const cls = `dl-badge dl-${info.status}`;
+    if (badge.className !== cls) badge.className = cls;
+    const text = `⏰ ${info.relativeText}`;
+    if (badge.textContent !== text) badge.textContent = text;
+    return DeadlineScheduler.nextBadgeChange(at, now);
+}
+
+// --- INDIZES & ZÄHLER ---
+// Werden bei jeder Mutation fortgeschrieben statt pro Render aus data.todos berechnet.
+const tasksById = new Map();
+const folderNames = new Map();
+const openCounts = new Map(); // folderId -> Anzahl offener Aufgaben
+let openTotal = 0;
+
+function trackTask(t, sign) {
+    if (t.done) return;
+    openTotal += sign;
+    openCounts.set(t.folderId, (openCounts.get(t.folderId) || 0) + sign);
+}
+
+function rebuildIndexes() {
+    tasksById.clear(); folderNames.clear(); openCounts.clear(); openTotal = 0;
+    data.folders.forEach(f => folderNames.set(f.id, f.name));
+    data.todos.forEach(t => { tasksById.set(t.id, t); trackTask(t, +1); });
+}
+
+// Änderung an einer bestehenden Aufgabe: Zähler vorher aus-, danach wieder eintragen
+function updateTask(t, change) {
+    trackTask(t, -1);
+    change(t);
+    trackTask(t, +1);
+    saveTask(t);
 }
 
 // --- DRAG AND DROP ---
 function drag(ev, id) {
     ev.dataTransfer.setData("text/plain", id);
     ev.dataTransfer.effectAllowed = "move";
+    holdListOf(ev.currentTarget);
 }
 function allowDrop(ev) {
     ev.preventDefault();
@@ -540,11 +807,12 @@ function drop(ev, newStatus) {
     ev.preventDefault();
     ev.currentTarget.classList.remove('drag-over');
     const id = ev.dataTransfer.getData("text/plain");
-    const t = data.todos.find(x => x.id === id);
-    if (t) {
-        t.status = newStatus;
-        t.done = (newStatus === 'done');
-        save();
+    const t = tasksById.get(id);
+    if (t && t.status !== newStatus) {
+        updateTask(t, x => {
+            x.status = newStatus;
+            x.done = (newStatus === 'done');
+        });
     }
 }
 
@@ -571,17 +839,26 @@ function addFolder() {
     const name = inp.value.trim();
     if (!name) return;
     const id = 'f_' + Date.now();
-    data.folders.push({id, name});
-    inp.value = ''; activeFolderId = id; save();
+    const folder = {id, name};
+    data.folders.push(folder);
+    folderNames.set(id, name);
+    inp.value = ''; activeFolderId = id; saveFolder(folder);
 }
 
 function deleteFolder(id, event) {
     if(event) event.stopPropagation();
     if(!confirm('Ordner wirklich löschen?')) return;
     data.folders = data.folders.filter(f => f.id !== id);
-    data.todos = data.todos.filter(t => t.folderId !== id);
+    data.todos = data.todos.filter(t => {
+        if (t.folderId !== id) return true;
+        tasksById.delete(t.id);
+        return false;
+    });
+    folderNames.delete(id);
+    openTotal -= openCounts.get(id) || 0;
+    openCounts.delete(id);
     if(activeFolderId === id) activeFolderId = 'all';
-    save();
+    removeFolder(id);
 }
 
 function selectFolder(id) { activeFolderId = id; render(); }
@@ -607,31 +884,38 @@ function addTask() {
     }
 
     const newId = Date.now().toString(36) + Math.random().toString(36).substr(2);
-    data.todos.push({
+    const task = {
         id: newId, text: text, done: false, status: 'todo',
         prio: prioInp.value, folderId: targetFolder, 
         created: new Date().toISOString(),
         deadline: finalDeadline
-    });
+    };
+    data.todos.push(task);
+    tasksById.set(task.id, task);
+    trackTask(task, +1);
 
     inp.value = '';
     document.getElementById('hasDeadlineToggle').checked = false;
     toggleDateInput(); 
-    save();
+    saveTask(task);
 }
 
 function toggle(id) {
-    const t = data.todos.find(x => x.id === id);
+    const t = tasksById.get(id);
     if (t) { 
-        t.done = !t.done; 
-        if (t.done) t.status = 'done'; else t.status = 'todo'; 
-        save(); 
+        updateTask(t, x => {
+            x.done = !x.done; 
+            if (x.done) x.status = 'done'; else x.status = 'todo'; 
+        });
     }
 }
 function del(id) {
-    if(confirm('Aufgabe löschen?')) {
-        data.todos = data.todos.filter(x => x.id !== id);
-        save();
+    const t = tasksById.get(id);
+    if(t && confirm('Aufgabe löschen?')) {
+        data.todos.splice(data.todos.indexOf(t), 1);
+        tasksById.delete(id);
+        trackTask(t, -1);
+        removeTasks([id]);
     }
 }
 function clearDone() {
@@ -640,24 +924,60 @@ function clearDone() {
             const folderMatch = activeFolderId === 'all' || t.folderId === activeFolderId;
             return !(t.done && folderMatch);
         };
+        const removed = data.todos.filter(t => !condition(t)).map(t => t.id);
         data.todos = data.todos.filter(condition);
-        save();
+        removed.forEach(id => tasksById.delete(id)); // erledigte zählen nicht zu openCounts
+        removeTasks(removed);
     }
 }
 function updateText(id, txt) {
-    const t = data.todos.find(x => x.id === id);
-    if (t) { t.text = txt; save(); }
+    const t = tasksById.get(id);
+    if (t && t.text !== txt) { t.text = txt; saveTask(t); }
 }
 
 // --- RENDERER ---
+// Schlüsselbasierter Abgleich: ein Knoten pro id bleibt über Renderläufe erhalten,
+// neu befüllt wird er nur, wenn sich seine Signatur (sichtbare Felder) geändert hat.
+const folderNodes = new Map();
+const listNodes = new Map();
+const cardNodes = { todo: new Map(), doing: new Map(), done: new Map() };
+
+function reconcile(container, cache, items, seen, keyOf, sigOf, create, fill) {
+    let ref = container.firstChild;
+    for (const item of items) {
+        const key = keyOf(item);
+        seen.add(key);
+        let entry = cache.get(key);
+        if (!entry) {
+            entry = { el: create(item), sig: null };
+            cache.set(key, entry);
+        }
+        const sig = sigOf(item);
+        if (entry.sig !== sig) { fill(entry.el, item); entry.sig = sig; }
+
+        if (entry.el === ref) {
+            ref = ref.nextSibling;
+        } else if (ref && entry.el === ref.nextSibling) {
+            // ref steht falsch (verschoben oder gelöscht) – überspringen, er wird
+            // an seiner Stelle eingefügt bzw. beim Aufräumen entfernt
+            ref = entry.el.nextSibling;
+        } else {
+            container.insertBefore(entry.el, ref);
+        }
+    }
+}
+
+function prune(cache, seen) {
+    for (const [key, entry] of cache) {
+        if (!seen.has(key)) { entry.el.remove(); cache.delete(key); }
+    }
+}
+
 function render() {
     renderFolders();
     const headerTitle = document.getElementById('headerTitle');
     if (activeFolderId === 'all') headerTitle.innerText = "Alle Aufgaben";
-    else {
-        const curr = data.folders.find(f => f.id === activeFolderId);
-        headerTitle.innerText = curr ? curr.name : "Unbekannt";
-    }
+    else headerTitle.innerText = folderNames.get(activeFolderId) || "Unbekannt";
 
     let visibleTodos = data.todos;
     if (activeFolderId !== 'all') {
@@ -669,88 +989,121 @@ function render() {
 }
 
 function renderFolders() {
-    const fList = document.getElementById('folderList');
-    fList.innerHTML = '';
-    const allDiv = document.createElement('div');
-    const allCount = data.todos.filter(t => !t.done).length;
-    allDiv.className = `folder-row ${activeFolderId === 'all' ? 'active' : ''}`;
-    allDiv.innerHTML = `
-        <div class="folder-info"><span class="folder-name">Alle Aufgaben</span> <span class="folder-count">${allCount}</span></div>
-        <div style="width:24px;"></div> 
-    `;
-    allDiv.onclick = () => selectFolder('all');
-    fList.appendChild(allDiv);
-
-    data.folders.forEach(f => {
-        const div = document.createElement('div');
-        const count = data.todos.filter(t => t.folderId === f.id && !t.done).length;
-        div.className = `folder-row ${activeFolderId === f.id ? 'active' : ''}`;
-        div.innerHTML = `
-            <div class="folder-info"><span class="folder-name">${f.name}</span><span class="folder-count">${count}</span></div>
-            <button class="btn-folder-del" title="Ordner löschen" onclick="deleteFolder('${f.id}', event)">×</button>
-        `;
-        div.onclick = () => selectFolder(f.id);
-        fList.appendChild(div);
-    });
+    const rows = [{ id: 'all', name: 'Alle Aufgaben', count: openTotal }]
+        .concat(data.folders.map(f => ({ id: f.id, name: f.name, count: openCounts.get(f.id) || 0 })));
+    const seen = new Set();
+    reconcile(document.getElementById('folderList'), folderNodes, rows, seen,
+        f => f.id,
+        f => `${f.name}\\u0000${f.count}\\u0000${activeFolderId === f.id}`,
+        f => {
+            const div = document.createElement('div');
+            div.onclick = () => selectFolder(f.id);
+            return div;
+        },
+        (div, f) => {
+            div.className = `folder-row ${activeFolderId === f.id ? 'active' : ''}`;
+            div.innerHTML = f.id === 'all' ? `
+                <div class="folder-info"><span class="folder-name">Alle Aufgaben</span> <span class="folder-count">${f.count}</span></div>
+                <div style="width:24px;"></div> 
+            ` : `
+                <div class="folder-info"><span class="folder-name">${f.name}</span><span class="folder-count">${f.count}</span></div>
+                <button class="btn-folder-del" title="Ordner löschen" onclick="deleteFolder('${f.id}', event)">×</button>
+            `;
+        });
+    prune(folderNodes, seen);
 }
 
-function renderList(todos) {
-    const tList = document.getElementById('listView');
-    tList.innerHTML = '';
-    const prioScore = { high: 3, med: 2, low: 1 };
+// Sichtbare Felder einer Aufgabe; der Ordnername zählt nur in "Alle Aufgaben" mit
+function taskSig(t) {
+    const folder = activeFolderId === 'all' ? (folderNames.get(t.folderId) || '') : '';
+    return `${t.text}\\u0000${t.done}\\u0000${t.status}\\u0000${t.prio}\\u0000${t.deadline}\\u0000${folder}`;
+}
 
-    const sorted = [...todos].sort((a, b) => {
-        if (a.done !== b.done) return a.done - b.done;
+function folderBadgeHtml(t, style) {
+    if (activeFolderId !== 'all') return '';
+    const name = folderNames.get(t.folderId);
+    return name ? `<span class="badge"${style}>${name}</span>` : '';
+}
 
-        if (!a.done) {
-             const now = new Date().getTime();
-             const aDl = a.deadline ? new Date(a.deadline).getTime() : Infinity;
-             const bDl = b.deadline ? new Date(b.deadline).getTime() : Infinity;
-             const aOver = aDl < now;
-             const bOver = bDl < now;
-             if (aOver !== bOver) return bOver - aOver; 
-        }
+function renderList(todos) {
+    const prioScore = { high: 3, med: 2, low: 1 };
+    const now = Date.now();
 
-        const pA = prioScore[a.prio] || 1;
-        const pB = prioScore[b.prio] || 1;
-        return pB - pA;
+    // Sortierschlüssel einmal pro Aufgabe statt pro Vergleich berechnen
+    const keyed = todos.map(t => {
+        const dl = t.deadline ? new Date(t.deadline).getTime() : Infinity;
+        return { t, done: t.done ? 1 : 0, over: (!t.done && dl < now) ? 1 : 0, prio: prioScore[t.prio] || 1 };
     });
+    keyed.sort((a, b) => (a.done - b.done) || (b.over - a.over) || (b.prio - a.prio));
 
-    sorted.forEach(t => {
-        const item = document.createElement('div');
-        item.className = 'item';
-
-        let folderName = '';
-        if (activeFolderId === 'all') {
-             const f = data.folders.find(x => x.id === t.folderId);
-             if (f) folderName = `<span class="badge">${f.name}</span>`;
-        }
+    listWindow.setItems(keyed.map(k => k.t));
+}
 
-        const deadlineHtml = t.done ? '' : getDeadlineHtml(t.deadline);
+function createListItem() {
+    const item = document.createElement('div');
+    item.className = 'item';
+    return item;
+}
 
-        item.innerHTML = `
-            <div class="check ${t.done?'checked':''}" onclick="toggle('${t.id}')">${t.done?'✓':''}</div>
-            <div class="prio-indicator prio-${t.prio||'low'}" title="${t.prio}"></div>
-            <div class="text-content">
-                <div class="task-text ${t.done?'done':''}" contenteditable="true" onblur="updateText('${t.id}', this.innerText)">${t.text}</div>
-                <div class="task-meta">
-                    ${deadlineHtml} ${folderName}
-                </div>
+function fillListItem(item, t) {
+    const deadlineHtml = t.done ? '' : getDeadlineHtml(t.deadline);
+    item.innerHTML = `
+        <div class="check ${t.done?'checked':''}" onclick="toggle('${t.id}')">${t.done?'✓':''}</div>
+        <div class="prio-indicator prio-${t.prio||'low'}" title="${t.prio}"></div>
+        <div class="text-content">
+            <div class="task-text ${t.done?'done':''}" contenteditable="true" onblur="updateText('${t.id}', this.innerText)">${t.text}</div>
+            <div class="task-meta">
+                ${deadlineHtml} ${folderBadgeHtml(t, '')}
             </div>
-            <button class="btn-del" onclick="del('${t.id}')">×</button>
-        `;
-        tList.appendChild(item);
-    });
+        </div>
+        <button class="btn-del" onclick="del('${t.id}')">×</button>
+    `;
+}
+
+function createCard(t) {
+    const card = document.createElement('div');
+    card.className = 'board-card';
+    card.draggable = true;
+    card.ondragstart = (e) => drag(e, t.id);
+    card.ondragend = releaseHeldList;
+    return card;
 }
 
+function fillCard(card, t) {
+    const deadlineHtml = t.done ? '' : getDeadlineHtml(t.deadline);
+    card.innerHTML = `
+        <div class="card-top">
+            <div class="prio-indicator prio-${t.prio||'low'}"></div>
+            <button style="border:none;background:none;color:#888;cursor:pointer;" onclick="del('${t.id}')">×</button>
+        </div>
+        <div class="card-text ${t.done?'done':''}">${t.text}</div>
+        <div class="card-footer">
+           ${deadlineHtml} ${folderBadgeHtml(t, ' style="font-size:10px;"')}
+        </div>
+    `;
+}
+
+// Ein Fenster pro Liste bzw. Kanban-Spalte; gezeichnet wird nur der sichtbare
+// Ausschnitt, per reconcile() gegen die Knoten des letzten Ausschnitts
+const paintWith = (cache, create, fill) => (win, slice) => {
+    const seen = new Set();
+    reconcile(win, cache, slice, seen, t => t.id, taskSig, create, fill);
+    prune(cache, seen);
+};
+const listWindow = new WindowedList(document.getElementById('listView'),
+    { keyOf: t => t.id, estimate: 50, paint: paintWith(listNodes, createListItem, fillListItem) });
+const boardWindows = {};
+['todo', 'doing', 'done'].forEach(s => {
+    boardWindows[s] = new WindowedList(document.getElementById('col-' + s),
+        { keyOf: t => t.id, estimate: 100, paint: paintWith(cardNodes[s], createCard, fillCard) });
+});
+
 function renderBoard(todos) {
-    const cols = { todo: document.getElementById('col-todo'), doing: document.getElementById('col-doing'), done: document.getElementById('col-done') };
-    Object.values(cols).forEach(c => c.innerHTML = '');
     const groups = { todo: [], doing: [], done: [] };
     const prioScore = { high: 3, med: 2, low: 1 };
 
-    todos.sort((a, b) => (prioScore[b.prio]||1) - (prioScore[a.prio]||1));
-    todos.forEach(t => {
+    const sorted = [...todos].sort((a, b) => (prioScore[b.prio]||1) - (prioScore[a.prio]||1));
+    sorted.forEach(t => {
         let s = t.status || (t.done ? 'done' : 'todo');
         if(!groups[s]) s = 'todo';
         groups[s].push(t);
@@ -760,46 +1113,65 @@ function renderBoard(todos) {
     document.getElementById('cnt-doing').innerText = groups.doing.length;
     document.getElementById('cnt-done').innerText = groups.done.length;
 
-    const createCard = (t) => {
-        const card = document.createElement('div');
-        card.className = 'board-card';
-        card.draggable = true;
-        card.ondragstart = (e) => drag(e, t.id);
+    for (const s of ['todo', 'doing', 'done']) boardWindows[s].setItems(groups[s]);
+}
 
-        let folderBadge = '';
-        if (activeFolderId === 'all') {
-             const f = data.folders.find(x => x.id === t.folderId);
-             if (f) folderBadge = `<span class="badge" style="font-size:10px;">${f.name}</span>`;
+// --- BENCHMARK ---
+// In der Konsole: await todoBenchmark()  – schaltet eine Aufgabe in einer Liste mit
+// n Aufgaben um und misst Renderzeit und Frame-Zeit (bis zum nächsten gezeichneten Frame),
+// einmal mit Abgleich und einmal mit kaltem Cache (entspricht dem Neuaufbau aller Zeilen).
+window.todoBenchmark = async function(n = 5000, rounds = 20) {
+    const saved = { data, backend, activeFolderId };
+    const nextFrame = () => new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r)));
+    const measure = async (coldCache) => {
+        const renderMs = [], frameMs = [];
+        for (let i = 0; i < rounds; i++) {
+            const id = 'bench' + ((i * 7919) % n);
+            await nextFrame();
+            if (coldCache) {
+                [listNodes, ...Object.values(cardNodes)].forEach(c => { c.forEach(e => e.el.remove()); c.clear(); });
+            }
+            const t0 = performance.now();
+            toggle(id);
+            const t1 = performance.now();
+            await new Promise(r => requestAnimationFrame(r));
+            frameMs.push(performance.now() - t0);
+            renderMs.push(t1 - t0);
         }
-
-        const deadlineHtml = t.done ? '' : getDeadlineHtml(t.deadline);
-
-        card.innerHTML = `
-            <div class="card-top">
-                <div class="prio-indicator prio-${t.prio||'low'}"></div>
-                <button style="border:none;background:none;color:#888;cursor:pointer;" onclick="del('${t.id}')">×</button>
-            </div>
-            <div class="card-text ${t.done?'done':''}">${t.text}</div>
-            <div class="card-footer">
-               ${deadlineHtml} ${folderBadge}
-            </div>
-        `;
-        return card;
+        const med = a => a.slice().sort((x, y) => x - y)[a.length >> 1];
+        return { render_ms: +med(renderMs).toFixed(2), frame_ms: +med(frameMs).toFixed(2) };
     };
 
-    groups.todo.forEach(t => cols.todo.appendChild(createCard(t)));
-    groups.doing.forEach(t => cols.doing.appendChild(createCard(t)));
-    groups.done.forEach(t => cols.done.appendChild(createCard(t)));
-}
+    backend = null; // nichts in die echte Ablage schreiben
+    data = { folders: [{ id: 'bench_f', name: 'Benchmark' }], todos: [] };
+    const prios = ['low', 'med', 'high'];
+    for (let i = 0; i < n; i++) {
+        data.todos.push({ id: 'bench' + i, text: 'Aufgabe ' + i, done: i % 5 === 0, status: i % 5 === 0 ? 'done' : 'todo',
+                          prio: prios[i % 3], folderId: 'bench_f', created: new Date().toISOString(),
+                          deadline: i % 10 === 0 ? new Date(Date.now() + i * 60000).toISOString() : null });
+    }
+    rebuildIndexes();
+    activeFolderId = 'all';
+    render();
+    const result = { tasks: n, keyed: await measure(false), rebuild: await measure(true) };
+
+    ({ data, backend, activeFolderId } = saved);
+    rebuildIndexes();
+    render();
+    console.table({ keyed: result.keyed, rebuild: result.rebuild });
+    return result;
+};
 
 document.getElementById('newTask').onkeydown = (e) => { if(e.key === 'Enter') addTask(); };
 document.getElementById('newFolderInput').onkeydown = (e) => { if(e.key === 'Enter') addFolder(); };
 
-load();
-switchView('list'); 
+connectBackend(async () => {
+    await load();
+    switchView('list');
+});
 
-// --- REALTIME TIMER STARTEN (Alle 10 Sekunden) ---
-setInterval(updateRealtimeDeadlines, 10000);
+// --- REALTIME: Badges werden nur zum nächsten Statuswechsel aktualisiert ---
+new DeadlineScheduler('.dl-badge[data-deadline]', refreshDeadlineBadge).start();
 
 </script>
 </body>
@@ -859,7 +1231,7 @@ setInterval(updateRealtimeDeadlines, 10000);
 
   .empty-msg { text-align: center; color: rgba(255,255,255,0.3); margin-top: 20px; font-size: 12px; }
 </style>
-""" + THEME_OVERRIDE_CSS + THEME_SCRIPT + """
+""" + THEME_OVERRIDE_CSS + THEME_SCRIPT + DEADLINE_SCHEDULER_SCRIPT + """
 </head>
 <body class="__BODY_CLASS__">
   <div class="app-container">
@@ -875,19 +1247,42 @@ setInterval(updateRealtimeDeadlines, 10000);
   </div>
 
 <script>
-const KEY = 'todo_list_v2_kanban'; 
+const KEY = 'todo_list_v2_kanban'; // alter localStorage-Stand, wird einmalig nach Python übernommen
 let data = { folders: [], todos: [] };
+let backend = null;
+
+// Gleiche Ablage wie im Hauptfenster: nur der geänderte Datensatz geht an Python
+function connectBackend(onReady) {
+    if (typeof qt === 'undefined' || typeof qt.webChannelTransport === 'undefined' || typeof QWebChannel === 'undefined') {
+        console.error("QWebChannel nicht gefunden! Aufgaben werden nicht gespeichert.");
+        onReady();
+        return;
+    }
+    new QWebChannel(qt.webChannelTransport, (channel) => {
+        backend = channel.objects.todoBackend;
+        onReady();
+    });
+}
+
+function persist(call, what) {
+    if (!backend) return;
+    Promise.resolve(call(backend)).then(ok => {
+        if (ok === false || ok < 0) console.error("Speichern fehlgeschlagen: " + what);
+    }).catch(err => console.error("Speichern fehlgeschlagen: " + what, err));
+}
 
-function load() {
-    const raw = localStorage.getItem(KEY);
-    if(raw) data = JSON.parse(raw);
-    else {
-        // Fallback für leere DB
-        const old = localStorage.getItem('todo_list_v1');
-        if(old && JSON.parse(old).length) data = {folders:[{id:'d',name:'All'}], todos:JSON.parse(old)};
+function saveTask(t) { persist(b => b.upsert_task(JSON.stringify(t)), 'Aufgabe ' + t.id); render(); }
+function saveFolder(f) { persist(b => b.upsert_folder(JSON.stringify(f)), 'Ordner ' + f.id); }
+
+async function load() {
+    let snap = backend ? await backend.load_all() : { folders: [], todos: [], imported: true };
+    if (!snap.imported) {
+        const legacy = localStorage.getItem(KEY) || localStorage.getItem('todo_list_v1') || '';
+        await backend.import_legacy(legacy);
+        snap = await backend.load_all();
     }
+    data = { folders: snap.folders, todos: snap.todos };
 }
-function save() { localStorage.setItem(KEY, JSON.stringify(data)); render(); }
 
 function render() {
   const listEl = document.getElementById('todoList');
@@ -929,20 +1324,16 @@ function render() {
     item.appendChild(content);
     listEl.appendChild(item);
   });
-  updateRealtimeDeadlines(); // Einmal direkt beim Render aufrufen
 }
 
-// Gleiche Logic wie im Main Window, nur angepasst für Popup-Style
-function updateRealtimeDeadlines() {
-    const now = new Date();
-    document.querySelectorAll('.dl-mini[data-deadline]').forEach(el => {
-        const d = new Date(el.getAttribute('data-deadline'));
-        const isOver = d < now;
-        const txt = d.toLocaleDateString() + ' ' + d.toLocaleTimeString([],{hour:'2-digit',minute:'2-digit'});
-        el.innerText = '⏰ ' + txt;
-        if(isOver) el.classList.add('dl-overdue');
-        else el.classList.remove('dl-overdue');
-    });
+// Gleiche Logik wie im Main Window, nur angepasst für Popup-Style: der Text ist
+// fest, einziger Wechsel ist der Übergang zu überfällig
+function refreshDeadlineMini(el, at, now) {
+    const d = new Date(at);
+    const txt = '⏰ ' + d.toLocaleDateString() + ' ' + d.toLocaleTimeString([],{hour:'2-digit',minute:'2-digit'});
+    if (el.textContent !== txt) el.textContent = txt;
+    el.classList.toggle('dl-overdue', at < now);
+    return at < now ? Infinity : at + 1;
 }
 
 function addTodo() {
@@ -951,15 +1342,20 @@ function addTodo() {
   if (!text) return;
 
   let fId = data.folders.length > 0 ? data.folders[0].id : 'default';
-  if(data.folders.length === 0) data.folders.push({id: 'default', name: 'Allgemein'});
+  if(data.folders.length === 0) {
+    const folder = {id: 'default', name: 'Allgemein'};
+    data.folders.push(folder);
+    saveFolder(folder);
+  }
 
-  data.todos.push({
+  const task = {
     id: Date.now().toString(36) + Math.random().toString(36).substr(2),
     text: text, done: false, status: 'todo', prio: prio, folderId: fId, 
     created: new Date().toISOString(),
     deadline: null
-  });
-  save();
+  };
+  data.todos.push(task);
+  saveTask(task);
   document.getElementById('newInput').value = '';
 }
 
@@ -968,7 +1364,7 @@ function markDone(id) {
   if(t) { 
       t.done = true; 
       t.status = 'done'; 
-      save(); 
+      saveTask(t); 
   }
 }
 
@@ -976,10 +1372,12 @@ document.getElementById('newInput').addEventListener('keydown', (e) => {
   if (e.key === 'Enter') addTodo();
 });
 
-load();
-render();
-// Auch im Popup einen Timer setzen
-setInterval(updateRealtimeDeadlines, 10000);
+connectBackend(async () => {
+    await load();
+    render();
+});
+// Auch im Popup: Anzeige nur beim Übergang zu überfällig aktualisieren
+new DeadlineScheduler('.dl-mini[data-deadline]', refreshDeadlineMini).start();
 </script>
 </body>
 </html>
@@ -1015,10 +1413,54 @@ setInterval(updateRealtimeDeadlines, 10000);
 
     def closeEvent(self, event):
         self._cleanup_theme_watcher()
+        self.backend.close()
         super().closeEvent(event)
 
 
+def _benchmark_store(sizes=(100, 1000, 10000), rounds=200):
+    """
+    Speicherlatenz pro Klick: ganzer Bestand als JSON (wie früher in localStorage)
+    gegen Upsert der einen geänderten Aufgabe in SQLite.
+    """
+    import random
+    import tempfile
+
+    rnd = random.Random(1)
+    for n in sizes:
+        data = {"folders": [{"id": "f_default", "name": "Allgemein"}],
+                "todos": [{"id": f"t{i}", "text": f"Aufgabe {i} mit etwas Beschreibung", "done": False,
+                           "status": "todo", "prio": "med", "folderId": "f_default",
+                           "created": "2024-01-01T00:00:00.000Z", "deadline": None} for i in range(n)]}
+        with tempfile.TemporaryDirectory() as tmp:
+            blob_path = os.path.join(tmp, "blob.json")
+            t0 = time.perf_counter()
+            for _ in range(rounds):
+                task = rnd.choice(data["todos"])
+                task["done"] = not task["done"]
+                with open(blob_path, "w", encoding="utf-8") as f:
+                    f.write(json.dumps(data))
+            t_blob = (time.perf_counter() - t0) / rounds
+
+            store = TaskStore(os.path.join(tmp, "tasks.sqlite3"))
+            store.import_legacy(data)
+            t0 = time.perf_counter()
+            for _ in range(rounds):
+                task = rnd.choice(data["todos"])
+                task["done"] = not task["done"]
+                raw = json.dumps(task)  # so kommt der Datensatz über den WebChannel
+                store.upsert_task(_parse_record(raw))
+            t_upsert = (time.perf_counter() - t0) / rounds
+            store.close()
+        print(f"{n:6d} Aufgaben: ganzer Bestand {t_blob * 1000:7.2f} ms, "
+              f"Upsert einer Aufgabe {t_upsert * 1000:6.2f} ms")
+
+
 if __name__ == '__main__':
+    # Speicherlatenz messen: python To-Do.py --benchmark-store
+    if len(sys.argv) == 2 and sys.argv[1] == "--benchmark-store":
+        _benchmark_store()
+        sys.exit(0)
+
     app = QApplication(sys.argv)
     window = PluginWidget(theme="dark", mode="Window")
     window.show()
@@ -1,8 +1,14 @@
 # scripts/pro_canvas_html_v1_singlefile.py
+import base64
+import json
 import os
+import re
+import shutil
 import sys
+import time
+from urllib.parse import quote, unquote
 from PyQt5.QtCore import (
-    QObject, pyqtSlot, pyqtSignal, QUrl, QEvent
+    QObject, pyqtSlot, pyqtSignal, QUrl, QEvent, QBuffer, QIODevice
 )
 from PyQt5.QtWebChannel import QWebChannel
 from PyQt5.QtWidgets import (
@@ -11,12 +17,45 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtGui import QPalette
 
+# Eigenes URL-Schema für Bilddaten (ab Qt 5.12). Ohne Registrierung vor dem Start der
+# QApplication fällt das Plugin auf Data-URLs über den WebChannel zurück.
+try:
+    from PyQt5.QtWebEngineCore import (
+        QWebEngineUrlScheme, QWebEngineUrlSchemeHandler, QWebEngineUrlRequestJob
+    )
+    STORE_SCHEME_SUPPORTED = True
+except ImportError:
+    QWebEngineUrlSchemeHandler = QObject
+    STORE_SCHEME_SUPPORTED = False
+
+STORE_SCHEME = b"canvas-store"
+
 # --- 1. Python-Backend-Logik (Unsere API für JS) ---
 
 # Speicherort geändert, damit wir nicht die Text-Notizen überschreiben
 NOTES_DIR = os.path.expanduser('~/.simple_canvas_plugin_v1')
 os.makedirs(NOTES_DIR, exist_ok=True)
 
+# Zeichnungen werden als Strich-Protokoll gespeichert (eine JSON-Zeile pro Strich,
+# nur anhängen). Ältere Zeichnungen liegen noch als Base64-PNG in <titel>.txt und
+# werden beim Laden als Hintergrund verwendet.
+STROKE_EXT = '.strokes.jsonl'
+LEGACY_EXT = '.txt'
+EXPORT_DIR = os.path.join(NOTES_DIR, 'export')
+CLEAR_RECORD = '{"op":"clear"}'
+
+# Revision des Protokolls (<titel>.strokes.rev), neu bei jedem Neuschreiben. Anhängen
+# vergrößert das Protokoll immer, Neuschreiben kann aber dieselbe Größe ergeben; erst
+# (Größe, Revision) bezeichnet einen Protokollstand eindeutig.
+LOG_REV_EXT = '.strokes.rev'
+# Kachel-Abbild der Leinwand (<titel>.tiles/<x>_<y>.png + manifest.json), damit lange
+# Protokolle beim Laden nicht erneut abgespielt werden müssen. Gültig, solange
+# manifest["log_size"] und manifest["log_rev"] zum Protokoll passen.
+TILE_DIR_EXT = '.tiles'
+TILE_KEY_RE = re.compile(r'^\d+_\d+$')
+# Ausgelagerte Undo-Kacheln (werden beim Schließen gelöscht)
+HISTORY_DIR = os.path.join(NOTES_DIR, '.history')
+
 THEME_LIGHT = "light"
 THEME_DARK = "dark"
 SUPPORTED_THEMES = {THEME_LIGHT, THEME_DARK}
@@ -37,9 +76,116 @@ def _detect_host_theme(default=THEME_LIGHT):
     return default
 
 
+def _log_path(title):
+    return os.path.join(NOTES_DIR, title + STROKE_EXT)
+
+
+def _rev_path(title):
+    return os.path.join(NOTES_DIR, title + LOG_REV_EXT)
+
+
+def _read_log_rev(title):
+    try:
+        with open(_rev_path(title), 'r', encoding='ascii') as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def _legacy_path(title):
+    return os.path.join(NOTES_DIR, title + LEGACY_EXT)
+
+
+def _tile_dir(title):
+    return os.path.join(NOTES_DIR, title + TILE_DIR_EXT)
+
+
+def _inside(root, *names):
+    """Pfad unterhalb von root; ValueError, wenn er (z.B. über ".." im Titel) hinausführt."""
+    root = os.path.realpath(root)
+    path = os.path.realpath(os.path.join(root, *names))
+    if os.path.commonpath([root, path]) != root:
+        raise ValueError("Pfad außerhalb der Ablage")
+    return path
+
+
+def _png_bytes(data_url):
+    if not data_url.startswith("data:image/png;base64,"):
+        raise ValueError("keine PNG-Data-URL")
+    return base64.b64decode(data_url.split(",", 1)[1])
+
+
+def _png_data_url(path):
+    with open(path, 'rb') as f:
+        return "data:image/png;base64," + base64.b64encode(f.read()).decode('ascii')
+
+
+def _atomic_write_bytes(path, data):
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def register_store_scheme():
+    """
+    Registriert canvas-store:// – muss vor dem Erzeugen der QApplication laufen
+    (der Launcher macht das beim Start, der Standalone-Modus in __main__).
+    """
+    if not STORE_SCHEME_SUPPORTED or QWebEngineUrlScheme.schemeByName(STORE_SCHEME).name():
+        return
+    scheme = QWebEngineUrlScheme(STORE_SCHEME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    scheme.setFlags(QWebEngineUrlScheme.SecureScheme |
+                    QWebEngineUrlScheme.LocalAccessAllowed |
+                    QWebEngineUrlScheme.CorsEnabled)
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+def store_scheme_registered():
+    return STORE_SCHEME_SUPPORTED and bool(QWebEngineUrlScheme.schemeByName(STORE_SCHEME).name())
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _after_last_clear(lines):
+    """Nur die Striche nach dem letzten "Leeren" sind für das Bild relevant."""
+    for i in range(len(lines) - 1, -1, -1):
+        if lines[i] == CLEAR_RECORD:
+            return lines[i + 1:], True
+    return lines, False
+
+
+def _rewrite_log(title, lines):
+    """Schreibt das Protokoll atomar neu (tmp + os.replace); liefert die neue Revision."""
+    # Revision zuerst: bricht das Schreiben ab, verwirft das schlimmstenfalls ein gültiges Abbild
+    rev = f"{time.time_ns():x}"
+    _atomic_write_bytes(_rev_path(title), rev.encode('ascii'))
+    path = _log_path(title)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        if lines:
+            f.write("\n".join(lines) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return rev
+
+
 class CanvasAPI(QObject):
     """
-    API zum Speichern und Laden von Zeichnungen (als Base64 Strings).
+    API zum Speichern und Laden von Zeichnungen.
+
+    Gespeichert wird ein Strich-Protokoll ({"c": Farbe, "w": Breite, "p": [x0, y0,
+    dx1, dy1, ...]} pro Zeile). Die Seite hängt beim Speichern nur die neuen
+    Striche an; PNG entsteht nur beim Export.
     """
 
     notesChanged = pyqtSignal()
@@ -48,56 +194,269 @@ class CanvasAPI(QObject):
     def __init__(self, initial_theme=THEME_LIGHT):
         super().__init__()
         self._theme = initial_theme if initial_theme in SUPPORTED_THEMES else THEME_LIGHT
+        # Eigenes Auslagerungsverzeichnis pro Instanz (Fenster und Popup teilen sich NOTES_DIR)
+        self._history_dir = os.path.join(HISTORY_DIR, f"{os.getpid()}_{id(self):x}")
+        # Titel -> Protokollrevision, auf der der Stand der Seite beruht
+        self._log_revs = {}
+        # True, wenn die Seite über canvas-store:// läuft: Bilder gehen dann als URL
+        # raus statt als Base64-Data-URL durch den WebChannel
+        self.store_urls = False
 
     @pyqtSlot(result='QVariantList')
     def list_notes(self):
         """Liefert eine Liste aller Zeichnungs-Titel."""
         try:
-            # Wir nutzen weiterhin .txt, speichern darin aber den Base64 Image String
-            return sorted(
-                [f[:-4] for f in os.listdir(NOTES_DIR) if f.endswith('.txt')],
-                key=lambda s: s.lower()
-            )
+            titles = set()
+            for f in os.listdir(NOTES_DIR):
+                if f.endswith(STROKE_EXT):
+                    titles.add(f[:-len(STROKE_EXT)])
+                elif f.endswith(LEGACY_EXT):
+                    titles.add(f[:-len(LEGACY_EXT)])
+            return sorted(titles, key=lambda s: s.lower())
         except Exception as e:
             print(f"Fehler beim Auflisten der Zeichnungen: {e}")
             return []
 
-    @pyqtSlot(str, result=str)
-    def load_note(self, title):
-        """Lädt den Base64-String einer Zeichnung."""
-        path = os.path.join(NOTES_DIR, title + '.txt')
-        if not title or not os.path.exists(path):
-            return ""
+    @pyqtSlot(str, result='QVariantMap')
+    def load_drawing(self, title):
+        """
+        Lädt eine Zeichnung: {base, log, size}.
+        base: Base64-PNG einer alten Zeichnung als Hintergrund (oder "").
+        log:  Strich-Zeilen nach dem letzten "Leeren", durch \n getrennt.
+        size: Dateigröße des Protokolls – Token für append_strokes.
+        """
+        empty = {"base": "", "log": "", "size": 0}
+        if not title:
+            return empty
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return f.read()
+            path = _log_path(title)
+            # Revision vor dem Protokoll lesen: schreibt dazwischen jemand neu, passt sie nicht mehr
+            self._log_revs[title] = _read_log_rev(title)
+            lines, cleared = [], False
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    lines, cleared = _after_last_clear(f.read().splitlines())
+            base = ""
+            legacy = _legacy_path(title)
+            if not cleared and os.path.exists(legacy):
+                if self.store_urls:
+                    base = f"base/{quote(title, safe='')}?v={os.stat(legacy).st_mtime_ns}"
+                else:
+                    with open(legacy, 'r', encoding='utf-8') as f:
+                        base = f.read()
+            return {"base": base, "log": "\n".join(lines), "size": _file_size(path)}
         except Exception as e:
             print(f"Fehler beim Laden der Zeichnung {title}: {e}")
+            return empty
+
+    @pyqtSlot(str, str, int, result=int)
+    def append_strokes(self, title, lines, expected_size):
+        """
+        Hängt neue Strich-Zeilen an. expected_size ist die Protokollgröße, die die
+        Seite zuletzt kannte; passt sie nicht, wird nichts geschrieben und -1
+        geliefert (die Seite schickt dann alles über replace_strokes).
+        Enthält der Anhang ein "Leeren", wird das Protokoll dabei kompaktiert.
+        """
+        if not title:
+            return -1
+        path = _log_path(title)
+        try:
+            new_lines = [line for line in lines.split("\n") if line]
+            for line in new_lines:
+                json.loads(line)  # keine kaputten Zeilen ins Protokoll
+            if _file_size(path) != expected_size or self._log_revs.get(title) != _read_log_rev(title):
+                return -1
+            if CLEAR_RECORD in new_lines:
+                kept, _ = _after_last_clear(new_lines)
+                self._log_revs[title] = _rewrite_log(title, kept)
+                self._drop_legacy(title)
+            elif new_lines:
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.write("\n".join(new_lines) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+            return _file_size(path)
+        except Exception as e:
+            print(f"Fehler beim Speichern der Zeichnung {title}: {e}")
+            return -1
+
+    @pyqtSlot(str, str, result=int)
+    def replace_strokes(self, title, lines):
+        """Schreibt das Protokoll vollständig neu (Fallback / neue Zeichnung)."""
+        if not title:
+            return -1
+        path = _log_path(title)
+        try:
+            is_new = not os.path.exists(path) and not os.path.exists(_legacy_path(title))
+            all_lines = [line for line in lines.split("\n") if line]
+            for line in all_lines:
+                json.loads(line)
+            kept, cleared = _after_last_clear(all_lines)
+            self._log_revs[title] = _rewrite_log(title, kept)
+            if cleared:
+                self._drop_legacy(title)
+            if is_new:
+                self.notesChanged.emit()
+            return _file_size(path)
+        except Exception as e:
+            print(f"Fehler beim Speichern der Zeichnung {title}: {e}")
+            return -1
+
+    @pyqtSlot(str, 'QVariantMap', int, bool, result=bool)
+    def save_tiles(self, title, tiles, log_size, full):
+        """
+        Aktualisiert das Kachel-Abbild: tiles = {"x_y": PNG-Data-URL oder ""}
+        ("" = leere Kachel). Es kommen nur geänderte Kacheln; bei full=True
+        ersetzen sie das Abbild vollständig. log_size bindet das Abbild an den
+        Protokollstand.
+        """
+        if not title:
+            return False
+        directory = _tile_dir(title)
+        try:
+            if full and os.path.isdir(directory):
+                shutil.rmtree(directory)
+            os.makedirs(directory, exist_ok=True)
+            for key, data_url in tiles.items():
+                if not TILE_KEY_RE.match(key):
+                    continue
+                path = os.path.join(directory, key + '.png')
+                if data_url:
+                    _atomic_write_bytes(path, _png_bytes(data_url))
+                elif os.path.exists(path):
+                    os.remove(path)
+            manifest = json.dumps({"log_size": log_size,
+                                   "log_rev": self._log_revs.get(title, "")}).encode('utf-8')
+            _atomic_write_bytes(os.path.join(directory, 'manifest.json'), manifest)
+            return True
+        except Exception as e:
+            print(f"Fehler beim Speichern der Kacheln für {title}: {e}")
+            return False
+
+    @pyqtSlot(str, result='QVariantMap')
+    def load_tiles(self, title):
+        """Kachel-Abbild: {log_size, tiles: {"x_y": Bild-URL}}; log_size -1 = keins."""
+        directory = _tile_dir(title)
+        try:
+            with open(os.path.join(directory, 'manifest.json'), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            log_size = int(manifest["log_size"])
+            # Gleiche Größe reicht nicht: ein Neuschreiben kann sie zufällig treffen
+            if manifest.get("log_rev", "") != self._log_revs.get(title, _read_log_rev(title)):
+                return {"log_size": -1, "tiles": {}}
+            tiles = {}
+            for name in os.listdir(directory):
+                if name.endswith('.png') and TILE_KEY_RE.match(name[:-4]):
+                    key = name[:-4]
+                    if self.store_urls:
+                        tiles[key] = f"tiles/{quote(title, safe='')}/{key}.png?v={log_size}"
+                    else:
+                        tiles[key] = _png_data_url(os.path.join(directory, name))
+            return {"log_size": log_size, "tiles": tiles}
+        except (OSError, ValueError, KeyError):
+            return {"log_size": -1, "tiles": {}}
+
+    @pyqtSlot(str, str, result=bool)
+    def spill_tile(self, key, data_url):
+        """Lagert eine Undo-Kachel (PNG-Data-URL) auf die Platte aus."""
+        if not TILE_KEY_RE.match(key):
+            return False
+        try:
+            os.makedirs(self._history_dir, exist_ok=True)
+            with open(os.path.join(self._history_dir, key + '.png'), 'wb') as f:
+                f.write(_png_bytes(data_url))
+            return True
+        except Exception as e:
+            print(f"Fehler beim Auslagern der Undo-Kachel: {e}")
+            return False
+
+    @pyqtSlot(str, result=str)
+    def restore_tile(self, key):
+        """URL einer ausgelagerten Undo-Kachel ("" falls nicht vorhanden)."""
+        if not TILE_KEY_RE.match(key):
+            return ""
+        path = os.path.join(self._history_dir, key + '.png')
+        try:
+            if self.store_urls:
+                return f"history/{key}.png?v={os.stat(path).st_mtime_ns}"
+            return _png_data_url(path)
+        except OSError:
             return ""
 
-    @pyqtSlot(str, str)
-    def save_note(self, title, content):
-        """Speichert den Base64-String der Zeichnung."""
-        if not title: return
-        path = os.path.join(NOTES_DIR, title + '.txt')
+    def read_store_path(self, parts):
+        """
+        Rohdaten für canvas-store://<host>/<parts...> (ohne Base64):
+        base/<titel>, tiles/<titel>/<x_y>.png, history/<key>.png. parts sind bereits
+        URL-dekodiert. None = unbekannt, ValueError bei Pfaden außerhalb der Ablage.
+        """
+        if len(parts) == 2 and parts[0] == "base":
+            with open(_inside(NOTES_DIR, parts[1] + LEGACY_EXT), 'r', encoding='utf-8') as f:
+                return _png_bytes(f.read().strip())
+        if len(parts) == 3 and parts[0] == "tiles" and parts[2].endswith('.png') \
+                and TILE_KEY_RE.match(parts[2][:-4]):
+            with open(_inside(NOTES_DIR, parts[1] + TILE_DIR_EXT, parts[2]), 'rb') as f:
+                return f.read()
+        if len(parts) == 2 and parts[0] == "history" and parts[1].endswith('.png') \
+                and TILE_KEY_RE.match(parts[1][:-4]):
+            with open(_inside(self._history_dir, parts[1]), 'rb') as f:
+                return f.read()
+        return None
+
+    @pyqtSlot('QVariantList')
+    def drop_tiles(self, keys):
+        """Entfernt ausgelagerte Undo-Kacheln, die nicht mehr gebraucht werden."""
+        for key in keys:
+            if TILE_KEY_RE.match(str(key)):
+                try:
+                    os.remove(os.path.join(self._history_dir, f"{key}.png"))
+                except OSError:
+                    pass
+
+    def close(self):
+        shutil.rmtree(self._history_dir, ignore_errors=True)
+
+    def _drop_legacy(self, title):
+        # Das alte PNG ist nach "Leeren" nicht mehr Teil des Bildes
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            self.notesChanged.emit()
+            os.remove(_legacy_path(title))
+        except FileNotFoundError:
+            pass
+
+    @pyqtSlot(str, str, result=str)
+    def export_png(self, title, data_url):
+        """Speichert ein PNG-Abbild (Data-URL) unter EXPORT_DIR; liefert den Pfad oder ""."""
+        if not title or not data_url.startswith("data:image/png;base64,"):
+            return ""
+        try:
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            path = os.path.join(EXPORT_DIR, title + '.png')
+            with open(path, 'wb') as f:
+                f.write(base64.b64decode(data_url.split(",", 1)[1]))
+            return path
         except Exception as e:
-            print(f"Fehler beim Speichern der Zeichnung {title}: {e}")
+            print(f"Fehler beim Exportieren der Zeichnung {title}: {e}")
+            return ""
 
     @pyqtSlot(str)
     def delete_note(self, title):
         """Löscht eine Zeichnung."""
         if not title: return
-        path = os.path.join(NOTES_DIR, title + '.txt')
-        if os.path.exists(path):
-            try:
-                os.remove(path)
-                self.notesChanged.emit()
-            except Exception as e:
-                print(f"Fehler beim Löschen der Zeichnung {title}: {e}")
+        removed = False
+        shutil.rmtree(_tile_dir(title), ignore_errors=True)
+        self._log_revs.pop(title, None)
+        try:
+            os.remove(_rev_path(title))
+        except OSError:
+            pass
+        for path in (_log_path(title), _legacy_path(title)):
+            if os.path.exists(path):
+                try:
+                    os.remove(path)
+                    removed = True
+                except Exception as e:
+                    print(f"Fehler beim Löschen der Zeichnung {title}: {e}")
+        if removed:
+            self.notesChanged.emit()
 
     def _set_theme_internal(self, theme: str):
         theme_lower = (theme or "").lower()
@@ -119,6 +478,57 @@ class CanvasAPI(QObject):
         return self._theme
 
 
+class CanvasStoreHandler(QWebEngineUrlSchemeHandler):
+    """
+    Liefert Seite und Bilddaten über canvas-store://<host>/... direkt als Bytes aus.
+    Jede Plugin-Instanz bekommt einen eigenen Host (eigener Origin), ein Handler
+    pro Profil bedient alle.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._sites = {}  # host -> (CanvasAPI, html)
+
+    def add_site(self, host, api, html):
+        self._sites[host] = (api, html)
+
+    def remove_site(self, host):
+        self._sites.pop(host, None)
+
+    def requestStarted(self, job):
+        url = job.requestUrl()
+        site = self._sites.get(url.host())
+        if site is None or bytes(job.requestMethod()) != b"GET":
+            job.fail(QWebEngineUrlRequestJob.RequestDenied)
+            return
+        api, html = site
+        # Erst an "/" trennen, dann dekodieren: ein Titel mit "/" (%2F) bleibt ein Segment
+        parts = [unquote(p) for p in url.path(QUrl.FullyEncoded).split('/') if p]
+        try:
+            if not parts or parts == ["index.html"]:
+                data, mime = html.encode('utf-8'), b"text/html"
+            else:
+                data, mime = api.read_store_path(parts), b"image/png"
+        except (OSError, ValueError):
+            data = None
+        if data is None:
+            job.fail(QWebEngineUrlRequestJob.UrlNotFound)
+            return
+        buf = QBuffer(job)  # lebt so lange wie der Request
+        buf.setData(data)
+        buf.open(QIODevice.ReadOnly)
+        job.reply(mime, buf)
+
+
+def _store_handler_for(profile):
+    """Ein Handler pro Profil; ein bereits installierter (z.B. nach Plugin-Reload) wird weiterverwendet."""
+    handler = profile.urlSchemeHandler(STORE_SCHEME)
+    if handler is None:
+        handler = CanvasStoreHandler(profile)
+        profile.installUrlSchemeHandler(STORE_SCHEME, handler)
+    return handler
+
+
 class HostThemeWatcher(QObject):
     themeChanged = pyqtSignal(str)
 
@@ -204,6 +614,12 @@ canvas {
     display: block;
     touch-action: none;
 }
+/* Live-Ebene für den Strich in Arbeit, deckungsgleich über der Leinwand */
+#live-canvas {
+    position: absolute;
+    top: 0;
+    left: 0;
+}
 
 /* --- Toolbar --- */
 .toolbar {
@@ -289,6 +705,12 @@ let isDrawing = false;
 let lastX = 0;
 let lastY = 0;
 
+// Strich-Protokoll der offenen Zeichnung: {c, w, p: [x0, y0, x1, y1, ...]} oder {op: "clear"}
+let strokes = [];
+let currentStroke = null;
+let savedCount = 0;   // so viele Einträge liegen schon im Protokoll auf der Platte
+let savedSize = 0;    // Protokollgröße laut Backend (Token für append_strokes)
+
 // Canvas Settings
 let brushColor = "#000000";
 let brushSize = 3;
@@ -329,38 +751,52 @@ async function initThemeSync() {
 }
 
 // --- Canvas Logic ---
+// Zwei Ebenen: "canvas" hält alle fertigen Striche, "liveCanvas" liegt darüber und
+// zeigt nur den Strich, der gerade gezeichnet wird. Pointer-Samples werden gepuffert
+// und einmal pro Animation-Frame als ein geglätteter Pfad gezeichnet.
+
+let liveCanvas, liveCtx;
+let frameRequested = false;
+let liveDirty = null;        // zuletzt bemalter Bereich der Live-Ebene {x0, y0, x1, y1}
+let oldestSampleTime = 0;    // Zeitstempel des ältesten noch nicht gezeichneten Samples
+
+// Messwerte (Ringpuffer): Pointer-zu-Frame-Latenz und Zeichenzeit pro Frame, in ms
+const PERF_SAMPLES = 600;
+const perf = { latency: [], frame: [] };
 
 function setupCanvas(canvasId) {
     canvas = document.getElementById(canvasId);
     ctx = canvas.getContext('2d');
+    liveCanvas = document.getElementById('live-canvas');
+    liveCtx = liveCanvas.getContext('2d');
 
     // Größe der Leinwand an den Container anpassen
     const wrapper = canvas.parentElement;
-    canvas.width = wrapper.clientWidth;
-    canvas.height = wrapper.clientHeight;
+    canvas.width = liveCanvas.width = wrapper.clientWidth;
+    canvas.height = liveCanvas.height = wrapper.clientHeight;
 
     // Standardhintergrund Weiß
-    clearCanvas();
-
-    // Event Listeners
-    canvas.addEventListener('mousedown', startDrawing);
-    canvas.addEventListener('mousemove', draw);
-    canvas.addEventListener('mouseup', stopDrawing);
-    canvas.addEventListener('mouseout', stopDrawing);
-
-    // Touch Support (optional)
-    canvas.addEventListener('touchstart', (e) => {
-        const touch = e.touches[0];
-        const mouseEvent = new MouseEvent("mousedown", {
-            clientX: touch.clientX, clientY: touch.clientY
-        });
-        canvas.dispatchEvent(mouseEvent);
-    }, false);
+    wipeCanvas();
+
+    // Pointer Events decken Maus, Stift und Touch ab
+    liveCanvas.addEventListener('pointerdown', startDrawing);
+    liveCanvas.addEventListener('pointermove', draw);
+    liveCanvas.addEventListener('pointerup', stopDrawing);
+    liveCanvas.addEventListener('pointercancel', stopDrawing);
 
     // Tools initialisieren
     document.getElementById('color-picker').addEventListener('change', (e) => brushColor = e.target.value);
     document.getElementById('size-slider').addEventListener('input', (e) => brushSize = e.target.value);
     document.getElementById('btn-clear').addEventListener('click', clearCanvas);
+    document.getElementById('btn-export').addEventListener('click', exportCurrentDrawing);
+    document.getElementById('btn-undo').addEventListener('click', () => tileHistory.undo());
+    document.getElementById('btn-redo').addEventListener('click', () => tileHistory.redo());
+    document.addEventListener('keydown', (e) => {
+        if (!(e.ctrlKey || e.metaKey) || isDrawing || e.target.tagName === 'INPUT') return;
+        const key = e.key.toLowerCase();
+        if (key === 'z' && !e.shiftKey) { e.preventDefault(); tileHistory.undo(); }
+        else if (key === 'y' || (key === 'z' && e.shiftKey)) { e.preventDefault(); tileHistory.redo(); }
+    });
     document.getElementById('btn-eraser').addEventListener('click', () => brushColor = "#FFFFFF");
     document.getElementById('btn-pen').addEventListener('click', () => {
         brushColor = document.getElementById('color-picker').value;
@@ -368,28 +804,382 @@ function setupCanvas(canvasId) {
 }
 
 function startDrawing(e) {
+    if (e.button !== 0) return;
+    liveCanvas.setPointerCapture(e.pointerId);
     isDrawing = true;
     [lastX, lastY] = getPos(e);
+    currentStroke = { c: brushColor, w: +brushSize, p: [Math.round(lastX), Math.round(lastY)] };
+    oldestSampleTime = e.timeStamp;
+    requestFrame();
 }
 
+// Nur puffern – gezeichnet wird im nächsten Animation-Frame
 function draw(e) {
+    if (!isDrawing || !currentStroke) return;
+    const samples = (typeof e.getCoalescedEvents === 'function') ? e.getCoalescedEvents() : [];
+    for (const sample of (samples.length ? samples : [e])) {
+        const [x, y] = getPos(sample);
+        const rx = Math.round(x), ry = Math.round(y);
+        const p = currentStroke.p;
+        if (rx === p[p.length - 2] && ry === p[p.length - 1]) continue;
+        p.push(rx, ry);
+        [lastX, lastY] = [x, y];
+    }
+    if (!oldestSampleTime) oldestSampleTime = e.timeStamp;
+    requestFrame();
+}
+
+function stopDrawing(e) {
     if (!isDrawing) return;
-    const [x, y] = getPos(e);
+    isDrawing = false;
+    if (e && e.pointerId !== undefined && liveCanvas.hasPointerCapture(e.pointerId)) {
+        liveCanvas.releasePointerCapture(e.pointerId);
+    }
+    if (currentStroke) {
+        // Fertigen Strich einmal auf die feste Ebene übernehmen, Live-Ebene leeren
+        const keys = tilesInBounds(strokeBounds(currentStroke));
+        tileHistory.record(currentStroke, keys);
+        keys.forEach(key => dirtyTiles.add(key));
+        drawStroke(currentStroke);
+        clearLiveLayer();
+        strokes.push(currentStroke);
+        currentStroke = null;
+    }
+    oldestSampleTime = 0;
+}
+
+function requestFrame() {
+    if (frameRequested) return;
+    frameRequested = true;
+    requestAnimationFrame(renderFrame);
+}
 
-    ctx.beginPath();
-    ctx.moveTo(lastX, lastY);
-    ctx.lineTo(x, y);
-    ctx.strokeStyle = brushColor;
-    ctx.lineWidth = brushSize;
-    ctx.lineCap = 'round';
-    ctx.lineJoin = 'round';
-    ctx.stroke();
+function renderFrame(now) {
+    frameRequested = false;
+    if (!currentStroke) return;
+    const t0 = performance.now();
 
-    [lastX, lastY] = [x, y];
+    clearLiveLayer();
+    tracePath(liveCtx, currentStroke);
+    liveDirty = strokeBounds(currentStroke);
+
+    recordPerf(perf.frame, performance.now() - t0);
+    if (oldestSampleTime) recordPerf(perf.latency, now - oldestSampleTime);
+    oldestSampleTime = 0;
 }
 
-function stopDrawing() {
-    isDrawing = false;
+function clearLiveLayer() {
+    if (!liveDirty) return;
+    liveCtx.clearRect(liveDirty.x0, liveDirty.y0, liveDirty.x1 - liveDirty.x0, liveDirty.y1 - liveDirty.y0);
+    liveDirty = null;
+}
+
+function strokeBounds(stroke) {
+    const p = stroke.p;
+    let x0 = p[0], y0 = p[1], x1 = p[0], y1 = p[1];
+    for (let i = 2; i < p.length; i += 2) {
+        if (p[i] < x0) x0 = p[i]; else if (p[i] > x1) x1 = p[i];
+        if (p[i + 1] < y0) y0 = p[i + 1]; else if (p[i + 1] > y1) y1 = p[i + 1];
+    }
+    const pad = stroke.w / 2 + 2;
+    return { x0: Math.floor(x0 - pad), y0: Math.floor(y0 - pad), x1: Math.ceil(x1 + pad), y1: Math.ceil(y1 + pad) };
+}
+
+/**
+ * Ein Strich als ein Pfad: quadratische Kurven durch die Mittelpunkte der Samples
+ * glätten die Ecken. Stil wird einmal pro Strich gesetzt.
+ */
+function tracePath(target, stroke) {
+    const p = stroke.p;
+    target.beginPath();
+    target.strokeStyle = stroke.c;
+    target.lineWidth = stroke.w;
+    target.lineCap = 'round';
+    target.lineJoin = 'round';
+    target.moveTo(p[0], p[1]);
+    if (p.length === 2) {
+        target.lineTo(p[0] + 0.01, p[1]); // einzelner Klick = Punkt
+    } else {
+        for (let i = 2; i < p.length - 2; i += 2) {
+            target.quadraticCurveTo(p[i], p[i + 1], (p[i] + p[i + 2]) / 2, (p[i + 1] + p[i + 3]) / 2);
+        }
+        target.lineTo(p[p.length - 2], p[p.length - 1]);
+    }
+    target.stroke();
+}
+
+// Zeichnet einen fertigen Strich auf die feste Ebene
+function drawStroke(stroke) {
+    tracePath(ctx, stroke);
+}
+
+function recordPerf(list, value) {
+    list.push(value);
+    if (list.length > PERF_SAMPLES) list.shift();
+}
+
+// In der DevTools-Konsole: zeichenheftPerf() -> Median/95%-Werte der letzten Frames
+function zeichenheftPerf() {
+    const pct = (list, q) => {
+        if (!list.length) return 0;
+        const sorted = list.slice().sort((a, b) => a - b);
+        return +sorted[Math.min(sorted.length - 1, Math.floor(q * sorted.length))].toFixed(2);
+    };
+    return {
+        frames: perf.frame.length,
+        latencyP50: pct(perf.latency, 0.5), latencyP95: pct(perf.latency, 0.95),
+        frameP50: pct(perf.frame, 0.5), frameP95: pct(perf.frame, 0.95),
+    };
+}
+window.zeichenheftPerf = zeichenheftPerf;
+
+// --- Kacheln & Undo ---
+// Die feste Ebene wird in TILE×TILE-Kacheln betrachtet. Jeder Strich merkt sich nur die
+// Kacheln, die er berührt (Zustand davor); Undo/Redo tauscht genau diese Kacheln.
+
+const TILE = 256;
+const HISTORY_BUDGET_BYTES = 64 * 1024 * 1024; // Undo-Kacheln im Speicher, darüber wird ausgelagert
+const HISTORY_MAX_ENTRIES = 200;
+
+let dirtyTiles = new Set();   // seit dem letzten Speichern geänderte Kacheln ("x_y")
+let snapshotFull = true;      // nächstes Speichern muss das Kachel-Abbild komplett schreiben
+let logDiverged = false;      // Undo hat bereits gespeicherte Striche entfernt -> Protokoll neu schreiben
+
+function tileKey(tx, ty) { return tx + "_" + ty; }
+
+function tilesInBounds(b) {
+    const keys = [];
+    const tx0 = Math.max(0, Math.floor(b.x0 / TILE)), ty0 = Math.max(0, Math.floor(b.y0 / TILE));
+    const tx1 = Math.min(Math.ceil(canvas.width / TILE) - 1, Math.floor(b.x1 / TILE));
+    const ty1 = Math.min(Math.ceil(canvas.height / TILE) - 1, Math.floor(b.y1 / TILE));
+    for (let ty = ty0; ty <= ty1; ty++) {
+        for (let tx = tx0; tx <= tx1; tx++) keys.push(tileKey(tx, ty));
+    }
+    return keys;
+}
+
+function allTiles() {
+    return tilesInBounds({ x0: 0, y0: 0, x1: canvas.width - 1, y1: canvas.height - 1 });
+}
+
+function markAllTilesDirty() {
+    allTiles().forEach(key => dirtyTiles.add(key));
+}
+
+function tileRect(key) {
+    const [tx, ty] = key.split("_").map(Number);
+    const x = tx * TILE, y = ty * TILE;
+    return { x: x, y: y, w: Math.min(TILE, canvas.width - x), h: Math.min(TILE, canvas.height - y) };
+}
+
+function readTile(key) {
+    const r = tileRect(key);
+    return ctx.getImageData(r.x, r.y, r.w, r.h);
+}
+
+// Hilfsleinwand zum Kodieren/Dekodieren einzelner Kacheln
+const scratch = document.createElement('canvas');
+const scratchCtx = scratch.getContext('2d');
+
+function imageDataToPng(data) {
+    scratch.width = data.width;
+    scratch.height = data.height;
+    scratchCtx.putImageData(data, 0, 0);
+    return scratch.toDataURL("image/png");
+}
+
+function loadImage(src) {
+    return new Promise((resolve, reject) => {
+        const img = new Image();
+        img.onload = () => resolve(img);
+        img.onerror = reject;
+        img.src = src;
+    });
+}
+
+async function pngToImageData(src, width, height) {
+    const img = await loadImage(src);
+    scratch.width = width;
+    scratch.height = height;
+    scratchCtx.clearRect(0, 0, width, height);
+    scratchCtx.drawImage(img, 0, 0);
+    return scratchCtx.getImageData(0, 0, width, height);
+}
+
+function isBlankTile(data) {
+    const d = data.data;
+    for (let i = 0; i < d.length; i++) if (d[i] !== 255) return false;
+    return true;
+}
+
+class TileHistory {
+    constructor() {
+        this.undoStack = [];
+        this.redoStack = [];
+        this.bytes = 0;
+        this.lru = new Map();   // Kachel-Slot -> true, älteste Nutzung zuerst
+        this.nextId = 1;
+        this.busy = false;
+    }
+
+    // Vor dem Übernehmen eines Strichs/Leerens: Zustand der betroffenen Kacheln sichern
+    record(entryRecord, keys) {
+        const entry = { id: this.nextId++, record: entryRecord, tiles: [] };
+        keys.forEach((key, i) => {
+            const slot = { spillKey: entry.id + "_" + i, key: key, data: readTile(key), spilled: null };
+            entry.tiles.push(slot);
+            this.bytes += slot.data.data.length;
+            this.lru.set(slot, true);
+        });
+        this.undoStack.push(entry);
+        this.drop(this.redoStack.splice(0));
+        if (this.undoStack.length > HISTORY_MAX_ENTRIES) this.drop(this.undoStack.splice(0, 1));
+        this.enforceBudget();
+    }
+
+    // Zustand der Kacheln mit dem gesicherten tauschen (Undo und Redo sind symmetrisch)
+    async swap(entry) {
+        for (const slot of entry.tiles) {
+            const current = readTile(slot.key);
+            const saved = await this.materialize(slot);
+            const r = tileRect(slot.key);
+            ctx.putImageData(saved, r.x, r.y);
+            slot.data = current;
+            slot.spilled = null;
+            this.lru.delete(slot);
+            this.lru.set(slot, true);
+            dirtyTiles.add(slot.key);
+        }
+        this.enforceBudget();
+    }
+
+    async materialize(slot) {
+        if (slot.data) return slot.data;
+        await slot.spilled;
+        const r = tileRect(slot.key);
+        const url = await window.backend.restore_tile(slot.spillKey);
+        const data = url ? await pngToImageData(url, r.w, r.h) : ctx.createImageData(r.w, r.h);
+        this.bytes += data.data.length;
+        return data;
+    }
+
+    // Über dem Budget: am längsten nicht benutzte Kacheln als PNG auslagern
+    enforceBudget() {
+        for (const slot of this.lru.keys()) {
+            if (this.bytes <= HISTORY_BUDGET_BYTES) break;
+            if (!slot.data) continue;
+            const url = imageDataToPng(slot.data);
+            this.bytes -= slot.data.data.length;
+            slot.data = null;
+            slot.spilled = window.backend.spill_tile(slot.spillKey, url);
+            this.lru.delete(slot);
+        }
+    }
+
+    drop(entries) {
+        const spilled = [];
+        for (const entry of entries) {
+            for (const slot of entry.tiles) {
+                if (slot.data) this.bytes -= slot.data.data.length;
+                else spilled.push(slot.spillKey);
+                this.lru.delete(slot);
+            }
+        }
+        if (spilled.length) window.backend.drop_tiles(spilled);
+    }
+
+    reset() {
+        this.drop(this.undoStack.splice(0));
+        this.drop(this.redoStack.splice(0));
+    }
+
+    async undo() {
+        if (this.busy || !this.undoStack.length) return;
+        this.busy = true;
+        try {
+            const entry = this.undoStack.pop();
+            await this.swap(entry);
+            this.redoStack.push(entry);
+            strokes.pop();
+            if (strokes.length < savedCount) {
+                savedCount = strokes.length;
+                logDiverged = true;
+            }
+        } finally {
+            this.busy = false;
+        }
+    }
+
+    async redo() {
+        if (this.busy || !this.redoStack.length) return;
+        this.busy = true;
+        try {
+            const entry = this.redoStack.pop();
+            await this.swap(entry);
+            this.undoStack.push(entry);
+            strokes.push(entry.record);
+        } finally {
+            this.busy = false;
+        }
+    }
+}
+
+const tileHistory = new TileHistory();
+
+// Kachel-Abbild aktualisieren: nur geänderte Kacheln werden neu kodiert
+async function saveDirtyTiles(title, logSize) {
+    if (!dirtyTiles.size) return;
+    const keys = Array.from(dirtyTiles);
+    const full = snapshotFull;
+    const tiles = {};
+    for (const key of keys) {
+        const data = readTile(key);
+        tiles[key] = isBlankTile(data) ? "" : imageDataToPng(data);
+    }
+    // Während des Speicherns neu gemalte Kacheln bleiben für das nächste Mal markiert
+    dirtyTiles.clear();
+    snapshotFull = false;
+    const ok = await window.backend.save_tiles(title, tiles, logSize, full);
+    if (!ok) {
+        keys.forEach(key => dirtyTiles.add(key));
+        snapshotFull = snapshotFull || full;
+    }
+}
+
+// Gültiges Kachel-Abbild zeichnen statt das Protokoll abzuspielen
+async function drawSnapshot(tiles) {
+    const entries = Object.entries(tiles);
+    const images = await Promise.all(entries.map(([, url]) => loadImage(url)));
+    entries.forEach(([key], i) => {
+        const r = tileRect(key);
+        if (r.w > 0 && r.h > 0) ctx.drawImage(images[i], r.x, r.y);
+    });
+}
+
+function replayStrokes(list) {
+    for (const entry of list) {
+        if (entry.op === 'clear') wipeCanvas();
+        else drawStroke(entry);
+    }
+}
+
+// Protokollzeile: Punkte delta-kodiert (x0, y0, dx1, dy1, ...), das hält die Zeilen kurz
+function encodeEntry(entry) {
+    if (entry.op) return JSON.stringify({ op: entry.op });
+    const p = entry.p;
+    const d = [p[0], p[1]];
+    for (let i = 2; i < p.length; i += 2) d.push(p[i] - p[i - 2], p[i + 1] - p[i - 1]);
+    return JSON.stringify({ c: entry.c, w: entry.w, p: d });
+}
+
+function decodeEntry(line) {
+    const entry = JSON.parse(line);
+    if (entry.op) return entry;
+    const d = entry.p;
+    const p = [d[0], d[1]];
+    for (let i = 2; i < d.length; i += 2) p.push(p[i - 2] + d[i], p[i - 1] + d[i + 1]);
+    entry.p = p;
+    return entry;
 }
 
 function getPos(e) {
@@ -400,11 +1190,32 @@ function getPos(e) {
     ];
 }
 
-function clearCanvas() {
+function wipeCanvas() {
     ctx.fillStyle = "#FFFFFF";
     ctx.fillRect(0, 0, canvas.width, canvas.height);
 }
 
+// "Leeren" ist ein Eintrag im Protokoll, damit das Speichern nur anhängen muss
+function clearCanvas() {
+    const record = { op: 'clear' };
+    const keys = allTiles();
+    tileHistory.record(record, keys);
+    keys.forEach(key => dirtyTiles.add(key));
+    wipeCanvas();
+    strokes.push(record);
+}
+
+// Neues Blatt/andere Zeichnung: Undo-Verlauf und Kachelstatus zurücksetzen
+function resetDrawingState(logSize) {
+    tileHistory.reset();
+    strokes = [];
+    savedCount = 0;
+    savedSize = logSize;
+    dirtyTiles.clear();
+    snapshotFull = true;
+    logDiverged = false;
+}
+
 // --- Window Mode Logic ---
 
 const el = {
@@ -442,7 +1253,7 @@ async function refreshNoteList() {
 }
 
 async function openDrawing(title) {
-    const content = await window.backend.load_note(title);
+    const doc = await window.backend.load_drawing(title);
     currentSelectedTitle = title;
     el.currentTitle.value = title;
 
@@ -451,16 +1262,33 @@ async function openDrawing(title) {
         li.classList.toggle('selected', li.dataset.title === title);
     });
 
-    // Bild laden
-    if (content) {
+    resetDrawingState(doc.size);
+    strokes = doc.log ? doc.log.split("\n").map(decodeEntry) : [];
+    savedCount = strokes.length;
+    wipeCanvas();
+
+    // Passt das Kachel-Abbild zum Protokoll, wird es direkt gezeichnet
+    const snapshot = doc.size > 0 ? await window.backend.load_tiles(title) : null;
+    if (currentSelectedTitle !== title) return;
+    if (snapshot && snapshot.log_size === doc.size) {
+        await drawSnapshot(snapshot.tiles);
+        snapshotFull = false;
+        return;
+    }
+    markAllTilesDirty(); // Abbild fehlt/veraltet: beim nächsten Speichern komplett schreiben
+
+    // Alte Zeichnungen: PNG als Hintergrund, danach die Striche
+    if (doc.base) {
         const img = new Image();
-        img.onload = function() {
-            clearCanvas(); // Erst weiß machen
-            ctx.drawImage(img, 0, 0); // Dann Bild drauf malen
+        img.onload = () => {
+            if (currentSelectedTitle !== title) return;
+            wipeCanvas();
+            ctx.drawImage(img, 0, 0);
+            replayStrokes(strokes);
         };
-        img.src = content;
+        img.src = doc.base;
     } else {
-        clearCanvas(); // Leeres Blatt
+        replayStrokes(strokes);
     }
 }
 
@@ -470,24 +1298,43 @@ async function saveCurrentDrawing() {
         showStatus("Bitte erstelle eine 'Neue Zeichnung'.", "error");
         return;
     }
-    // Canvas als Base64 Bild speichern (PNG)
-    const dataURL = canvas.toDataURL("image/png");
-
-    await window.backend.save_note(title, dataURL);
+    // Nur die neuen Striche anhängen; passt das Token nicht (oder hat Undo bereits
+    // gespeicherte Striche entfernt), alles neu schreiben
+    const count = strokes.length;
+    if (count > savedCount || logDiverged) {
+        const fresh = strokes.slice(savedCount).map(encodeEntry).join("\n");
+        let size = logDiverged ? -1 : await window.backend.append_strokes(title, fresh, savedSize);
+        if (size < 0) size = await window.backend.replace_strokes(title, strokes.map(encodeEntry).join("\n"));
+        if (size < 0) {
+            showStatus("Fehler beim Speichern.", "error");
+            return;
+        }
+        savedCount = count;
+        savedSize = size;
+        logDiverged = false;
+    }
+    await saveDirtyTiles(title, savedSize);
     showStatus(`Zeichnung '${title}' gespeichert!`, "success");
 }
 
+// PNG nur auf Anforderung
+async function exportCurrentDrawing() {
+    const title = el.currentTitle.value;
+    if (!title) return;
+    const path = await window.backend.export_png(title, canvas.toDataURL("image/png"));
+    if (path) showStatus(`Exportiert: ${path}`, "success");
+    else showStatus("Export fehlgeschlagen.", "error");
+}
+
 async function addNewDrawing() {
     const newTitle = el.newTitle.value.trim();
     if (!newTitle) {
         showStatus("Bitte Titel eingeben.", "error");
         return;
     }
-    // Leeres weißes Bild speichern
-    clearCanvas();
-    const dataURL = canvas.toDataURL("image/png");
-
-    await window.backend.save_note(newTitle, dataURL);
+    // Leeres Protokoll anlegen
+    wipeCanvas();
+    resetDrawingState(await window.backend.replace_strokes(newTitle, ""));
 
     currentSelectedTitle = newTitle;
     await refreshNoteList();
@@ -502,7 +1349,8 @@ async function deleteCurrentDrawing() {
     await window.backend.delete_note(title);
 
     el.currentTitle.value = "";
-    clearCanvas();
+    wipeCanvas();
+    resetDrawingState(0);
     currentSelectedTitle = "";
     showStatus(`Gelöscht: ${title}`, "success");
 }
@@ -565,11 +1413,15 @@ HTML_TEMPLATE = r"""
                 <label>Größe:</label>
                 <input type="range" id="size-slider" min="1" max="20" value="3">
                 <div style="flex:1"></div>
+                <button id="btn-undo" class="secondary" title="Rückgängig (Strg+Z)">↶</button>
+                <button id="btn-redo" class="secondary" title="Wiederholen (Strg+Y)">↷</button>
+                <button id="btn-export" class="secondary">🖼️ PNG</button>
                 <button id="btn-clear" class="danger">🗑️ Leeren</button>
             </div>
 
             <div class="canvas-wrapper">
                 <canvas id="main-canvas"></canvas>
+                <canvas id="live-canvas"></canvas>
             </div>
 
             <div class="button-bar">
@@ -634,10 +1486,19 @@ class PluginWidget(QMainWindow):
         except NameError:
             current_dir_path = os.path.abspath(os.getcwd())
 
-        base_url = QUrl.fromLocalFile(current_dir_path + os.path.sep)
-        base_url.setQuery(f"mode={mode}&theme={self._current_theme}")
-
-        self.browser.setHtml(self.html_content, base_url)
+        query = f"mode={mode}&theme={self._current_theme}"
+        self._store_host = None
+        if store_scheme_registered():
+            # Seite über canvas-store:// laden: Bilder kommen vom selben Origin als Bytes
+            self._store_host = f"z{id(self):x}"
+            self._store_handler = _store_handler_for(self.browser.page().profile())
+            self._store_handler.add_site(self._store_host, self.backend, self.html_content)
+            self.backend.store_urls = True
+            self.browser.load(QUrl(f"{STORE_SCHEME.decode()}://{self._store_host}/index.html?{query}"))
+        else:
+            base_url = QUrl.fromLocalFile(current_dir_path + os.path.sep)
+            base_url.setQuery(query)
+            self.browser.setHtml(self.html_content, base_url)
         self._view_ready = False
         self.browser.loadFinished.connect(self._on_view_ready)
 
@@ -647,6 +1508,10 @@ class PluginWidget(QMainWindow):
             self._theme_watcher = HostThemeWatcher(app_instance)
             self._theme_watcher.themeChanged.connect(self.backend.set_theme)
             self.destroyed.connect(self._cleanup_theme_watcher)
+            app_instance.aboutToQuit.connect(self._release_store)
+        # Der Launcher schließt Tabs per deleteLater() ohne closeEvent; ausgelagerte
+        # Undo-Kacheln sollen dabei nicht auf der Platte liegen bleiben
+        self.destroyed.connect(self._release_store)
 
     def _on_view_ready(self, ok: bool):
         self._view_ready = bool(ok)
@@ -671,12 +1536,170 @@ class PluginWidget(QMainWindow):
             self._theme_watcher.deleteLater()
             self._theme_watcher = None
 
+    def _release_store(self):
+        if self._store_host:
+            self._store_handler.remove_site(self._store_host)
+            self._store_host = None
+        self.backend.close()
+
     def closeEvent(self, event):
         self._cleanup_theme_watcher()
+        self._release_store()
         super().closeEvent(event)
 
 
+def _encode_stroke(color, width, points):
+    """Wie encodeEntry() im JS: Punkte delta-kodiert."""
+    deltas = list(points[:2])
+    for i in range(2, len(points), 2):
+        deltas += [points[i] - points[i - 2], points[i + 1] - points[i - 1]]
+    return json.dumps({"c": color, "w": width, "p": deltas}, separators=(',', ':'))
+
+
+def _benchmark(num_strokes=300, points_per_stroke=60, size=(1600, 1000)):
+    """
+    Dateigröße und Speicherlatenz: Strich-Protokoll (nur anhängen) gegen den
+    alten Weg (ganzes Bild als PNG-Data-URL in eine .txt).
+    """
+    import random
+    import tempfile
+    from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, QPointF, Qt
+    from PyQt5.QtGui import QColor, QImage, QPainter, QPen
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication.instance() or QApplication([])  # noqa: F841 (QPainter braucht eine App)
+
+    rnd = random.Random(3)
+    strokes = []
+    for _ in range(num_strokes):
+        x, y = rnd.randrange(size[0]), rnd.randrange(size[1])
+        pts = []
+        for _ in range(points_per_stroke):
+            x = min(size[0] - 1, max(0, x + rnd.randint(-6, 6)))
+            y = min(size[1] - 1, max(0, y + rnd.randint(-6, 6)))
+            pts += [x, y]
+        strokes.append((f"#{rnd.randrange(0xffffff):06x}", rnd.randint(1, 20), pts))
+
+    image = QImage(size[0], size[1], QImage.Format_ARGB32)
+    image.fill(Qt.white)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "bench" + STROKE_EXT)
+        png_path = os.path.join(tmp, "bench" + LEGACY_EXT)
+        t_log = t_png = 0.0
+
+        for color, width, pts in strokes:
+            painter = QPainter(image)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(QPen(QColor(color), width, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+            painter.drawPolyline(*[QPointF(pts[i], pts[i + 1]) for i in range(0, len(pts), 2)])
+            painter.end()
+
+            # Neu: eine Zeile anhängen
+            t0 = time.perf_counter()
+            with open(log_path, 'a', encoding='utf-8') as f:
+                f.write(_encode_stroke(color, width, pts) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            t_log += time.perf_counter() - t0
+
+            # Alt: ganzes Bild als PNG-Data-URL neu schreiben
+            t0 = time.perf_counter()
+            data = QByteArray()
+            buf = QBuffer(data)
+            buf.open(QIODevice.WriteOnly)
+            image.save(buf, "PNG")
+            data_url = "data:image/png;base64," + base64.b64encode(bytes(data)).decode('ascii')
+            with open(png_path, 'w', encoding='utf-8') as f:
+                f.write(data_url)
+                f.flush()
+                os.fsync(f.fileno())
+            t_png += time.perf_counter() - t0
+
+        print(f"{num_strokes} Striche à {points_per_stroke} Punkte, Leinwand {size[0]}x{size[1]}")
+        print(f"  Strich-Protokoll: {_file_size(log_path) / 1024:9.1f} KB, "
+              f"{t_log / num_strokes * 1000:7.2f} ms pro Speichern")
+        print(f"  PNG-Data-URL:     {_file_size(png_path) / 1024:9.1f} KB, "
+              f"{t_png / num_strokes * 1000:7.2f} ms pro Speichern")
+
+
+def _benchmark_transfer(size=(3840, 2160), rounds=20):
+    """
+    Laden eines 4K-Bildes: PNG als Base64-Data-URL im WebChannel-JSON (alt) gegen
+    Rohbytes über canvas-store:// (neu). Gemessen wird die Python-Seite plus das
+    Base64-Dekodieren, das sonst im Browser anfällt.
+    """
+    import random
+    import tempfile
+    from PyQt5.QtCore import QByteArray, QPointF, Qt
+    from PyQt5.QtGui import QColor, QImage, QPainter, QPen
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+
+    rnd = random.Random(5)
+    image = QImage(size[0], size[1], QImage.Format_ARGB32)
+    image.fill(Qt.white)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    for _ in range(400):
+        painter.setPen(QPen(QColor(f"#{rnd.randrange(0xffffff):06x}"), rnd.randint(1, 20),
+                            Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+        x, y = rnd.randrange(size[0]), rnd.randrange(size[1])
+        pts = []
+        for _ in range(80):
+            x, y = x + rnd.randint(-15, 15), y + rnd.randint(-15, 15)
+            pts.append(QPointF(x, y))
+        painter.drawPolyline(*pts)
+    painter.end()
+
+    data = QByteArray()
+    buf = QBuffer(data)
+    buf.open(QIODevice.WriteOnly)
+    image.save(buf, "PNG")
+    png = bytes(data)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        txt_path, png_path = os.path.join(tmp, "a.txt"), os.path.join(tmp, "a.png")
+        with open(txt_path, 'w', encoding='utf-8') as f:
+            f.write("data:image/png;base64," + base64.b64encode(png).decode('ascii'))
+        with open(png_path, 'wb') as f:
+            f.write(png)
+
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            with open(txt_path, 'r', encoding='utf-8') as f:
+                payload = json.dumps({"base": f.read()})               # WebChannel-Nachricht
+            received = json.loads(payload)["base"]
+            base64.b64decode(received.split(",", 1)[1])               # Data-URL im Browser
+        t_old = (time.perf_counter() - t0) / rounds
+
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            with open(png_path, 'rb') as f:
+                raw = f.read()
+            out = QBuffer()
+            out.setData(raw)
+            out.open(QIODevice.ReadOnly)
+            bytes(out.readAll())
+        t_new = (time.perf_counter() - t0) / rounds
+
+    print(f"4K-Leinwand {size[0]}x{size[1]}, PNG {len(png) / 1024:.0f} KB")
+    print(f"  Base64 über WebChannel: {len(payload) / 1024:8.0f} KB, {t_old * 1000:7.2f} ms")
+    print(f"  canvas-store://:        {len(png) / 1024:8.0f} KB, {t_new * 1000:7.2f} ms")
+
+
 if __name__ == "__main__":
+    # Speicherformate vergleichen: python Zeichenheft.py --benchmark
+    if len(sys.argv) == 2 and sys.argv[1] == "--benchmark":
+        _benchmark()
+        sys.exit(0)
+    # Bildübertragung vergleichen: python Zeichenheft.py --benchmark-transfer
+    if len(sys.argv) == 2 and sys.argv[1] == "--benchmark-transfer":
+        _benchmark_transfer()
+        sys.exit(0)
+
+    register_store_scheme()
     app = QApplication(sys.argv)
 
     # Window Modus starten
@@ -0,0 +1,570 @@
+# scripts/_kalender_ics.py
+"""
+ICS-Parsing und RRULE-Expansion für Kalender.py.
+
+Liegt bewusst in einem eigenen Modul (der "_"-Prefix versteckt es im Launcher):
+Kalender.py wird vom Launcher als "plugin_module" geladen und ist in den
+Worker-Prozessen eines ProcessPoolExecutor nicht importierbar – dieses Modul
+schon. Es hängt daher auch nicht von PyQt ab.
+
+Ergebnisse werden kompakt als Tupel mit Epoch-Sekunden geliefert:
+    (start, end, all_day, title, uid)
+Die Epoch-Werte beziehen sich auf *naive lokale* Zeiten (LOCAL_TZ) und werden
+mit from_epoch() verlustfrei zurückgewandelt.
+
+Für die Weitergabe an die Seite werden die Vorkommen in einem spalten-
+orientierten EventStore gesammelt (Arrays statt eines Dicts pro Termin).
+"""
+import base64
+import heapq
+import os
+import re
+import sys
+from array import array
+import time as _time
+from datetime import datetime, date, timedelta, time, timezone as dt_timezone
+
+from pytz import timezone, utc as pytz_utc
+from dateutil.rrule import rrulestr, rruleset
+from icalendar import Calendar
+
+LOCAL_TZ = timezone("Europe/Berlin")  # Lokale TZ für Normalisierung
+_EPOCH = datetime(1970, 1, 1)
+
+
+# ===========================
+# Datums-/Zeit-Helfer
+# ===========================
+def to_epoch(dt: datetime) -> int:
+    """Naive datetime -> Sekunden seit 1970 (ohne TZ-Umrechnung)."""
+    return (dt - _EPOCH) // timedelta(seconds=1)
+
+
+def from_epoch(seconds: int) -> datetime:
+    """Gegenstück zu to_epoch()."""
+    return _EPOCH + timedelta(seconds=seconds)
+
+
+def _is_all_day(prop) -> bool:
+    value = getattr(prop, "dt", prop)
+    return isinstance(value, date) and not isinstance(value, datetime)
+
+
+# ===========================
+# Zeitzonen-Normalisierung
+# ===========================
+_OFFSET_BUCKET = 900  # Sekunden; Zeitumstellungen liegen auf Viertelstunden-Grenzen
+_UNTIL_RE = re.compile(r"UNTIL=([0-9TZ]+)", re.IGNORECASE)
+
+
+class _Zone:
+    """
+    Gecachte Umrechnung zwischen Wanduhrzeit einer Zone und UTC.
+
+    Alle Werte sind Epoch-Sekunden (naive Wanduhrzeit bzw. UTC). UTC-Offsets
+    werden je Viertelstunde gecacht, sodass die teure tzinfo-Berechnung pro
+    Zone und Zeitraum nur einmal anfällt – nicht pro Vorkommen.
+    """
+
+    __slots__ = ("name", "tz", "fixed", "_wall_offsets", "_utc_offsets")
+
+    def __init__(self, name, tz):
+        self.name = name
+        self.tz = tz
+        self.fixed = None
+        if tz is dt_timezone.utc or tz is pytz_utc or isinstance(tz, dt_timezone):
+            self.fixed = int(tz.utcoffset(None).total_seconds())
+        self._wall_offsets = {}
+        self._utc_offsets = {}
+
+    def wall_to_utc(self, wall: int) -> int:
+        if self.fixed is not None:
+            return wall - self.fixed
+        bucket = wall - wall % _OFFSET_BUCKET
+        off = self._wall_offsets.get(bucket)
+        if off is None:
+            naive = from_epoch(bucket)
+            if hasattr(self.tz, "localize"):  # pytz
+                aware = self.tz.localize(naive, is_dst=False)
+            else:
+                aware = naive.replace(tzinfo=self.tz)
+            off = self._wall_offsets[bucket] = int(aware.utcoffset().total_seconds())
+        return wall - off
+
+    def utc_to_wall(self, utc: int) -> int:
+        if self.fixed is not None:
+            return utc + self.fixed
+        bucket = utc - utc % _OFFSET_BUCKET
+        off = self._utc_offsets.get(bucket)
+        if off is None:
+            aware = datetime.fromtimestamp(bucket, self.tz)
+            off = self._utc_offsets[bucket] = int(aware.utcoffset().total_seconds())
+        return utc + off
+
+
+_ZONES = {}
+
+
+def _zone_for(tz) -> _Zone:
+    """Liefert die (gecachte) _Zone zu einem tzinfo; pytz-/zoneinfo-Varianten teilen sich eine."""
+    name = getattr(tz, "zone", None) or getattr(tz, "key", None) or str(tz)
+    zone = _ZONES.get(name)
+    if zone is None:
+        if hasattr(tz, "localize") and getattr(tz, "zone", None):
+            tz = timezone(tz.zone)  # unlokalisierte pytz-Basiszone
+        zone = _ZONES[name] = _Zone(name, tz)
+    return zone
+
+
+LOCAL_ZONE = _zone_for(LOCAL_TZ)
+
+
+class _Moment:
+    """
+    Ein ICS-Zeitwert, einmalig normalisiert.
+
+    ``zone`` ist None für schwebende Zeiten (naive datetime / date); diese
+    gelten als lokale Wanduhrzeit. ``wall`` ist die Wanduhrzeit in ``zone``.
+    """
+
+    __slots__ = ("zone", "wall", "all_day")
+
+    def __init__(self, value):
+        self.all_day = isinstance(value, date) and not isinstance(value, datetime)
+        if self.all_day:
+            self.zone = None
+            self.wall = to_epoch(datetime.combine(value, time.min))
+        elif value.tzinfo is None:
+            self.zone = None
+            self.wall = to_epoch(value)
+        else:
+            self.zone = _zone_for(value.tzinfo)
+            self.wall = to_epoch(value.replace(tzinfo=None))
+
+    def utc(self) -> int:
+        return (self.zone or LOCAL_ZONE).wall_to_utc(self.wall)
+
+    def wall_in(self, zone) -> int:
+        """Wanduhrzeit in ``zone`` (None = schwebend/lokal)."""
+        if self.zone is zone or (zone is None and self.zone is LOCAL_ZONE) or (self.zone is None and zone is LOCAL_ZONE):
+            return self.wall
+        return (zone or LOCAL_ZONE).utc_to_wall(self.utc())
+
+    def local(self) -> int:
+        """Lokale (naive) Anzeigezeit."""
+        return self.wall_in(None)
+
+
+def _prop_moment(prop):
+    return _Moment(getattr(prop, "dt", prop))
+
+
+def _iter_dts(props):
+    if not props:
+        return
+    for p in props if isinstance(props, list) else [props]:
+        for d in getattr(p, "dts", None) or []:
+            yield getattr(d, "dt", d)
+
+
+# ===========================
+# Expansion
+# ===========================
+def expand_calendar(path: str, window_start: datetime, window_end: datetime) -> list:
+    """
+    Liest eine ICS-Datei und expandiert alle Termine im Fenster.
+
+    Jeder Master wird einmal normalisiert und in der Wanduhrzeit seiner
+    eigenen Zone expandiert (schwebende und lokale Termine ohne jede
+    Umrechnung); erst die Vorkommen werden über gecachte Offsets in lokale
+    Zeit übertragen. Overrides (RECURRENCE-ID) werden über die normalisierte
+    Epoch-Zeit zugeordnet, unabhängig davon, in welcher Zone sie notiert sind.
+
+    Rückgabe: Liste von (start, end, all_day, title, uid), sortiert nach
+    (start, end). Fehler beim Lesen/Parsen liefern die bis dahin gesammelten
+    Termine (bzw. eine leere Liste).
+    """
+    out = []
+    try:
+        with open(path, "rb") as f:
+            cal = Calendar.from_ical(f.read())
+
+        masters = []
+        overrides = {}  # uid -> [(RECURRENCE-ID als _Moment, Komponente)]
+
+        for comp in cal.walk():
+            if comp.name != "VEVENT":
+                continue
+
+            uid = str(comp.get("UID") or "")
+            rec_id = comp.get("RECURRENCE-ID")
+
+            if rec_id:
+                overrides.setdefault(uid, []).append((_prop_moment(rec_id), comp))
+            else:
+                masters.append(comp)
+
+        for comp in masters:
+            uid = str(comp.get("UID") or "")
+            dtstart_prop = comp.get("DTSTART")
+            if not dtstart_prop:
+                continue
+
+            start = _prop_moment(dtstart_prop)
+            zone = start.zone
+            if zone is LOCAL_ZONE:
+                zone = None  # lokale Zone == schwebend: keinerlei Umrechnung nötig
+
+            end_prop = comp.get("DTEND")
+            duration = None
+            if end_prop is not None:
+                end = _prop_moment(end_prop)
+                duration = end.utc() - start.utc() if zone else end.local() - start.local()
+            else:
+                dur_prop = comp.get("DURATION")
+                if dur_prop:
+                    try:
+                        duration = int(getattr(dur_prop, "dt", dur_prop).total_seconds())
+                    except Exception:
+                        duration = None
+            if duration is None:
+                duration = 3600
+            duration_min1 = max(duration, 60)
+
+            summary_base = str(comp.get("SUMMARY") or "Termin")
+            all_day_base = start.all_day
+
+            rrule_prop = comp.get("RRULE")
+            rdate_props = comp.get("RDATE")
+            exdate_props = comp.get("EXDATE")
+
+            has_recur = bool(rrule_prop or rdate_props or exdate_props)
+
+            if not has_recur:
+                s = start.local()
+                if duration <= 0:
+                    e = s + 3600
+                elif zone is None:
+                    e = s + duration
+                else:
+                    e = LOCAL_ZONE.utc_to_wall(start.utc() + duration)
+                # Ende nach der Umrechnung nicht hinter dem Beginn (andere TZID, Zeitumstellung)
+                if e <= s:
+                    e = s + 3600
+                out.append((s, e, all_day_base, summary_base, uid))
+                continue
+
+            # Expansion in der Wanduhrzeit der Master-Zone
+            rset = rruleset()
+            wall_start = from_epoch(start.wall)
+
+            if rrule_prop:
+                try:
+                    rule_bytes = rrule_prop.to_ical() if hasattr(rrule_prop, "to_ical") else None
+                    rule_str = (rule_bytes.decode()
+                                if isinstance(rule_bytes, (bytes, bytearray))
+                                else (str(rule_bytes) if rule_bytes is not None else str(rrule_prop)))
+                    r = rrulestr(rule_str, dtstart=wall_start, ignoretz=True)
+                    until = _UNTIL_RE.search(rule_str)
+                    if until and until.group(1).upper().endswith("Z"):
+                        # UNTIL ist in UTC notiert -> in die Wanduhrzeit der Master-Zone umrechnen
+                        try:
+                            until_utc = datetime.strptime(until.group(1).upper(), "%Y%m%dT%H%M%SZ")
+                        except ValueError:
+                            until_utc = None  # unbekanntes Format: UNTIL bleibt, wie rrulestr es gelesen hat
+                        if until_utc is not None:
+                            r = r.replace(until=from_epoch((zone or LOCAL_ZONE).utc_to_wall(to_epoch(until_utc))))
+                    rset.rrule(r)
+                except Exception:
+                    pass
+
+            for d in _iter_dts(rdate_props):
+                try:
+                    rset.rdate(from_epoch(_Moment(d).wall_in(zone)))
+                except Exception:
+                    pass
+
+            for d in _iter_dts(exdate_props):
+                try:
+                    rset.exdate(from_epoch(_Moment(d).wall_in(zone)))
+                except Exception:
+                    pass
+
+            # Fenster (lokale Zeit) in die Wanduhrzeit der Master-Zone übertragen (±1 Tag Puffer)
+            try:
+                occurrences = rset.between(window_start - timedelta(days=1), window_end + timedelta(days=1), inc=True)
+            except Exception:
+                occurrences = []
+
+            # Overrides über normalisierte Zeit indizieren: UTC für zonierte, Wanduhrzeit für schwebende Master
+            ov_index = {}
+            for rid, ov in overrides.get(uid, ()):
+                if zone is None:
+                    ov_index[rid.local()] = ov
+                elif rid.zone is None:
+                    ov_index[zone.wall_to_utc(rid.wall)] = ov
+                else:
+                    ov_index[rid.utc()] = ov
+
+            lo, hi = to_epoch(window_start), to_epoch(window_end)
+            for occ in occurrences:
+                wall = to_epoch(occ)
+                if zone is None:
+                    key = wall
+                    s = wall
+                    e = wall + duration_min1
+                else:
+                    key = zone.wall_to_utc(wall)
+                    s = LOCAL_ZONE.utc_to_wall(key)
+                    e = LOCAL_ZONE.utc_to_wall(key + duration_min1)
+                if s < lo or s > hi:
+                    continue
+
+                ov = ov_index.get(key) if ov_index else None
+                if ov is None:
+                    if e <= s:
+                        e = s + 3600
+                    out.append((s, e, all_day_base, summary_base, uid))
+                    continue
+
+                o_dtstart_prop = ov.get("DTSTART")
+                o_dtend_prop = ov.get("DTEND")
+                if o_dtstart_prop:
+                    o_start_m = _prop_moment(o_dtstart_prop)
+                    o_start, o_all_day = o_start_m.local(), o_start_m.all_day
+                else:
+                    o_start, o_all_day = s, all_day_base
+                if o_dtend_prop:
+                    o_end = _prop_moment(o_dtend_prop).local()
+                else:
+                    o_end = o_start + duration_min1
+                if o_end <= o_start:
+                    o_end = o_start + 3600
+
+                o_summary = str(ov.get("SUMMARY") or summary_base)
+                out.append((o_start, o_end, o_all_day, o_summary, uid))
+
+    except Exception:
+        pass
+
+    out.sort(key=lambda r: (r[0], r[1]))
+    return out
+
+
+def _tag_rows(index: int, rows):
+    for s, e, all_day, title, uid in rows:
+        yield s, e, index, all_day, title, uid
+
+
+def merge_calendars(per_calendar):
+    """
+    k-Wege-Merge der (je Kalender bereits sortierten) Ergebnislisten.
+    Liefert (start, end, kalender_index, all_day, title, uid); bei gleichen
+    Zeiten bleibt die Kalender-Reihenfolge erhalten.
+    """
+    return heapq.merge(*(_tag_rows(i, rows) for i, rows in enumerate(per_calendar)),
+                       key=lambda r: (r[0], r[1]))
+
+
+# ===========================
+# Spaltenorientierte Ablage
+# ===========================
+class EventStore:
+    """
+    Alle Vorkommen als parallele Arrays statt als Liste von Dicts.
+
+    Zeile i: starts[i] / ends[i] (naive Epoch-Sekunden), cal_ids[i] (Index in
+    ``calendars`` = [(name, farbe, pfad), ...]), title_ids[i] / uid_ids[i]
+    (Index in den internierten Tabellen ``titles`` / ``uids``) und Bit i der
+    Bitmaske ``all_day``.
+    """
+
+    __slots__ = ("calendars", "titles", "uids", "starts", "ends", "cal_ids",
+                 "title_ids", "uid_ids", "all_day", "_title_index", "_uid_index")
+
+    def __init__(self, calendars):
+        self.calendars = list(calendars)
+        self.titles = []
+        self.uids = []
+        self._title_index = {}
+        self._uid_index = {}
+        self.starts = array("q")
+        self.ends = array("q")
+        self.cal_ids = array("H")
+        self.title_ids = array("I")
+        self.uid_ids = array("I")
+        self.all_day = bytearray()
+
+    @classmethod
+    def from_merged(cls, calendars, merged):
+        """Baut den Store aus der Ausgabe von merge_calendars()."""
+        store = cls(calendars)
+        for s, e, cal_id, all_day, title, uid in merged:
+            store.append(s, e, cal_id, all_day, title, uid)
+        return store
+
+    @staticmethod
+    def _intern(table, index, value):
+        idx = index.get(value)
+        if idx is None:
+            idx = index[value] = len(table)
+            table.append(value)
+        return idx
+
+    def append(self, start, end, cal_id, all_day, title, uid):
+        i = len(self.starts)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.cal_ids.append(cal_id)
+        self.title_ids.append(self._intern(self.titles, self._title_index, title))
+        self.uid_ids.append(self._intern(self.uids, self._uid_index, uid))
+        if i & 7 == 0:
+            self.all_day.append(0)
+        if all_day:
+            self.all_day[i >> 3] |= 1 << (i & 7)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def is_all_day(self, i: int) -> bool:
+        return bool((self.all_day[i >> 3] >> (i & 7)) & 1)
+
+    def row_key(self, i: int) -> tuple:
+        """Stabiler Schlüssel eines Vorkommens: (pfad, uid, start)."""
+        return self.calendars[self.cal_ids[i]][2], self.uids[self.uid_ids[i]], self.starts[i]
+
+    def row_signature(self, i: int) -> tuple:
+        """Alles, was sich bei gleichem Schlüssel ändern kann (für Deltas)."""
+        name, color, _ = self.calendars[self.cal_ids[i]]
+        return self.ends[i], self.is_all_day(i), self.titles[self.title_ids[i]], name, color
+
+    def overlapping_day(self, day: date) -> list:
+        """Indizes aller Vorkommen, deren Start- bis Enddatum ``day`` enthält."""
+        d = to_epoch(datetime.combine(day, time.min)) // 86400
+        starts, ends = self.starts, self.ends
+        return [i for i in range(len(starts)) if starts[i] // 86400 <= d <= ends[i] // 86400]
+
+    def to_payload(self, indices, ids) -> dict:
+        """
+        Kompakter, in sich geschlossener JSON-Payload für eine Zeilenauswahl.
+        ``ids`` sind die (vom Aufrufer vergebenen) Draht-IDs je Zeile.
+        """
+        titles, title_index, title_col = [], {}, []
+        uids, uid_index, uid_col = [], {}, []
+        bits = bytearray((len(indices) + 7) >> 3)
+        for n, i in enumerate(indices):
+            title_col.append(self._intern(titles, title_index, self.titles[self.title_ids[i]]))
+            uid_col.append(self._intern(uids, uid_index, self.uids[self.uid_ids[i]]))
+            if self.is_all_day(i):
+                bits[n >> 3] |= 1 << (n & 7)
+        return {
+            "cals": self.calendars,
+            "titles": titles,
+            "uids": uids,
+            "id": list(ids),
+            "start": [self.starts[i] for i in indices],
+            "end": [self.ends[i] for i in indices],
+            "cal": [self.cal_ids[i] for i in indices],
+            "title": title_col,
+            "uid": uid_col,
+            "allDay": base64.b64encode(bytes(bits)).decode("ascii"),
+        }
+
+
+# ===========================
+# Benchmark: python _kalender_ics.py [anzahl_kalender]
+# ===========================
+def _write_synthetic_calendar(path: str, n: int, seed: int):
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//Pro Calendar Plugin//Bench//"]
+    base = datetime.now().replace(minute=0, second=0, microsecond=0) - timedelta(days=700)
+    freqs = ["DAILY", "WEEKLY;BYDAY=MO,WE,FR", "WEEKLY", "MONTHLY"]
+    for i in range(n):
+        start = base + timedelta(days=(i * 7 + seed) % 60, hours=(i + seed) % 10)
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:bench-{seed}-{i}",
+            f"SUMMARY:Termin {seed}/{i}",
+            f"DTSTART;TZID=Europe/Berlin:{start:%Y%m%dT%H%M%S}",
+            f"DTEND;TZID=Europe/Berlin:{start + timedelta(hours=1):%Y%m%dT%H%M%S}",
+            f"RRULE:FREQ={freqs[i % len(freqs)]}",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\r\n".join(lines) + "\r\n")
+
+
+def _benchmark(num_calendars: int = 20, events_per_calendar: int = 40):
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+    from itertools import repeat
+
+    now = datetime.now()
+    ws, we = now - timedelta(days=730), now + timedelta(days=730)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(num_calendars):
+            p = os.path.join(tmp, f"bench_{i}.ics")
+            _write_synthetic_calendar(p, events_per_calendar, i)
+            paths.append(p)
+
+        t0 = _time.perf_counter()
+        seq = [expand_calendar(p, ws, we) for p in paths]
+        n_seq = sum(1 for _ in merge_calendars(seq))
+        t_seq = _time.perf_counter() - t0
+
+        with ProcessPoolExecutor() as pool:
+            t0 = _time.perf_counter()
+            par = list(pool.map(expand_calendar, paths, repeat(ws), repeat(we)))
+            n_par = sum(1 for _ in merge_calendars(par))
+            t_par = _time.perf_counter() - t0
+
+    print(f"{num_calendars} Kalender, {n_seq} Vorkommen, {os.cpu_count()} CPUs")
+    print(f"  sequenziell: {t_seq * 1000:8.1f} ms")
+    print(f"  parallel:    {t_par * 1000:8.1f} ms  ({n_par} Vorkommen, inkl. Pool-Start)")
+
+    _benchmark_formats(paths, seq)
+
+
+def _benchmark_formats(paths, per_calendar):
+    """Vergleicht Dict-Liste + JSON (altes Format) mit EventStore + Payload."""
+    import json
+    import tracemalloc
+
+    calendars = [(os.path.basename(p), "#8ab4f8", p) for p in paths]
+
+    tracemalloc.start()
+    t0 = _time.perf_counter()
+    dicts = [{
+        "title": title,
+        "start": from_epoch(s).isoformat(),
+        "end": from_epoch(e).isoformat(),
+        "allDay": bool(all_day),
+        "calendar": calendars[i][0],
+        "color": calendars[i][1],
+        "path": calendars[i][2],
+        "uid": uid,
+    } for s, e, i, all_day, title, uid in merge_calendars(per_calendar)]
+    old_json = json.dumps(dicts, ensure_ascii=False)
+    t_old = _time.perf_counter() - t0
+    peak_old = tracemalloc.get_traced_memory()[1]
+    del dicts
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    t0 = _time.perf_counter()
+    store = EventStore.from_merged(calendars, merge_calendars(per_calendar))
+    rows = range(len(store))
+    new_json = json.dumps(store.to_payload(rows, rows), ensure_ascii=False)
+    t_new = _time.perf_counter() - t0
+    peak_new = tracemalloc.get_traced_memory()[1]
+    del store
+    tracemalloc.stop()
+
+    print("  Format          Peak-RAM      JSON       Zeit")
+    print(f"  Dict-Liste  {peak_old / 2**20:8.1f} MB {len(old_json) / 2**20:7.1f} MB {t_old * 1000:8.1f} ms")
+    print(f"  EventStore  {peak_new / 2**20:8.1f} MB {len(new_json) / 2**20:7.1f} MB {t_new * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
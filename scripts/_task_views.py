@@ -0,0 +1,268 @@
+# scripts/_task_views.py
+"""
+Gemeinsame Seitenskripte der Aufgaben-Plugins (To-Do, sui): der ereignisgesteuerte
+Deadline-Zeitgeber und die gefensterte Liste für Aufgabenlisten und Kanban-Spalten.
+Beide Plugins binden die Strings in den <head> ihrer Seiten ein.
+
+Der führende Unterstrich hält die Datei aus der Plugin-Liste des Launchers heraus.
+"""
+
+DEADLINE_SCHEDULER_SCRIPT = """
+<script>
+// Ein gemeinsamer Zeitgeber für alle Deadline-Anzeigen der Seite. Statt alle paar
+// Sekunden jede Badge neu zu berechnen, liegt pro Badge der nächste Zeitpunkt, an dem
+// sich Status oder Text ändert, in einem Min-Heap; geweckt wird nur zu diesem Zeitpunkt
+// und nur für die betroffenen Badges. Neue/entfernte Badges meldet ein MutationObserver,
+// solange die Seite verborgen ist, ruht der Timer.
+class DeadlineScheduler {
+  // refresh(el, at, now) aktualisiert die Anzeige und liefert den nächsten
+  // Änderungszeitpunkt (ms) oder Infinity
+  constructor(selector, refresh) {
+    this.selector = selector;
+    this.refresh = refresh;
+    this.heap = [];          // [{ due, el, state }], Min-Heap nach due
+    this.live = new Map();   // Badge -> { at, due }
+    this.timer = null;
+    this.observer = new MutationObserver(records => this.onMutations(records));
+  }
+
+  start(root = document.body) {
+    root.querySelectorAll(this.selector).forEach(el => this.track(el, Date.now()));
+    this.observer.observe(root, { childList: true, subtree: true });
+    document.addEventListener('visibilitychange', () => {
+      if (document.hidden) this.sleep(); else this.tick();
+    });
+    this.arm();
+  }
+
+  track(el, now) {
+    const at = new Date(el.getAttribute('data-deadline')).getTime();
+    if (isNaN(at)) { this.live.delete(el); return; }
+    const state = { at, due: this.refresh(el, at, now) };
+    this.live.set(el, state);
+    if (state.due !== Infinity) this.push({ due: state.due, el, state });
+  }
+
+  collect(node, fn) {
+    if (node.nodeType !== 1) return;
+    if (node.matches(this.selector)) fn(node);
+    node.querySelectorAll(this.selector).forEach(fn);
+  }
+
+  onMutations(records) {
+    const now = Date.now();
+    for (const r of records) {
+      r.removedNodes.forEach(n => this.collect(n, el => this.live.delete(el)));
+      r.addedNodes.forEach(n => this.collect(n, el => { if (el.isConnected) this.track(el, now); }));
+    }
+    // Veraltete Einträge (entfernte oder neu geplante Badges) gelegentlich aufräumen
+    if (this.heap.length > 2 * this.live.size + 64) {
+      this.heap = this.heap.filter(e => this.live.get(e.el) === e.state).sort((a, b) => a.due - b.due);
+    }
+    this.arm();
+  }
+
+  tick() {
+    this.timer = null;
+    const now = Date.now();
+    while (this.heap.length && this.heap[0].due <= now) {
+      const e = this.pop();
+      if (this.live.get(e.el) !== e.state) continue;
+      e.state.due = this.refresh(e.el, e.state.at, now);
+      if (e.state.due !== Infinity) this.push(e);
+    }
+    this.arm();
+  }
+
+  arm() {
+    if (this.timer !== null) { clearTimeout(this.timer); this.timer = null; }
+    if (document.hidden || !this.heap.length) return;
+    // Lange Pausen begrenzen (setTimeout-Obergrenze, Uhrzeitsprünge nach Standby)
+    const delay = Math.min(Math.max(0, this.heap[0].due - Date.now()), DeadlineScheduler.MAX_SLEEP_MS);
+    this.timer = setTimeout(() => this.tick(), delay);
+  }
+
+  sleep() {
+    if (this.timer !== null) { clearTimeout(this.timer); this.timer = null; }
+  }
+
+  push(e) {
+    const h = this.heap;
+    let i = h.push(e) - 1;
+    while (i > 0) {
+      const p = (i - 1) >> 1;
+      if (h[p].due <= h[i].due) break;
+      [h[p], h[i]] = [h[i], h[p]];
+      i = p;
+    }
+  }
+
+  pop() {
+    const h = this.heap;
+    const top = h[0], last = h.pop();
+    if (h.length) {
+      h[0] = last;
+      let i = 0;
+      for (;;) {
+        const l = 2 * i + 1, r = l + 1;
+        let m = i;
+        if (l < h.length && h[l].due < h[m].due) m = l;
+        if (r < h.length && h[r].due < h[m].due) m = r;
+        if (m === i) break;
+        [h[m], h[i]] = [h[i], h[m]];
+        i = m;
+      }
+    }
+    return top;
+  }
+
+  // Nächste Änderung einer Badge im Hauptfenster: normal -> urgent (24 h vorher),
+  // dann Stunden-, in der letzten Stunde Minutentext, danach die Überfällig-Tage
+  static nextBadgeChange(at, now) {
+    const diff = at - now;
+    const MIN = 60000, HOUR = 3600000, DAY = 86400000;
+    if (diff >= DAY) return at - DAY + 1;
+    if (diff >= HOUR) return at - Math.floor(diff / HOUR) * HOUR + 1;
+    if (diff >= 0) return at - Math.floor(diff / MIN) * MIN + 1;
+    return at + (Math.floor(-diff / DAY) + 1) * DAY;
+  }
+}
+DeadlineScheduler.MAX_SLEEP_MS = 6 * 3600000;
+</script>
+"""
+
+WINDOWED_LIST_SCRIPT = """
+<script>
+// Fensterung für Liste und Kanban-Spalten.
+// Nur die sichtbaren Zeilen (plus Überhang) liegen im DOM; der Rest wird durch
+// Padding am Fenster-Element ersetzt. Zeilen dürfen unterschiedlich hoch sein:
+// gemessene Höhen werden pro Schlüssel gemerkt, unbekannte geschätzt.
+class WindowedList {
+  // paint(win, slice) muss win genau die Knoten für slice (in Reihenfolge) geben
+  constructor(scrollEl, { keyOf, paint, estimate = 60, overscan = 6, empty = '' }) {
+    this.scrollEl = scrollEl;
+    this.keyOf = keyOf;
+    this.paint = paint;
+    this.estimate = estimate;
+    this.overscan = overscan;
+    this.items = [];
+    this.heights = new Map();  // Schlüssel -> gemessene Höhe inkl. Abstand
+    this.measured = { sum: 0, count: 0 };
+    this.offsets = null;       // Präfixsummen der Höhen, null = neu berechnen
+    this.frame = 0;
+    this.held = false;
+
+    this.emptyEl = document.createElement('div');
+    this.emptyEl.className = 'vlist-empty';
+    this.emptyEl.innerHTML = empty;
+    this.win = document.createElement('div');
+    this.win.className = 'vlist-window';
+    this.win.vlist = this;
+    scrollEl.innerHTML = '';
+    scrollEl.append(this.emptyEl, this.win);
+
+    scrollEl.addEventListener('scroll', () => this.schedule(), { passive: true });
+    new ResizeObserver(() => { this.offsets = null; this.schedule(); }).observe(scrollEl);
+  }
+
+  setItems(items) {
+    this.items = items;
+    this.offsets = null;
+    if (this.heights.size > 2 * items.length + 256) {
+      const keep = new Map();
+      items.forEach(it => { const k = this.keyOf(it); if (this.heights.has(k)) keep.set(k, this.heights.get(k)); });
+      this.heights = keep;
+    }
+    this.draw();
+  }
+
+  // Während eines Drags nicht neu zeichnen, damit die gezogene Karte im DOM bleibt
+  hold(on) {
+    this.held = on;
+    if (!on) this.schedule();
+  }
+
+  schedule() {
+    if (this.held || this.frame) return;
+    this.frame = requestAnimationFrame(() => this.draw());
+  }
+
+  heightOf(item) {
+    const h = this.heights.get(this.keyOf(item));
+    if (h !== undefined) return h;
+    return this.measured.count ? this.measured.sum / this.measured.count : this.estimate;
+  }
+
+  getOffsets() {
+    if (!this.offsets) {
+      const n = this.items.length;
+      const offs = new Float64Array(n + 1);
+      for (let i = 0; i < n; i++) offs[i + 1] = offs[i] + this.heightOf(this.items[i]);
+      this.offsets = offs;
+    }
+    return this.offsets;
+  }
+
+  // Index der Zeile, in der y liegt
+  indexAt(y) {
+    const offs = this.getOffsets();
+    let lo = 0, hi = this.items.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (offs[mid + 1] <= y) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+  }
+
+  draw() {
+    if (this.frame) { cancelAnimationFrame(this.frame); this.frame = 0; }
+    const n = this.items.length;
+    this.emptyEl.style.display = n ? 'none' : '';
+
+    const scrollBox = this.scrollEl.getBoundingClientRect();
+    const winTop = this.win.getBoundingClientRect().top - scrollBox.top + this.scrollEl.scrollTop;
+    const viewTop = this.scrollEl.scrollTop - winTop;
+    const viewBottom = viewTop + this.scrollEl.clientHeight;
+    const start = Math.max(0, this.indexAt(viewTop) - this.overscan);
+    const end = Math.min(n, this.indexAt(viewBottom) + 1 + this.overscan);
+
+    this.paint(this.win, this.items.slice(start, end));
+    this.measure(start, end);
+    const offs = this.getOffsets();
+    this.win.style.paddingTop = offs[start] + 'px';
+    this.win.style.paddingBottom = (offs[n] - offs[end]) + 'px';
+    // Zeilen niedriger als geschätzt: Ausschnitt reicht nicht bis unten, nachzeichnen
+    if (end < n && offs[end] < viewBottom) this.schedule();
+  }
+
+  measure(start, end) {
+    const rows = this.win.children;
+    if (!rows.length) return;
+    const cs = getComputedStyle(rows[rows.length - 1]);
+    const gap = (parseFloat(getComputedStyle(this.win).rowGap) || 0) + parseFloat(cs.marginTop) + parseFloat(cs.marginBottom);
+    for (let i = 0; i < rows.length && start + i < end; i++) {
+      const h = i + 1 < rows.length ? rows[i + 1].offsetTop - rows[i].offsetTop : rows[i].offsetHeight + gap;
+      const key = this.keyOf(this.items[start + i]);
+      const old = this.heights.get(key);
+      if (old === h) continue;
+      if (old === undefined) { this.measured.sum += h; this.measured.count++; }
+      else this.measured.sum += h - old;
+      this.heights.set(key, h);
+      this.offsets = null;
+    }
+  }
+}
+
+// Gezogene Karte: ihre Liste pausiert bis dragend
+let heldList = null;
+function holdListOf(el) {
+  const win = el.closest('.vlist-window');
+  heldList = win ? win.vlist : null;
+  if (heldList) heldList.hold(true);
+}
+function releaseHeldList() {
+  if (heldList) heldList.hold(false);
+  heldList = null;
+}
+</script>
+"""
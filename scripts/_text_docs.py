@@ -0,0 +1,378 @@
+# scripts/_text_docs.py
+"""
+Gemeinsame Bausteine für die Text-Plugins (Notizen, readme): Patch-Anwendung mit
+UTF-16-Offsets aus dem Editor, Write-Behind-Puffer mit Revisionen und die
+seitenweise abrufbare Metadatenliste mit Änderungs-Token samt der virtualisierten
+Seitenliste (VIRTUAL_LIST_JS), die sie im Browser anzeigt.
+
+Der führende Unterstrich hält die Datei aus der Plugin-Liste des Launchers heraus.
+"""
+import re
+
+# Zeichen außerhalb der BMP belegen in JS (UTF-16) zwei Positionen, in Python eine
+_ASTRAL_RE = re.compile('[\U00010000-\U0010FFFF]')
+
+
+def _utf16_index(text, offset):
+    """Rechnet einen UTF-16-Offset aus dem Editor in einen Python-Stringindex um."""
+    return len(text.encode('utf-16-le')[:2 * offset].decode('utf-16-le'))
+
+
+def apply_text_patch(text, ops, astral=None):
+    """
+    Wendet Patch-Operationen [[start, delete_count, insert], ...] nacheinander auf
+    text an. Offsets sind UTF-16-Codeeinheiten wie in JS. ValueError bei
+    ungültigen Bereichen.
+    """
+    if astral is None:
+        astral = _ASTRAL_RE.search(text) is not None
+    for start, delete_count, insert in ops:
+        start, delete_count = int(start), int(delete_count)
+        if astral:
+            end = _utf16_index(text, start + delete_count)
+            start = _utf16_index(text, start)
+        else:
+            end = start + delete_count
+        if start < 0 or delete_count < 0 or end > len(text):
+            raise ValueError("Patch passt nicht zum Dokument")
+        text = text[:start] + insert + text[end:]
+        astral = astral or _ASTRAL_RE.search(insert) is not None
+    return text, astral
+
+
+class WriteBehindBuffer:
+    """
+    In-Memory-Stand der geöffneten Dokumente mit Revisionszähler.
+
+    Der Editor schickt Patches gegen eine bekannte Revision; passt die Revision
+    nicht, wird None geliefert und der Client sendet den vollen Text. Geschrieben
+    wird gesammelt über flush() (Write-Behind).
+
+    Fenster und Popup eines Plugins haben je einen eigenen Puffer über derselben
+    Ablage. Mit stamp (key -> Stempel der Ablage, z.B. (mtime_ns, size)) merkt sich
+    der Puffer, auf welchem Stand ein Dokument beruht; hat ein anderer Puffer
+    inzwischen geschrieben, wird der eigene Stand verworfen statt zurückgeschrieben
+    und on_external(key) aufgerufen.
+    """
+
+    MAX_CLEAN_DOCS = 8
+
+    def __init__(self, read, stamp=None, on_external=None):
+        self._read = read
+        self._stamp = stamp
+        self._on_external = on_external
+        self._docs = {}  # key -> [rev, text, astral, dirty, stamp]
+        self._last_rev = 0  # Revisionen werden nie wiederverwendet, auch nach dem Verdrängen nicht
+
+    def _new_rev(self):
+        self._last_rev += 1
+        return self._last_rev
+
+    def _current_stamp(self, key):
+        return self._stamp(key) if self._stamp else None
+
+    def _touch(self, key):
+        doc = self._docs.pop(key)
+        self._docs[key] = doc
+        return doc
+
+    def _check(self, key):
+        """Verwirft den gepufferten Stand, wenn die Ablage inzwischen anders aussieht."""
+        doc = self._docs.get(key)
+        if doc is None or self._stamp is None or self._current_stamp(key) == doc[4]:
+            return
+        del self._docs[key]
+        if doc[3]:
+            print(f"'{key}' wurde an anderer Stelle gespeichert, ungesicherte Änderung verworfen.")
+        if self._on_external:
+            self._on_external(key)
+
+    def open(self, key):
+        """(text, rev) oder None, falls das Dokument nicht existiert."""
+        self._check(key)
+        if key in self._docs:
+            doc = self._touch(key)
+        else:
+            stamp = self._current_stamp(key)  # vor dem Lesen, sonst bliebe eine Änderung dazwischen unbemerkt
+            text = self._read(key)
+            if text is None:
+                return None
+            doc = self._docs[key] = [self._new_rev(), text, None, False, stamp]
+            self._evict()
+        return doc[1], doc[0]
+
+    def text(self, key):
+        self._check(key)
+        doc = self._docs.get(key)
+        return doc[1] if doc else None
+
+    def replace(self, key, text):
+        """Setzt den vollen Text (überschreibt bewusst den Stand der Ablage); liefert die neue Revision."""
+        self._docs.pop(key, None)
+        rev = self._new_rev()
+        self._docs[key] = [rev, text, None, True, self._current_stamp(key)]
+        return rev
+
+    def patch(self, key, base_rev, ops):
+        """Neue Revision oder None bei Konflikt/ungültigem Patch."""
+        self._check(key)
+        doc = self._docs.get(key)
+        if doc is None or doc[0] != base_rev:
+            return None
+        try:
+            text, astral = apply_text_patch(doc[1], ops, doc[2])
+        except (ValueError, TypeError, UnicodeDecodeError):
+            return None
+        doc[0] = self._new_rev()
+        doc[1], doc[2], doc[3] = text, astral, True
+        self._touch(key)
+        return doc[0]
+
+    def saved(self, key, stamp):
+        """Nach eigenem Schreiben: Stempel der Ablage als neue Basis übernehmen."""
+        if key in self._docs:
+            self._docs[key][4] = stamp
+
+    def discard(self, key):
+        self._docs.pop(key, None)
+
+    def mark_dirty(self, key):
+        """Nach fehlgeschlagenem Schreiben erneut vormerken."""
+        if key in self._docs:
+            self._docs[key][3] = True
+
+    def take_dirty(self):
+        """Liefert [(key, text)] aller geänderten Dokumente und markiert sie als sauber."""
+        out = []
+        for key in [key for key, doc in self._docs.items() if doc[3]]:
+            self._check(key)
+            doc = self._docs.get(key)
+            if doc is not None:
+                doc[3] = False
+                out.append((key, doc[1]))
+        self._evict()
+        return out
+
+    def _evict(self):
+        clean = [key for key, doc in self._docs.items() if not doc[3]]
+        for key in clean[:max(0, len(clean) - self.MAX_CLEAN_DOCS)]:
+            del self._docs[key]
+
+
+class MetaListing:
+    """
+    Sortierte, seitenweise abrufbare Liste von Metadaten mit Änderungs-Token.
+
+    Jeder Eintrag ist ein dict mit dem Schlüsselfeld key_field sowie "size" und
+    "mtime". Clients holen Seiten über page() und danach nur noch die Änderungen
+    seit ihrem letzten Token über changes(). Ist das Token älter als das
+    Änderungsprotokoll, wird ein Reset signalisiert.
+    """
+
+    MAX_LOG = 2000
+
+    def __init__(self, items, key_field="title"):
+        self.key_field = key_field
+        self.sort_keys = {
+            "title": lambda m: m[key_field].lower(),
+            "mtime": lambda m: (m["mtime"], m[key_field].lower()),
+            "size": lambda m: (m["size"], m[key_field].lower()),
+        }
+        self._items = {m[key_field]: m for m in items}
+        self.token = 1
+        self._log = []      # [(token, key)]
+        self._sorted = {}   # (sort, descending) -> sortierte Liste
+
+    def _bump(self, key):
+        self.token += 1
+        self._log.append((self.token, key))
+        if len(self._log) > self.MAX_LOG:
+            del self._log[:len(self._log) - self.MAX_LOG]
+        self._sorted.clear()
+
+    def upsert(self, meta):
+        self._items[meta[self.key_field]] = meta
+        self._bump(meta[self.key_field])
+
+    def remove(self, key):
+        if self._items.pop(key, None) is not None:
+            self._bump(key)
+
+    def rebase(self, items):
+        """Ersetzt alle Einträge (Ablage wurde von außen geändert); Clients bekommen einen Reset."""
+        self._items = {m[self.key_field]: m for m in items}
+        self.token += 1
+        self._log = []
+        self._sorted.clear()
+
+    def page(self, offset, limit, sort="title", descending=False):
+        sort = sort if sort in self.sort_keys else "title"
+        order_key = (sort, bool(descending))
+        order = self._sorted.get(order_key)
+        if order is None:
+            order = self._sorted[order_key] = sorted(
+                self._items.values(), key=self.sort_keys[sort], reverse=bool(descending))
+        offset = max(0, int(offset))
+        limit = max(0, int(limit))
+        return {"token": self.token, "total": len(order), "offset": offset,
+                "items": order[offset:offset + limit]}
+
+    def changes(self, since):
+        since = int(since)
+        if since >= self.token:
+            return {"token": self.token, "reset": False, "upserts": [], "removed": []}
+        if not self._log or since < self._log[0][0] - 1:
+            return {"token": self.token, "reset": True, "upserts": [], "removed": []}
+        keys = {key for tok, key in self._log if tok > since}
+        return {
+            "token": self.token,
+            "reset": False,
+            "upserts": [self._items[k] for k in keys if k in self._items],
+            "removed": [k for k in keys if k not in self._items],
+        }
+
+
+# Gegenstück zu MetaListing im Browser; Notizen und readme stellen es ihrem MAIN_JS voran
+VIRTUAL_LIST_JS = """
+/**
+ * Virtualisierte Liste: nur die sichtbaren Zeilen (plus Überhang) liegen im DOM,
+ * die Daten kommen seitenweise vom Backend und werden pro Seite zwischengespeichert.
+ */
+class VirtualList {
+    constructor(container, opts) {
+        this.el = container;
+        this.rowHeight = opts.rowHeight;
+        this.pageSize = opts.pageSize || 200;
+        this.overscan = opts.overscan || 10;
+        this.fetchPage = opts.fetchPage;     // (offset, limit, sort, descending) => {token, total, offset, items}
+        this.fetchChanges = opts.fetchChanges; // (since) => {token, reset, upserts, removed}
+        this.renderRow = opts.renderRow;     // (li, item|undefined) => void
+        this.keyOf = opts.keyOf;
+        this.sort = "title";
+        this.descending = false;
+        this.token = 0;
+        this.total = 0;
+        this.pages = new Map();    // Seitennummer -> Items
+        this.pending = new Set();
+        this.rows = new Map();     // Index -> <li>
+        this.frame = 0;
+
+        this.spacer = document.createElement('li');
+        this.spacer.className = 'vl-spacer';
+        this.el.appendChild(this.spacer);
+        this.el.addEventListener('scroll', () => this.scheduleDraw(), { passive: true });
+        window.addEventListener('resize', () => this.scheduleDraw());
+    }
+
+    setSort(sort, descending) {
+        this.sort = sort;
+        this.descending = !!descending;
+        this.el.scrollTop = 0;
+        return this.reload();
+    }
+
+    async reload() {
+        this.pages.clear();
+        this.token = 0;
+        await this.loadPage(0);
+    }
+
+    // Holt nur die Änderungen seit dem letzten Token und patcht, wo es die Sortierung erlaubt
+    async sync() {
+        if (!this.token) return this.reload();
+        const ch = await this.fetchChanges(this.token);
+        if (ch.token === this.token) return;
+        if (ch.reset) return this.reload();
+
+        const located = (this.sort === "title" && !ch.removed.length)
+            ? ch.upserts.map(item => this.locate(this.keyOf(item))) : null;
+        if (located && located.every(pos => pos)) {
+            // Nur bekannte Einträge geändert, Reihenfolge nach Titel bleibt gleich
+            ch.upserts.forEach((item, i) => {
+                const [page, idx] = located[i];
+                this.pages.get(page)[idx] = item;
+            });
+            this.token = ch.token;
+            this.refreshRows();
+            return;
+        }
+        // Position unklar (neue/gelöschte Einträge oder Sortierung betroffen): sichtbare Seiten neu holen
+        this.pages.clear();
+        this.token = ch.token;
+        await this.loadPage(Math.floor(this.el.scrollTop / this.rowHeight / this.pageSize));
+    }
+
+    locate(key) {
+        for (const [page, items] of this.pages) {
+            const idx = items.findIndex(item => this.keyOf(item) === key);
+            if (idx >= 0) return [page, idx];
+        }
+        return null;
+    }
+
+    async loadPage(page) {
+        if (this.pending.has(page)) return;
+        this.pending.add(page);
+        try {
+            const res = await this.fetchPage(page * this.pageSize, this.pageSize, this.sort, this.descending);
+            if (res.token < this.token) return; // veraltete Antwort
+            if (res.token !== this.token) {
+                this.pages.clear();
+                this.token = res.token;
+            }
+            this.total = res.total;
+            this.pages.set(page, res.items);
+        } catch (e) {
+            console.error("Fehler beim Laden der Listenseite:", e);
+            return;
+        } finally {
+            this.pending.delete(page);
+        }
+        this.draw();
+    }
+
+    itemAt(index) {
+        const page = this.pages.get(Math.floor(index / this.pageSize));
+        return page ? page[index % this.pageSize] : undefined;
+    }
+
+    scheduleDraw() {
+        if (this.frame) return;
+        this.frame = requestAnimationFrame(() => {
+            this.frame = 0;
+            this.draw();
+        });
+    }
+
+    draw() {
+        this.spacer.style.height = (this.total * this.rowHeight) + 'px';
+        const first = Math.max(0, Math.floor(this.el.scrollTop / this.rowHeight) - this.overscan);
+        const last = Math.min(this.total - 1,
+            Math.ceil((this.el.scrollTop + this.el.clientHeight) / this.rowHeight) + this.overscan);
+
+        for (const [index, li] of this.rows) {
+            if (index < first || index > last) {
+                li.remove();
+                this.rows.delete(index);
+            }
+        }
+        for (let index = first; index <= last; index++) {
+            const item = this.itemAt(index);
+            if (item === undefined) this.loadPage(Math.floor(index / this.pageSize));
+            let li = this.rows.get(index);
+            if (!li) {
+                li = document.createElement('li');
+                li.style.top = (index * this.rowHeight) + 'px';
+                this.rows.set(index, li);
+                this.el.appendChild(li);
+            }
+            this.renderRow(li, item);
+        }
+    }
+
+    // Sichtbare Zeilen neu beschriften, z.B. nach Änderung der Auswahl
+    refreshRows() {
+        for (const [index, li] of this.rows) this.renderRow(li, this.itemAt(index));
+    }
+}
+"""
@@ -0,0 +1,511 @@
+# scripts/_timeline_canvas.py
+"""
+Canvas-Zeitachse und Gantt-Renderer (TimelineCanvas) für Projektmanager und
+Milestone Master. Beide Plugins binden TIMELINE_CANVAS_SCRIPT in den <head> ein.
+
+Der führende Unterstrich hält die Datei aus der Plugin-Liste des Launchers heraus.
+"""
+
+TIMELINE_CANVAS_SCRIPT = """
+<script>
+// Zeitachse und Gantt auf einem <canvas> statt einem DOM-Knoten pro Eintrag.
+// Gezeichnet wird nur der Sichtbereich: Punkte liegen nach Datum sortiert und werden
+// per Binärsuche eingegrenzt, im Gantt zählen nur die sichtbaren Zeilen. Beim
+// Herauszoomen werden Punkte, die enger als clusterPx liegen, zu einem Sammelpunkt
+// mit Anzahl zusammengefasst (Klick zoomt hinein), Beschriftungen entfallen, wenn
+// kein Platz ist, und das Raster wechselt von Tagen bis zu Jahren. Klicks und Ziehen
+// prüfen die Trefferflächen des letzten Frames bzw. die Zeile unter dem Zeiger.
+class TimelineCanvas {
+  // items: [{ id, start, end, label, sub, color, fill, dep }], Zeiten in ms (UTC-Tage),
+  // color/fill als Namen von CSS-Variablen. mode 'track': ein Punkt pro Eintrag bei end,
+  // mode 'rows': ein Balken start..end pro Zeile in der übergebenen Reihenfolge, title steht
+  // über der Namensspalte.
+  constructor(host, opts) {
+    this.host = host;
+    this.opts = Object.assign({
+      mode: 'track', rowHeight: 32, labelWidth: 0, headerHeight: 26, clusterPx: 14, title: '',
+      palette: {}, onClick: null, onDrag: null, tooltip: null
+    }, opts);
+    this.pal = Object.assign({
+      text: '--text', muted: '--muted', line: '--border', accent: '--accent', today: '--danger', bg: '--card-bg'
+    }, this.opts.palette);
+    this.canvas = document.createElement('canvas');
+    this.canvas.style.display = 'block';
+    this.canvas.style.touchAction = 'none';
+    host.innerHTML = '';
+    host.appendChild(this.canvas);
+    this.ctx = this.canvas.getContext('2d');
+    this.items = [];
+    this.index = new Map();   // id -> Position in items
+    this.deps = [];           // [{ a, b }] Abhängigkeiten als Zeitspanne, sortiert nach a
+    this.range = null;        // { start, end } des Projekts
+    this.t0 = 0;              // Zeit am linken Rand der Zeichenfläche
+    this.msPerPx = 864e5;
+    this.scrollY = 0;
+    this.userView = false;    // Zoom/Verschiebung vom Benutzer -> nicht automatisch einpassen
+    this.w = 0; this.h = 0; this.dpr = 1;
+    this.hits = [];           // Trefferflächen des letzten Frames (track)
+    this.colors = new Map(); this.colorKey = null;
+    this.frame = 0; this.drag = null; this.preview = null; this.hoverKey = null;
+    this.bind();
+    this.resize();
+    if (window.ResizeObserver) new ResizeObserver(() => this.resize()).observe(host);
+    // Theme-Wechsel setzt nur die Klasse am body
+    new MutationObserver(() => this.invalidate()).observe(document.body, { attributes: true, attributeFilter: ['class'] });
+  }
+
+  setItems(items, range) {
+    const sameRange = range && this.range && range.start === this.range.start && range.end === this.range.end;
+    this.range = range || null;
+    this.items = this.opts.mode === 'track' ? items.slice().sort((a, b) => a.end - b.end) : items.slice();
+    this.reindex();
+    if (!sameRange) { this.userView = false; this.scrollY = 0; }
+    if (!this.userView) this.fit();
+    this.invalidate();
+  }
+
+  // Einen Eintrag ersetzen, ohne alle neu aufzubauen
+  updateItem(item) {
+    const i = this.index.get(item.id);
+    if (i === undefined) return;
+    const old = this.items[i];
+    this.items[i] = item;
+    if (old.end !== item.end || old.dep !== item.dep) {
+      if (this.opts.mode === 'track') this.items.sort((a, b) => a.end - b.end);
+      this.reindex();
+    }
+    this.invalidate();
+  }
+
+  reindex() {
+    this.index = new Map();
+    this.items.forEach((it, i) => this.index.set(it.id, i));
+    this.deps = [];
+    this.items.forEach(it => {
+      const j = it.dep ? this.index.get(it.dep) : undefined;
+      if (j === undefined) return;
+      const d = this.items[j];
+      this.deps.push({ a: Math.min(d.end, it.end), b: Math.max(d.end, it.end) });
+    });
+    this.deps.sort((x, y) => x.a - y.a);
+  }
+
+  fit() {
+    const span = this.w - this.opts.labelWidth, pad = this.opts.mode === 'track' ? 40 : 12;
+    if (!this.range || span <= 2 * pad) return;
+    this.msPerPx = Math.max(1, (this.range.end - this.range.start) / (span - 2 * pad));
+    this.t0 = this.range.start - pad * this.msPerPx;
+  }
+
+  resize() {
+    const r = this.host.getBoundingClientRect(), dpr = window.devicePixelRatio || 1;
+    const w = Math.round(r.width), h = Math.round(r.height);
+    if (w === this.w && h === this.h && dpr === this.dpr) return;
+    this.w = w; this.h = h; this.dpr = dpr;
+    this.canvas.width = Math.max(1, Math.round(w * dpr));
+    this.canvas.height = Math.max(1, Math.round(h * dpr));
+    this.canvas.style.width = w + 'px';
+    this.canvas.style.height = h + 'px';
+    if (!this.userView) this.fit();
+    this.invalidate();
+  }
+
+  invalidate() {
+    if (!this.frame) this.frame = requestAnimationFrame(() => { this.frame = 0; this.draw(); });
+  }
+
+  xOf(t) { return this.opts.labelWidth + (t - this.t0) / this.msPerPx; }
+  tOf(x) { return this.t0 + (x - this.opts.labelWidth) * this.msPerPx; }
+
+  zoomAt(x, factor) {
+    const t = this.tOf(x);
+    this.msPerPx = Math.min(TimelineCanvas.MAX_MS_PER_PX, Math.max(TimelineCanvas.MIN_MS_PER_PX, this.msPerPx * factor));
+    this.t0 = t - (x - this.opts.labelWidth) * this.msPerPx;
+  }
+
+  color(name) {
+    let c = this.colors.get(name);
+    if (c === undefined) {
+      c = getComputedStyle(this.host).getPropertyValue(name).trim() || '#888';
+      this.colors.set(name, c);
+    }
+    return c;
+  }
+
+  // erster Index mit end >= t (track: items nach end sortiert)
+  lowerBound(t) {
+    let lo = 0, hi = this.items.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (this.items[mid].end < t) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+  }
+
+  itemAt(i) {
+    const it = this.items[i];
+    return this.preview && this.preview.id === it.id ? Object.assign({}, it, { end: this.preview.end }) : it;
+  }
+
+  // Rastereinheit so wählen, dass zwischen zwei Beschriftungen mindestens 64 px liegen
+  ticks(x0) {
+    const units = TimelineCanvas.UNITS, out = [];
+    let u = units[units.length - 1];
+    for (let i = 0; i < units.length; i++) if (units[i].ms / this.msPerPx >= 64) { u = units[i]; break; }
+    const stride = Math.max(1, Math.ceil(64 / (u.ms / this.msPerPx)));
+    const tEnd = this.tOf(this.w);
+    let t = u.floor(this.tOf(x0));
+    for (let n = 0; t <= tEnd && out.length < 200; n++) {
+      if (n % stride === 0) out.push({ t: t, label: u.label(new Date(t)) });
+      t = u.next(t);
+    }
+    return out;
+  }
+
+  draw() {
+    const ctx = this.ctx, key = document.body.className;
+    if (key !== this.colorKey) { this.colorKey = key; this.colors.clear(); }
+    ctx.setTransform(this.dpr, 0, 0, this.dpr, 0, 0);
+    ctx.clearRect(0, 0, this.w, this.h);
+    this.hits = [];
+    if (!this.range || this.w <= 0 || this.h <= 0) return;
+    if (this.opts.mode === 'rows') this.drawRows(ctx); else this.drawTrack(ctx);
+  }
+
+  drawTrack(ctx) {
+    const o = this.opts, w = this.w, cy = Math.round(this.h / 2), font = TimelineCanvas.FONT;
+    const now = Date.now(), rs = this.range.start, re = this.range.end;
+
+    // Raster mit Datumsbeschriftung am unteren Rand
+    ctx.font = '9px ' + font; ctx.textAlign = 'left'; ctx.textBaseline = 'alphabetic';
+    this.ticks(0).forEach(tk => {
+      const x = Math.round(this.xOf(tk.t));
+      ctx.globalAlpha = 0.35; ctx.fillStyle = this.color(this.pal.line); ctx.fillRect(x, 0, 1, this.h - 14);
+      ctx.globalAlpha = 1; ctx.fillStyle = this.color(this.pal.muted); ctx.fillText(tk.label, x + 3, this.h - 3);
+    });
+
+    // Projektspanne und Fortschritt bis heute
+    const xs = Math.max(-10, this.xOf(rs)), xe = Math.min(w + 10, this.xOf(re));
+    const xn = Math.max(xs, Math.min(xe, this.xOf(Math.max(rs, Math.min(re, now)))));
+    if (xe > xs) {
+      ctx.fillStyle = this.color(this.pal.line); TimelineCanvas.roundRect(ctx, xs, cy - 3, xe - xs, 6, 3); ctx.fill();
+      ctx.globalAlpha = 0.85; ctx.fillStyle = this.color(this.pal.accent);
+      if (xn > xs) { TimelineCanvas.roundRect(ctx, xs, cy - 3, xn - xs, 6, 3); ctx.fill(); }
+      ctx.globalAlpha = 1;
+    }
+
+    const tA = this.tOf(-o.clusterPx - 60), tB = this.tOf(w + o.clusterPx + 60);
+
+    // Abhängigkeiten: nur Spannen, die den Sichtbereich schneiden
+    ctx.globalAlpha = 0.35; ctx.fillStyle = this.color(this.pal.muted);
+    for (let i = 0; i < this.deps.length && this.deps[i].a <= tB; i++) {
+      const d = this.deps[i];
+      if (d.b < tA) continue;
+      const x1 = Math.max(-2, this.xOf(d.a)), x2 = Math.min(w + 2, this.xOf(d.b));
+      ctx.fillRect(x1, cy - 1, x2 - x1, 2);
+    }
+    ctx.globalAlpha = 1;
+
+    // Heute-Markierung
+    if (now >= tA && now <= tB) {
+      const x = Math.round(this.xOf(now));
+      ctx.fillStyle = this.color(this.pal.today);
+      ctx.fillRect(x - 1, cy - 18, 2, 36);
+      ctx.font = '700 9px ' + font; ctx.textAlign = 'center';
+      TimelineCanvas.roundRect(ctx, x - 22, cy - 36, 44, 14, 7); ctx.fill();
+      ctx.fillStyle = '#fff'; ctx.fillText('HEUTE', x, cy - 26);
+    }
+
+    // Punkte gruppieren: alles, was näher als clusterPx am ersten Punkt einer Gruppe liegt
+    const dragged = this.drag && this.drag.moved && this.preview ? this.preview.id : null;
+    const groups = [];
+    for (let i = this.lowerBound(tA), n = this.items.length; i < n && this.items[i].end <= tB; i++) {
+      if (this.items[i].id === dragged) continue;
+      const x = this.xOf(this.items[i].end), g = groups[groups.length - 1];
+      if (g && x - g.x0 < o.clusterPx) { g.n++; g.x1 = x; g.last = i; }
+      else groups.push({ x0: x, x1: x, n: 1, first: i, last: i });
+    }
+    const labelRight = [-Infinity, -Infinity];   // rechter Rand der letzten Beschriftung oben/unten
+    groups.forEach(g => {
+      if (g.n === 1) { this.drawNode(ctx, this.items[g.first], g.x0, cy, g.first % 2, labelRight); return; }
+      const x = (g.x0 + g.x1) / 2, r = Math.min(15, 8 + Math.log2(g.n) * 1.5);
+      ctx.beginPath(); ctx.arc(x, cy, r, 0, 2 * Math.PI);
+      ctx.fillStyle = this.color(this.pal.bg); ctx.fill();
+      ctx.lineWidth = 2; ctx.strokeStyle = this.color(this.pal.accent); ctx.stroke();
+      ctx.fillStyle = this.color(this.pal.text); ctx.font = '700 9px ' + font;
+      ctx.textAlign = 'center'; ctx.textBaseline = 'middle';
+      ctx.fillText(g.n > 999 ? '999+' : String(g.n), x, cy + 0.5);
+      ctx.textBaseline = 'alphabetic';
+      this.hits.push({ x: x, y: cy, r: r + 3, group: g });
+    });
+    if (dragged) {
+      const i = this.index.get(dragged);
+      this.drawNode(ctx, this.itemAt(i), this.xOf(this.preview.end), cy, i % 2, [-Infinity, -Infinity]);
+    }
+  }
+
+  drawNode(ctx, it, x, cy, top, labelRight) {
+    const font = TimelineCanvas.FONT;
+    ctx.beginPath(); ctx.arc(x, cy, 6.5, 0, 2 * Math.PI);
+    ctx.fillStyle = this.color(this.pal.bg); ctx.fill();
+    ctx.fillStyle = this.color(it.fill || it.color); ctx.fill();
+    ctx.lineWidth = 3; ctx.strokeStyle = this.color(it.color); ctx.stroke();
+    this.hits.push({ x: x, y: cy, r: 10, item: it });
+
+    // Beschriftung nur, wenn sie nicht mit der vorigen auf derselben Seite kollidiert
+    const side = top ? 0 : 1;
+    ctx.font = '600 11px ' + font;
+    const name = TimelineCanvas.fitText(ctx, it.label || '', 110);
+    const nw = ctx.measureText(name).width;
+    ctx.font = '10px ' + font;
+    const sw = it.sub ? ctx.measureText(it.sub).width : 0, half = Math.max(nw, sw) / 2 + 4;
+    if (x - half < labelRight[side] + 6) return;
+    labelRight[side] = x + half;
+    const dir = top ? -1 : 1;
+    ctx.fillStyle = this.color(this.pal.line);
+    ctx.fillRect(Math.round(x), top ? cy - 24 : cy + 10, 1, 14);
+    ctx.textAlign = 'center';
+    ctx.fillStyle = this.color(this.pal.bg);
+    TimelineCanvas.roundRect(ctx, x - nw / 2 - 4, cy + dir * 31 - 11, nw + 8, 16, 4); ctx.fill();
+    ctx.fillStyle = this.color(this.pal.text); ctx.font = '600 11px ' + font;
+    ctx.fillText(name, x, cy + dir * 31 + 1);
+    if (it.sub) {
+      ctx.fillStyle = this.color(this.pal.muted); ctx.font = '10px ' + font;
+      ctx.fillText(it.sub, x, cy + dir * 46 + 3);
+    }
+  }
+
+  drawRows(ctx) {
+    const o = this.opts, w = this.w, lw = o.labelWidth, hh = o.headerHeight, rh = o.rowHeight, font = TimelineCanvas.FONT;
+    const bodyH = this.h - hh, total = this.items.length * rh;
+    this.scrollY = Math.max(0, Math.min(this.scrollY, total - bodyH));
+    const first = Math.floor(this.scrollY / rh), last = Math.min(this.items.length, Math.ceil((this.scrollY + bodyH) / rh));
+
+    // Kopf mit Raster
+    ctx.font = '9px ' + font; ctx.textAlign = 'left'; ctx.textBaseline = 'middle';
+    this.ticks(lw).forEach(tk => {
+      const x = Math.round(this.xOf(tk.t));
+      if (x < lw) return;
+      ctx.globalAlpha = 0.5; ctx.fillStyle = this.color(this.pal.line); ctx.fillRect(x, 0, 1, this.h);
+      ctx.globalAlpha = 1; ctx.fillStyle = this.color(this.pal.muted); ctx.fillText(tk.label, x + 4, hh / 2);
+    });
+    ctx.fillStyle = this.color(this.pal.muted); ctx.font = '600 10px ' + font;
+    ctx.fillText(o.title, 12, hh / 2);
+
+    // sichtbare Zeilen
+    ctx.save();
+    ctx.beginPath(); ctx.rect(0, hh, w, bodyH); ctx.clip();
+    for (let i = first; i < last; i++) {
+      const it = this.itemAt(i), y = hh + i * rh - this.scrollY;
+      ctx.fillStyle = this.color(this.pal.line); ctx.fillRect(0, y + rh - 1, w, 1);
+      const x1 = Math.max(lw, this.xOf(it.start)), x2 = Math.min(w + 8, Math.max(this.xOf(it.end), this.xOf(it.start) + 4));
+      if (x2 > lw) {
+        const bh = Math.min(22, rh - 10), by = y + (rh - bh) / 2;
+        ctx.fillStyle = this.color(it.color);
+        TimelineCanvas.roundRect(ctx, x1, by, Math.max(4, x2 - x1), bh, 5); ctx.fill();
+        ctx.font = '600 10px ' + font;
+        const text = TimelineCanvas.fitText(ctx, it.label || '', x2 - x1 - 14);
+        if (text) { ctx.fillStyle = '#fff'; ctx.fillText(text, x1 + 7, by + bh / 2); }
+      }
+      // Namensspalte
+      ctx.fillStyle = this.color(this.pal.bg); ctx.fillRect(0, y, lw, rh - 1);
+      ctx.beginPath(); ctx.arc(16, y + rh / 2, 4, 0, 2 * Math.PI);
+      ctx.fillStyle = this.color(it.color); ctx.fill();
+      ctx.fillStyle = this.color(this.pal.text); ctx.font = '600 12px ' + font;
+      ctx.fillText(TimelineCanvas.fitText(ctx, it.label || '', lw - 40), 28, y + rh / 2);
+    }
+    ctx.restore();
+
+    ctx.fillStyle = this.color(this.pal.line);
+    ctx.fillRect(0, hh - 1, w, 1);
+    ctx.fillRect(lw, 0, 1, this.h);
+    const xn = Math.round(this.xOf(Date.now()));
+    if (xn >= lw && xn <= w) {
+      ctx.globalAlpha = 0.7; ctx.fillStyle = this.color(this.pal.today); ctx.fillRect(xn - 1, 0, 2, this.h); ctx.globalAlpha = 1;
+    }
+    if (total > bodyH) {
+      const th = Math.max(24, bodyH * bodyH / total), ty = hh + (bodyH - th) * this.scrollY / (total - bodyH);
+      ctx.globalAlpha = 0.6; ctx.fillStyle = this.color(this.pal.line);
+      TimelineCanvas.roundRect(ctx, w - 5, ty, 4, th, 2); ctx.fill(); ctx.globalAlpha = 1;
+    }
+    ctx.textBaseline = 'alphabetic';
+  }
+
+  hitAt(x, y) {
+    if (this.opts.mode === 'rows') {
+      const o = this.opts;
+      if (y < o.headerHeight) return null;
+      const i = Math.floor((y - o.headerHeight + this.scrollY) / o.rowHeight);
+      if (i < 0 || i >= this.items.length) return null;
+      const it = this.items[i];
+      if (x < o.labelWidth) return { item: it };
+      const x1 = this.xOf(it.start), x2 = Math.max(this.xOf(it.end), x1 + 4);
+      return x >= x1 - 4 && x <= x2 + 6 ? { item: it } : null;
+    }
+    let best = null, bestD = Infinity;
+    this.hits.forEach(h => {
+      const d = Math.hypot(h.x - x, h.y - y);
+      if (d <= h.r && d < bestD) { best = h; bestD = d; }
+    });
+    return best;
+  }
+
+  localPos(ev) {
+    const r = this.canvas.getBoundingClientRect();
+    return { x: ev.clientX - r.left, y: ev.clientY - r.top };
+  }
+
+  bind() {
+    const c = this.canvas;
+    c.addEventListener('wheel', ev => {
+      ev.preventDefault();
+      const pos = this.localPos(ev), rows = this.opts.mode === 'rows';
+      const vertical = Math.abs(ev.deltaY) >= Math.abs(ev.deltaX);
+      if (ev.ctrlKey || (!rows && vertical && !ev.shiftKey)) this.zoomAt(pos.x, Math.exp(ev.deltaY * 0.0015));
+      else if (rows && vertical && !ev.shiftKey) this.scrollY += ev.deltaY;
+      else this.t0 += (vertical ? ev.deltaY : ev.deltaX) * this.msPerPx;
+      this.userView = true;
+      this.invalidate();
+    }, { passive: false });
+    c.addEventListener('pointerdown', ev => {
+      if (ev.button !== 0) return;
+      const pos = this.localPos(ev), hit = this.hitAt(pos.x, pos.y);
+      this.drag = { x0: pos.x, y0: pos.y, t0: this.t0, s0: this.scrollY, hit: hit, moved: false,
+                    item: hit && hit.item && this.opts.onDrag ? hit.item : null };
+      c.setPointerCapture(ev.pointerId);
+    });
+    c.addEventListener('pointermove', ev => {
+      const pos = this.localPos(ev), d = this.drag;
+      if (!d) { this.hover(pos.x, pos.y); return; }
+      if (!d.moved && Math.abs(pos.x - d.x0) + Math.abs(pos.y - d.y0) < 4) return;
+      d.moved = true;
+      if (d.item) {
+        this.preview = { id: d.item.id, end: TimelineCanvas.snapDay(this.tOf(pos.x)) };
+        c.title = TimelineCanvas.dayLabel(this.preview.end);
+      } else {
+        this.t0 = d.t0 - (pos.x - d.x0) * this.msPerPx;
+        if (this.opts.mode === 'rows') this.scrollY = d.s0 - (pos.y - d.y0);
+        this.userView = true;
+      }
+      this.invalidate();
+    });
+    c.addEventListener('pointerup', () => {
+      const d = this.drag, pv = this.preview;
+      this.drag = null; this.preview = null;
+      if (!d) return;
+      if (!d.moved) this.click(d.hit);
+      else if (d.item && pv && pv.end !== d.item.end) this.opts.onDrag(d.item, pv.end);
+      this.invalidate();
+    });
+    c.addEventListener('pointercancel', () => { this.drag = null; this.preview = null; this.invalidate(); });
+    c.addEventListener('dblclick', () => { this.userView = false; this.fit(); this.invalidate(); });
+  }
+
+  click(hit) {
+    if (!hit) return;
+    if (hit.group) {
+      // Sammelpunkt: auf seine Zeitspanne zoomen
+      const a = this.items[hit.group.first].end, b = this.items[hit.group.last].end;
+      const span = this.w - this.opts.labelWidth;
+      this.msPerPx = Math.max(TimelineCanvas.MIN_MS_PER_PX, Math.max(b - a, 864e5) / (span * 0.6));
+      this.t0 = (a + b) / 2 - span / 2 * this.msPerPx;
+      this.userView = true;
+      this.invalidate();
+    } else if (this.opts.onClick) {
+      this.opts.onClick(hit.item);
+    }
+  }
+
+  hover(x, y) {
+    const hit = this.hitAt(x, y), key = hit ? (hit.item ? hit.item.id : 'g' + hit.group.first) : null;
+    if (key === this.hoverKey) return;
+    this.hoverKey = key;
+    this.canvas.style.cursor = hit ? 'pointer' : 'grab';
+    if (!hit) this.canvas.title = '';
+    else if (hit.group) this.canvas.title = hit.group.n + ' Einträge – klicken zum Vergrößern';
+    else this.canvas.title = this.opts.tooltip ? this.opts.tooltip(hit.item) : (hit.item.label || '');
+  }
+}
+
+TimelineCanvas.FONT = "'Segoe UI', system-ui, sans-serif";
+TimelineCanvas.MIN_MS_PER_PX = 6e5;      // 10 min pro Pixel
+TimelineCanvas.MAX_MS_PER_PX = 2e10;     // rund 230 Tage pro Pixel
+
+TimelineCanvas.snapDay = function(t) { return Math.round(t / 864e5) * 864e5; };
+TimelineCanvas.dayLabel = function(t) { return new Date(t).toISOString().slice(0, 10); };
+
+TimelineCanvas.roundRect = function(ctx, x, y, w, h, r) {
+  r = Math.min(r, w / 2, h / 2);
+  ctx.beginPath();
+  ctx.moveTo(x + r, y);
+  ctx.arcTo(x + w, y, x + w, y + h, r);
+  ctx.arcTo(x + w, y + h, x, y + h, r);
+  ctx.arcTo(x, y + h, x, y, r);
+  ctx.arcTo(x, y, x + w, y, r);
+  ctx.closePath();
+};
+
+// Text auf maxW kürzen (mit …); '' wenn nicht einmal ein Zeichen passt
+TimelineCanvas.fitText = function(ctx, text, maxW) {
+  if (maxW <= 0) return '';
+  if (ctx.measureText(text).width <= maxW) return text;
+  let lo = 0, hi = text.length;
+  while (lo < hi) {
+    const mid = (lo + hi + 1) >> 1;
+    if (ctx.measureText(text.slice(0, mid) + '…').width <= maxW) lo = mid; else hi = mid - 1;
+  }
+  return lo ? text.slice(0, lo) + '…' : '';
+};
+
+TimelineCanvas.UNITS = (function() {
+  const DAY = 864e5;
+  const fmt = o => new Intl.DateTimeFormat('de-DE', Object.assign({ timeZone: 'UTC' }, o));
+  const dayFmt = fmt({ day: 'numeric', month: 'numeric' }), monthFmt = fmt({ month: 'short', year: '2-digit' });
+  const months = (k, label) => ({
+    ms: 30.44 * DAY * k, label: label,
+    floor: t => { const d = new Date(t); return Date.UTC(d.getUTCFullYear(), d.getUTCMonth() - d.getUTCMonth() % k, 1); },
+    next: t => { const d = new Date(t); return Date.UTC(d.getUTCFullYear(), d.getUTCMonth() + k, 1); }
+  });
+  return [
+    { ms: DAY, floor: t => Math.floor(t / DAY) * DAY, next: t => t + DAY, label: d => dayFmt.format(d) },
+    // Wochen ab Montag (1.1.1970 war ein Donnerstag)
+    { ms: 7 * DAY, floor: t => { const n = Math.floor(t / DAY); return (n - (n + 3) % 7) * DAY; }, next: t => t + 7 * DAY, label: d => dayFmt.format(d) },
+    months(1, d => monthFmt.format(d)),
+    months(3, d => 'Q' + (d.getUTCMonth() / 3 + 1) + ' ' + String(d.getUTCFullYear()).slice(2)),
+    months(12, d => String(d.getUTCFullYear()))
+  ];
+})();
+
+// Konsole: TimelineCanvas.benchmark('track', 5000) bzw. TimelineCanvas.benchmark('rows', 5000).
+// Zeichnet abwechselnd hinein-/herausgezoomt und verschoben wie beim Mausrad und
+// misst die Zeit pro Frame (Budget für 60 fps: 16,7 ms).
+TimelineCanvas.benchmark = function(mode, n, frames) {
+  mode = mode || 'track'; n = n || 5000; frames = frames || 240;
+  const host = document.createElement('div');
+  host.style.cssText = 'position:fixed;left:0;top:0;width:1000px;height:' + (mode === 'rows' ? 600 : 180) + 'px;visibility:hidden;';
+  document.body.appendChild(host);
+  const DAY = 864e5, start = Date.UTC(2024, 0, 1), span = 5 * 365 * DAY, items = [];
+  for (let i = 0; i < n; i++) {
+    const end = start + Math.floor(Math.random() * span / DAY) * DAY;
+    items.push({ id: 'b' + i, start: start, end: end, label: 'Eintrag ' + i, sub: TimelineCanvas.dayLabel(end),
+                 color: '--accent', dep: i > 0 && i % 3 === 0 ? 'b' + (i - 1) : null });
+  }
+  const tl = new TimelineCanvas(host, { mode: mode, labelWidth: mode === 'rows' ? 200 : 0, rowHeight: 38, headerHeight: 36, title: 'BENCHMARK' });
+  tl.setItems(items, { start: start, end: start + span });
+  const times = [];
+  for (let f = 0; f < frames; f++) {
+    tl.zoomAt(500, f % 120 < 60 ? 0.93 : 1 / 0.93);
+    tl.t0 += 3 * tl.msPerPx;
+    if (mode === 'rows') tl.scrollY += 40;
+    const t = performance.now();
+    tl.draw();
+    times.push(performance.now() - t);
+  }
+  host.remove();
+  times.sort((a, b) => a - b);
+  const avg = times.reduce((s, v) => s + v, 0) / times.length, p95 = times[Math.floor(times.length * 0.95)];
+  console.log(mode + ', ' + n + ' Einträge: Frame Ø ' + avg.toFixed(2) + ' ms, p95 ' + p95.toFixed(2) + ' ms (Budget 16,7 ms)');
+  return { avg: avg, p95: p95 };
+};
+</script>
+"""
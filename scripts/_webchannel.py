@@ -0,0 +1,34 @@
+# scripts/_webchannel.py
+"""
+qwebchannel.js für Plugin-Seiten, die unter http://localhost/ laufen (dort liegt
+der alte localStorage-Stand). Ein <script src="qrc:..."> wäre von diesem
+Ursprung aus nicht ladbar, daher wird die Datei als Seitenskript eingebunden.
+
+Der führende Unterstrich hält die Datei aus der Plugin-Liste des Launchers heraus.
+"""
+from PyQt5.QtCore import QFile, QIODevice
+from PyQt5.QtWebEngineWidgets import QWebEngineScript
+
+# Name des Profilskripts, mit dem der Launcher qwebchannel.js (plus
+# window.launcherStorage) schon in jede Seite des Standardprofils einbindet
+LAUNCHER_SCRIPT_NAME = "launcherStorage"
+
+
+def install_webchannel_script(page):
+    """
+    Bindet qwebchannel.js in page ein, sofern der Launcher das nicht schon für
+    das Profil der Seite erledigt. False, wenn die Datei nicht verfügbar ist.
+    """
+    if page.profile().scripts().findScripts(LAUNCHER_SCRIPT_NAME):
+        return True
+    source = QFile(":/qtwebchannel/qwebchannel.js")
+    if not source.open(QIODevice.ReadOnly):
+        return False
+    script = QWebEngineScript()
+    script.setName("qwebchannel")
+    script.setSourceCode(bytes(source.readAll()).decode("utf-8"))
+    script.setInjectionPoint(QWebEngineScript.DocumentCreation)
+    script.setWorldId(QWebEngineScript.MainWorld)
+    source.close()
+    page.scripts().insert(script)
+    return True
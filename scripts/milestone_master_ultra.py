@@ -1,7 +1,21 @@
 from PyQt5.QtWidgets import QApplication, QVBoxLayout, QWidget, QMainWindow
 from PyQt5.QtWebEngineWidgets import QWebEngineView
-from PyQt5.QtCore import QUrl, QEvent, QObject, pyqtSignal
+from PyQt5.QtWebChannel import QWebChannel
+from PyQt5.QtCore import QUrl, QEvent, QObject, pyqtSignal, pyqtSlot
+import os
 import sys
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _timeline_canvas import TIMELINE_CANVAS_SCRIPT  # noqa: E402
+from _webchannel import install_webchannel_script  # noqa: E402
+
+MILESTONE_DIR = os.path.expanduser('~/.milestone_master')
+SNAPSHOT_FILE = 'snapshot.json'
+JOURNAL_FILE = 'journal.jsonl'
+COMPACT_OPS = 1000             # Journalzeilen bis zur Verdichtung
+COMPACT_BYTES = 1024 * 1024    # oder Journalgröße in Bytes
 
 THEME_LIGHT = "light"
 THEME_DARK = "dark"
@@ -131,6 +145,293 @@ THEME_SCRIPT = """
 """
 
 
+# ============================================================
+# PERSISTENZ: Snapshot + Änderungsjournal
+# ============================================================
+
+_CHILD_KEYS = ("milestones", "tasks")  # Projekt -> Meilensteine -> Aufgaben
+
+
+def _index_of(items, item_id):
+    for i, item in enumerate(items):
+        if isinstance(item, dict) and item.get("id") == item_id:
+            return i
+    return -1
+
+
+def _apply_op(state, op):
+    """
+    Wendet eine Operation aus der Oberfläche auf den Stand an:
+      {"op": "set", "path": [...], "fields": {...}}  Felder eines Eintrags setzen
+      {"op": "put", "path": [...], "item": {...}}    Eintrag ersetzen oder anhängen
+      {"op": "del", "path": [...]}                   Eintrag entfernen
+      {"op": "active", "index": n}                   aktives Projekt
+    path = [Projekt-id, Meilenstein-id, Aufgaben-id], so weit nötig.
+    Ungültige Operationen lösen ValueError aus und ändern nichts.
+    """
+    if not isinstance(op, dict):
+        raise ValueError("Operation ist kein Objekt")
+    kind = op.get("op")
+    if kind == "active":
+        index = op.get("index")
+        if not isinstance(index, int) or isinstance(index, bool) or index < 0:
+            raise ValueError(f"ungültiger Projektindex: {index!r}")
+        state["aIdx"] = index
+        return
+    path = op.get("path")
+    if (not isinstance(path, list) or not 1 <= len(path) <= len(_CHILD_KEYS) + 1
+            or not all(isinstance(p, str) and p for p in path)):
+        raise ValueError(f"ungültiger Pfad: {path!r}")
+    items = state["projects"]
+    for depth, item_id in enumerate(path[:-1]):
+        i = _index_of(items, item_id)
+        if i < 0:
+            raise ValueError(f"unbekannter Eintrag: {item_id}")
+        items = items[i].setdefault(_CHILD_KEYS[depth], [])
+    i = _index_of(items, path[-1])
+    if kind == "set":
+        fields = op.get("fields")
+        if i < 0 or not isinstance(fields, dict):
+            raise ValueError(f"set ohne Ziel oder Felder: {path!r}")
+        items[i].update(fields)
+    elif kind == "put":
+        item = op.get("item")
+        if not isinstance(item, dict) or item.get("id") != path[-1]:
+            raise ValueError(f"put mit falscher id: {path!r}")
+        if i < 0:
+            items.append(item)
+        else:
+            items[i] = item
+    elif kind == "del":
+        if i >= 0:
+            del items[i]
+    else:
+        raise ValueError(f"unbekannte Operation: {kind!r}")
+
+
+class ProjectJournal:
+    """
+    Projekte als Snapshot (snapshot.json) plus Änderungsjournal (journal.jsonl).
+
+    Jede Bearbeitung hängt genau eine kurze Zeile {"seq": n, "ops": [...]} an das
+    Journal an, die Speicherzeit hängt also nicht von der Größe der Projekte ab.
+    Beim Öffnen wird das Journal auf den Snapshot nachgespielt; eine unvollständige
+    letzte Zeile (Prozess beim Schreiben beendet) wird verworfen. Ab COMPACT_OPS
+    Zeilen bzw. COMPACT_BYTES wird der Stand atomar in einen neuen Snapshot
+    geschrieben und das Journal geleert. Zeilen mit seq <= Snapshot-seq werden beim
+    Nachspielen übersprungen, ein Abbruch zwischen den beiden Schritten ist also
+    unkritisch.
+
+    Es darf nur ein Prozess gleichzeitig schreiben; reine Leser (Popup) öffnen das
+    Journal nie zum Schreiben.
+    """
+
+    def __init__(self, directory, compact_ops=COMPACT_OPS, compact_bytes=COMPACT_BYTES, sync=True):
+        self.directory = directory
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.journal_path = os.path.join(directory, JOURNAL_FILE)
+        self.compact_ops = compact_ops
+        self.compact_bytes = compact_bytes
+        self.sync = sync
+        self.state = {"projects": [], "aIdx": 0}
+        self.imported = False
+        self.seq = 0
+        self._snapshot_seq = 0
+        self._journal = None
+        self._journal_lines = 0
+        self._journal_size = 0   # Bytes bis zum Ende der letzten gültigen Zeile
+        self._dirty = False      # Stand weicht vom Snapshot ab
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                snap = json.loads(f.read().decode('utf-8'))
+            self.state = {"projects": list(snap.get("projects") or []), "aIdx": int(snap.get("aIdx") or 0)}
+            self.imported = bool(snap.get("imported"))
+            self.seq = self._snapshot_seq = int(snap.get("seq") or 0)
+        except FileNotFoundError:
+            pass
+        except (ValueError, TypeError, AttributeError) as e:
+            # Snapshots werden atomar ersetzt; ein defekter Stand wird zur Analyse beiseitegelegt
+            broken = f"{self.snapshot_path}.defekt-{int(time.time())}"
+            print(f"Snapshot unlesbar ({e}), verschoben nach {broken}")
+            os.replace(self.snapshot_path, broken)
+
+        try:
+            with open(self.journal_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        offset = 0
+        while offset < len(data):
+            end = data.find(b"\n", offset)
+            if end < 0:
+                break  # letzte Zeile unvollständig
+            try:
+                entry = json.loads(data[offset:end].decode('utf-8'))
+                seq = int(entry["seq"])
+                ops = entry["ops"]
+            except (ValueError, TypeError, KeyError):
+                break
+            if seq > self.seq:
+                for op in ops:
+                    try:
+                        _apply_op(self.state, op)
+                    except ValueError as e:
+                        print(f"Journal-Eintrag {seq} übersprungen: {e}")
+                self.seq = seq
+            offset = end + 1
+            self._journal_lines += 1
+        self._journal_size = offset
+        if offset < len(data):
+            print(f"Journal: {len(data) - offset} Bytes nach Eintrag {self.seq} verworfen")
+
+    def _open_journal(self):
+        if self._journal is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._journal = open(self.journal_path, 'ab')
+            # Reste einer abgebrochenen Zeile abschneiden, sonst klebt der nächste Eintrag daran
+            if self._journal.tell() != self._journal_size:
+                self._journal.truncate(self._journal_size)
+        return self._journal
+
+    def snapshot(self):
+        return {"projects": self.state["projects"], "aIdx": self.state["aIdx"], "imported": self.imported}
+
+    def append(self, ops):
+        """Wendet die gültigen Operationen an und schreibt sie als eine Journalzeile."""
+        applied = []
+        for op in ops:
+            try:
+                _apply_op(self.state, op)
+                applied.append(op)
+            except ValueError as e:
+                print(f"Operation verworfen: {e}")
+        if not applied:
+            return 0
+        self.seq += 1
+        line = (json.dumps({"seq": self.seq, "ops": applied}, ensure_ascii=False, separators=(",", ":"))
+                + "\n").encode('utf-8')
+        journal = self._open_journal()
+        journal.write(line)
+        journal.flush()
+        if self.sync:
+            os.fsync(journal.fileno())
+        self._journal_lines += 1
+        self._journal_size += len(line)
+        self._dirty = True
+        if self._journal_lines >= self.compact_ops or self._journal_size >= self.compact_bytes:
+            self.compact()
+        return len(applied)
+
+    def compact(self):
+        """Schreibt den aktuellen Stand als Snapshot und leert das Journal."""
+        if not self._dirty:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        snap = dict(self.snapshot(), seq=self.seq)
+        tmp = self.snapshot_path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(json.dumps(snap, ensure_ascii=False, separators=(",", ":")).encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        self._snapshot_seq = self.seq
+        journal = self._open_journal()
+        journal.truncate(0)
+        journal.flush()
+        self._journal_lines = 0
+        self._journal_size = 0
+        self._dirty = False
+
+    def import_legacy(self, data):
+        """
+        Übernimmt einmalig den alten localStorage-Stand ({projects, aIdx}) und legt
+        sofort einen Snapshot an. Liefert die Zahl der übernommenen Projekte.
+        """
+        if self.imported:
+            return 0
+        projects = [p for p in (data or {}).get("projects") or []
+                    if isinstance(p, dict) and isinstance(p.get("id"), str)]
+        known = {p.get("id") for p in self.state["projects"]}
+        self.state["projects"].extend(p for p in projects if p["id"] not in known)
+        a_idx = (data or {}).get("aIdx")
+        if isinstance(a_idx, int) and not isinstance(a_idx, bool) and a_idx >= 0:
+            self.state["aIdx"] = a_idx
+        self.imported = True
+        self._dirty = True
+        self.compact()
+        return len(projects)
+
+    def close(self):
+        """Verdichtet, falls dieser Prozess etwas geschrieben hat, und schließt das Journal."""
+        if self._journal is None:
+            return
+        try:
+            self.compact()
+        except OSError as e:
+            print(f"Verdichten beim Schließen fehlgeschlagen: {e}")
+        finally:
+            self._journal.close()
+            self._journal = None
+
+
+class MilestoneAPI(QObject):
+    """
+    Projekt-Ablage für die Weboberfläche (per QWebChannel als 'msBackend').
+    JS schickt pro Bearbeitung nur die Operation(en), nie den ganzen Bestand.
+    """
+
+    def __init__(self, journal=None):
+        super().__init__()
+        self._journal = journal
+        if journal is None:
+            try:
+                self._journal = ProjectJournal(MILESTONE_DIR)
+            except OSError as e:
+                print(f"Projektablage nicht lesbar: {e}")
+
+    @pyqtSlot(result='QVariantMap')
+    def load(self):
+        """Kompletter Stand beim Start: {projects, aIdx, imported}."""
+        if self._journal is None:
+            return {"projects": [], "aIdx": 0, "imported": False}
+        return self._journal.snapshot()
+
+    @pyqtSlot(str, result=int)
+    def apply(self, raw):
+        """Eine Operation oder eine Liste davon (JSON); liefert die Zahl der übernommenen."""
+        if self._journal is None:
+            return -1
+        try:
+            ops = json.loads(raw)
+        except (TypeError, ValueError):
+            print("Ungültige Operation verworfen.")
+            return -1
+        try:
+            return self._journal.append(ops if isinstance(ops, list) else [ops])
+        except OSError as e:
+            print(f"Fehler beim Schreiben des Journals: {e}")
+            return -1
+
+    @pyqtSlot(str, result=int)
+    def import_legacy(self, raw):
+        """Einmaliger Import des alten localStorage-Stands (bereits normalisiert von JS)."""
+        if self._journal is None:
+            return -1
+        try:
+            data = json.loads(raw) if raw else {}
+            return self._journal.import_legacy(data if isinstance(data, dict) else {})
+        except (ValueError, OSError) as e:
+            print(f"Fehler beim Import der alten Projekte: {e}")
+            return -1
+
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
+
+
 class PluginWidget(QMainWindow):
     def __init__(self, theme="dark", mode="Window"):
         super().__init__()
@@ -144,6 +445,14 @@ class PluginWidget(QMainWindow):
         layout.addWidget(self.browser)
         self.setCentralWidget(central)
 
+        # Projekt-Ablage für JS bereitstellen
+        self.backend = MilestoneAPI()
+        self.channel = QWebChannel(self.browser.page())
+        self.channel.registerObject('msBackend', self.backend)
+        self.browser.page().setWebChannel(self.channel)
+        if not install_webchannel_script(self.browser.page()):
+            print("qwebchannel.js nicht gefunden – Projekte werden nicht gespeichert.")
+
         normalized = theme.lower() if isinstance(theme, str) else None
         host_theme = _detect_host_theme(normalized if normalized in SUPPORTED_THEMES else THEME_DARK)
         self._current_theme = host_theme if host_theme in SUPPORTED_THEMES else THEME_DARK
@@ -165,6 +474,10 @@ class PluginWidget(QMainWindow):
             self._theme_watcher = HostThemeWatcher(app_instance)
             self._theme_watcher.themeChanged.connect(self._on_host_theme_changed)
             self.destroyed.connect(self._cleanup_watcher)
+            app_instance.aboutToQuit.connect(self.backend.close)
+        # Der Launcher schließt Tabs per deleteLater() ohne closeEvent; Journal
+        # trotzdem verdichten und schließen
+        self.destroyed.connect(self.backend.close)
 
     def _build_window_html(self, body_class):
         template = """<!doctype html>
@@ -387,61 +700,11 @@ body { display: flex; background: var(--bg); color: var(--text); }
 .tl-card { padding: 10px 14px 16px; flex-shrink: 0; }
 .tl-hdr { display: flex; justify-content: space-between; align-items: center; margin-bottom: 6px; }
 .tl-hdr-title { font-size: 11px; font-weight: 700; text-transform: uppercase; letter-spacing: .08em; }
-.tl-container { position: relative; display: flex; align-items: center; min-height: 160px; padding-inline: 20px; margin: 10px 0; }
-.tl-track { position: relative; width: 100%; height: 6px; background: var(--border); border-radius: 999px; }
-.tl-prog { position: absolute; left: 0; top: 0; height: 100%; background: linear-gradient(90deg, var(--accent), var(--accent2)); border-radius: 999px; opacity: .85; transition: width .4s; }
-.tl-now { position: absolute; top: -18px; bottom: -18px; width: 2px; background: var(--danger); z-index: 5; pointer-events: none; }
-.tl-now::after {
-  content: 'HEUTE'; position: absolute; top: -20px; left: -22px;
-  background: var(--danger); color: #fff; font-size: 9px; padding: 2px 6px;
-  border-radius: 999px; font-weight: 700; letter-spacing: .06em;
-}
-.ms-node {
-  position: absolute; top: 50%; transform: translate(-50%, -50%);
-  width: 16px; height: 16px; border-radius: 50%;
-  border: 3px solid var(--muted); background: var(--card-bg);
-  cursor: pointer; z-index: 10; transition: transform .15s;
-}
-.ms-node:hover { transform: translate(-50%,-50%) scale(1.3); z-index: 20; }
-.ms-node.done { border-color: var(--success); background: var(--success); }
-.ms-node.future { border-color: var(--accent); background: var(--accent-soft); }
-.ms-node.overdue { border-color: var(--danger); background: var(--danger-soft); }
-.ms-node.blocked { border-color: var(--warning); background: var(--warning-soft); }
-.dep-line { position: absolute; top: 50%; height: 2px; background: var(--muted); z-index: 4; pointer-events: none; opacity: .35; }
-.node-wrap {
-  position: absolute; left: 50%; transform: translateX(-50%);
-  width: 110px; text-align: center; pointer-events: none;
-  display: flex; flex-direction: column; align-items: center;
-}
-.node-wrap::before { content: ''; display: block; width: 1px; height: 14px; background: var(--border); margin: 0 auto; }
-.node-lbl { font-size: 11px; font-weight: 600; color: var(--text); line-height: 1.2; background: var(--card-bg); padding: 2px 4px; border-radius: 4px; }
-.node-date { white-space: nowrap; font-size: 10px; color: var(--muted); margin-top: 2px; }
-.node-wrap.bottom { top: 22px; }
-.node-wrap.top { bottom: 22px; flex-direction: column-reverse; }
-.node-wrap.top .node-date { margin-bottom: 2px; margin-top: 0; }
+.tl-canvas { height: 180px; margin: 6px 0; }
 
 /* ===== GANTT ===== */
 #vGantt { display: none; flex-direction: column; padding: 14px 18px; gap: 10px; overflow: hidden; height: 100%; }
-.gantt-wrap { border-radius: 12px; overflow: hidden; display: flex; flex-direction: column; flex: 1; min-height: 0; border: 1px solid var(--card-border); }
-.gantt-hdr { display: flex; border-bottom: 1px solid var(--border); flex-shrink: 0; height: 36px; background: var(--card-bg); }
-.gantt-lbl { width: 200px; flex-shrink: 0; padding: 8px 12px; font-size: 10px; text-transform: uppercase; letter-spacing: .08em; color: var(--muted); font-weight: 600; border-right: 1px solid var(--border); display: flex; align-items: center; }
-.gantt-chart-hdr { flex: 1; position: relative; overflow: hidden; }
-.gantt-body { flex: 1; overflow-y: auto; min-height: 0; background: var(--card-bg); }
-.gantt-row { display: flex; border-bottom: 1px solid var(--border); min-height: 38px; align-items: center; }
-.gantt-row:hover { background: var(--row-alt); }
-.gantt-row-lbl { width: 200px; flex-shrink: 0; padding: 6px 12px; font-size: 12px; font-weight: 600; border-right: 1px solid var(--border); white-space: nowrap; overflow: hidden; text-overflow: ellipsis; display: flex; align-items: center; gap: 5px; }
-.gantt-row-chart { flex: 1; position: relative; height: 38px; }
-.gantt-bar {
-  position: absolute; height: 22px; top: 50%; transform: translateY(-50%);
-  border-radius: 5px; display: flex; align-items: center; padding: 0 7px;
-  font-size: 10px; font-weight: 600; color: #fff; white-space: nowrap; overflow: hidden; min-width: 4px;
-}
-.gantt-bar.done { background: var(--success); }
-.gantt-bar.overdue { background: var(--danger); }
-.gantt-bar.normal { background: var(--accent); }
-.gantt-today { position: absolute; top: 0; bottom: 0; width: 2px; background: var(--danger); opacity: .7; z-index: 5; }
-.gantt-grid { position: absolute; top: 0; bottom: 0; width: 1px; background: var(--border); opacity: .5; }
-.gantt-mlbl { position: absolute; font-size: 9px; color: var(--muted); top: 10px; }
+.gantt-wrap { border-radius: 12px; overflow: hidden; flex: 1; min-height: 0; border: 1px solid var(--card-border); background: var(--card-bg); }
 
 /* ===== BURNDOWN ===== */
 #vBurn { display: none; flex-direction: column; padding: 14px 18px; gap: 10px; overflow-y: auto; height: 100%; }
@@ -454,7 +717,7 @@ body { display: flex; background: var(--bg); color: var(--text); }
 .heat-grid { display: flex; flex-wrap: wrap; gap: 8px; }
 .heat-item { flex: 1; min-width: 120px; border-radius: 10px; padding: 10px 12px; border: 2px solid transparent; }
 </style>
-""" + THEME_OVERRIDE_CSS + THEME_SCRIPT + """
+""" + THEME_OVERRIDE_CSS + THEME_SCRIPT + TIMELINE_CANVAS_SCRIPT + """
 </head>
 <body class="__BODY_CLASS__">
 
@@ -571,15 +834,10 @@ body { display: flex; background: var(--bg); color: var(--text); }
         <div class="card tl-card">
           <div class="tl-hdr">
             <span class="tl-hdr-title">Projektzeitachse</span>
-            <span style="font-size:10px;color:var(--muted);">🔴 Heute &nbsp;·&nbsp; Punkte = Meilensteine &nbsp;·&nbsp; Pfeil = Abhängigkeit</span>
+            <span style="font-size:10px;color:var(--muted);">🔴 Heute &nbsp;·&nbsp; Punkte = Meilensteine &nbsp;·&nbsp; Linie = Abhängigkeit &nbsp;·&nbsp; Mausrad = Zoom, Ziehen = Datum, Doppelklick = alles</span>
           </div>
           <div style="padding:8px 4px;border-radius:10px;">
-            <div class="tl-container" id="tlContainer">
-              <div class="tl-track" id="tlTrack">
-                <div class="tl-prog" id="tlProg"></div>
-                <div class="tl-now" id="tlNow"></div>
-              </div>
-            </div>
+            <div class="tl-canvas" id="tlCanvas"></div>
           </div>
         </div>
         <div class="ms-editor" style="flex:1;min-height:0;">
@@ -593,13 +851,7 @@ body { display: flex; background: var(--bg); color: var(--text); }
 
       <!-- GANTT -->
       <div id="vGantt">
-        <div class="gantt-wrap">
-          <div class="gantt-hdr">
-            <div class="gantt-lbl">Meilenstein</div>
-            <div class="gantt-chart-hdr" id="ganttHdr"></div>
-          </div>
-          <div class="gantt-body" id="ganttBody"></div>
-        </div>
+        <div class="gantt-wrap" id="ganttCanvas"></div>
       </div>
 
       <!-- BURNDOWN -->
@@ -623,10 +875,11 @@ body { display: flex; background: var(--bg); color: var(--text); }
 // ============================================================
 // STATE
 // ============================================================
-var SKEY = 'milestone_ultra_v2';
+var SKEY = 'milestone_ultra_v2';   // nur noch für den einmaligen Import
 var projects = [];
 var aIdx = 0;   // active project index
 var curTab = 'dash';
+var backend = null;
 
 // ============================================================
 // HELPERS
@@ -649,18 +902,9 @@ function msStat(ms) {
   if (d < now) return { l: 'Überfällig', c: 'bd' };
   return { l: 'Offen', c: 'bw' };
 }
-function blocked(ms, all) {
-  if (!ms.blockedBy) return false;
-  var dep = null;
-  for (var i = 0; i < all.length; i++) { if (all[i].id === ms.blockedBy) { dep = all[i]; break; } }
-  return dep && !dep.done;
-}
 function health(p) {
-  var now = new Date(), ms = p.milestones || [], tasks = [];
-  ms.forEach(function(m) { (m.tasks || []).forEach(function(t) { tasks.push(t); }); });
-  var tot = tasks.length, done = tasks.filter(function(t) { return t.done; }).length;
-  var over = ms.filter(function(m) { return !m.done && spd(m.date) && spd(m.date) < now; }).length;
-  var hi = ms.filter(function(m) { return !m.done && m.risk === 'high'; }).length;
+  var st = statsOf(p), tot = st.tasksTot, done = st.tasksDone;
+  var over = st.overdue(Date.now()), hi = st.openHigh;
   var s = 100 - over * 15 - hi * 8;
   if (tot > 0) s = Math.round(s * (0.4 + 0.6 * done / tot));
   s = Math.max(0, Math.min(100, s));
@@ -669,11 +913,158 @@ function health(p) {
 }
 function velocity(p) {
   var now = new Date(), start = spd(p.start) || now;
-  var weeks = Math.max(1, dd(start, now) / 7), tasks = [];
-  (p.milestones || []).forEach(function(m) { (m.tasks || []).forEach(function(t) { tasks.push(t); }); });
-  return Math.round(tasks.filter(function(t) { return t.done; }).length / weeks * 10) / 10;
+  var weeks = Math.max(1, dd(start, now) / 7);
+  return Math.round(statsOf(p).tasksDone / weeks * 10) / 10;
 }
 
+// ============================================================
+// KENNZAHLEN (inkrementell)
+// ============================================================
+// Pro Projekt werden Summen, überfällige/blockierte Meilensteine und der
+// Abhängigkeitsgraph (blockedBy) bei jeder Änderung nachgeführt, statt bei jedem
+// Rendern aus allen Meilensteinen neu gezählt. Topologische Ordnung und Zyklen
+// werden nur nach Änderungen am Graphen neu bestimmt.
+var projStats = new WeakMap();
+function statsOf(p) {
+  var st = projStats.get(p);
+  if (!st) { st = new ProjectStats(p); projStats.set(p, st); }
+  return st;
+}
+
+function ProjectStats(p) {
+  this.byId = new Map();        // id -> Meilenstein
+  this.seqOf = new Map();       // id -> Einfügeposition (Reihenfolge wie im Array)
+  this.contrib = new Map();     // id -> zuletzt gezählter Beitrag
+  this.dependents = new Map();  // id -> Set der Meilensteine mit blockedBy = id
+  this.openDated = [];          // offene Meilensteine mit Datum, sortiert nach (t, seq)
+  this.critical = new Set();
+  this.tasksTot = 0; this.tasksDone = 0; this.msDone = 0; this.openHigh = 0; this.blockedCnt = 0;
+  this.seq = 0;
+  this.graph = null;            // {rank, cyclic}; null = nach Graphänderung neu bestimmen
+  var self = this;
+  (p.milestones || []).forEach(function(m) { self.add(m); });
+}
+ProjectStats.prototype.measure = function(m) {
+  var tasks = m.tasks || [], done = 0;
+  for (var i = 0; i < tasks.length; i++) if (tasks[i].done) done++;
+  var dep = m.blockedBy ? this.byId.get(m.blockedBy) : null, d = spd(m.date);
+  return {
+    tot: tasks.length, done: done, msDone: m.done ? 1 : 0,
+    high: !m.done && m.risk === 'high' ? 1 : 0,
+    blocked: dep && !dep.done ? 1 : 0,
+    critical: !m.done && (m.risk === 'high' || !!m.blockedBy),
+    dep: m.blockedBy || '',
+    key: !m.done && d ? { t: d.getTime(), seq: this.seqOf.get(m.id), id: m.id } : null
+  };
+};
+ProjectStats.prototype.track = function(id, c, sign) {
+  this.tasksTot += sign * c.tot; this.tasksDone += sign * c.done; this.msDone += sign * c.msDone;
+  this.openHigh += sign * c.high; this.blockedCnt += sign * c.blocked;
+  if (sign > 0) {
+    this.contrib.set(id, c);
+    if (c.critical) this.critical.add(id);
+    if (c.key) this.openDated.splice(this.findDated(c.key), 0, c.key);
+  } else {
+    this.contrib.delete(id);
+    this.critical.delete(id);
+    if (c.key) this.openDated.splice(this.findDated(c.key), 1);
+  }
+};
+ProjectStats.prototype.findDated = function(key) {
+  var lo = 0, hi = this.openDated.length;
+  while (lo < hi) {
+    var mid = (lo + hi) >> 1, e = this.openDated[mid];
+    if (e.t < key.t || (e.t === key.t && e.seq < key.seq)) lo = mid + 1; else hi = mid;
+  }
+  return lo;
+};
+ProjectStats.prototype.link = function(id, dep, on) {
+  if (!dep) return;
+  var set = this.dependents.get(dep);
+  if (on) { if (!set) this.dependents.set(dep, set = new Set()); set.add(id); }
+  else if (set) { set.delete(id); if (!set.size) this.dependents.delete(dep); }
+};
+ProjectStats.prototype.retrackDependents = function(id) {
+  var set = this.dependents.get(id), self = this, ids = [];
+  if (set) set.forEach(function(d) {
+    var m = self.byId.get(d);
+    self.track(d, self.contrib.get(d), -1);
+    self.track(d, self.measure(m), 1);
+    ids.push(d);
+  });
+  return ids;
+};
+ProjectStats.prototype.add = function(m) {
+  this.byId.set(m.id, m); this.seqOf.set(m.id, this.seq++);
+  var c = this.measure(m);
+  this.link(m.id, c.dep, true);
+  this.track(m.id, c, 1);
+  this.retrackDependents(m.id);
+  this.graph = null;
+};
+ProjectStats.prototype.remove = function(id) {
+  var c = this.contrib.get(id); if (!c) return;
+  this.track(id, c, -1); this.link(id, c.dep, false);
+  this.byId.delete(id); this.seqOf.delete(id);
+  this.retrackDependents(id);
+  this.graph = null;
+};
+// Nach Änderung an einem Meilenstein (Felder oder Aufgaben). Liefert die ids, deren
+// Anzeige sich geändert haben kann: der Meilenstein selbst und ggf. die von ihm blockierten.
+ProjectStats.prototype.update = function(m) {
+  var old = this.contrib.get(m.id);
+  if (!old) { this.add(m); return [m.id]; }
+  var c = this.measure(m);
+  this.track(m.id, old, -1);
+  if (old.dep !== c.dep) { this.link(m.id, old.dep, false); this.link(m.id, c.dep, true); this.graph = null; }
+  this.track(m.id, c, 1);
+  return old.msDone !== c.msDone ? [m.id].concat(this.retrackDependents(m.id)) : [m.id];
+};
+ProjectStats.prototype.isBlocked = function(id) { var c = this.contrib.get(id); return !!(c && c.blocked); };
+ProjectStats.prototype.overdue = function(nowTs) { return this.findDated({ t: nowTs, seq: -1 }); };
+ProjectStats.prototype.nextOpen = function() { return this.openDated.length ? this.byId.get(this.openDated[0].id) : null; };
+ProjectStats.prototype.depOf = function(m) { return m.blockedBy ? this.byId.get(m.blockedBy) || null : null; };
+// Topologische Ordnung (Voraussetzung vor Abhängigem): Wurzeln sind Meilensteine ohne
+// vorhandene Voraussetzung, von dort über dependents. Nicht erreichte Knoten liegen in
+// einem Zyklus oder hängen an einem; die Zyklen selbst findet das Verfolgen der Kette.
+ProjectStats.prototype.order = function() {
+  if (this.graph) return this.graph;
+  var self = this, queue = [], rank = new Map(), cyclic = new Set();
+  this.byId.forEach(function(m, id) { var dep = self.contrib.get(id).dep; if (!dep || !self.byId.has(dep)) queue.push(id); });
+  for (var qi = 0; qi < queue.length; qi++) {
+    rank.set(queue[qi], qi);
+    var set = this.dependents.get(queue[qi]);
+    if (set) set.forEach(function(d) { if (!rank.has(d)) queue.push(d); });
+  }
+  var walkOf = new Map(), walk = 0;
+  this.byId.forEach(function(m, id) {
+    if (rank.has(id) || walkOf.has(id)) return;
+    walk++;
+    var cur = id;
+    while (!rank.has(cur) && !walkOf.has(cur)) { walkOf.set(cur, walk); cur = self.contrib.get(cur).dep; }
+    if (walkOf.get(cur) === walk) { var c = cur; do { cyclic.add(c); c = self.contrib.get(c).dep; } while (c !== cur); }
+  });
+  this.byId.forEach(function(m, id) { if (!rank.has(id)) rank.set(id, queue.length + self.seqOf.get(id)); });
+  this.graph = { rank: rank, cyclic: cyclic };
+  return this.graph;
+};
+ProjectStats.prototype.inCycle = function(id) { return this.order().cyclic.has(id); };
+// Alle Meilensteine, die (transitiv) auf id warten, inkl. id selbst. Keiner davon
+// darf Voraussetzung von id werden, sonst entsteht ein Zyklus.
+ProjectStats.prototype.downstream = function(id) {
+  var out = new Set([id]), stack = [id];
+  while (stack.length) {
+    var set = this.dependents.get(stack.pop());
+    if (set) set.forEach(function(d) { if (!out.has(d)) { out.add(d); stack.push(d); } });
+  }
+  return out;
+};
+ProjectStats.prototype.criticalList = function() {
+  var rank = this.order().rank, self = this, list = [];
+  this.critical.forEach(function(id) { list.push(self.byId.get(id)); });
+  return list.sort(function(a, b) { return rank.get(a.id) - rank.get(b.id); });
+};
+
 // ============================================================
 // DATA
 // ============================================================
@@ -692,32 +1083,75 @@ function defProject() {
   };
 }
 function fixMs(ms) {
+  if (!ms.id) ms.id = uid();
   if (!ms.tasks) ms.tasks = [];
+  ms.tasks.forEach(function(t) { if (!t.id) t.id = uid(); });
   if (!ms.risk) ms.risk = 'low';
   if (!ms.notes) ms.notes = '';
   if (ms.blockedBy === undefined || ms.blockedBy === null) ms.blockedBy = '';
 }
-function loadData() {
+function legacyData() {
+  // Alter localStorage-Stand (v2 oder v1), mit ids versehen für den Import
+  var res = { projects: [], aIdx: 0 };
   var raw = localStorage.getItem(SKEY);
   if (raw) {
     try {
       var p = JSON.parse(raw);
-      if (p && p.projects) { projects = p.projects; aIdx = p.aIdx || 0; }
-      else if (p && p.milestones) { projects = [p]; aIdx = 0; }
-      else { projects = [defProject()]; }
-    } catch(e) { projects = [defProject()]; }
+      if (p && p.projects) { res.projects = p.projects; res.aIdx = p.aIdx || 0; }
+      else if (p && p.milestones) { res.projects = [p]; }
+    } catch(e) {}
   } else {
     var old = localStorage.getItem('milestone_master_v1');
-    if (old) { try { var od = JSON.parse(old); projects = [Object.assign(defProject(), od)]; } catch(e) { projects = [defProject()]; } }
-    else { projects = [defProject()]; }
+    if (old) { try { var od = JSON.parse(old); res.projects = [Object.assign(defProject(), od)]; } catch(e) {} }
   }
-  if (!projects || !projects.length) projects = [defProject()];
+  if (!Array.isArray(res.projects)) res.projects = [];
+  res.projects.forEach(function(p) { if (!p.id) p.id = uid(); (p.milestones || []).forEach(fixMs); });
+  return res;
+}
+function loadData() {
+  if (!backend) { var res = legacyData(); res.imported = true; return Promise.resolve(res).then(applyLoaded); }
+  return Promise.resolve(backend.load()).then(function(snap) {
+    if (snap.imported) return snap;
+    return Promise.resolve(backend.import_legacy(JSON.stringify(legacyData()))).then(function() { return backend.load(); });
+  }).then(applyLoaded);
+}
+function applyLoaded(snap) {
+  projects = snap.projects || []; aIdx = snap.aIdx || 0;
+  if (!projects.length) { var p = defProject(); projects = [p]; putItem([p.id], p); }
   projects.forEach(function(p) { (p.milestones || []).forEach(fixMs); });
   if (aIdx >= projects.length) aIdx = 0;
 }
-function saveData() {
-  localStorage.setItem(SKEY, JSON.stringify({ projects: projects, aIdx: aIdx }));
+
+// ============================================================
+// PERSISTENZ (Python-Journal über QWebChannel)
+// ============================================================
+// Jede Bearbeitung schickt nur die Operation(en) an Python, nicht den ganzen Bestand.
+// path = [Projekt-id, Meilenstein-id, Aufgaben-id], so weit nötig.
+function connectBackend(onReady) {
+  if (typeof qt === 'undefined' || typeof qt.webChannelTransport === 'undefined' || typeof QWebChannel === 'undefined') {
+    console.error('QWebChannel nicht gefunden! Projekte werden nicht gespeichert.');
+    onReady();
+    return;
+  }
+  new QWebChannel(qt.webChannelTransport, function(channel) {
+    backend = channel.objects.msBackend;
+    onReady();
+  });
+}
+function record(ops) {
+  if (!backend) return;
+  Promise.resolve(backend.apply(JSON.stringify(ops))).then(function(n) {
+    if (n < ops.length) console.error('Speichern fehlgeschlagen', ops);
+  }).catch(function(err) { console.error('Speichern fehlgeschlagen', ops, err); });
+}
+function saveFields(path, obj, keys) {
+  var fields = {};
+  keys.forEach(function(k) { fields[k] = obj[k]; });
+  record([{ op: 'set', path: path, fields: fields }]);
 }
+function putItem(path, item) { record([{ op: 'put', path: path, item: item }]); }
+function delItem(path) { record([{ op: 'del', path: path }]); }
+function saveActive() { record([{ op: 'active', index: aIdx }]); }
 function getP() { return projects[aIdx] || projects[0]; }
 function normDates(p) {
   var s = spd(p.start) || new Date(), e = spd(p.end) || new Date();
@@ -731,14 +1165,16 @@ function normDates(p) {
 function addProject() {
   var p = defProject(); p.title = 'Projekt ' + (projects.length + 1);
   projects.push(p); aIdx = projects.length - 1;
-  saveData(); loadUI(); updateAll();
+  record([{ op: 'put', path: [p.id], item: p }, { op: 'active', index: aIdx }]);
+  loadUI(); updateAll();
 }
-function switchProject(i) { aIdx = i; saveData(); loadUI(); updateAll(); }
+function switchProject(i) { aIdx = i; saveActive(); loadUI(); updateAll(); }
 function deleteProject(i) {
   if (projects.length <= 1) { alert('Mindestens ein Projekt muss bleiben.'); return; }
   if (!confirm('Projekt löschen?')) return;
-  projects.splice(i, 1); if (aIdx >= projects.length) aIdx = projects.length - 1;
-  saveData(); loadUI(); updateAll();
+  var gone = projects.splice(i, 1)[0]; if (aIdx >= projects.length) aIdx = projects.length - 1;
+  record([{ op: 'del', path: [gone.id] }, { op: 'active', index: aIdx }]);
+  loadUI(); updateAll();
 }
 function loadUI() {
   var p = getP();
@@ -748,7 +1184,7 @@ function loadUI() {
 }
 function onTitleBlur() {
   var p = getP(); p.title = document.getElementById('projTitleInp').value.trim() || 'Projekt';
-  saveData(); renderProjList(); updateTopBar();
+  saveFields([p.id], p, ['title']); renderProjList(); updateTopBar();
 }
 function onDateCh() {
   var p = getP();
@@ -757,7 +1193,7 @@ function onDateCh() {
   normDates(p);
   document.getElementById('startDateInp').value = p.start;
   document.getElementById('endDateInp').value = p.end;
-  saveData(); updateAll();
+  saveFields([p.id], p, ['start', 'end']); updateAll();
 }
 
 // ============================================================
@@ -765,8 +1201,9 @@ function onDateCh() {
 // ============================================================
 function addMs() {
   var p = getP();
-  p.milestones.push({ id: uid(), name: 'Neuer Meilenstein', date: p.end || iso(new Date()), done: false, risk: 'low', notes: '', blockedBy: '', tasks: [] });
-  saveData(); updateAll();
+  var ms = { id: uid(), name: 'Neuer Meilenstein', date: p.end || iso(new Date()), done: false, risk: 'low', notes: '', blockedBy: '', tasks: [] };
+  p.milestones.push(ms); statsOf(p).add(ms);
+  putItem([p.id, ms.id], ms); updateAll();
   setTimeout(function() { document.querySelectorAll('.ms-list').forEach(function(el) { el.scrollTop = el.scrollHeight; }); }, 60);
 }
 
@@ -798,14 +1235,13 @@ function renderTab() {
 // STATS
 // ============================================================
 function calcStats() {
-  var p = getP(), now = new Date(), ms = p.milestones || [], tasks = [];
-  ms.forEach(function(m) { (m.tasks || []).forEach(function(t) { tasks.push(t); }); });
-  var tot = tasks.length, done = tasks.filter(function(t) { return t.done; }).length;
+  var p = getP(), now = new Date(), st = statsOf(p);
+  var tot = st.tasksTot, done = st.tasksDone;
   var pct = tot === 0 ? 0 : Math.round(done / tot * 100);
-  var msTot = ms.length, msDone = ms.filter(function(m) { return m.done; }).length;
+  var msTot = st.byId.size, msDone = st.msDone;
   var msPct = msTot === 0 ? 0 : Math.round(msDone / msTot * 100);
-  var over = ms.filter(function(m) { return !m.done && spd(m.date) && spd(m.date) < now; }).length;
-  var blk = ms.filter(function(m) { return blocked(m, ms); }).length;
+  var over = st.overdue(now.getTime());
+  var blk = st.blockedCnt;
   var end = spd(p.end) || now, dLeft = dd(now, end);
   var vel = velocity(p), h = health(p);
 
@@ -823,23 +1259,19 @@ function calcStats() {
   el('hDot', function(e) { e.style.background = h.col; });
   el('hLbl', function(e) { e.textContent = h.lbl; e.style.color = h.col; });
 
-  // Critical path
-  var cp = ms.filter(function(m) { return !m.done && (m.risk === 'high' || m.blockedBy); });
+  // Critical path (in Abhängigkeitsreihenfolge)
+  var cp = st.criticalList();
   el('critCard', function(e) { e.style.display = cp.length ? 'block' : 'none'; });
   el('critContent', function(e) {
     e.innerHTML = cp.map(function(m) {
-      var dep = '';
-      if (m.blockedBy) { for (var i = 0; i < ms.length; i++) { if (ms[i].id === m.blockedBy) { dep = ' (blockiert von: ' + ms[i].name + ')'; break; } } }
-      return '<span style="margin-right:8px;">⛔ <strong>' + m.name + '</strong>' + dep + ' <span class="badge bd">' + m.risk + '</span></span>';
+      var d = st.depOf(m), dep = d ? ' (blockiert von: ' + d.name + ')' : '';
+      var cyc = st.inCycle(m.id) ? ' <span class="badge bw">Zyklus</span>' : '';
+      return '<span style="margin-right:8px;">⛔ <strong>' + m.name + '</strong>' + dep + ' <span class="badge bd">' + m.risk + '</span>' + cyc + '</span>';
     }).join('<br>');
   });
 
   // Next milestone
-  var upcoming = null, upcoming_d = null;
-  ms.filter(function(m) { return !m.done; }).forEach(function(m) {
-    var d = spd(m.date); if (!d) return;
-    if (!upcoming || d < upcoming_d) { upcoming = m; upcoming_d = d; }
-  });
+  var upcoming = st.nextOpen(), upcoming_d = upcoming ? spd(upcoming.date) : null;
   el('nextMsBox', function(e) {
     if (!upcoming) { e.innerHTML = '<span style="color:var(--success)">🎉 Alle erledigt!</span>'; return; }
     var days = dd(now, upcoming_d);
@@ -848,10 +1280,9 @@ function calcStats() {
   });
 }
 function updateTopBar() {
-  var p = getP(), now = new Date(), end = spd(p.end) || now;
-  var dLeft = dd(now, end), tasks = [];
-  (p.milestones || []).forEach(function(m) { (m.tasks || []).forEach(function(t) { tasks.push(t); }); });
-  var tot = tasks.length, done = tasks.filter(function(t) { return t.done; }).length;
+  var p = getP(), now = new Date(), end = spd(p.end) || now, st = statsOf(p);
+  var dLeft = dd(now, end);
+  var tot = st.tasksTot, done = st.tasksDone;
   var pct = tot === 0 ? 0 : Math.round(done / tot * 100);
   el('topTitle', function(e) { e.textContent = p.title || 'Projekt'; });
   el('topRange', function(e) { e.innerHTML = '<strong>' + (p.start || '?') + '</strong> → <strong>' + (p.end || '?') + '</strong>'; });
@@ -869,7 +1300,7 @@ function renderProjList() {
   projects.forEach(function(p, i) {
     var btn = document.createElement('button');
     btn.className = 'proj-btn' + (i === aIdx ? ' active' : '');
-    var open = (p.milestones || []).filter(function(m) { return !m.done; }).length;
+    var st = statsOf(p), open = st.byId.size - st.msDone;
     btn.innerHTML = '<span class="proj-name">' + (p.title || 'Projekt') + '</span>' +
       '<span class="proj-badge">' + open + '</span>' +
       '<span class="proj-del" title="Löschen">×</span>';
@@ -886,13 +1317,37 @@ function renderProjList() {
 // ============================================================
 // MILESTONE LIST
 // ============================================================
+var msRows = {};   // containerId -> Map(id -> {row, noteRow})
 function renderMsList(containerId) {
   var p = getP(), container = document.getElementById(containerId); if (!container) return;
   container.innerHTML = '';
+  var rows = msRows[containerId] = new Map();
   var sorted = (p.milestones || []).slice().sort(function(a, b) {
     return (spd(a.date) || new Date(0)) - (spd(b.date) || new Date(0));
   });
-  sorted.forEach(function(ms) { appendMsRow(ms, p, container, containerId); });
+  sorted.forEach(function(ms) { rows.set(ms.id, appendMsRow(ms, p, container, containerId)); });
+}
+
+// Nach Änderung einzelner Felder: Kennzahlen nachführen und nur die betroffenen
+// Zeilen bzw. Zeitstrahl-Knoten neu zeichnen, nicht die ganze Liste.
+function msEdited(p, ms, repaint) {
+  var ids = statsOf(p).update(ms);
+  calcStats(); updateTopBar(); renderProjList();
+  if (repaint) repaintMs(p, ids);
+}
+function repaintMs(p, ids) {
+  var cid = curTab === 'dash' ? 'msListDash' : curTab === 'tl' ? 'msListTL' : null;
+  if (!cid) { renderTab(); return; }
+  var rows = msRows[cid], container = document.getElementById(cid), st = statsOf(p);
+  ids.forEach(function(id) {
+    var old = rows && rows.get(id), ms = st.byId.get(id);
+    if (!old || !ms || !container) return;
+    var frag = document.createDocumentFragment();
+    rows.set(id, appendMsRow(ms, p, frag, cid));
+    container.insertBefore(frag, old.row);
+    old.row.remove(); old.noteRow.remove();
+  });
+  if (curTab === 'tl') ids.forEach(function(id) { paintTlNode(p, id); });
 }
 
 function appendMsRow(ms, p, container, containerId) {
@@ -900,7 +1355,7 @@ function appendMsRow(ms, p, container, containerId) {
   var doneT = tasks.filter(function(t) { return t.done; }).length;
   var totT = tasks.length;
   var taskPct = totT === 0 ? 0 : Math.round(doneT / totT * 100);
-  var isBlocked = blocked(ms, p.milestones || []);
+  var isBlocked = statsOf(p).isBlocked(ms.id);
   var stat = msStat(ms);
 
   var row = document.createElement('div');
@@ -908,19 +1363,19 @@ function appendMsRow(ms, p, container, containerId) {
 
   // Col 1: checkbox
   var chk = document.createElement('input'); chk.type = 'checkbox'; chk.className = 'ms-chk'; chk.checked = !!ms.done;
-  chk.onchange = function() { ms.done = chk.checked; saveData(); updateAll(); };
+  chk.onchange = function() { ms.done = chk.checked; saveFields([p.id, ms.id], ms, ['done']); msEdited(p, ms, true); };
 
   // Col 2: date
   var dWrap = document.createElement('div'); dWrap.className = 'ms-date-wrap';
   var dLbl = document.createElement('div'); dLbl.className = 'ms-date-lbl'; dLbl.textContent = 'Fällig am';
   var dInp = document.createElement('input'); dInp.type = 'date'; dInp.className = 'ms-date-inp'; dInp.value = ms.date || '';
-  dInp.onchange = function() { var d = spd(dInp.value); if (d) { ms.date = iso(d); saveData(); renderTimeline(); calcStats(); } };
+  dInp.onchange = function() { var d = spd(dInp.value); if (d) { ms.date = iso(d); saveFields([p.id, ms.id], ms, ['date']); msEdited(p, ms, false); paintTlNode(p, ms.id); } };
   dWrap.appendChild(dLbl); dWrap.appendChild(dInp);
 
   // Col 3: name + meta + progress
   var mDiv = document.createElement('div'); mDiv.className = 'ms-main';
   var nInp = document.createElement('input'); nInp.type = 'text'; nInp.className = 'ms-name-inp'; nInp.value = ms.name || '';
-  nInp.onchange = function() { ms.name = nInp.value || 'Meilenstein'; saveData(); renderTimeline(); calcStats(); };
+  nInp.onchange = function() { ms.name = nInp.value || 'Meilenstein'; saveFields([p.id, ms.id], ms, ['name']); calcStats(); paintTlNode(p, ms.id); };
   var meta = document.createElement('div'); meta.className = 'ms-meta';
   meta.innerHTML = '<span class="badge ' + stat.c + '">' + stat.l + '</span>' + (isBlocked ? '<span style="color:var(--warning);font-size:10px;">⛔ Blockiert</span>' : '');
   var prog = document.createElement('div'); prog.className = 'ms-prog';
@@ -934,13 +1389,24 @@ function appendMsRow(ms, p, container, containerId) {
   [['low','🟢 Low'],['medium','🟡 Medium'],['high','🔴 High']].forEach(function(rv) {
     var o = document.createElement('option'); o.value = rv[0]; o.textContent = rv[1]; o.selected = ms.risk === rv[0]; rSel.appendChild(o);
   });
-  rSel.onchange = function() { ms.risk = rSel.value; rSel.className = 'risk-sel risk-' + ms.risk; saveData(); calcStats(); };
+  rSel.onchange = function() { ms.risk = rSel.value; rSel.className = 'risk-sel risk-' + ms.risk; saveFields([p.id, ms.id], ms, ['risk']); msEdited(p, ms, false); };
   var dSel = document.createElement('select'); dSel.className = 'dep-sel';
   var noneOpt = document.createElement('option'); noneOpt.value = ''; noneOpt.textContent = 'Keine Abh.'; dSel.appendChild(noneOpt);
-  (p.milestones || []).filter(function(m) { return m.id !== ms.id; }).forEach(function(m) {
-    var o = document.createElement('option'); o.value = m.id; o.textContent = m.name; o.selected = ms.blockedBy === m.id; dSel.appendChild(o);
-  });
-  dSel.onchange = function() { ms.blockedBy = dSel.value; saveData(); calcStats(); renderMsList(containerId); };
+  var curDep = statsOf(p).depOf(ms);
+  if (curDep) { var co = document.createElement('option'); co.value = curDep.id; co.textContent = curDep.name; co.selected = true; dSel.appendChild(co); }
+  // Vollständige Auswahl erst beim Öffnen; Meilensteine, die auf diesen warten, würden einen Zyklus bilden
+  var depsFilled = false;
+  dSel.onfocus = dSel.onmousedown = function() {
+    if (depsFilled) return; depsFilled = true;
+    var down = statsOf(p).downstream(ms.id);
+    (p.milestones || []).forEach(function(m) {
+      if (down.has(m.id) || (curDep && m.id === curDep.id)) return;
+      var o = document.createElement('option'); o.value = m.id; o.textContent = m.name; dSel.appendChild(o);
+    });
+  };
+  dSel.onchange = function() {
+    ms.blockedBy = dSel.value; saveFields([p.id, ms.id], ms, ['blockedBy']); msEdited(p, ms, true);
+  };
   rDiv.appendChild(rSel); rDiv.appendChild(dSel);
 
   // Col 5: tasks
@@ -953,21 +1419,21 @@ function appendMsRow(ms, p, container, containerId) {
     var line = document.createElement('div'); line.className = 'task-line';
     var cb = document.createElement('input'); cb.type = 'checkbox'; cb.className = 'task-cb'; cb.checked = !!task.done;
     cb.onchange = function() {
-      task.done = cb.checked; saveData(); calcStats();
+      task.done = cb.checked; saveFields([p.id, ms.id, task.id], task, ['done']); msEdited(p, ms, false);
       var d2 = tasks.filter(function(t) { return t.done; }).length;
       tSum.textContent = d2 + '/' + tasks.length + ' Aufgaben';
       progFill.style.width = (tasks.length === 0 ? 0 : Math.round(d2 / tasks.length * 100)) + '%';
     };
     var txt = document.createElement('input'); txt.type = 'text'; txt.className = 'task-txt'; txt.value = task.text;
-    txt.onchange = function() { task.text = txt.value; saveData(); };
+    txt.onchange = function() { task.text = txt.value; saveFields([p.id, ms.id, task.id], task, ['text']); };
     var rm = document.createElement('button'); rm.className = 'task-rm'; rm.textContent = '×';
-    rm.onclick = function() { var i = tasks.indexOf(task); if (i >= 0) tasks.splice(i, 1); saveData(); calcStats(); renderMsList(containerId); };
+    rm.onclick = function() { var i = tasks.indexOf(task); if (i >= 0) tasks.splice(i, 1); delItem([p.id, ms.id, task.id]); msEdited(p, ms, true); };
     line.appendChild(cb); line.appendChild(txt); line.appendChild(rm);
     tList.appendChild(line);
   });
   tCol.appendChild(tList);
   var addT = document.createElement('button'); addT.className = 'task-add'; addT.textContent = '+ Aufgabe';
-  addT.onclick = function() { tasks.push({ id: uid(), text: 'Neue Aufgabe', done: false }); saveData(); calcStats(); renderMsList(containerId); };
+  addT.onclick = function() { var t = { id: uid(), text: 'Neue Aufgabe', done: false }; tasks.push(t); putItem([p.id, ms.id, t.id], t); msEdited(p, ms, true); };
   tCol.appendChild(addT);
   var noteBtn = document.createElement('button'); noteBtn.className = 'note-btn'; noteBtn.textContent = ms.notes ? '📝 Notiz' : '+ Notiz';
   noteBtn.onclick = function() { noteArea.classList.toggle('vis'); noteBtn.textContent = noteArea.classList.contains('vis') ? '📝 Notiz' : '+ Notiz'; };
@@ -975,7 +1441,7 @@ function appendMsRow(ms, p, container, containerId) {
 
   // Col 6: delete
   var del = document.createElement('button'); del.className = 'ms-del'; del.textContent = '×';
-  del.onclick = function() { if (confirm('Meilenstein löschen?')) { p.milestones = p.milestones.filter(function(m) { return m.id !== ms.id; }); saveData(); updateAll(); } };
+  del.onclick = function() { if (confirm('Meilenstein löschen?')) { p.milestones = p.milestones.filter(function(m) { return m.id !== ms.id; }); statsOf(p).remove(ms.id); delItem([p.id, ms.id]); updateAll(); } };
 
   row.appendChild(chk); row.appendChild(dWrap); row.appendChild(mDiv);
   row.appendChild(rDiv); row.appendChild(tCol); row.appendChild(del);
@@ -984,109 +1450,81 @@ function appendMsRow(ms, p, container, containerId) {
   // Note area (full-width extra row)
   var noteArea = document.createElement('textarea'); noteArea.className = 'note-area' + (ms.notes ? ' vis' : '');
   noteArea.placeholder = 'Notizen, Risiken, Details...'; noteArea.value = ms.notes || '';
-  noteArea.onchange = function() { ms.notes = noteArea.value; saveData(); };
+  noteArea.onchange = function() { ms.notes = noteArea.value; saveFields([p.id, ms.id], ms, ['notes']); };
   var noteRow = document.createElement('div'); noteRow.style.cssText = 'grid-column:1/-1;padding:0 4px 6px;';
   noteRow.appendChild(noteArea);
   container.appendChild(noteRow);
+  return { row: row, noteRow: noteRow };
 }
 
 // ============================================================
 // TIMELINE
 // ============================================================
-function renderTimeline() {
-  var p = getP(), track = document.getElementById('tlTrack'); if (!track) return;
-  track.innerHTML = '<div class="tl-prog" id="tlProg"></div><div class="tl-now" id="tlNow"></div>';
-  var s = spd(p.start), e = spd(p.end); if (!s || !e || e <= s) return;
-  var sTs = s.getTime(), eTs = e.getTime(), tot = eTs - sTs, nowTs = Date.now();
-  var nowPct = Math.max(0, Math.min(100, (nowTs - sTs) / tot * 100));
-  document.getElementById('tlProg').style.width = nowPct + '%';
-  document.getElementById('tlNow').style.left = nowPct + '%';
-
-  var ms = (p.milestones || []).slice().sort(function(a, b) { return (spd(a.date) || new Date(0)) - (spd(b.date) || new Date(0)); });
-
-  // Dependency lines
-  ms.forEach(function(m) {
-    if (!m.blockedBy) return;
-    var dep = null; for (var i = 0; i < ms.length; i++) { if (ms[i].id === m.blockedBy) { dep = ms[i]; break; } }
-    if (!dep) return;
-    var fd = spd(dep.date), td = spd(m.date); if (!fd || !td) return;
-    var fp = Math.max(0, Math.min(100, (fd.getTime() - sTs) / tot * 100));
-    var tp = Math.max(0, Math.min(100, (td.getTime() - sTs) / tot * 100));
-    var line = document.createElement('div'); line.className = 'dep-line';
-    line.style.left = fp + '%'; line.style.width = Math.max(0, tp - fp) + '%';
-    track.appendChild(line);
-  });
+var tlView = null, ganttView = null;   // TimelineCanvas, beim ersten Anzeigen erzeugt
+function tlItem(p, m) {
+  var md = spd(m.date), s = spd(p.start), st = statsOf(p), dep = st.depOf(m);
+  var col = m.done ? ['--success', '--success'] : msStat(m).l === 'Überfällig' ? ['--danger', '--danger-soft']
+    : st.isBlocked(m.id) ? ['--warning', '--warning-soft'] : ['--accent', '--accent-soft'];
+  var risk = { low: '🟢', medium: '🟡', high: '🔴' }[m.risk] || '';
+  return { id: m.id, start: s ? s.getTime() : md.getTime(), end: md.getTime(), label: m.name,
+           sub: md.getUTCDate() + '.' + (md.getUTCMonth() + 1) + '. ' + risk,
+           color: col[0], fill: col[1], dep: dep ? dep.id : null, done: !!m.done };
+}
+function tlItems(p) {
+  return (p.milestones || []).filter(function(m) { return spd(m.date); }).map(function(m) { return tlItem(p, m); });
+}
+function tlRange(p) {
+  var s = spd(p.start), e = spd(p.end);
+  return s && e && e > s ? { start: s.getTime(), end: e.getTime() } : null;
+}
+// Ziehen eines Meilensteins setzt sein Datum auf den Tag unter dem Zeiger
+function tlDragged(item, ts) {
+  var p = getP(), m = statsOf(p).byId.get(item.id); if (!m) return;
+  m.date = iso(new Date(ts)); saveFields([p.id, m.id], m, ['date']);
+  msEdited(p, m, true);
+}
+function tlToggle(item) {
+  var p = getP(), m = statsOf(p).byId.get(item.id); if (!m) return;
+  m.done = !m.done; saveFields([p.id, m.id], m, ['done']); msEdited(p, m, true);
+}
+function tlTooltip(item) { return item.label + ' (' + iso(new Date(item.end)) + ')'; }
 
-  // Nodes
-  ms.forEach(function(m, idx) {
-    var md = spd(m.date); if (!md) return;
-    var pct = Math.max(0, Math.min(100, (md.getTime() - sTs) / tot * 100));
-    var isBlk = blocked(m, p.milestones || []);
-    var st = msStat(m);
-    var cls = m.done ? 'done' : (st.l === 'Überfällig' ? 'overdue' : 'future');
-    if (isBlk && !m.done) cls = 'blocked';
-
-    var node = document.createElement('div'); node.className = 'ms-node ' + cls; node.style.left = pct + '%';
-    node.title = m.name + ' (' + (m.date || '') + ')';
-
-    var wrap = document.createElement('div'); wrap.className = 'node-wrap ' + (idx % 2 !== 0 ? 'top' : 'bottom');
-    var risk = { low: '🟢', medium: '🟡', high: '🔴' }[m.risk] || '';
-    wrap.innerHTML = '<div class="node-lbl">' + m.name + '</div><div class="node-date">' + md.getDate() + '.' + (md.getMonth() + 1) + '. ' + risk + '</div>';
-    node.appendChild(wrap);
-    node.onclick = function() { m.done = !m.done; saveData(); updateAll(); };
-    track.appendChild(node);
-  });
+function renderTimeline() {
+  var p = getP(), host = document.getElementById('tlCanvas'); if (!host) return;
+  if (!tlView) tlView = new TimelineCanvas(host, { mode: 'track', onClick: tlToggle, onDrag: tlDragged, tooltip: tlTooltip });
+  var range = tlRange(p);
+  tlView.setItems(range ? tlItems(p) : [], range);
+}
+function paintTlNode(p, id) {
+  var m = statsOf(p).byId.get(id);
+  if (tlView && m && spd(m.date)) tlView.updateItem(tlItem(p, m));
 }
 
 // ============================================================
 // GANTT
 // ============================================================
 function renderGantt() {
-  var p = getP(), s = spd(p.start), e = spd(p.end);
-  var hdr = document.getElementById('ganttHdr'), body = document.getElementById('ganttBody');
-  if (!hdr || !body || !s || !e || e <= s) return;
-  hdr.innerHTML = ''; body.innerHTML = '';
-  var totDays = dd(s, e), now = new Date();
-  var nowPct = Math.max(0, Math.min(100, dd(s, now) / totDays * 100));
-
-  // Month labels
-  var cur = new Date(s.getFullYear(), s.getMonth(), 1);
-  while (cur <= e) {
-    var pct = Math.max(0, Math.min(100, dd(s, cur) / totDays * 100));
-    var ml = document.createElement('div'); ml.className = 'gantt-mlbl'; ml.style.left = pct + '%';
-    ml.textContent = cur.toLocaleDateString('de-DE', { month: 'short', year: '2-digit' });
-    hdr.appendChild(ml);
-    var gl = document.createElement('div'); gl.className = 'gantt-grid'; gl.style.left = pct + '%'; hdr.appendChild(gl);
-    cur.setMonth(cur.getMonth() + 1);
-  }
-  var todayHdr = document.createElement('div'); todayHdr.className = 'gantt-today'; todayHdr.style.left = nowPct + '%'; hdr.appendChild(todayHdr);
-
-  var ms = (p.milestones || []).slice().sort(function(a, b) { return (spd(a.date) || new Date(0)) - (spd(b.date) || new Date(0)); });
-  ms.forEach(function(m) {
-    var md = spd(m.date); if (!md) return;
-    var endPct = Math.max(2, Math.min(100, dd(s, md) / totDays * 100));
-    var st = msStat(m);
-    var row = document.createElement('div'); row.className = 'gantt-row';
-    var lbl = document.createElement('div'); lbl.className = 'gantt-row-lbl';
-    lbl.innerHTML = '<span class="badge ' + st.c + '" style="font-size:8px;padding:1px 4px;">' + (m.done ? '✓' : '○') + '</span> ' + m.name;
-    var chart = document.createElement('div'); chart.className = 'gantt-row-chart';
-    var tl = document.createElement('div'); tl.className = 'gantt-today'; tl.style.left = nowPct + '%';
-    var bar = document.createElement('div');
-    bar.className = 'gantt-bar ' + (m.done ? 'done' : (md < now ? 'overdue' : 'normal'));
-    bar.style.cssText = 'left:0;width:' + endPct + '%';
-    bar.textContent = m.name; bar.title = m.name + ' bis ' + (m.date || '');
-    chart.appendChild(tl); chart.appendChild(bar);
-    row.appendChild(lbl); row.appendChild(chart); body.appendChild(row);
+  var p = getP(), host = document.getElementById('ganttCanvas'); if (!host) return;
+  if (!ganttView) ganttView = new TimelineCanvas(host, {
+    mode: 'rows', rowHeight: 38, labelWidth: 200, headerHeight: 36, title: 'MEILENSTEIN',
+    onDrag: tlDragged, tooltip: function(it) { return it.label + ' bis ' + iso(new Date(it.end)); }
   });
+  var range = tlRange(p);
+  if (!range) { ganttView.setItems([], null); return; }
+  var now = Date.now();
+  var items = tlItems(p).sort(function(a, b) { return a.end - b.end; }).map(function(it) {
+    it.color = it.done ? '--success' : it.end < now ? '--danger' : '--accent';
+    return it;
+  });
+  ganttView.setItems(items, range);
 }
 
 // ============================================================
 // BURNDOWN
 // ============================================================
 function renderBurndown() {
-  var p = getP(), now = new Date(), ms = p.milestones || [], tasks = [];
-  ms.forEach(function(m) { (m.tasks || []).forEach(function(t) { tasks.push(t); }); });
-  var tot = tasks.length, done = tasks.filter(function(t) { return t.done; }).length;
+  var p = getP(), now = new Date(), st = statsOf(p);
+  var tot = st.tasksTot, done = st.tasksDone;
   var remaining = tot - done, vel = velocity(p);
   var s = spd(p.start) || now, e = spd(p.end) || now;
   var daysLeft = dd(now, e), daysTotal = Math.max(1, dd(s, e)), elapsed = Math.max(1, dd(s, now));
@@ -1184,12 +1622,56 @@ document.addEventListener('keydown', function(ev) {
 // ============================================================
 function updateAll() { calcStats(); updateTopBar(); renderProjList(); renderTab(); }
 
+// ============================================================
+// BENCHMARK (Konsole: msStatsBenchmark())
+// ============================================================
+// Einzelne Feldänderung (Meilenstein erledigt) auf Testprojekten wachsender Größe:
+// früher updateAll() mit Neuberechnung aus allen Meilensteinen, jetzt msEdited().
+// Zum Schluss werden die inkrementellen Kennzahlen gegen einen Neuaufbau geprüft.
+window.msStatsBenchmark = function(sizes, rounds) {
+  sizes = sizes || [100, 1000, 5000]; rounds = rounds || 30;
+  var savedBackend = backend, savedIdx = aIdx, savedTab = curTab;
+  backend = null;   // nichts ins Journal schreiben
+  switchTab('dash');
+  sizes.forEach(function(n) {
+    var p = defProject(); p.title = 'Benchmark ' + n; p.milestones = [];
+    var t0 = new Date(p.start).getTime();
+    for (var i = 0; i < n; i++) {
+      p.milestones.push({ id: 'b' + i, name: 'Meilenstein ' + i, date: iso(new Date(t0 + (i % 120 - 30) * 86400000)),
+        done: Math.random() < 0.3, risk: ['low', 'medium', 'high'][i % 3], notes: '',
+        blockedBy: i > 0 && Math.random() < 0.4 ? 'b' + Math.floor(Math.random() * i) : '',
+        tasks: [0, 1, 2, 3].map(function(k) { return { id: 'b' + i + 't' + k, text: 'Aufgabe', done: Math.random() < 0.5 }; }) });
+    }
+    projects.push(p); aIdx = projects.length - 1;
+    updateAll();
+    var full = 0, inc = 0, k;
+    for (k = 0; k < rounds; k++) {
+      var m1 = p.milestones[Math.floor(Math.random() * n)];
+      var t = performance.now();
+      m1.done = !m1.done; projStats.delete(p); updateAll();
+      full += performance.now() - t;
+      var m2 = p.milestones[Math.floor(Math.random() * n)];
+      t = performance.now();
+      m2.done = !m2.done; msEdited(p, m2, true);
+      inc += performance.now() - t;
+    }
+    var st = statsOf(p), ref = new ProjectStats(p), diff = 0;
+    ['tasksTot', 'tasksDone', 'msDone', 'openHigh', 'blockedCnt'].forEach(function(key) { if (st[key] !== ref[key]) diff++; });
+    if (st.overdue(Date.now()) !== ref.overdue(Date.now()) || st.critical.size !== ref.critical.size) diff++;
+    console.log(n + ' Meilensteine: Neuberechnung ' + (full / rounds).toFixed(2) + ' ms, inkrementell ' +
+      (inc / rounds).toFixed(2) + ' ms pro Änderung, Abweichungen: ' + diff);
+    projects.pop();
+  });
+  backend = savedBackend; aIdx = savedIdx;
+  loadUI(); switchTab(savedTab); updateAll();
+};
+
 // ============================================================
 // INIT
 // ============================================================
-loadData();
-loadUI();
-switchTab('dash');
+connectBackend(function() {
+  loadData().then(function() { loadUI(); switchTab('dash'); });
+});
 </script>
 </body>
 </html>"""
@@ -1277,9 +1759,23 @@ function hlth(p) {
   var col = s >= 75 ? 'var(--success)' : s >= 45 ? 'var(--warning)' : 'var(--danger)';
   return { s: s, col: col, lbl: (s >= 75 ? 'Gut' : s >= 45 ? 'Mittel' : 'Kritisch') + ' (' + s + ')' };
 }
-function loadData() {
+function connectBackend(onReady) {
+  if (typeof qt === 'undefined' || typeof qt.webChannelTransport === 'undefined' || typeof QWebChannel === 'undefined') { onReady(null); return; }
+  new QWebChannel(qt.webChannelTransport, function(channel) { onReady(channel.objects.msBackend); });
+}
+function loadLegacy() {
   var raw = localStorage.getItem(SKEY);
   if (raw) { try { var p = JSON.parse(raw); if (p && p.projects) { projects = p.projects; aIdx = p.aIdx || 0; } else if (p && p.milestones) { projects = [p]; } } catch(e) {} }
+}
+function loadData(backend) {
+  // Nur lesen: das Popup schreibt nie ins Journal, der Import ist Sache des Fensters
+  return Promise.resolve(backend ? backend.load() : null).then(function(snap) {
+    if (snap && snap.imported) { projects = snap.projects || []; aIdx = snap.aIdx || 0; }
+    else loadLegacy();
+    normalize();
+  });
+}
+function normalize() {
   if (!projects || !projects.length) projects = [{ id: '_', title: 'Projekt', start: '', end: '', milestones: [] }];
   projects.forEach(function(p) { (p.milestones || []).forEach(function(m) { if (!m.tasks) m.tasks = []; if (!m.risk) m.risk = 'low'; }); });
 }
@@ -1324,7 +1820,7 @@ function refresh() {
   s('ppNT', function(e) { e.textContent = ut.length === 0 ? 'Keine Tasks' : utd + '/' + ut.length + ' Tasks'; });
   s('ppNL', function(e) { e.innerHTML = ''; ut.filter(function(t) { return !t.done; }).slice(0, 3).forEach(function(t) { var li = document.createElement('li'); li.textContent = t.text; e.appendChild(li); }); });
 }
-loadData(); refresh();
+connectBackend(function(backend) { loadData(backend).then(refresh); });
 </script>
 </body>
 </html>"""
@@ -1358,10 +1854,111 @@ loadData(); refresh();
 
     def closeEvent(self, event):
         self._cleanup_watcher()
+        self.backend.close()
         super().closeEvent(event)
 
 
+def _bench_state(n_ms):
+    milestones = [{"id": f"m{i}", "name": f"Meilenstein {i}", "date": "2025-01-01", "done": False,
+                   "risk": "low", "notes": "", "blockedBy": "",
+                   "tasks": [{"id": f"m{i}t{k}", "text": f"Aufgabe {k}", "done": False} for k in range(5)]}
+                  for i in range(n_ms)]
+    return {"projects": [{"id": "p0", "title": "Projekt", "start": "2025-01-01", "end": "2025-12-31",
+                          "milestones": milestones}], "aIdx": 0}
+
+
+def _bench_op(seq, n_ms):
+    """Deterministische Bearbeitung Nr. seq (für Schreiber und Prüfung gleich)."""
+    i = (seq * 7919) % n_ms
+    return {"op": "set", "path": ["p0", f"m{i}", f"m{i}t{seq % 5}"], "fields": {"done": seq % 2 == 0}}
+
+
+def _journal_writer(directory, n_ms, compact_ops, acked):
+    """Schreibt Bearbeitungen, bis der Prozess hart beendet wird; acked = letzte bestätigte seq."""
+    journal = ProjectJournal(directory, compact_ops=compact_ops)
+    seq = journal.seq
+    while True:
+        seq += 1
+        journal.append([_bench_op(seq, n_ms)])
+        acked.value = seq
+
+
+def _benchmark_journal(sizes=(100, 1000, 5000), rounds=300, kills=20):
+    """
+    1) Speicherzeit pro Bearbeitung: ganzer Bestand als JSON (wie früher saveData)
+       gegen eine Journalzeile (inkl. anteiliger Verdichtung).
+    2) Wiederherstellung: Schreiberprozess wird mitten im Schreiben hart beendet,
+       danach muss der Stand jede bestätigte Bearbeitung enthalten und exakt dem
+       Nachspielen der Bearbeitungen 1..seq entsprechen.
+    """
+    import copy
+    import multiprocessing
+    import random
+    import tempfile
+
+    for n in sizes:
+        state = _bench_state(n)
+        with tempfile.TemporaryDirectory() as tmp:
+            blob_path = os.path.join(tmp, "blob.json")
+            t0 = time.perf_counter()
+            for seq in range(1, rounds + 1):
+                _apply_op(state, _bench_op(seq, n))
+                with open(blob_path, "w", encoding="utf-8") as f:
+                    f.write(json.dumps(state))
+                    f.flush()
+                    os.fsync(f.fileno())
+            t_blob = (time.perf_counter() - t0) / rounds
+
+            journal = ProjectJournal(os.path.join(tmp, "journal"), compact_ops=rounds // 3)
+            journal.import_legacy(_bench_state(n))
+            t0 = time.perf_counter()
+            for seq in range(1, rounds + 1):
+                raw = json.dumps(_bench_op(seq, n))  # so kommt die Operation über den WebChannel
+                journal.append([json.loads(raw)])
+            t_journal = (time.perf_counter() - t0) / rounds
+            journal.close()
+        print(f"{n:5d} Meilensteine: ganzer Bestand {t_blob * 1000:7.2f} ms, "
+              f"Journalzeile {t_journal * 1000:6.2f} ms (Verdichtung alle {rounds // 3} Zeilen)")
+
+    rnd = random.Random(1)
+    n = 200
+    for trial in range(kills):
+        with tempfile.TemporaryDirectory() as tmp:
+            journal = ProjectJournal(tmp)
+            journal.import_legacy(_bench_state(n))
+            journal.close()
+            acked = multiprocessing.Value('q', 0, lock=False)  # ein Lock könnte der getötete Prozess halten
+            proc = multiprocessing.Process(target=_journal_writer, args=(tmp, n, rnd.choice((50, 500)), acked))
+            proc.start()
+            time.sleep(0.2 + rnd.random() * 0.3)
+            proc.kill()
+            proc.join()
+            last_acked = acked.value
+
+            recovered = ProjectJournal(tmp)
+            expected = _bench_state(n)
+            for seq in range(1, recovered.seq + 1):
+                _apply_op(expected, _bench_op(seq, n))
+            ok = recovered.seq >= last_acked and recovered.state == expected
+            # nach einem abgeschnittenen Eintrag muss weitergeschrieben werden können
+            recovered.append([_bench_op(recovered.seq + 1, n)])
+            _apply_op(expected, _bench_op(recovered.seq, n))
+            recovered.close()
+            ok = ok and ProjectJournal(tmp).state == expected
+            expected_copy = copy.deepcopy(expected)
+            with open(os.path.join(tmp, JOURNAL_FILE), "ab") as f:
+                f.write(b'{"seq": 999999, "ops": [{"op": "del", "pa')  # abgerissene Zeile
+            ok = ok and ProjectJournal(tmp).state == expected_copy
+        print(f"Abbruch {trial + 1:2d}: bestätigt {last_acked:6d}, wiederhergestellt bis "
+              f"{recovered.seq - 1:6d} – {'ok' if ok else 'FEHLER'}")
+
+
 if __name__ == '__main__':
+    # Speicherzeit und Wiederherstellung prüfen: python milestone_master_ultra.py --benchmark-journal
+    if len(sys.argv) == 2 and sys.argv[1] == "--benchmark-journal":
+        _benchmark_journal()
+        sys.exit(0)
+
     app = QApplication(sys.argv)
     window = PluginWidget(theme="dark", mode="Window")
     window.show()
@@ -1,4 +1,6 @@
 # scripts/readme_manager.py
+import hashlib
+import json
 import os
 import sys
 import shutil
@@ -12,6 +14,9 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEnginePage
 from PyQt5.QtGui import QPalette
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _text_docs import VIRTUAL_LIST_JS, MetaListing, WriteBehindBuffer  # noqa: E402
+
 # --- KONFIGURATION ---
 # Hier werden die READMEs gespeichert:
 DATA_DIR = os.path.expanduser('~/.tray_launcher_readmes')
@@ -22,6 +27,13 @@ THEME_LIGHT = "light"
 THEME_DARK = "dark"
 SUPPORTED_THEMES = {THEME_LIGHT, THEME_DARK}
 
+# Autosave-Patches werden gesammelt nach dieser Ruhezeit auf die Platte geschrieben
+WRITE_BEHIND_MS = 1500
+
+# Gerendertes HTML je Inhalts-Hash, damit die Vorschau beim Öffnen sofort steht
+RENDER_CACHE_DIR = os.path.join(DATA_DIR, '.render_cache')
+RENDER_CACHE_MAX_FILES = 200
+
 
 # --- 1. Backend Logik (API) ---
 
@@ -40,6 +52,89 @@ def _detect_host_theme(default=THEME_LIGHT):
     return default
 
 
+def _atomic_write(path, content):
+    """Schreibt über eine temporäre Datei + os.replace, damit nie eine halbe Datei entsteht."""
+    directory, name = os.path.split(path)
+    tmp = os.path.join(directory, f".{name}.tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _read_file(name):
+    path = os.path.join(DATA_DIR, name)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+class RenderCache:
+    """
+    Festplatten-Cache für gerendertes Markdown: <sha256 des Inhalts>.html.
+    Befüllt wird er mit dem HTML, das die Seite beim ersten Öffnen selbst
+    rendert; älteste Einträge (nach mtime) fliegen beim Überschreiten raus.
+    """
+
+    def __init__(self, root, max_files=RENDER_CACHE_MAX_FILES):
+        self.root = root
+        self.max_files = max_files
+        os.makedirs(root, exist_ok=True)
+
+    @staticmethod
+    def content_hash(content):
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def _path(self, digest):
+        return os.path.join(self.root, digest + '.html')
+
+    def get(self, digest):
+        path = self._path(digest)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                html = f.read()
+            os.utime(path)  # zuletzt benutzt
+            return html
+        except OSError:
+            return None
+
+    def put(self, digest, html):
+        _atomic_write(self._path(digest), html)
+        self._evict()
+
+    def _evict(self):
+        with os.scandir(self.root) as it:
+            entries = [e for e in it if e.name.endswith('.html')]
+        if len(entries) <= self.max_files:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for e in entries[:len(entries) - self.max_files]:
+            try:
+                os.remove(e.path)
+            except OSError:
+                pass
+
+
+def _file_stamp(name):
+    """(mtime_ns, size) einer README oder None."""
+    try:
+        st = os.stat(os.path.join(DATA_DIR, name))
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _dir_version():
+    """Ändert sich bei jedem Anlegen, Speichern (os.replace) und Löschen im Ordner."""
+    return os.stat(DATA_DIR).st_mtime_ns
+
+
+def _file_meta(name, st):
+    return {"name": name, "size": st.st_size, "mtime": st.st_mtime_ns // 1_000_000}
+
+
 class ReadmeAPI(QObject):
     """
     Schnittstelle zwischen Python (Dateisystem) und JavaScript (Editor).
@@ -52,6 +147,19 @@ class ReadmeAPI(QObject):
     def __init__(self, initial_theme=THEME_LIGHT):
         super().__init__()
         self._theme = initial_theme
+        self._listing = None  # MetaListing, erst beim ersten Seitenabruf aufgebaut
+        self._listing_version = None  # Ordnerstand, auf dem die Liste beruht
+        # Fenster und Popup haben je eine eigene API; Speichern des anderen über Stempel erkennen
+        self._buffer = WriteBehindBuffer(_read_file, _file_stamp, self._on_external_change)
+        try:
+            self._render_cache = RenderCache(RENDER_CACHE_DIR)
+        except OSError as e:
+            print(f"Render-Cache nicht verfügbar: {e}")
+            self._render_cache = None
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(WRITE_BEHIND_MS)
+        self._flush_timer.timeout.connect(self.flush_pending)
 
     @pyqtSlot(result=list)
     def list_files(self):
@@ -64,18 +172,150 @@ class ReadmeAPI(QObject):
             print(f"Fehler beim Listen: {e}")
             return []
 
-    @pyqtSlot(str, result=str)
+    def _scan_meta(self):
+        with os.scandir(DATA_DIR) as it:
+            return [_file_meta(e.name, e.stat()) for e in it
+                    if e.is_file() and e.name.lower().endswith('.md')]
+
+    def _get_listing(self):
+        version = _dir_version()
+        if self._listing is None:
+            self._listing = MetaListing(self._scan_meta(), "name")
+        elif version != self._listing_version:
+            # Von außen geändert (anderes Fenster): neu einlesen, Clients bekommen einen Reset
+            self._listing.rebase(self._scan_meta())
+        self._listing_version = version
+        return self._listing
+
+    def _track_own_change(self, version_before):
+        """Eigene Änderung: Liste ist aktuell, sofern vorher nichts von außen kam."""
+        if self._listing is not None and self._listing_version == version_before:
+            self._listing_version = _dir_version()
+
+    def _on_external_change(self, filename):
+        self._listing_version = None
+        self.fileListChanged.emit()
+
+    def check_external_changes(self):
+        """Beim Aktivieren des Fensters: Hat das andere Fenster den Ordner geändert?"""
+        if self._listing is not None and _dir_version() != self._listing_version:
+            self.fileListChanged.emit()
+
+    @pyqtSlot(int, int, str, bool, result='QVariantMap')
+    def list_files_page(self, offset, limit, sort, descending):
+        """
+        Eine Seite der Dateiliste: {token, total, offset, items: [{name, size, mtime}]}.
+        sort: "title" | "mtime" | "size".
+        """
+        try:
+            return self._get_listing().page(offset, limit, sort, descending)
+        except Exception as e:
+            print(f"Fehler beim Listen: {e}")
+            return {"token": 0, "total": 0, "offset": 0, "items": []}
+
+    @pyqtSlot(int, result='QVariantMap')
+    def list_files_changes(self, since_token):
+        """Änderungen seit since_token: {token, reset, upserts, removed}."""
+        return self._get_listing().changes(since_token)
+
+    def _cached_html(self, content):
+        if not self._render_cache or not content:
+            return ""
+        return self._render_cache.get(RenderCache.content_hash(content)) or ""
+
+    @pyqtSlot(str, result='QVariantMap')
     def load_file(self, filename):
-        """Lädt den Inhalt einer Datei."""
-        if not filename: return ""
-        path = os.path.join(DATA_DIR, filename)
-        if not os.path.exists(path): return ""
+        """Lädt eine Datei: {content, html}. html ist die gecachte Vorschau oder ""."""
+        if not filename: return {"content": "", "html": ""}
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return f.read()
+            content = self._buffer.text(filename)
+            if content is None:
+                content = _read_file(filename) or ""
+            return {"content": content, "html": self._cached_html(content)}
         except Exception as e:
             print(f"Fehler beim Laden von {filename}: {e}")
-            return ""
+            return {"content": "", "html": ""}
+
+    @pyqtSlot(str, result='QVariantMap')
+    def open_file(self, filename):
+        """
+        Lädt eine Datei in den Puffer: {content, rev, html}. Danach schickt der
+        Editor nur noch Patches (patch_file). rev 0 = Datei existiert nicht;
+        html ist die gecachte Vorschau oder "".
+        """
+        try:
+            opened = self._buffer.open(filename) if filename else None
+        except Exception as e:
+            print(f"Fehler beim Laden von {filename}: {e}")
+            opened = None
+        if opened is None:
+            return {"content": "", "rev": 0, "html": ""}
+        return {"content": opened[0], "rev": opened[1], "html": self._cached_html(opened[0])}
+
+    @pyqtSlot(str, int, str)
+    def store_rendered(self, filename, rev, html):
+        """
+        Legt das von der Seite gerenderte HTML für den Stand rev in den Cache.
+        Der Hash wird hier aus dem Puffer berechnet, nicht vom Client übernommen.
+        """
+        if not self._render_cache:
+            return
+        try:
+            opened = self._buffer.open(filename)
+            if opened is None or opened[1] != rev or not opened[0]:
+                return  # inzwischen geändert
+            self._render_cache.put(RenderCache.content_hash(opened[0]), html)
+        except Exception as e:
+            print(f"Fehler beim Schreiben des Render-Caches: {e}")
+
+    @pyqtSlot(str, int, str, result=int)
+    def patch_file(self, filename, base_rev, ops_json):
+        """
+        Wendet einen Patch ([[start, delete_count, insert], ...], UTF-16-Offsets)
+        auf die Revision base_rev an. Neue Revision oder -1 bei Konflikt.
+        """
+        try:
+            rev = self._buffer.patch(filename, base_rev, json.loads(ops_json))
+        except ValueError:
+            rev = None
+        if rev is None:
+            return -1
+        self._flush_timer.start()
+        return rev
+
+    @pyqtSlot(str, str, result=int)
+    def replace_file(self, filename, content):
+        """Ersetzt den gepufferten Text vollständig (Fallback für patch_file)."""
+        if not filename:
+            return -1
+        rev = self._buffer.replace(filename, content)
+        self._flush_timer.start()
+        return rev
+
+    @pyqtSlot()
+    def flush_pending(self):
+        """Schreibt alle gepufferten Änderungen atomar auf die Platte."""
+        self._flush_timer.stop()
+        written = False
+        for filename, content in self._buffer.take_dirty():
+            try:
+                self._write_file(filename, content)
+                written = True
+            except Exception as e:
+                self._buffer.mark_dirty(filename)
+                print(f"Fehler beim Speichern: {e}")
+        if written:
+            self.fileListChanged.emit()  # Frontend holt nur die Änderungen seit seinem Token
+
+    def _write_file(self, filename, content):
+        path = os.path.join(DATA_DIR, filename)
+        version_before = _dir_version()
+        _atomic_write(path, content)
+        st = os.stat(path)
+        self._buffer.saved(filename, (st.st_mtime_ns, st.st_size))
+        self._track_own_change(version_before)
+        if self._listing is not None:
+            self._listing.upsert(_file_meta(filename, st))
 
     @pyqtSlot(str, str)
     def save_file(self, filename, content):
@@ -85,21 +325,21 @@ class ReadmeAPI(QObject):
         if not filename.lower().endswith('.md'):
             filename += ".md"
 
-        path = os.path.join(DATA_DIR, filename)
-        try:
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            self.fileListChanged.emit()  # Liste aktualisieren (falls neue Datei)
-        except Exception as e:
-            print(f"Fehler beim Speichern: {e}")
+        self._buffer.replace(filename, content)
+        self.flush_pending()
 
     @pyqtSlot(str)
     def delete_file(self, filename):
         """Löscht eine Datei."""
+        self._buffer.discard(filename)
         path = os.path.join(DATA_DIR, filename)
         if os.path.exists(path):
             try:
+                version_before = _dir_version()
                 os.remove(path)
+                self._track_own_change(version_before)
+                if self._listing is not None:
+                    self._listing.remove(filename)
                 self.fileListChanged.emit()
             except Exception as e:
                 print(f"Fehler beim Löschen: {e}")
@@ -143,13 +383,20 @@ body {
     padding: 10px; border-bottom: 1px solid #e1e4e8;
     display: flex; gap: 5px;
 }
+#list-sort { margin: 0 10px 6px 10px; }
+/* Virtualisierte Liste: Zeilen mit fester Höhe, absolut positioniert */
 #file-list {
-    flex: 1; overflow-y: auto; list-style: none; padding: 0; margin: 0;
+    flex: 1; min-height: 0; overflow-y: auto; list-style: none; padding: 0; margin: 0;
+    position: relative;
 }
 #file-list li {
+    position: absolute; left: 0; right: 0; height: 34px; line-height: 18px;
     padding: 8px 15px; cursor: pointer; border-bottom: 1px solid transparent;
     font-size: 14px; white-space: nowrap; overflow: hidden; text-overflow: ellipsis;
 }
+#file-list li.vl-spacer { position: static; width: 1px; padding: 0; visibility: hidden; pointer-events: none; }
+#file-list li.placeholder { opacity: .4; }
+#file-list li.empty { color: #888; font-style: italic; cursor: default; }
 #file-list li:hover { background-color: #e8eaed; }
 #file-list li.active { background-color: #0366d6; color: white; }
 
@@ -226,9 +473,38 @@ body.theme-dark button.primary { background: #238636; border-color: #2ea043; col
 .hidden { display: none !important; }
 """
 
-MAIN_JS = r"""
+MAIN_JS = VIRTUAL_LIST_JS + r"""
 let currentFile = null;
 let isScrolling = false;
+let fileList = null;
+
+// Zuletzt mit dem Backend abgeglichener Stand der geöffneten Datei
+let synced = { file: null, text: "", rev: 0 };
+let saveChain = Promise.resolve();
+
+/**
+ * Minimaler Patch zwischen zwei Ständen: gemeinsamer Anfang und gemeinsames Ende
+ * werden übersprungen, der Rest wird als [[start, deleteCount, insert]] übertragen.
+ * Offsets in UTF-16-Einheiten; Surrogatpaare werden nie getrennt.
+ */
+function computePatch(oldText, newText) {
+    if (oldText === newText) return [];
+    const maxPrefix = Math.min(oldText.length, newText.length);
+    let prefix = 0;
+    while (prefix < maxPrefix && oldText.charCodeAt(prefix) === newText.charCodeAt(prefix)) prefix++;
+    if (prefix > 0 && isHighSurrogate(oldText.charCodeAt(prefix - 1))) prefix--;
+
+    const maxSuffix = maxPrefix - prefix;
+    let suffix = 0;
+    while (suffix < maxSuffix &&
+           oldText.charCodeAt(oldText.length - 1 - suffix) === newText.charCodeAt(newText.length - 1 - suffix)) suffix++;
+    if (suffix > 0 && isLowSurrogate(oldText.charCodeAt(oldText.length - suffix))) suffix--;
+
+    return [[prefix, oldText.length - prefix - suffix, newText.slice(prefix, newText.length - suffix)]];
+}
+
+function isHighSurrogate(code) { return code >= 0xD800 && code <= 0xDBFF; }
+function isLowSurrogate(code) { return code >= 0xDC00 && code <= 0xDFFF; }
 
 window.addEventListener('load', () => {
     // QWebChannel initialisieren
@@ -246,15 +522,28 @@ window.addEventListener('load', () => {
         // UI Events
         setupUI();
     });
+
+    // Der Launcher schließt Tabs ohne closeEvent: ausstehendes Autosave und
+    // Write-Behind beim Verlassen der Seite schreiben
+    window.addEventListener('pagehide', flushOnLeave);
+    document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'hidden') flushOnLeave();
+    });
 });
 
+function flushOnLeave() {
+    if (!window.backend) return;
+    flushSave().then(() => window.backend.flush_pending());
+}
+
 function setupUI() {
     const editor = document.getElementById('editor');
     const preview = document.getElementById('preview-pane');
 
     // Live Rendering
     editor.addEventListener('input', () => {
-        renderMarkdown(editor.value);
+        if (mdPreview) mdPreview.schedule(editor.value);
+        else renderMarkdown(editor.value);
         saveDebounced();
     });
 
@@ -274,6 +563,17 @@ function setupUI() {
         }
     });
 
+    // Dateiliste: ein Klick-Handler für alle (wiederverwendeten) Zeilen
+    document.getElementById('file-list').addEventListener('click', (event) => {
+        const li = event.target.closest('li');
+        if (li && li.dataset.name) loadFile(li.dataset.name);
+    });
+    const sortSelect = document.getElementById('list-sort');
+    sortSelect.addEventListener('change', () => {
+        const [sort, dir] = sortSelect.value.split(':');
+        fileList.setSort(sort, dir === 'desc');
+    });
+
     // Buttons
     document.getElementById('btn-new').onclick = createNewFile;
     document.getElementById('btn-delete').onclick = deleteCurrentFile;
@@ -286,41 +586,68 @@ function syncScroll(source, target) {
 
 // --- Datei Logik ---
 
-function refreshFileList() {
-    window.backend.list_files().then(files => {
-        const list = document.getElementById('file-list');
-        list.innerHTML = "";
-
-        if (files.length === 0) {
-            list.innerHTML = "<li style='color:#888; font-style:italic; padding:10px;'>Keine READMEs</li>";
-        }
+function renderFileRow(li, file) {
+    if (!file) {
+        li.textContent = "…";
+        li.className = 'placeholder';
+        delete li.dataset.name;
+        return;
+    }
+    li.className = (currentFile === file.name) ? 'active' : '';
+    li.textContent = file.name.replace('.md', ''); // Endung verstecken
+    li.dataset.name = file.name;
+}
 
-        files.forEach(f => {
-            const li = document.createElement('li');
-            li.textContent = f.replace('.md', ''); // Endung verstecken
-            li.onclick = () => loadFile(f);
-            if (currentFile === f) li.classList.add('active');
-            list.appendChild(li);
+// Erster Aufruf lädt die erste Seite, danach werden nur noch Änderungen seit dem Token geholt
+async function refreshFileList() {
+    const list = document.getElementById('file-list');
+    if (!fileList) {
+        fileList = new VirtualList(list, {
+            rowHeight: 34,
+            pageSize: 200,
+            fetchPage: (offset, limit, sort, desc) => window.backend.list_files_page(offset, limit, sort, desc),
+            fetchChanges: (since) => window.backend.list_files_changes(since),
+            renderRow: renderFileRow,
+            keyOf: (file) => file.name,
         });
-    });
+        await fileList.reload();
+    } else {
+        await fileList.sync();
+    }
+
+    let empty = list.querySelector('li.empty');
+    if (fileList.total === 0 && !empty) {
+        empty = document.createElement('li');
+        empty.className = 'empty';
+        empty.textContent = "Keine READMEs";
+        list.appendChild(empty);
+    } else if (fileList.total > 0 && empty) {
+        empty.remove();
+    }
 }
 
-function loadFile(filename) {
+async function loadFile(filename) {
+    await flushSave(); // ausstehendes Autosave der bisherigen Datei zuerst abschicken
     currentFile = filename;
-    // UI Update List selection
-    const list = document.getElementById('file-list');
-    Array.from(list.children).forEach(li => {
-        li.classList.toggle('active', li.textContent === filename.replace('.md', ''));
-    });
+    // Auswahl in den sichtbaren Zeilen aktualisieren
+    if (fileList) fileList.refreshRows();
 
     document.getElementById('current-filename').textContent = filename;
     document.getElementById('editor').disabled = false;
     document.getElementById('btn-delete').disabled = false;
 
-    window.backend.load_file(filename).then(content => {
-        document.getElementById('editor').value = content;
-        renderMarkdown(content);
-    });
+    const doc = await window.backend.open_file(filename);
+    if (currentFile !== filename) return; // inzwischen andere Datei gewählt
+    synced = { file: filename, text: doc.content, rev: doc.rev };
+    document.getElementById('editor').value = doc.content;
+    if (doc.html) {
+        // Gecachte Vorschau sofort zeigen; live gerendert wird erst ab der ersten Änderung
+        getPreview().showCached(doc.content, doc.html);
+    } else {
+        renderMarkdown(doc.content, (html) => {
+            if (doc.rev > 0) window.backend.store_rendered(filename, doc.rev, html);
+        });
+    }
 }
 
 function createNewFile() {
@@ -337,28 +664,61 @@ function createNewFile() {
     setTimeout(() => loadFile(filename), 100);
 }
 
-let saveTimeout;
+let saveTimeout = null;
 function saveDebounced() {
     if (!currentFile) return;
     clearTimeout(saveTimeout);
-    saveTimeout = setTimeout(() => {
-        const content = document.getElementById('editor').value;
-        const status = document.getElementById('status-msg');
+    saveTimeout = setTimeout(flushSave, 500); // Autosave nach 500ms Inaktivität
+}
 
-        window.backend.save_file(currentFile, content);
+// Schickt das ausstehende Autosave sofort (z.B. vor einem Dateiwechsel)
+function flushSave() {
+    if (saveTimeout === null) return saveChain;
+    clearTimeout(saveTimeout);
+    saveTimeout = null;
+    if (!currentFile) return saveChain;
 
+    const file = currentFile;
+    const content = document.getElementById('editor').value;
+    // Nacheinander, damit jeder Patch auf der Revision des vorherigen aufsetzt
+    saveChain = saveChain.then(() => pushFile(file, content)).then(() => {
+        const status = document.getElementById('status-msg');
         status.textContent = "Gespeichert";
         status.style.opacity = 1;
         setTimeout(() => status.style.opacity = 0, 1500);
-    }, 500); // Autosave nach 500ms Inaktivität
+    });
+    return saveChain;
+}
+
+/**
+ * Schickt nur die Änderung gegenüber dem zuletzt abgeglichenen Stand; bei
+ * Revisionskonflikt geht der volle Text über replace_file raus.
+ */
+async function pushFile(file, content) {
+    try {
+        let rev = -1;
+        if (synced.file === file && synced.rev > 0) {
+            const ops = computePatch(synced.text, content);
+            if (!ops.length) return;
+            rev = await window.backend.patch_file(file, synced.rev, JSON.stringify(ops));
+        }
+        if (rev < 0) rev = await window.backend.replace_file(file, content);
+        synced = { file: file, text: content, rev: rev };
+    } catch (e) {
+        console.error("Fehler beim Speichern:", e);
+    }
 }
 
 function deleteCurrentFile() {
     if (!currentFile) return;
     if (confirm("Möchtest du '" + currentFile + "' wirklich löschen?")) {
-        window.backend.delete_file(currentFile);
+        clearTimeout(saveTimeout);
+        saveTimeout = null;
+        synced = { file: null, text: "", rev: 0 };
+        const file = currentFile;
+        saveChain = saveChain.then(() => window.backend.delete_file(file));
         document.getElementById('editor').value = "";
-        document.getElementById('preview-pane').innerHTML = "";
+        if (mdPreview) mdPreview.clear();
         document.getElementById('current-filename').textContent = "";
         document.getElementById('editor').disabled = true;
         document.getElementById('btn-delete').disabled = true;
@@ -367,21 +727,250 @@ function deleteCurrentFile() {
 }
 
 // --- Markdown Renderer ---
-function renderMarkdown(text) {
-    const prev = document.getElementById('preview-pane');
-    if (typeof marked !== 'undefined') {
-        prev.innerHTML = marked.parse(text);
-        // Highlight JS neu triggern wenn vorhanden
-        if (typeof hljs !== 'undefined') {
-            prev.querySelectorAll('pre code').forEach((block) => {
-                hljs.highlightElement(block);
-            });
+// Geparst wird in einem Web Worker; die Vorschau ersetzt nur die geänderten Blöcke.
+const MARKED_URL = "https://cdnjs.cloudflare.com/ajax/libs/marked/4.3.0/marked.min.js";
+const HLJS_URL = "https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.7.0/highlight.min.js";
+const RENDER_DEBOUNCE_MS = 80;
+
+/**
+ * Zerlegt den Text mit marked.lexer in Blöcke und rendert nur Blöcke, deren
+ * Rohtext noch nicht bekannt ist. Liefert die Block-IDs in Dokumentreihenfolge
+ * plus HTML für neue IDs. Läuft im Worker, als Fallback auch im Hauptthread.
+ */
+function createBlockRenderer() {
+    let cache = new Map();   // raw -> {id, html}
+    let linksKey = "";
+    let nextId = 1;
+
+    return {
+        render(text) {
+            const tokens = marked.lexer(text);
+            const key = JSON.stringify(tokens.links || {});
+            if (key !== linksKey) {   // Referenz-Links geändert: alle Blöcke neu
+                cache = new Map();
+                linksKey = key;
+            }
+            const next = new Map();
+            const ids = [];
+            const html = {};
+            for (const token of tokens) {
+                if (token.type === 'space') continue;
+                let block = next.get(token.raw) || cache.get(token.raw);
+                if (!block) {
+                    const single = [token];
+                    single.links = tokens.links;
+                    block = { id: nextId++, html: marked.parser(single) };
+                    html[block.id] = block.html;
+                }
+                next.set(token.raw, block);
+                ids.push(block.id);
+            }
+            cache = next; // nur Blöcke des aktuellen Stands behalten
+            return { ids: ids, html: html };
+        },
+        reset() {
+            cache = new Map();
+        },
+    };
+}
+
+class MarkdownPreview {
+    constructor(pane) {
+        this.pane = pane;
+        this.blocks = [];          // [{id, el}] in Dokumentreihenfolge
+        this.htmlById = new Map();
+        this.seq = 0;
+        this.busy = false;
+        this.pendingText = null;
+        this.timer = null;
+        this.worker = null;
+        this.local = null;
+        this.observer = ('IntersectionObserver' in window)
+            ? new IntersectionObserver((entries) => this.onCodeVisible(entries), { root: pane, rootMargin: '200px' })
+            : null;
+
+        try {
+            const src = `importScripts(${JSON.stringify(MARKED_URL)});
+const renderer = (${createBlockRenderer.toString()})();
+onmessage = (e) => {
+    if (e.data.reset) renderer.reset();
+    const out = renderer.render(e.data.text);
+    postMessage({ seq: e.data.seq, reset: e.data.reset, ids: out.ids, html: out.html });
+};`;
+            this.worker = new Worker(URL.createObjectURL(new Blob([src], { type: 'text/javascript' })));
+            this.worker.onmessage = (e) => this.onResult(e.data);
+            this.worker.onerror = (e) => {
+                console.warn("Markdown-Worker nicht verfügbar, rendere im Hauptthread:", e.message);
+                this.worker = null;
+                this.busy = false;
+                this.needsReset = true;
+                if (this.pendingText === null) this.pendingText = this.lastText || "";
+                this.dispatch(true);
+            };
+        } catch (e) {
+            this.worker = null;
         }
-    } else {
-        prev.innerText = text; 
+    }
+
+    // Sofort rendern (Datei geladen): die alte Vorschau bleibt stehen, bis das Ergebnis da ist.
+    // onRendered(html) bekommt das vollständige HTML dieses Stands (für den Render-Cache).
+    show(text, onRendered) {
+        clearTimeout(this.timer);
+        this.needsReset = true;
+        this.pendingText = text;
+        this.onRendered = onRendered ? { seq: this.seq + 1, fn: onRendered } : null;
+        this.dispatch(true);
+    }
+
+    // Fertiges HTML aus dem Cache anzeigen; der Worker übernimmt beim nächsten schedule()
+    showCached(text, html) {
+        clearTimeout(this.timer);
+        this.pendingText = null;
+        this.seq++;           // laufende Aufträge verwerfen
+        this.onRendered = null;
+        this.lastText = text;
+        this.needsReset = true;
+        this.clearBlocks();
+        this.pane.innerHTML = html;
+        this.observeCode(this.pane);
+    }
+
+    // Beim Tippen: entprellt, höchstens ein Auftrag gleichzeitig im Worker
+    schedule(text) {
+        this.pendingText = text;
+        clearTimeout(this.timer);
+        this.timer = setTimeout(() => this.dispatch(false), RENDER_DEBOUNCE_MS);
+    }
+
+    dispatch(force) {
+        if (this.pendingText === null || (this.busy && !force)) return;
+        const text = this.pendingText;
+        this.pendingText = null;
+        this.lastText = text;
+        const seq = ++this.seq;
+        const reset = !!this.needsReset;
+        this.needsReset = false;
+
+        if (this.worker) {
+            this.busy = true;
+            this.worker.postMessage({ seq: seq, text: text, reset: reset });
+            return;
+        }
+        if (typeof marked === 'undefined') {
+            this.pane.innerText = text;
+            return;
+        }
+        if (!this.local) this.local = createBlockRenderer();
+        if (reset) this.local.reset();
+        const out = this.local.render(text);
+        this.onResult({ seq: seq, reset: reset, ids: out.ids, html: out.html });
+    }
+
+    onResult(msg) {
+        this.busy = false;
+        if (msg.seq === this.seq) {
+            if (msg.reset) this.clearBlocks();
+            this.patch(msg.ids, msg.html);
+            if (this.onRendered && this.onRendered.seq === msg.seq) {
+                this.onRendered.fn(msg.ids.map(id => this.htmlById.get(id)).join(""));
+                this.onRendered = null;
+            }
+        }
+        else Object.entries(msg.html).forEach(([id, html]) => this.htmlById.set(+id, html));
+        this.dispatch(false); // inzwischen getippten Stand nachreichen
+    }
+
+    // Vorschau leeren (Datei gelöscht); laufende Aufträge werden verworfen
+    clear() {
+        clearTimeout(this.timer);
+        this.pendingText = null;
+        this.seq++;
+        this.needsReset = true;
+        this.clearBlocks();
+    }
+
+    clearBlocks() {
+        if (this.observer) this.observer.disconnect();
+        this.pane.innerHTML = "";
+        this.blocks = [];
+        this.htmlById.clear();
+    }
+
+    // Gemeinsamen Anfang und gemeinsames Ende behalten, nur die Mitte ersetzen
+    patch(ids, html) {
+        Object.entries(html).forEach(([id, h]) => this.htmlById.set(+id, h));
+
+        const old = this.blocks;
+        let prefix = 0;
+        while (prefix < old.length && prefix < ids.length && old[prefix].id === ids[prefix]) prefix++;
+        let suffix = 0;
+        while (suffix < old.length - prefix && suffix < ids.length - prefix &&
+               old[old.length - 1 - suffix].id === ids[ids.length - 1 - suffix]) suffix++;
+
+        old.slice(prefix, old.length - suffix).forEach(b => {
+            if (this.observer) b.el.querySelectorAll('pre code').forEach(c => this.observer.unobserve(c));
+            b.el.remove();
+        });
+        const anchor = suffix ? old[old.length - suffix].el : null;
+        const inserted = ids.slice(prefix, ids.length - suffix).map(id => {
+            const el = document.createElement('div');
+            el.className = 'md-block';
+            el.innerHTML = this.htmlById.get(id) || "";
+            this.pane.insertBefore(el, anchor);
+            this.observeCode(el);
+            return { id: id, el: el };
+        });
+        this.blocks = old.slice(0, prefix).concat(inserted, old.slice(old.length - suffix));
+
+        const live = new Set(ids);
+        for (const id of this.htmlById.keys()) if (!live.has(id)) this.htmlById.delete(id);
+    }
+
+    // Syntax-Highlighting erst, wenn ein Codeblock sichtbar wird
+    observeCode(el) {
+        el.querySelectorAll('pre code').forEach(code => {
+            if (this.observer) this.observer.observe(code);
+            else highlightCode(code);
+        });
+    }
+
+    onCodeVisible(entries) {
+        entries.forEach(entry => {
+            if (!entry.isIntersecting) return;
+            this.observer.unobserve(entry.target);
+            highlightCode(entry.target);
+        });
     }
 }
 
+// highlight.js wird erst beim ersten sichtbaren Codeblock nachgeladen
+let hljsLoading = null;
+function highlightCode(code) {
+    if (!hljsLoading) {
+        hljsLoading = new Promise((resolve) => {
+            if (typeof hljs !== 'undefined') return resolve();
+            const script = document.createElement('script');
+            script.src = HLJS_URL;
+            script.onload = resolve;
+            script.onerror = resolve;
+            document.head.appendChild(script);
+        });
+    }
+    hljsLoading.then(() => {
+        if (typeof hljs !== 'undefined' && code.isConnected) hljs.highlightElement(code);
+    });
+}
+
+let mdPreview = null;
+function getPreview() {
+    if (!mdPreview) mdPreview = new MarkdownPreview(document.getElementById('preview-pane'));
+    return mdPreview;
+}
+
+function renderMarkdown(text, onRendered) {
+    getPreview().show(text, onRendered);
+}
+
 function applyTheme(theme) {
     document.body.className = "theme-" + theme;
 }
@@ -396,7 +985,6 @@ HTML_TEMPLATE = r"""
     <script src="https://cdnjs.cloudflare.com/ajax/libs/marked/4.3.0/marked.min.js"></script>
     <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.7.0/styles/github.min.css">
     <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.7.0/styles/github-dark.min.css" media="(prefers-color-scheme: dark)">
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.7.0/highlight.min.js"></script>
 
     <style>{style}</style>
 </head>
@@ -406,8 +994,12 @@ HTML_TEMPLATE = r"""
         <div id="sidebar-header">
             <button id="btn-new" class="primary" style="width:100%">+ Neu</button>
         </div>
-        <ul id="file-list">
-            </ul>
+        <select id="list-sort">
+            <option value="title">Name (A–Z)</option>
+            <option value="mtime:desc">Zuletzt geändert</option>
+            <option value="size:desc">Größe</option>
+        </select>
+        <ul id="file-list"></ul>
     </div>
 
     <div id="main-area">
@@ -520,8 +1112,18 @@ class PluginWidget(QMainWindow):
         if app:
             self._theme_watcher = HostThemeWatcher(app)
             self._theme_watcher.themeChanged.connect(self.backend.set_theme)
+            app.aboutToQuit.connect(self.backend.flush_pending)
+        # Der Launcher schließt Tabs per deleteLater() ohne closeEvent; das
+        # Write-Behind darf dabei nicht verloren gehen
+        self.destroyed.connect(self.backend.flush_pending)
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.ActivationChange and self.isActiveWindow():
+            self.backend.check_external_changes()
+        super().changeEvent(event)
 
     def closeEvent(self, event):
+        self.backend.flush_pending()
         if self._theme_watcher:
             self._theme_watcher.cleanup()
         super().closeEvent(event)
@@ -1,9 +1,13 @@
 from PyQt5.QtWidgets import QApplication, QVBoxLayout, QWidget, QMainWindow
 from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEnginePage
 from PyQt5.QtCore import QUrl, QEvent, QObject, pyqtSignal
+import os
 import sys
 import json
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _task_views import DEADLINE_SCHEDULER_SCRIPT, WINDOWED_LIST_SCRIPT  # noqa: E402
+
 # --- KONFIGURATION & THEMES ---
 
 THEME_LIGHT = "light"
@@ -421,6 +425,10 @@ class PluginWidget(QMainWindow):
   }
   .col-count { background: var(--border-color); border-radius: 10px; padding: 2px 8px; font-size: 11px; color: var(--text-main); }
   .col-body { flex: 1; overflow-y: auto; padding: 10px; display: flex; flex-direction: column; gap: 8px; }
+
+  /* Gefensterte Listen: nur sichtbare Zeilen im DOM, Rest als Padding */
+  .vlist-window { flex-shrink: 0; }
+  .col-body .vlist-window { display: flex; flex-direction: column; gap: 8px; }
   .board-card {
       background: var(--item-bg); border: 1px solid var(--border-color);
       border-radius: 6px; padding: 10px; cursor: grab;
@@ -523,7 +531,7 @@ class PluginWidget(QMainWindow):
   ::-webkit-scrollbar-track { background: transparent; }
   ::-webkit-scrollbar-thumb { background: var(--border-color); border-radius: 3px; }
 </style>
-""" + THEME_OVERRIDE_CSS + THEME_SCRIPT + """
+""" + THEME_OVERRIDE_CSS + THEME_SCRIPT + DEADLINE_SCHEDULER_SCRIPT + WINDOWED_LIST_SCRIPT + """
 </head>
 <body class="__BODY_CLASS__">
 
@@ -779,11 +787,20 @@ let timerTaskId = null;
 // =====================================================
 // PERSISTENCE
 // =====================================================
+// Ablage: im Launcher dessen Plugin-Ablage, eigenständig localStorage
+let store = null;
+function openStorage() {
+  if (!window.launcherStorage) return Promise.resolve();
+  return launcherStorage.open({ legacyKeys: [KEY, 'todo_list_v2_kanban'] }).then(s => { store = s; });
+}
+function storageGet(key) { return store ? store.get(key) : localStorage.getItem(key); }
+function storageSet(key, value) { if (store) store.set(key, value); else localStorage.setItem(key, value); }
+
 function load() {
-  let raw = localStorage.getItem(KEY);
+  let raw = storageGet(KEY);
   if (!raw) {
     // Migrate from old key
-    const oldRaw = localStorage.getItem('todo_list_v2_kanban');
+    const oldRaw = storageGet('todo_list_v2_kanban');
     if (oldRaw) {
       const oldData = JSON.parse(oldRaw);
       data = {
@@ -804,6 +821,7 @@ function load() {
   if (activeFolderId !== 'all' && !data.folders.find(f => f.id === activeFolderId)) {
     activeFolderId = 'all';
   }
+  taskIndex.rebuild(data.todos);
 }
 
 function migrateTask(t) {
@@ -818,7 +836,7 @@ function migrateTask(t) {
 }
 
 function save() {
-  localStorage.setItem(KEY, JSON.stringify(data));
+  storageSet(KEY, JSON.stringify(data));
   render();
 }
 
@@ -837,14 +855,16 @@ function spawnRecurring(t) {
     nextDeadline = d.toISOString();
   }
   const newId = Date.now().toString(36) + Math.random().toString(36).substr(2);
-  data.todos.push({
+  const next = {
     id: newId, text: t.text, done: false, status: 'todo',
     prio: t.prio, folderId: t.folderId,
     created: now.toISOString(), deadline: nextDeadline,
     description: t.description, tags: [...t.tags],
     subtasks: t.subtasks.map(s => ({...s, done: false})),
     recurType: t.recurType, timerTotal: 0
-  });
+  };
+  data.todos.push(next);
+  taskIndex.add(next);
 }
 
 // =====================================================
@@ -893,18 +913,184 @@ function filterByTag(tag) {
   render();
 }
 
-function applyFilters(todos) {
-  let list = [...todos];
-  if (activeFolderId !== 'all') list = list.filter(t => t.folderId === activeFolderId);
-  if (searchQuery) list = list.filter(t => t.text.toLowerCase().includes(searchQuery) || t.description.toLowerCase().includes(searchQuery) || t.tags.some(tag => tag.toLowerCase().includes(searchQuery)));
-  if (activeTagFilter !== 'all') list = list.filter(t => t.tags.includes(activeTagFilter));
-  const now = new Date();
-  if (statusFilter === 'todo') list = list.filter(t => !t.done);
-  else if (statusFilter === 'done') list = list.filter(t => t.done);
-  else if (statusFilter === 'urgent') list = list.filter(t => !t.done && t.deadline && (new Date(t.deadline) - now) < 86400000 && (new Date(t.deadline) - now) > 0);
-  else if (statusFilter === 'overdue') list = list.filter(t => !t.done && t.deadline && new Date(t.deadline) < now);
-  else if (statusFilter === 'recurring') list = list.filter(t => t.recurType);
-  return list;
+// Indizes für die Filter: Ordner, Tags (invertiert), Status, Suchtext und
+// Deadlines (sortierte Epoch-Werte). Eine Filterabfrage ist damit eine
+// Schnittmenge der passenden Mengen statt einer Filterkette über alle Aufgaben.
+// Jede Mutation meldet die betroffene Aufgabe per add/update/remove.
+const DAY_MS = 86400000;
+
+class TaskIndex {
+  constructor() { this.rebuild([]); }
+
+  rebuild(todos) {
+    this.entries = new Map();   // id -> { task, seq, folder, tags, done, recur, at, corpus }
+                                // corpus (Suchtext in Kleinbuchstaben) erst bei der ersten Suche
+    this.byFolder = new Map();  // folderId -> Set(id)
+    this.byTag = new Map();     // tag -> Set(id)
+    this.open = new Set();
+    this.done = new Set();
+    this.recurring = new Set();
+    this.deadlines = [];        // [{ at, id }] offener Aufgaben, nach at sortiert
+    this.bySeq = [];            // seq -> Eintrag, für die Rückgabe in Listenreihenfolge
+    this.seq = 0;
+    this.search = null;         // { q, hits: Set(id) } der letzten Suchanfrage
+    todos.forEach(t => this.add(t, true));
+    this.deadlines.sort((a, b) => a.at - b.at);
+  }
+
+  static corpusOf(t) {
+    return (t.text + '\\\n' + (t.description || '') + '\\\n' + (t.tags || []).join('\\\n')).toLowerCase();
+  }
+
+  matches(e, q) {
+    if (e.corpus === null) e.corpus = TaskIndex.corpusOf(e.task);
+    return e.corpus.includes(q);
+  }
+
+  static bucket(map, key) {
+    let set = map.get(key);
+    if (!set) { set = new Set(); map.set(key, set); }
+    return set;
+  }
+
+  static unbucket(map, key, id) {
+    const set = map.get(key);
+    if (!set) return;
+    set.delete(id);
+    if (!set.size) map.delete(key);
+  }
+
+  // Erste Position mit deadlines[i].at >= at
+  lowerBound(at) {
+    let lo = 0, hi = this.deadlines.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (this.deadlines[mid].at < at) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+  }
+
+  add(t, bulk = false, seq = this.seq++) {
+    const at = t.deadline ? new Date(t.deadline).getTime() : NaN;
+    const e = {
+      task: t, seq, folder: t.folderId, tags: [...new Set(t.tags || [])],
+      done: !!t.done, recur: !!t.recurType, at, corpus: null
+    };
+    this.entries.set(t.id, e);
+    this.bySeq[seq] = e;
+    TaskIndex.bucket(this.byFolder, e.folder).add(t.id);
+    e.tags.forEach(tag => TaskIndex.bucket(this.byTag, tag).add(t.id));
+    (e.done ? this.done : this.open).add(t.id);
+    if (e.recur) this.recurring.add(t.id);
+    if (!e.done && !isNaN(at)) {
+      if (bulk) this.deadlines.push({ at, id: t.id });
+      else this.deadlines.splice(this.lowerBound(at), 0, { at, id: t.id });
+    }
+    if (this.search) {
+      if (this.matches(e, this.search.q)) this.search.hits.add(t.id);
+      else this.search.hits.delete(t.id);
+    }
+  }
+
+  remove(id) {
+    const e = this.entries.get(id);
+    if (!e) return;
+    this.entries.delete(id);
+    delete this.bySeq[e.seq];
+    TaskIndex.unbucket(this.byFolder, e.folder, id);
+    e.tags.forEach(tag => TaskIndex.unbucket(this.byTag, tag, id));
+    this.open.delete(id); this.done.delete(id); this.recurring.delete(id);
+    if (!e.done && !isNaN(e.at)) {
+      for (let i = this.lowerBound(e.at); i < this.deadlines.length && this.deadlines[i].at === e.at; i++) {
+        if (this.deadlines[i].id === id) { this.deadlines.splice(i, 1); break; }
+      }
+    }
+    if (this.search) this.search.hits.delete(id);
+    return e;
+  }
+
+  // Aufgabe wurde verändert: neu einsortieren, Position (seq) bleibt erhalten
+  update(t) {
+    const old = this.remove(t.id);
+    this.add(t, false, old ? old.seq : undefined);
+  }
+
+  // Deadline-Fenster [from, to) als Liste von ids offener Aufgaben
+  deadlineRange(from, to) {
+    const ids = [];
+    for (let i = this.lowerBound(from); i < this.deadlines.length && this.deadlines[i].at < to; i++) {
+      ids.push(this.deadlines[i].id);
+    }
+    return ids;
+  }
+
+  // Treffer der Textsuche über alle Aufgaben; tippt man weiter, wird nur in den
+  // letzten Treffern gesucht
+  searchHits(q) {
+    if (this.search && this.search.q === q) return this.search.hits;
+    let base = this.entries.keys();
+    if (this.search && q.startsWith(this.search.q)) base = this.search.hits;
+    const hits = new Set();
+    for (const id of base) {
+      if (this.matches(this.entries.get(id), q)) hits.add(id);
+    }
+    this.search = { q, hits };
+    return hits;
+  }
+
+  query({ folder = 'all', tag = 'all', status = 'all', search = '', now = Date.now() } = {}) {
+    const sets = [];
+    let range = null, from = -Infinity, to = Infinity;
+    if (folder !== 'all') sets.push(this.byFolder.get(folder) || new Set());
+    if (tag !== 'all') sets.push(this.byTag.get(tag) || new Set());
+    if (status === 'todo') sets.push(this.open);
+    else if (status === 'done') sets.push(this.done);
+    else if (status === 'recurring') sets.push(this.recurring);
+    // urgent: 0 < Deadline - now < 24h, overdue: Deadline < now
+    else if (status === 'urgent') { from = now + 1; to = now + DAY_MS; }
+    else if (status === 'overdue') to = now;
+    if (to !== Infinity) range = this.deadlineRange(from, to);
+
+    // Ohne andere Einschränkung die (zwischengespeicherte) Suchtreffermenge nutzen,
+    // sonst nur die schon eingegrenzten Kandidaten gegen den Suchtext prüfen
+    let text = search;
+    if (search && ((!sets.length && !range) || (this.search && this.search.q === search))) {
+      sets.push(this.searchHits(search));
+      text = '';
+    }
+    if (!sets.length && !range && !text) return data.todos.slice();
+
+    // Von der kleinsten Menge aus schneiden
+    sets.sort((a, b) => a.size - b.size);
+    let driver = range;
+    if (!driver || (sets.length && sets[0].size < driver.length)) driver = sets.shift();
+    const seqs = [];
+    for (const id of driver) {
+      if (!sets.every(s => s.has(id))) continue;
+      const e = this.entries.get(id);
+      if (range && driver !== range && !(!e.done && e.at >= from && e.at < to)) continue;
+      if (text && !this.matches(e, text)) continue;
+      seqs.push(e.seq);
+    }
+    // Zurück in Listenreihenfolge: numerische Sortierung der seq-Nummern
+    const order = Uint32Array.from(seqs).sort();
+    const out = new Array(order.length);
+    for (let i = 0; i < order.length; i++) out[i] = this.bySeq[order[i]].task;
+    return out;
+  }
+
+  tags() { return this.byTag.keys(); }
+}
+
+const taskIndex = new TaskIndex();
+
+function taskById(id) {
+  const e = taskIndex.entries.get(id);
+  return e ? e.task : undefined;
+}
+
+function applyFilters() {
+  return taskIndex.query({ folder: activeFolderId, tag: activeTagFilter, status: statusFilter, search: searchQuery });
 }
 
 // =====================================================
@@ -918,10 +1104,9 @@ function toggleDateInput() {
   else inp.focus();
 }
 
-function getDeadlineInfo(isoString) {
+function getDeadlineInfo(isoString, now = new Date()) {
   if (!isoString) return null;
   const date = new Date(isoString);
-  const now = new Date();
   const diffMs = date - now;
   const diffHrs = diffMs / (1000 * 60 * 60);
   const diffDays = diffMs / (1000 * 60 * 60 * 24);
@@ -946,12 +1131,14 @@ function getDeadlineHtml(isoString) {
   return `<span class="dl-badge dl-${info.status}" data-deadline="${isoString}" title="${info.formatted}">⏰ ${info.relativeText}</span>`;
 }
 
-function updateRealtimeDeadlines() {
-  document.querySelectorAll('.dl-badge[data-deadline]').forEach(badge => {
-    const iso = badge.getAttribute('data-deadline');
-    const info = getDeadlineInfo(iso);
-    if (info) { badge.className = `dl-badge dl-${info.status}`; badge.innerHTML = `⏰ ${info.relativeText}`; }
-  });
+// Vom DeadlineScheduler aufgerufen, nur wenn sich an dieser Badge etwas ändert
+function refreshDeadlineBadge(badge, at, now) {
+  const info = getDeadlineInfo(badge.getAttribute('data-deadline'), new Date(now));
+  const cls = `dl-badge dl-${info.status}`;
+  if (badge.className !== cls) badge.className = cls;
+  const text = `⏰ ${info.relativeText}`;
+  if (badge.textContent !== text) badge.textContent = text;
+  return DeadlineScheduler.nextBadgeChange(at, now);
 }
 
 function formatTime(ms) {
@@ -977,14 +1164,14 @@ function tagBadgeHtml(tag, small=true) {
 // =====================================================
 // DRAG AND DROP
 // =====================================================
-function drag(ev, id) { ev.dataTransfer.setData("text/plain", id); ev.dataTransfer.effectAllowed = "move"; }
+function drag(ev, id) { ev.dataTransfer.setData("text/plain", id); ev.dataTransfer.effectAllowed = "move"; holdListOf(ev.currentTarget); }
 function allowDrop(ev) { ev.preventDefault(); ev.currentTarget.classList.add('drag-over'); }
 function removeDragStyle(ev) { ev.currentTarget.classList.remove('drag-over'); }
 function drop(ev, newStatus) {
   ev.preventDefault(); ev.currentTarget.classList.remove('drag-over');
   const id = ev.dataTransfer.getData("text/plain");
   const t = data.todos.find(x => x.id === id);
-  if (t) { t.status = newStatus; t.done = (newStatus === 'done'); save(); }
+  if (t) { t.status = newStatus; t.done = (newStatus === 'done'); taskIndex.update(t); save(); }
 }
 
 // =====================================================
@@ -1029,21 +1216,22 @@ function toggleSelect(id) {
   });
 }
 function bulkSelectAll() {
-  applyFilters(data.todos).forEach(t => selectedIds.add(t.id));
+  applyFilters().forEach(t => selectedIds.add(t.id));
   updateBulkBar(); render();
 }
 function bulkDeselectAll() { selectedIds.clear(); updateBulkBar(); render(); }
-function bulkDone() { selectedIds.forEach(id => { const t = data.todos.find(x=>x.id===id); if(t){t.done=true;t.status='done'; logActivity('done');} }); selectedIds.clear(); save(); }
-function bulkUndone() { selectedIds.forEach(id => { const t = data.todos.find(x=>x.id===id); if(t){t.done=false;t.status='todo';} }); selectedIds.clear(); save(); }
+function bulkDone() { selectedIds.forEach(id => { const t = taskById(id); if(t){t.done=true;t.status='done'; taskIndex.update(t); logActivity('done');} }); selectedIds.clear(); save(); }
+function bulkUndone() { selectedIds.forEach(id => { const t = taskById(id); if(t){t.done=false;t.status='todo'; taskIndex.update(t);} }); selectedIds.clear(); save(); }
 function bulkDelete() {
   if(!confirm(`${selectedIds.size} Aufgaben löschen?`)) return;
   data.todos = data.todos.filter(t => !selectedIds.has(t.id));
+  selectedIds.forEach(id => taskIndex.remove(id));
   selectedIds.clear(); save();
 }
 function bulkMove() {
   const fId = document.getElementById('bulkFolderSel').value;
   if(!fId) return;
-  selectedIds.forEach(id => { const t = data.todos.find(x=>x.id===id); if(t) t.folderId = fId; });
+  selectedIds.forEach(id => { const t = taskById(id); if(t) { t.folderId = fId; taskIndex.update(t); } });
   selectedIds.clear(); save();
 }
 
@@ -1063,6 +1251,7 @@ function deleteFolder(id, event) {
   if(!confirm('Ordner wirklich löschen?')) return;
   data.folders = data.folders.filter(f => f.id !== id);
   data.todos = data.todos.filter(t => t.folderId !== id);
+  [...(taskIndex.byFolder.get(id) || [])].forEach(tid => taskIndex.remove(tid));
   if(activeFolderId === id) activeFolderId = 'all';
   save();
 }
@@ -1090,12 +1279,14 @@ function addTask() {
   const recurType = document.getElementById('newRecur').value;
 
   const newId = Date.now().toString(36) + Math.random().toString(36).substr(2);
-  data.todos.push({
+  const task = {
     id: newId, text, done: false, status: 'todo',
     prio: document.getElementById('newPrio').value, folderId: targetFolder,
     created: new Date().toISOString(), deadline: finalDeadline,
     description: '', tags, subtasks: [], recurType, timerTotal: 0
-  });
+  };
+  data.todos.push(task);
+  taskIndex.add(task);
   inp.value = ''; document.getElementById('newTagInput').value = '';
   document.getElementById('hasDeadlineToggle').checked = false;
   document.getElementById('newRecur').value = '';
@@ -1105,7 +1296,7 @@ function addTask() {
 }
 
 function toggle(id) {
-  const t = data.todos.find(x => x.id === id);
+  const t = taskById(id);
   if (t) {
     t.done = !t.done;
     if (t.done) {
@@ -1115,19 +1306,21 @@ function toggle(id) {
     } else {
       t.status = 'todo';
     }
+    taskIndex.update(t);
     save();
   }
 }
 
 function del(id) {
-  if(confirm('Aufgabe löschen?')) { data.todos = data.todos.filter(x => x.id !== id); save(); }
+  if(confirm('Aufgabe löschen?')) { data.todos = data.todos.filter(x => x.id !== id); taskIndex.remove(id); save(); }
 }
 
 function clearDone() {
   if(confirm('Erledigte löschen?')) {
     data.todos = data.todos.filter(t => {
       const folderMatch = activeFolderId === 'all' || t.folderId === activeFolderId;
-      return !(t.done && folderMatch);
+      if (t.done && folderMatch) { taskIndex.remove(t.id); return false; }
+      return true;
     });
     save();
   }
@@ -1248,12 +1441,12 @@ function renderTagsEditor(taskTags) {
 
 function addModalTag(tag) {
   const t = data.todos.find(x => x.id === currentDetailId);
-  if(t && !t.tags.includes(tag)) { t.tags.push(tag); renderTagsEditor(t.tags); }
+  if(t && !t.tags.includes(tag)) { t.tags.push(tag); taskIndex.update(t); renderTagsEditor(t.tags); }
 }
 
 function removeModalTag(tag) {
   const t = data.todos.find(x => x.id === currentDetailId);
-  if(t) { t.tags = t.tags.filter(x => x !== tag); renderTagsEditor(t.tags); }
+  if(t) { t.tags = t.tags.filter(x => x !== tag); taskIndex.update(t); renderTagsEditor(t.tags); }
 }
 
 // =====================================================
@@ -1325,6 +1518,7 @@ function saveDetail() {
 
   const dlVal = document.getElementById('modalDeadline').value;
   t.deadline = dlVal ? new Date(dlVal).toISOString() : null;
+  taskIndex.update(t);
 
   save();
   document.getElementById('detailModal').style.display = 'none';
@@ -1357,6 +1551,7 @@ function exportCSV() {
 // RENDER
 // =====================================================
 function render() {
+  renderGen++;
   renderFolders();
   renderTagsFilterSidebar();
   renderSideStats();
@@ -1369,9 +1564,9 @@ function render() {
     headerTitle.innerText = curr ? curr.name : 'Unbekannt';
   }
 
-  const visible = applyFilters(data.todos);
+  const visible = applyFilters();
   if (currentView === 'list') renderList(visible);
-  else if (currentView === 'board') renderBoard(applyFilters(data.todos));
+  else if (currentView === 'board') renderBoard(applyFilters());
   else renderStats();
 }
 
@@ -1398,9 +1593,8 @@ function renderFolders() {
 
 function renderTagsFilterSidebar() {
   const container = document.getElementById('tagsFilter');
-  // Collect all unique tags
-  const allTags = new Set();
-  data.todos.forEach(t => t.tags.forEach(tag => allTags.add(tag)));
+  // Alle vorhandenen Tags direkt aus dem invertierten Index
+  const allTags = [...taskIndex.tags()];
   container.innerHTML = '';
   const allChip = document.createElement('span');
   allChip.className = 'tag-chip' + (activeTagFilter === 'all' ? ' active' : '');
@@ -1443,12 +1637,6 @@ function renderSideStats() {
 }
 
 function renderList(todos) {
-  const tList = document.getElementById('listView');
-  tList.innerHTML = '';
-  if(!todos.length) {
-    tList.innerHTML = '<div style="text-align:center;color:var(--text-muted);margin-top:40px;font-size:13px;">Keine Aufgaben</div>';
-    return;
-  }
   const prioScore = { high: 3, med: 2, low: 1 };
   const sorted = [...todos].sort((a, b) => {
     if (a.done !== b.done) return a.done - b.done;
@@ -1461,54 +1649,56 @@ function renderList(todos) {
     return (prioScore[b.prio]||1) - (prioScore[a.prio]||1);
   });
 
-  sorted.forEach(t => {
-    const item = document.createElement('div');
-    item.className = `item ${selectedIds.has(t.id) ? 'selected' : ''} ${(timerTaskId === t.id && timerInterval) ? 'timer-running' : ''}`;
-    item.setAttribute('data-id', t.id);
+  listWindow.setItems(sorted);
+}
 
-    let folderName = '';
-    if (activeFolderId === 'all') {
-      const f = data.folders.find(x => x.id === t.folderId);
-      if (f) folderName = `<span class="badge">${f.name}</span>`;
-    }
+function buildListItem(t) {
+  const item = document.createElement('div');
+  item.className = `item ${selectedIds.has(t.id) ? 'selected' : ''} ${(timerTaskId === t.id && timerInterval) ? 'timer-running' : ''}`;
+  item.setAttribute('data-id', t.id);
 
-    const deadlineHtml = t.done ? '' : getDeadlineHtml(t.deadline);
-    const descIcon = (t.description && t.description.trim()) ? '<span title="Notizen">📄</span>' : '';
-    const recurIcon = t.recurType ? `<span class="recur-icon">🔄</span>` : '';
+  let folderName = '';
+  if (activeFolderId === 'all') {
+    const f = data.folders.find(x => x.id === t.folderId);
+    if (f) folderName = `<span class="badge">${f.name}</span>`;
+  }
 
-    // Subtask progress
-    let subtaskHtml = '';
-    if(t.subtasks && t.subtasks.length > 0) {
-      const done = t.subtasks.filter(s=>s.done).length;
-      const pct = Math.round(done/t.subtasks.length*100);
-      subtaskHtml = `<div class="subtask-progress"><span class="subtask-bar-wrap"><span class="subtask-bar-fill" style="width:${pct}%"></span></span><span class="subtask-text">${done}/${t.subtasks.length}</span></div>`;
-    }
+  const deadlineHtml = t.done ? '' : getDeadlineHtml(t.deadline);
+  const descIcon = (t.description && t.description.trim()) ? '<span title="Notizen">📄</span>' : '';
+  const recurIcon = t.recurType ? `<span class="recur-icon">🔄</span>` : '';
 
-    // Tag badges
-    const tagsHtml = t.tags.map(tag => tagBadgeHtml(tag)).join('');
+  // Subtask progress
+  let subtaskHtml = '';
+  if(t.subtasks && t.subtasks.length > 0) {
+    const done = t.subtasks.filter(s=>s.done).length;
+    const pct = Math.round(done/t.subtasks.length*100);
+    subtaskHtml = `<div class="subtask-progress"><span class="subtask-bar-wrap"><span class="subtask-bar-fill" style="width:${pct}%"></span></span><span class="subtask-text">${done}/${t.subtasks.length}</span></div>`;
+  }
 
-    // Timer display
-    const timerHtml = t.timerTotal > 0 ? `<span class="timer-display">⏱ ${formatTime(t.timerTotal)}</span>` : '';
+  // Tag badges
+  const tagsHtml = t.tags.map(tag => tagBadgeHtml(tag)).join('');
 
-    item.innerHTML = `
-      <input type="checkbox" class="sel-check" data-id="${t.id}" ${selectedIds.has(t.id)?'checked':''} onchange="toggleSelect('${t.id}')">
-      <div class="check ${t.done?'checked':''}" onclick="toggle('${t.id}')">${t.done?'✓':''}</div>
-      <div class="prio-indicator prio-${t.prio||'low'}"></div>
-      <div class="text-content" onclick="openDetail('${t.id}')">
-        <div class="task-text ${t.done?'done':''}">${t.text}</div>
-        <div class="task-meta">
-          ${deadlineHtml} ${folderName} ${tagsHtml} ${recurIcon} ${descIcon} ${timerHtml}
-        </div>
-        ${subtaskHtml}
-      </div>
-      <div class="btn-actions">
-        <button class="btn-icon-small btn-timer ${(timerTaskId===t.id&&timerInterval)?'running':''}" onclick="quickTimer('${t.id}')" title="Timer">⏱</button>
-        <button class="btn-icon-small" onclick="openDetail('${t.id}')" title="Details">✎</button>
-        <button class="btn-icon-small btn-del" onclick="del('${t.id}')" title="Löschen">×</button>
+  // Timer display
+  const timerHtml = t.timerTotal > 0 ? `<span class="timer-display">⏱ ${formatTime(t.timerTotal)}</span>` : '';
+
+  item.innerHTML = `
+    <input type="checkbox" class="sel-check" data-id="${t.id}" ${selectedIds.has(t.id)?'checked':''} onchange="toggleSelect('${t.id}')">
+    <div class="check ${t.done?'checked':''}" onclick="toggle('${t.id}')">${t.done?'✓':''}</div>
+    <div class="prio-indicator prio-${t.prio||'low'}"></div>
+    <div class="text-content" onclick="openDetail('${t.id}')">
+      <div class="task-text ${t.done?'done':''}">${t.text}</div>
+      <div class="task-meta">
+        ${deadlineHtml} ${folderName} ${tagsHtml} ${recurIcon} ${descIcon} ${timerHtml}
       </div>
-    `;
-    tList.appendChild(item);
-  });
+      ${subtaskHtml}
+    </div>
+    <div class="btn-actions">
+      <button class="btn-icon-small btn-timer ${(timerTaskId===t.id&&timerInterval)?'running':''}" onclick="quickTimer('${t.id}')" title="Timer">⏱</button>
+      <button class="btn-icon-small" onclick="openDetail('${t.id}')" title="Details">✎</button>
+      <button class="btn-icon-small btn-del" onclick="del('${t.id}')" title="Löschen">×</button>
+    </div>
+  `;
+  return item;
 }
 
 function quickTimer(id) {
@@ -1533,8 +1723,6 @@ function quickTimer(id) {
 }
 
 function renderBoard(todos) {
-  const cols = { todo: document.getElementById('col-todo'), doing: document.getElementById('col-doing'), done: document.getElementById('col-done') };
-  Object.values(cols).forEach(c => c.innerHTML = '');
   const groups = { todo: [], doing: [], done: [] };
   const prioScore = { high: 3, med: 2, low: 1 };
   todos.sort((a, b) => (prioScore[b.prio]||1) - (prioScore[a.prio]||1));
@@ -1544,41 +1732,70 @@ function renderBoard(todos) {
   document.getElementById('cnt-doing').innerText = groups.doing.length;
   document.getElementById('cnt-done').innerText = groups.done.length;
 
-  const createCard = (t) => {
-    const card = document.createElement('div');
-    card.className = 'board-card'; card.draggable = true;
-    card.ondragstart = (e) => drag(e, t.id);
-    let folderBadge = '';
-    if (activeFolderId === 'all') {
-      const f = data.folders.find(x => x.id === t.folderId);
-      if (f) folderBadge = `<span class="badge" style="font-size:10px;">${f.name}</span>`;
-    }
-    const deadlineHtml = t.done ? '' : getDeadlineHtml(t.deadline);
-    const tagsHtml = t.tags.map(tag => tagBadgeHtml(tag)).join('');
-    let subtaskHtml = '';
-    if(t.subtasks && t.subtasks.length > 0) {
-      const done = t.subtasks.filter(s=>s.done).length;
-      const pct = Math.round(done/t.subtasks.length*100);
-      subtaskHtml = `<div style="margin-top:5px;"><span class="subtask-bar-wrap" style="width:100%;display:block;"><span class="subtask-bar-fill" style="width:${pct}%"></span></span><span style="font-size:10px;color:var(--text-muted);">${done}/${t.subtasks.length} Subtasks</span></div>`;
-    }
-    card.innerHTML = `
-      <div class="card-top">
-        <div class="prio-indicator prio-${t.prio||'low'}"></div>
-        <div style="display:flex;gap:2px;">
-          <button style="border:none;background:none;color:var(--text-muted);cursor:pointer;font-size:13px;" onclick="openDetail('${t.id}')">✎</button>
-          <button style="border:none;background:none;color:var(--text-muted);cursor:pointer;font-size:13px;" onclick="del('${t.id}')">×</button>
-        </div>
+  for (const s of ['todo', 'doing', 'done']) boardWindows[s].setItems(groups[s]);
+}
+
+function buildCard(t) {
+  const card = document.createElement('div');
+  card.className = 'board-card'; card.draggable = true;
+  card.ondragstart = (e) => drag(e, t.id);
+  card.ondragend = releaseHeldList;
+  let folderBadge = '';
+  if (activeFolderId === 'all') {
+    const f = data.folders.find(x => x.id === t.folderId);
+    if (f) folderBadge = `<span class="badge" style="font-size:10px;">${f.name}</span>`;
+  }
+  const deadlineHtml = t.done ? '' : getDeadlineHtml(t.deadline);
+  const tagsHtml = t.tags.map(tag => tagBadgeHtml(tag)).join('');
+  let subtaskHtml = '';
+  if(t.subtasks && t.subtasks.length > 0) {
+    const done = t.subtasks.filter(s=>s.done).length;
+    const pct = Math.round(done/t.subtasks.length*100);
+    subtaskHtml = `<div style="margin-top:5px;"><span class="subtask-bar-wrap" style="width:100%;display:block;"><span class="subtask-bar-fill" style="width:${pct}%"></span></span><span style="font-size:10px;color:var(--text-muted);">${done}/${t.subtasks.length} Subtasks</span></div>`;
+  }
+  card.innerHTML = `
+    <div class="card-top">
+      <div class="prio-indicator prio-${t.prio||'low'}"></div>
+      <div style="display:flex;gap:2px;">
+        <button style="border:none;background:none;color:var(--text-muted);cursor:pointer;font-size:13px;" onclick="openDetail('${t.id}')">✎</button>
+        <button style="border:none;background:none;color:var(--text-muted);cursor:pointer;font-size:13px;" onclick="del('${t.id}')">×</button>
       </div>
-      <div class="card-text ${t.done?'done':''}" onclick="openDetail('${t.id}')">${t.text}</div>
-      ${subtaskHtml}
-      <div class="card-footer">${deadlineHtml} ${tagsHtml} ${folderBadge}</div>
-    `;
-    return card;
+    </div>
+    <div class="card-text ${t.done?'done':''}" onclick="openDetail('${t.id}')">${t.text}</div>
+    ${subtaskHtml}
+    <div class="card-footer">${deadlineHtml} ${tagsHtml} ${folderBadge}</div>
+  `;
+  return card;
+}
+
+// Ein Fenster pro Liste bzw. Kanban-Spalte. Beim Scrollen werden die Knoten des
+// letzten Ausschnitts wiederverwendet, nach jedem render() (neue Generation) neu gebaut;
+// Auswahl (selectedIds) und Timer-Status kommen dabei immer aus dem aktuellen Zustand.
+let renderGen = 0;
+function paintRows(cache, build) {
+  return (win, slice) => {
+    const keep = new Set();
+    let ref = win.firstChild;
+    for (const t of slice) {
+      let e = cache.get(t.id);
+      if (!e || e.gen !== renderGen) { e = { el: build(t), gen: renderGen }; cache.set(t.id, e); }
+      keep.add(t.id);
+      if (e.el === ref) ref = ref.nextSibling;
+      else win.insertBefore(e.el, ref);
+    }
+    while (ref) { const next = ref.nextSibling; ref.remove(); ref = next; }
+    for (const id of cache.keys()) if (!keep.has(id)) cache.delete(id);
   };
-  groups.todo.forEach(t => cols.todo.appendChild(createCard(t)));
-  groups.doing.forEach(t => cols.doing.appendChild(createCard(t)));
-  groups.done.forEach(t => cols.done.appendChild(createCard(t)));
 }
+const listWindow = new WindowedList(document.getElementById('listView'), {
+  keyOf: t => t.id, estimate: 58, paint: paintRows(new Map(), buildListItem),
+  empty: '<div style="text-align:center;color:var(--text-muted);margin-top:40px;font-size:13px;">Keine Aufgaben</div>'
+});
+const boardWindows = {};
+['todo', 'doing', 'done'].forEach(s => {
+  boardWindows[s] = new WindowedList(document.getElementById('col-' + s),
+    { keyOf: t => t.id, estimate: 110, paint: paintRows(new Map(), buildCard) });
+});
 
 // =====================================================
 // STATS VIEW
@@ -1696,12 +1913,100 @@ document.addEventListener('keydown', (e) => {
   if (inInput && e.key === 'Enter' && document.activeElement.id === 'modalTitle') saveDetail();
 });
 
+// =====================================================
+// BENCHMARK (Konsole: suiFilterBenchmark())
+// =====================================================
+// Filterlatenz mit n synthetischen Aufgaben: Index-Abfrage gegen die frühere
+// Filterkette über die ganze Liste. Die echten Daten bleiben unberührt.
+window.suiFilterBenchmark = function(n = 20000, rounds = 50) {
+  const now = Date.now();
+  const tagPool = ['arbeit', 'privat', 'einkauf', 'uni', 'sport', 'projekt', 'lesen', 'haushalt'];
+  const words = ['bericht', 'meeting', 'rechnung', 'entwurf', 'review', 'termin', 'anruf', 'planung'];
+  const todos = [];
+  for (let i = 0; i < n; i++) {
+    const done = i % 4 === 0;
+    todos.push({
+      id: 'b' + i, text: `${words[i % 8]} ${i}`, description: i % 3 ? `notiz zu ${words[(i * 7) % 8]}` : '',
+      done, status: done ? 'done' : 'todo', prio: ['low', 'med', 'high'][i % 3], folderId: 'f' + (i % 12),
+      tags: [tagPool[i % 8], tagPool[(i * 5) % 8]].filter((x, k, a) => a.indexOf(x) === k),
+      deadline: i % 5 ? new Date(now + ((i * 7919) % 2000 - 1000) * 3600000).toISOString() : null,
+      recurType: i % 17 === 0 ? 'weekly' : '', subtasks: [], timerTotal: 0, created: new Date(now).toISOString()
+    });
+  }
+
+  // Frühere Filterkette (Kopie + .filter-Durchläufe, Date-Parsing pro Aufgabe)
+  const linear = (q) => {
+    let list = [...todos];
+    if (q.folder !== 'all') list = list.filter(t => t.folderId === q.folder);
+    if (q.search) list = list.filter(t => t.text.toLowerCase().includes(q.search) || t.description.toLowerCase().includes(q.search) || t.tags.some(tag => tag.toLowerCase().includes(q.search)));
+    if (q.tag !== 'all') list = list.filter(t => t.tags.includes(q.tag));
+    const d0 = new Date(q.now);
+    if (q.status === 'todo') list = list.filter(t => !t.done);
+    else if (q.status === 'done') list = list.filter(t => t.done);
+    else if (q.status === 'urgent') list = list.filter(t => !t.done && t.deadline && (new Date(t.deadline) - d0) < 86400000 && (new Date(t.deadline) - d0) > 0);
+    else if (q.status === 'overdue') list = list.filter(t => !t.done && t.deadline && new Date(t.deadline) < d0);
+    else if (q.status === 'recurring') list = list.filter(t => t.recurType);
+    return list;
+  };
+
+  const savedData = data;
+  data = { folders: [], todos, activityLog: [] };
+  const index = new TaskIndex();
+  let t0 = performance.now();
+  index.rebuild(todos);
+  const buildMs = performance.now() - t0;
+
+  const queries = {
+    'Ordner': { folder: 'f3', tag: 'all', status: 'all', search: '' },
+    'Tag + offen': { folder: 'all', tag: 'uni', status: 'todo', search: '' },
+    'Überfällig': { folder: 'all', tag: 'all', status: 'overdue', search: '' },
+    'Dringend + Ordner': { folder: 'f5', tag: 'all', status: 'urgent', search: '' },
+    'Suche "rechnung 1"': { folder: 'all', tag: 'all', status: 'all', search: 'rechnung 1' },
+    'Ordner + Tag + Suche': { folder: 'f1', tag: 'arbeit', status: 'all', search: 'review' },
+  };
+  const result = {};
+  for (const [name, q] of Object.entries(queries)) {
+    q.now = now;
+    const a = index.query(q).map(t => t.id).join();
+    const b = linear(q).map(t => t.id).join();
+    if (a !== b) console.error('Abweichendes Ergebnis bei ' + name);
+    t0 = performance.now();
+    for (let r = 0; r < rounds; r++) linear(q);
+    const linMs = (performance.now() - t0) / rounds;
+    // kalt: Suchtreffer jedes Mal neu ermitteln; warm: Render nach einer Änderung
+    t0 = performance.now();
+    for (let r = 0; r < rounds; r++) { index.search = null; index.query(q); }
+    const coldMs = (performance.now() - t0) / rounds;
+    t0 = performance.now();
+    for (let r = 0; r < rounds; r++) index.query(q);
+    const warmMs = (performance.now() - t0) / rounds;
+    result[name] = { treffer: index.query(q).length, linear_ms: +linMs.toFixed(3),
+                     index_kalt_ms: +coldMs.toFixed(3), index_warm_ms: +warmMs.toFixed(3) };
+  }
+  // Tippen eines Suchbegriffs: jede Eingabe sucht nur in den vorigen Treffern
+  const typed = 'rechnung 1';
+  index.search = null;
+  t0 = performance.now();
+  for (let k = 1; k <= typed.length; k++) index.query({ search: typed.slice(0, k), now });
+  result['Tippen "' + typed + '" (je Taste)'] = {
+    treffer: index.query({ search: typed, now }).length,
+    linear_ms: null, index_kalt_ms: +((performance.now() - t0) / typed.length).toFixed(3), index_warm_ms: null
+  };
+
+  data = savedData;
+  console.log(`${n} Aufgaben, Indexaufbau ${buildMs.toFixed(1)} ms`);
+  console.table(result);
+  return { tasks: n, build_ms: +buildMs.toFixed(1), queries: result };
+};
+
 // =====================================================
 // INIT & REALTIME
 // =====================================================
-load();
-switchView('list');
-setInterval(updateRealtimeDeadlines, 10000);
+openStorage().then(() => {
+  load();
+  switchView('list');
+});
+new DeadlineScheduler('.dl-badge[data-deadline]', refreshDeadlineBadge).start();
 </script>
 </body>
 </html>"""
@@ -1747,7 +2052,7 @@ setInterval(updateRealtimeDeadlines, 10000);
   .empty-msg { text-align: center; color: rgba(255,255,255,0.3); margin-top: 20px; font-size: 12px; }
   .subtask-mini { font-size: 9px; color: #888; }
 </style>
-""" + THEME_OVERRIDE_CSS + THEME_SCRIPT + """
+""" + THEME_OVERRIDE_CSS + THEME_SCRIPT + DEADLINE_SCHEDULER_SCRIPT + """
 </head>
 <body class="__BODY_CLASS__">
   <div class="app-container">
@@ -1776,18 +2081,27 @@ const KEY = 'todo_ultra_v1';
 let data = { folders: [], todos: [], activityLog: [] };
 let activePopupFolder = 'all';
 
+// Ablage: im Launcher dessen Plugin-Ablage, eigenständig localStorage
+let store = null;
+function openStorage() {
+  if (!window.launcherStorage) return Promise.resolve();
+  return launcherStorage.open({ legacyKeys: [KEY, 'todo_list_v2_kanban'] }).then(s => { store = s; });
+}
+function storageGet(key) { return store ? store.get(key) : localStorage.getItem(key); }
+function storageSet(key, value) { if (store) store.set(key, value); else localStorage.setItem(key, value); }
+
 function load() {
-  const raw = localStorage.getItem(KEY);
+  const raw = storageGet(KEY);
   if(raw) data = JSON.parse(raw);
   else {
-    const old = localStorage.getItem('todo_list_v2_kanban');
+    const old = storageGet('todo_list_v2_kanban');
     if(old) { const od = JSON.parse(old); data = {folders: od.folders||[], todos: od.todos||[], activityLog:[]}; }
     else { data = {folders:[{id:'d',name:'All'}], todos:[], activityLog:[]}; }
   }
   data.todos.forEach(t => { if(!t.tags)t.tags=[]; if(!t.subtasks)t.subtasks=[]; if(!t.timerTotal)t.timerTotal=0; if(!t.recurType)t.recurType=''; });
 }
 
-function save() { localStorage.setItem(KEY, JSON.stringify(data)); render(); }
+function save() { storageSet(KEY, JSON.stringify(data)); render(); }
 
 function render() {
   const folderSel = document.getElementById('folderFilter');
@@ -1833,20 +2147,19 @@ function render() {
     item.appendChild(chk); item.appendChild(dot); item.appendChild(content);
     listEl.appendChild(item);
   });
-  updateDeadlines();
 }
 
-function updateDeadlines() {
-  const now = new Date();
-  document.querySelectorAll('.dl-mini[data-deadline]').forEach(el => {
-    const d = new Date(el.getAttribute('data-deadline'));
-    const diff = d - now;
-    let txt;
-    if(diff < 0) { txt = '⏰ Überfällig!'; el.classList.add('dl-overdue'); }
-    else if(diff < 3600000) { txt = `⏰ In ${Math.floor(diff/60000)} Min.`; el.classList.remove('dl-overdue'); }
-    else { txt = '⏰ ' + d.toLocaleDateString() + ' ' + d.toLocaleTimeString([],{hour:'2-digit',minute:'2-digit'}); el.classList.remove('dl-overdue'); }
-    el.innerText = txt;
-  });
+// Popup-Anzeige: Datum, in der letzten Stunde Minuten, danach "Überfällig!"
+function refreshDeadlineMini(el, at, now) {
+  const d = new Date(at);
+  const diff = at - now;
+  let txt, next;
+  if(diff < 0) { txt = '⏰ Überfällig!'; next = Infinity; }
+  else if(diff < 3600000) { txt = `⏰ In ${Math.floor(diff/60000)} Min.`; next = at - Math.floor(diff/60000) * 60000 + 1; }
+  else { txt = '⏰ ' + d.toLocaleDateString() + ' ' + d.toLocaleTimeString([],{hour:'2-digit',minute:'2-digit'}); next = at - 3600000 + 1; }
+  el.classList.toggle('dl-overdue', diff < 0);
+  if (el.textContent !== txt) el.textContent = txt;
+  return next;
 }
 
 function switchFolder(newId) { activePopupFolder = newId; render(); }
@@ -1874,8 +2187,8 @@ function markDone(id) {
 }
 
 document.getElementById('newInput').addEventListener('keydown', (e) => { if (e.key === 'Enter') addTodo(); });
-load(); render();
-setInterval(updateDeadlines, 10000);
+openStorage().then(() => { load(); render(); });
+new DeadlineScheduler('.dl-mini[data-deadline]', refreshDeadlineMini).start();
 </script>
 </body>
 </html>
@@ -29,9 +29,32 @@ from PyQt5.QtCore import (
     QPropertyAnimation, QEasingCurve, QEvent, QTimer, pyqtSignal
 )
 
+# --- Eigene URL-Schemata der Plugins ---
+# QWebEngineUrlScheme muss vor dem Erzeugen der QApplication registriert sein; die
+# Plugins werden erst später geladen und installieren dann nur noch ihren Handler.
+PLUGIN_URL_SCHEMES = (b"canvas-store",)  # Zeichenheft: Bilddaten als Bytes statt Base64
+
+
+def register_plugin_url_schemes():
+    try:
+        from PyQt5.QtWebEngineCore import QWebEngineUrlScheme
+    except Exception:
+        return  # Qt < 5.12: Plugins fallen auf den WebChannel zurück
+    for name in PLUGIN_URL_SCHEMES:
+        if QWebEngineUrlScheme.schemeByName(name).name():
+            continue
+        scheme = QWebEngineUrlScheme(name)
+        scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+        scheme.setFlags(QWebEngineUrlScheme.SecureScheme |
+                        QWebEngineUrlScheme.LocalAccessAllowed |
+                        QWebEngineUrlScheme.CorsEnabled)
+        QWebEngineUrlScheme.registerScheme(scheme)
+
+
 # --- WebEngine optional laden ---
 WEBENGINE_AVAILABLE = False
 try:
+    register_plugin_url_schemes()
     try:
         from PyQt5.QtWebEngine import QtWebEngine
 
@@ -45,6 +68,9 @@ try:
 except Exception:
     WEBENGINE_AVAILABLE = False
 
+# Gemeinsame Ablage für Plugin-Daten (SQLite + window.launcherStorage), s. _plugin_storage.py
+from _plugin_storage import PluginStorageService  # noqa: E402
+
 
 def safe_run_js(view: 'QWebEngineView', script: str):
     if not WEBENGINE_AVAILABLE or view is None:
@@ -1422,9 +1448,13 @@ if (explorerBtn) {{
             cls = getattr(mod, "PluginWidget", None)
             if cls is not None and isinstance(cls, type):
                 try:
-                    return cls(mode=mode)
+                    widget = cls(mode=mode)
                 except TypeError:
-                    return cls()
+                    widget = cls()
+                storage = getattr(self.app, "plugin_storage", None)
+                if storage is not None:
+                    storage.attach(widget, os.path.splitext(os.path.basename(path))[0])
+                return widget
             return None
         except Exception:
             return None
@@ -1436,6 +1466,8 @@ class TrayApp(QApplication):
         self.setQuitOnLastWindowClosed(False)
         self.setStyleSheet(current_stylesheet())
         self.setProperty("toolbar_theme", theme)
+        self.plugin_storage = PluginStorageService(self)
+        self.plugin_storage.install_page_script()
         self.popup = PopupWindow(app=self)
         self.main_window = MainAppWindow(self, popup=self.popup)
         self.popup.set_plugin_loader(self.main_window.load_plugin_from_path)
@@ -1466,6 +1498,7 @@ class TrayApp(QApplication):
                 self.tray.activated.disconnect(self.on_tray_activated)
             except Exception:
                 pass
+            self.plugin_storage.close()
             if WEBENGINE_AVAILABLE:
                 try:
                     if hasattr(self.popup, "html_toolbar"):
@@ -1484,6 +1517,10 @@ class TrayApp(QApplication):
 
 
 if __name__ == "__main__":
+    # Plugins (z.B. Kalender) nutzen Worker-Prozesse; in der PyInstaller-EXE
+    # darf ein Worker nicht erneut den Launcher starten.
+    import multiprocessing
+    multiprocessing.freeze_support()
     try:
         import ctypes, platform
 